@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: realtime factor of the pitch and volume post-processing stages
+
+Streams a long clip through the pipeline block by block, as the engine does
+after synthesis, and reports seconds of audio processed per second of wall
+time for each pitch/volume setting.
+
+Usage:
+    python benchmarks/bench_audio_effects.py [--seconds 60] [--block 4096] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+
+from stubs import add_src_to_path, use_temporary_cache
+
+add_src_to_path()
+use_temporary_cache()
+
+from tts_notify.core.audio_io import require_numpy  # noqa: E402
+from tts_notify.core.audio_pipeline import AudioPipeline  # noqa: E402
+from tts_notify.core.audio_dsp import Gain, PitchShifter  # noqa: E402
+
+SAMPLE_RATE = 22050
+CASES = [
+    # (pitch, volume)
+    (None, 0.5),
+    (0.8, None),
+    (1.25, None),
+    (2.0, None),
+    (1.25, 0.5),
+]
+
+
+def run_case(np, clip, pitch, volume, block, repeat) -> float:
+    """Best wall time for pushing the clip through a fresh pipeline"""
+    best = float("inf")
+    for _ in range(repeat):
+        stages = []
+        if pitch is not None:
+            stages.append(PitchShifter(pitch))
+        if volume is not None:
+            stages.append(Gain(volume))
+        pipeline = AudioPipeline(stages)
+        pipeline.configure(SAMPLE_RATE, 1)
+        start = time.perf_counter()
+        for offset in range(0, len(clip), block):
+            pipeline.process(clip[offset:offset + block])
+        pipeline.flush()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--block", type=int, default=4096)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        np = require_numpy()
+    except Exception as e:
+        print(e)
+        return 1
+
+    t = np.arange(int(SAMPLE_RATE * args.seconds), dtype=np.float32) / SAMPLE_RATE
+    clip = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)[:, None]
+
+    print(f"{args.seconds:.0f}s mono clip at {SAMPLE_RATE} Hz, {args.block}-frame blocks")
+    for pitch, volume in CASES:
+        elapsed = run_case(np, clip, pitch, volume, args.block, args.repeat)
+        label = f"pitch {pitch or 1.0:<5} volume {volume or 1.0:<5}"
+        print(f"{label:<28} {elapsed * 1e3:9.1f}ms  realtime x{args.seconds / elapsed:8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one serial save of a long document vs. sharded parallel rendering
+
+Renders a generated markdown document with save() as a single request and
+with render_document() at several concurrency levels, then once more to
+time a fully resumed run. Runs on any host using the stub executables from
+stubs.py; STUB_SYNTH_DELAY models render time per say call. The document
+must split into at least as many shards as the largest job count, or the
+extra jobs would have nothing to do.
+
+Usage:
+    python benchmarks/bench_document_render.py [--sections 40] [--shard-chars 600]
+        [--jobs 1 2 4 8] [--synth-delay 0.3]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+from stubs import add_src_to_path, stub_environment, use_temporary_cache
+
+add_src_to_path()
+use_temporary_cache()
+warnings.simplefilter("ignore")
+# Measure rendering itself, not the synthesis cache
+os.environ["TTS_NOTIFY_SYNTH_CACHE_ENABLED"] = "false"
+
+from tts_notify.core.audio_io import require_numpy  # noqa: E402
+from tts_notify.core.document_renderer import markdown_to_speech  # noqa: E402
+from tts_notify.core.segmenter import TextSegmenter  # noqa: E402
+from tts_notify.core.tts_engine import MacOSTTSEngine  # noqa: E402
+from tts_notify.core.models import TTSRequest, Voice, Language, AudioFormat  # noqa: E402
+
+
+def make_document(sections: int) -> str:
+    parts = ["# Release notes"]
+    for i in range(sections):
+        parts.append(f"## Change {i}\n\n"
+                     f"This release makes **component {i}** faster and fixes [issue {i}](https://example.com/{i}). "
+                     "Rendering now streams to disk, and errors are reported with the failing step.\n\n"
+                     f"- Improved caching for module {i}\n- Removed a deprecated option")
+    return "\n\n".join(parts)
+
+
+async def run(sections: int, shard_chars: int, jobs_list, tmp: Path) -> None:
+    voice = Voice(id="Alex", name="Alex", language=Language.ENGLISH)
+    request = TTSRequest(text=make_document(sections), voice=voice, rate=175, output_format=AudioFormat.WAV)
+    engine = MacOSTTSEngine()
+    await engine.initialize()
+
+    start = time.perf_counter()
+    response = await engine.save(TTSRequest(text=markdown_to_speech(request.text), voice=voice, rate=175,
+                                            output_format=AudioFormat.WAV), tmp / "serial.wav")
+    if not response.success:
+        raise RuntimeError(response.error)
+    serial = time.perf_counter() - start
+    print(f"serial save      {serial:7.2f}s")
+
+    for jobs in jobs_list:
+        start = time.perf_counter()
+        response = await engine.render_document(request, tmp / f"doc-{jobs}.wav", resume=False,
+                                                keep_shards=True, shard_chars=shard_chars,
+                                                max_concurrent=jobs)
+        if not response.success:
+            raise RuntimeError(response.error)
+        elapsed = time.perf_counter() - start
+        print(f"{jobs:>2} jobs          {elapsed:7.2f}s  x{serial / elapsed:5.2f}  "
+              f"{response.metadata['shards']} shards  {response.metadata['duration'] / 60:.1f} min audio")
+
+    start = time.perf_counter()
+    response = await engine.render_document(request, tmp / f"doc-{jobs_list[-1]}.wav",
+                                            shard_chars=shard_chars)
+    print(f"resumed          {time.perf_counter() - start:7.2f}s  "
+          f"{response.metadata['resumed']}/{response.metadata['shards']} shards reused")
+    await engine.cleanup()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sections", type=int, default=40)
+    parser.add_argument("--shard-chars", type=int, default=600)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--synth-delay", type=float, default=0.3)
+    args = parser.parse_args()
+
+    try:
+        require_numpy()
+    except Exception as e:
+        print(e)
+        return 1
+
+    shards = len(TextSegmenter.split_into_shards(markdown_to_speech(make_document(args.sections)),
+                                                 args.shard_chars))
+    if shards < max(args.jobs):
+        print(f"{args.sections} sections split into {shards} shards of up to {args.shard_chars} characters, "
+              f"fewer than {max(args.jobs)} jobs; raise --sections or lower --shard-chars")
+        return 1
+
+    with stub_environment(synth_delay=args.synth_delay), \
+            tempfile.TemporaryDirectory(prefix="tts-notify-bench-doc-") as tmp:
+        asyncio.run(run(args.sections, args.shard_chars, args.jobs, Path(tmp)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
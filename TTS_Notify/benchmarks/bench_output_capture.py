@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: temp-file capture vs. in-memory (memfd) capture of engine output
+
+Reports wall time per request and the bytes that went through the temporary
+filesystem versus bytes read back into the process.
+
+Usage:
+    python benchmarks/bench_output_capture.py [--requests 30] [--clip-kb 512]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import warnings
+
+from stubs import add_src_to_path, stub_environment, use_temporary_cache
+
+add_src_to_path()
+use_temporary_cache()
+warnings.simplefilter("ignore")
+# Measure synthesis itself, not the synthesis cache
+os.environ["TTS_NOTIFY_SYNTH_CACHE_ENABLED"] = "false"
+
+from tts_notify.core.output_capture import OutputCapture  # noqa: E402
+from tts_notify.core.tts_engine import MacOSTTSEngine  # noqa: E402
+from tts_notify.core.models import TTSRequest, Voice, Language  # noqa: E402
+
+
+def bench_capture_only(mode: str, requests: int, clip: bytes) -> None:
+    """Write a clip through the capture path and read it back"""
+    timings, on_disk, read = [], 0, 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        with OutputCapture.create(mode=mode) as capture:
+            with open(capture.path, "wb") as writer:
+                writer.write(clip)
+            capture.read()
+            on_disk += capture.bytes_on_disk
+            read += capture.bytes_read
+        timings.append(time.perf_counter() - start)
+    print(f"capture {mode:<9} mean {statistics.mean(timings) * 1e6:9.1f}us  "
+          f"tmpfs bytes/req {on_disk // requests:>9}  read bytes/req {read // requests:>9}")
+
+
+async def bench_engine(mode: str, requests: int, text: str) -> None:
+    """End-to-end synthesize() through a stub say"""
+    engine = MacOSTTSEngine(capture_mode=mode)
+    await engine.initialize()
+    voice = Voice(id="Alex", name="Alex", language=Language.ENGLISH)
+    timings, size = [], 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await engine.synthesize(TTSRequest(text=text, voice=voice, rate=175))
+        timings.append(time.perf_counter() - start)
+        if not response.success:
+            raise RuntimeError(response.error)
+        size = len(response.audio_data)
+    tmpfs = size if mode == "tempfile" else 0
+    print(f"engine  {mode:<9} mean {statistics.mean(timings) * 1e3:9.2f}ms  "
+          f"tmpfs bytes/req {tmpfs:>9}  read bytes/req {size:>9}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--clip-kb", type=int, default=512)
+    args = parser.parse_args()
+
+    if not OutputCapture.memfd_supported():
+        print("memfd is not supported on this platform; nothing to compare")
+        return 1
+
+    clip = os.urandom(args.clip_kb * 1024)
+    for mode in ("tempfile", "memfd"):
+        bench_capture_only(mode, args.requests, clip)
+
+    text = "Deployment finished successfully for every service in the cluster. " * 4
+    with stub_environment():
+        for mode in ("tempfile", "memfd"):
+            asyncio.run(bench_engine(mode, args.requests, text))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
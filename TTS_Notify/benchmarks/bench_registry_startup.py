@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sequential vs. concurrent EngineRegistry lifecycle
+
+Registers several stub engines (each spawns a stub synthesis worker that
+takes --load-delay seconds to load its voice, and lists voices through a
+stub `say -v ?` that waits --list-delay seconds for the speech daemon) and
+times initialize_all, get_all_engine_info and cleanup_all against the
+previous one-engine-at-a-time behavior.
+
+get_all_engine_info only gains from concurrency while engines wait on
+something outside the process. With --list-delay 0 each listing is just
+the CPU-bound startup of a Python stub, and on a machine with few cores
+starting them all at once is no faster, and can be slower, than one by one.
+
+Usage:
+    python benchmarks/bench_registry_startup.py [--engines 6] [--load-delay 0.3] [--list-delay 0.1]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import warnings
+from typing import List
+
+from stubs import add_src_to_path, stub_environment, use_temporary_cache
+
+add_src_to_path()
+use_temporary_cache()
+warnings.simplefilter("ignore")
+
+from tts_notify.core.tts_engine import TTSEngine, EngineRegistry  # noqa: E402
+from tts_notify.core.worker_pool import SynthesisWorkerPool  # noqa: E402
+from tts_notify.core.models import AudioFormat, Language, TTSResponse, Voice  # noqa: E402
+
+
+class StubEngine(TTSEngine):
+    """Engine whose startup cost is a worker voice load plus a voice listing"""
+
+    def __init__(self, name: str, worker_command: List[str]):
+        super().__init__(name)
+        self._supported_formats = [AudioFormat.AIFF]
+        self._pool = SynthesisWorkerPool(command=worker_command, min_size=1, max_size=1,
+                                         health_check_interval=0)
+
+    async def initialize(self) -> None:
+        await self._pool.start()
+        # The first round trip waits for the worker to finish loading
+        await self._pool.submit({"op": "ping"}, timeout=30)
+        self._initialized = True
+
+    async def cleanup(self) -> None:
+        await self._pool.stop()
+        self._initialized = False
+
+    def is_available(self) -> bool:
+        return True
+
+    async def get_supported_voices(self) -> List[Voice]:
+        process = await asyncio.create_subprocess_exec(
+            "say", "-v", "?", stdout=asyncio.subprocess.PIPE
+        )
+        stdout, _ = await process.communicate()
+        return [Voice(id=line.split()[0], name=line.split()[0], language=Language.UNKNOWN)
+                for line in stdout.decode().splitlines() if line.strip()]
+
+    async def speak(self, request) -> TTSResponse:
+        return TTSResponse(success=True)
+
+    async def synthesize(self, request) -> TTSResponse:
+        return TTSResponse(success=True, audio_data=b"")
+
+    async def save(self, request, output_path) -> TTSResponse:
+        return TTSResponse(success=True, file_path=output_path)
+
+
+def build_registry(count: int, worker_command: List[str]) -> EngineRegistry:
+    registry = EngineRegistry()
+    for i in range(count):
+        registry.register(StubEngine(f"stub-{i}", worker_command))
+    return registry
+
+
+async def sequential(registry: EngineRegistry) -> dict:
+    """The previous behavior: await each engine in turn"""
+    timings = {}
+    engines = dict(registry._engines)
+
+    start = time.perf_counter()
+    for engine in engines.values():
+        await engine.initialize()
+    timings["initialize_all"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for engine in engines.values():
+        await engine.get_engine_info()
+    timings["get_all_engine_info"] = time.perf_counter() - start
+    timings["get_all_engine_info (repeat)"] = timings["get_all_engine_info"]
+
+    start = time.perf_counter()
+    for engine in engines.values():
+        await engine.cleanup()
+    timings["cleanup_all"] = time.perf_counter() - start
+    return timings
+
+
+async def concurrent(registry: EngineRegistry) -> dict:
+    timings = {}
+
+    start = time.perf_counter()
+    results = await registry.initialize_all()
+    timings["initialize_all"] = time.perf_counter() - start
+    if not all(results.values()):
+        raise RuntimeError(f"Initialization failed: {results}")
+
+    start = time.perf_counter()
+    await registry.get_all_engine_info()
+    timings["get_all_engine_info"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await registry.get_all_engine_info()
+    timings["get_all_engine_info (repeat)"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await registry.cleanup_all()
+    timings["cleanup_all"] = time.perf_counter() - start
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--engines", type=int, default=6)
+    parser.add_argument("--load-delay", type=float, default=0.3,
+                        help="Simulated per-worker voice load time in seconds")
+    parser.add_argument("--list-delay", type=float, default=0.1,
+                        help="Simulated speech daemon latency of each voice listing in seconds")
+    args = parser.parse_args()
+
+    with stub_environment(load_delay=args.load_delay, list_delay=args.list_delay) as stub_dir:
+        worker_command = [str(stub_dir / "stub-synthesis-worker")]
+        before = await sequential(build_registry(args.engines, worker_command))
+        after = await concurrent(build_registry(args.engines, worker_command))
+
+    print(f"{args.engines} stub engines, {args.load_delay:.2f}s voice load "
+          f"and {args.list_delay:.2f}s voice listing each")
+    print(f"{'operation':<30}{'sequential':>12}{'concurrent':>12}{'speedup':>10}")
+    for operation, seconds in before.items():
+        speedup = seconds / after[operation] if after[operation] > 0 else float("inf")
+        print(f"{operation:<30}{seconds * 1000:10.1f}ms{after[operation] * 1000:10.1f}ms{speedup:9.1f}x")
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: block-wise resampling and channel mixing throughput
+
+Reports input samples per second and the realtime factor (seconds of audio
+processed per second of wall time) for a long clip at common rate pairs.
+
+Usage:
+    python benchmarks/bench_resampler.py [--seconds 60] [--block 4096] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+
+from stubs import add_src_to_path, use_temporary_cache
+
+add_src_to_path()
+use_temporary_cache()
+
+from tts_notify.core.audio_io import require_numpy  # noqa: E402
+from tts_notify.core.audio_pipeline import AudioPipeline  # noqa: E402
+from tts_notify.core.audio_dsp import ChannelMixer, Resampler  # noqa: E402
+
+CASES = [
+    # (source rate, source channels, target rate, target channels)
+    (22050, 1, 16000, 1),
+    (22050, 1, 44100, 1),
+    (22050, 1, 48000, 1),
+    (44100, 2, 22050, 1),
+    (22050, 1, 22050, 2),
+]
+
+
+def run_case(np, source_rate, source_channels, target_rate, target_channels,
+             seconds, block, repeat) -> None:
+    """Push a clip through a fresh pipeline block by block; keep the best run"""
+    frames = int(source_rate * seconds)
+    t = np.arange(frames, dtype=np.float32) / source_rate
+    clip = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    clip = np.repeat(clip[:, None], source_channels, axis=1)
+
+    best, produced = float("inf"), 0
+    for _ in range(repeat):
+        pipeline = AudioPipeline([ChannelMixer(target_channels), Resampler(target_rate)])
+        pipeline.configure(source_rate, source_channels)
+        produced = 0
+        start = time.perf_counter()
+        for offset in range(0, frames, block):
+            produced += len(pipeline.process(clip[offset:offset + block]))
+        produced += len(pipeline.flush())
+        best = min(best, time.perf_counter() - start)
+
+    label = f"{source_rate}Hz/{source_channels}ch -> {target_rate}Hz/{target_channels}ch"
+    print(f"{label:<30} {frames * source_channels / best / 1e6:8.2f} Msamples/s  "
+          f"realtime x{seconds / best:8.1f}  out frames {produced:>9}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--block", type=int, default=4096)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        np = require_numpy()
+    except Exception as e:
+        print(e)
+        return 1
+
+    for case in CASES:
+        run_case(np, *case, args.seconds, args.block, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
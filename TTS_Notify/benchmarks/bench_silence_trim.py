@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time-to-audible-onset and clip size with and without silence trimming
+
+For short notifications, reports synthesis time, the silence left before the
+first audible sample, their sum (time until something is heard when playback
+starts right after synthesis) and the clip size in bytes.
+
+Usage:
+    python benchmarks/bench_silence_trim.py [--requests 20]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import warnings
+
+from stubs import add_src_to_path, stub_environment, use_temporary_cache
+
+add_src_to_path()
+use_temporary_cache()
+warnings.simplefilter("ignore")
+# Measure synthesis itself, not the synthesis cache
+os.environ["TTS_NOTIFY_SYNTH_CACHE_ENABLED"] = "false"
+
+from tts_notify.core.audio_io import AudioReader, require_numpy  # noqa: E402
+from tts_notify.core.config_manager import config_manager  # noqa: E402
+from tts_notify.core.tts_engine import MacOSTTSEngine  # noqa: E402
+from tts_notify.core.models import TTSRequest, Voice, Language  # noqa: E402
+
+TEXTS = ["Build passed", "Deploy finished", "Tests failed on main", "New message"]
+AUDIBLE = 10 ** (-50 / 20)
+
+
+def onset_seconds(np, audio: bytes) -> float:
+    """Position of the first sample above -50 dBFS"""
+    with AudioReader(audio) as reader:
+        samples = np.abs(reader.to_float()).max(axis=1)
+        loud = np.flatnonzero(samples > AUDIBLE)
+        return (loud[0] if len(loud) else len(samples)) / reader.info.sample_rate
+
+
+async def bench(np, trim: bool, requests: int) -> None:
+    os.environ["TTS_NOTIFY_TRIM_SILENCE"] = "true" if trim else "false"
+    config_manager.reload_config()
+    engine = MacOSTTSEngine()
+    await engine.initialize()
+    voice = Voice(id="Alex", name="Alex", language=Language.ENGLISH)
+
+    synth, onset, size = [], [], []
+    for index in range(requests):
+        start = time.perf_counter()
+        response = await engine.synthesize(TTSRequest(text=TEXTS[index % len(TEXTS)], voice=voice))
+        synth.append(time.perf_counter() - start)
+        if not response.success:
+            raise RuntimeError(response.error)
+        onset.append(onset_seconds(np, response.audio_data))
+        size.append(len(response.audio_data))
+    await engine.cleanup()
+
+    label = "trimmed" if trim else "untrimmed"
+    print(f"{label:<10} synth {statistics.mean(synth) * 1e3:7.1f}ms  "
+          f"leading silence {statistics.mean(onset) * 1e3:7.1f}ms  "
+          f"time-to-onset {(statistics.mean(synth) + statistics.mean(onset)) * 1e3:7.1f}ms  "
+          f"bytes {statistics.mean(size):9.0f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        np = require_numpy()
+    except Exception as e:
+        print(e)
+        return 1
+
+    with stub_environment():
+        for trim in (False, True):
+            asyncio.run(bench(np, trim, args.requests))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
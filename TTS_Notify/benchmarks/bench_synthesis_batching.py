@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one `say` call per short request vs. batched renders split on silence
+
+Renders a burst of one-line notifications with batching off and on, and
+reports wall time, say invocations saved, and how far each batched clip's
+length is from the same text rendered alone. Runs on any host using the
+stub executables from stubs.py; STUB_LOAD_DELAY models process start and
+voice loading, which batching amortizes.
+
+Usage:
+    python benchmarks/bench_synthesis_batching.py [--requests 64] [--load-delay 0.1] [--window 0.05]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import warnings
+
+from stubs import add_src_to_path, stub_environment, use_temporary_cache
+
+add_src_to_path()
+use_temporary_cache()
+warnings.simplefilter("ignore")
+# Measure synthesis itself, not the synthesis cache or duplicate suppression
+os.environ["TTS_NOTIFY_SYNTH_CACHE_ENABLED"] = "false"
+os.environ["TTS_NOTIFY_COALESCE_WINDOW"] = "0"
+
+from tts_notify.core.audio_io import read_info, require_numpy  # noqa: E402
+from tts_notify.core.config_manager import config_manager  # noqa: E402
+from tts_notify.core.tts_engine import MacOSTTSEngine  # noqa: E402
+from tts_notify.core.models import TTSRequest, Voice, Language  # noqa: E402
+
+TEXTS = ["Build {i} passed.", "Deploy {i} finished on staging", "Tests failed on branch {i}",
+         "New message from the team about ticket {i}"]
+
+
+async def run(count: int, window: float):
+    """Synthesize count short requests concurrently; returns (seconds, durations, batcher stats)"""
+    os.environ["TTS_NOTIFY_BATCH_WINDOW"] = str(window)
+    config_manager.reload_config()
+    engine = MacOSTTSEngine()
+    await engine.initialize()
+    voice = Voice(id="Alex", name="Alex", language=Language.ENGLISH)
+    requests = [TTSRequest(text=TEXTS[i % len(TEXTS)].format(i=i), voice=voice, rate=175) for i in range(count)]
+
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(engine.synthesize(request) for request in requests))
+    elapsed = time.perf_counter() - start
+    for response in responses:
+        if not response.success:
+            raise RuntimeError(response.error)
+
+    durations = [read_info(response.audio_data).duration for response in responses]
+    stats = (await engine.get_engine_info())["batcher"]
+    await engine.cleanup()
+    return elapsed, durations, stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--load-delay", type=float, default=0.1)
+    parser.add_argument("--window", type=float, default=0.05)
+    args = parser.parse_args()
+
+    try:
+        require_numpy()
+    except Exception as e:
+        print(e)
+        return 1
+
+    with stub_environment(load_delay=args.load_delay):
+        solo_time, solo, _ = asyncio.run(run(args.requests, 0.0))
+        batch_time, batched, stats = asyncio.run(run(args.requests, args.window))
+
+    errors = [abs(a - b) * 1e3 for a, b in zip(solo, batched)]
+    print(f"{args.requests} requests, {args.load_delay * 1e3:.0f}ms per say start")
+    print(f"one call each   {solo_time:7.2f}s  {args.requests / solo_time:7.1f} req/s")
+    print(f"batched         {batch_time:7.2f}s  {args.requests / batch_time:7.1f} req/s  "
+          f"batches {stats['batches']}  say calls saved {stats['spawns_saved']}  "
+          f"split failures {stats['split_failures']}")
+    print(f"clip length vs solo render: mean {sum(errors) / len(errors):.1f}ms  max {max(errors):.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: WSOLA time-stretch quality and throughput, and rate variants served from the cache
+
+Reports, per speed, the realtime factor of TimeStretcher and its duration
+and pitch error on a tone; per pitch ratio, the realtime factor and pitch
+error of the WSOLA and delay-line pitch shifters; and the latency of a
+request at a new rate synthesized afresh versus derived from a clip cached
+at a nearby rate.
+
+Usage:
+    python benchmarks/bench_time_stretch.py [--seconds 30] [--block 4096] [--requests 10]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+from stubs import add_src_to_path, stub_environment, use_temporary_cache
+
+add_src_to_path()
+use_temporary_cache()
+warnings.simplefilter("ignore")
+
+from tts_notify.core.audio_io import require_numpy  # noqa: E402
+from tts_notify.core.audio_pipeline import AudioPipeline  # noqa: E402
+from tts_notify.core.audio_dsp import PitchShifter, TimeStretcher, WsolaPitchShifter  # noqa: E402
+from tts_notify.core.config_manager import config_manager  # noqa: E402
+from tts_notify.core.tts_engine import MacOSTTSEngine  # noqa: E402
+from tts_notify.core.models import TTSRequest, Voice, Language  # noqa: E402
+
+SAMPLE_RATE = 22050
+TONE = 220.0
+SPEEDS = [0.8, 0.9, 1.1, 1.25, 1.5]
+PITCHES = [0.8, 1.25, 1.5]
+TEXTS = ["Build passed", "Deploy finished", "Tests failed on main", "New message from the team"]
+
+
+def run(np, stage, clip, block):
+    """Push the clip through one stage; returns (output, seconds)"""
+    pipeline = AudioPipeline([stage])
+    pipeline.configure(SAMPLE_RATE, 1)
+    out = []
+    start = time.perf_counter()
+    for offset in range(0, len(clip), block):
+        out.append(pipeline.process(clip[offset:offset + block]))
+    out.append(pipeline.flush())
+    elapsed = time.perf_counter() - start
+    return np.concatenate([part for part in out if part is not None and len(part)]), elapsed
+
+
+def peak_hz(np, samples) -> float:
+    """Dominant frequency, refined by parabolic interpolation"""
+    mono = samples[:, 0] * np.hanning(len(samples))
+    spectrum = np.abs(np.fft.rfft(mono))
+    k = int(np.argmax(spectrum[1:-1])) + 1
+    a, b, c = np.log(spectrum[k - 1:k + 2] + 1e-12)
+    return (k + 0.5 * (a - c) / (a - 2 * b + c)) * SAMPLE_RATE / len(mono)
+
+
+async def bench_variants(requests: int) -> None:
+    voice = Voice(id="Alex", name="Alex", language=Language.ENGLISH)
+    for tolerance in (0.0, 0.15):
+        os.environ["TTS_NOTIFY_RATE_VARIANT_TOLERANCE"] = str(tolerance)
+        with tempfile.TemporaryDirectory(prefix="tts-notify-bench-cache-") as cache_dir:
+            os.environ["TTS_NOTIFY_SYNTH_CACHE_DIR"] = cache_dir
+            config_manager.reload_config()
+            engine = MacOSTTSEngine()
+            await engine.initialize()
+            # Warm the cache at the default rate
+            for text in TEXTS:
+                await engine.synthesize(TTSRequest(text=text, voice=voice, rate=175))
+
+            times, derived = [], 0
+            for index in range(requests):
+                rate = 190 + index % 10
+                start = time.perf_counter()
+                response = await engine.synthesize(TTSRequest(text=TEXTS[index % len(TEXTS)], voice=voice, rate=rate))
+                times.append(time.perf_counter() - start)
+                if not response.success:
+                    raise RuntimeError(response.error)
+                derived += "rate_variant" in response.metadata
+            await engine.cleanup()
+
+        label = "synthesized" if not tolerance else f"variant tol {tolerance:g}"
+        print(f"{label:<18} mean {statistics.mean(times) * 1e3:7.1f}ms  "
+              f"median {statistics.median(times) * 1e3:7.1f}ms  derived {derived}/{requests}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--block", type=int, default=4096)
+    parser.add_argument("--requests", type=int, default=10)
+    args = parser.parse_args()
+
+    try:
+        np = require_numpy()
+    except Exception as e:
+        print(e)
+        return 1
+
+    t = np.arange(int(SAMPLE_RATE * args.seconds), dtype=np.float32) / SAMPLE_RATE
+    clip = (0.3 * np.sin(2 * np.pi * TONE * t)).astype(np.float32)[:, None]
+
+    print(f"{args.seconds:.0f}s {TONE:.0f} Hz tone at {SAMPLE_RATE} Hz, {args.block}-frame blocks")
+    for speed in SPEEDS:
+        out, elapsed = run(np, TimeStretcher(speed), clip, args.block)
+        expected = len(clip) / speed
+        print(f"stretch x{speed:<5} realtime x{args.seconds / elapsed:7.1f}  "
+              f"length error {abs(len(out) - expected) / SAMPLE_RATE * 1e3:6.2f}ms  "
+              f"pitch {peak_hz(np, out):7.2f} Hz")
+
+    for ratio in PITCHES:
+        for label, stage in (("wsola", WsolaPitchShifter(ratio)), ("delay", PitchShifter(ratio))):
+            out, elapsed = run(np, stage, clip, args.block)
+            print(f"pitch x{ratio:<5} {label:<6} realtime x{args.seconds / elapsed:7.1f}  "
+                  f"pitch {peak_hz(np, out):7.2f} Hz (target {TONE * ratio:.2f})")
+
+    with stub_environment():
+        asyncio.run(bench_variants(args.requests))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
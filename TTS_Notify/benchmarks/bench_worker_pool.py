@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one `say` process per request vs. pooled synthesis workers
+
+Runs on any host using the stub executables from stubs.py. The stub worker
+stands in for a PyObjC worker that loads its voice once; without PyObjC the
+real pool is not started, since its workers would spawn say per job.
+
+Usage:
+    python benchmarks/bench_worker_pool.py [--requests 50] [--load-delay 0.05]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+from stubs import add_src_to_path, stub_environment, use_temporary_cache
+
+add_src_to_path()
+use_temporary_cache()
+warnings.simplefilter("ignore")
+# Measure synthesis itself, not the synthesis cache
+os.environ["TTS_NOTIFY_SYNTH_CACHE_ENABLED"] = "false"
+
+from tts_notify.core.tts_engine import MacOSTTSEngine  # noqa: E402
+from tts_notify.core.worker_pool import SynthesisWorkerPool  # noqa: E402
+from tts_notify.core.models import TTSRequest, Voice, Language  # noqa: E402
+
+
+async def run_requests(engine: MacOSTTSEngine, count: int, output_dir: Path) -> list:
+    voice = Voice(id="Alex", name="Alex", language=Language.ENGLISH)
+    latencies = []
+    for i in range(count):
+        request = TTSRequest(text=f"Build {i} finished", voice=voice, rate=175)
+        start = time.perf_counter()
+        response = await engine.save(request, output_dir / f"clip_{i}.aiff")
+        latencies.append(time.perf_counter() - start)
+        if not response.success:
+            raise RuntimeError(response.error)
+    return latencies
+
+
+def report(label: str, latencies: list) -> None:
+    total = sum(latencies)
+    print(f"{label:<16} total {total:7.3f}s  mean {statistics.mean(latencies) * 1000:7.2f}ms  "
+          f"p95 {sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000:7.2f}ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--load-delay", type=float, default=0.05,
+                        help="Simulated per-process voice load time in seconds")
+    args = parser.parse_args()
+
+    with stub_environment(load_delay=args.load_delay) as stub_dir, \
+            tempfile.TemporaryDirectory() as out:
+        output_dir = Path(out)
+
+        spawn_engine = MacOSTTSEngine()
+        await spawn_engine.initialize()
+        report("spawn per req", await run_requests(spawn_engine, args.requests, output_dir))
+
+        pool = SynthesisWorkerPool(command=[str(stub_dir / "stub-synthesis-worker")],
+                                   min_size=1, max_size=2, health_check_interval=0)
+        pooled_engine = MacOSTTSEngine(worker_pool=pool)
+        await pooled_engine.initialize()
+        try:
+            report("worker pool", await run_requests(pooled_engine, args.requests, output_dir))
+            print(f"pool stats: {pool.get_stats()}")
+        finally:
+            await pooled_engine.cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
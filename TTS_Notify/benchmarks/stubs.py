@@ -0,0 +1,158 @@
+"""
+Stub synthesis executables for benchmarking TTS Notify v2 on any host
+
+Writes a fake `say` command and a fake pooled synthesis worker into a
+directory. Both emit a valid 16-bit mono AIFF whose length scales with the
+word count and rate, and both sleep STUB_LOAD_DELAY seconds once per process
+to model voice loading. `say -v ?` sleeps STUB_LIST_DELAY seconds to model
+the round trip to the speech daemon that lists the installed voices.
+"""
+
+import os
+import stat
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+_AIFF_WRITER = r'''
+import math, re, struct
+
+def ext80(x):
+    if x == 0:
+        return b"\0" * 10
+    e = int(math.floor(math.log2(x)))
+    return struct.pack(">HQ", e + 16383, int(x / 2 ** e * (1 << 63)))
+
+def render_aiff(path, text, rate=175, sample_rate=22050):
+    # Honors say's [[slnc ms]] embedded silence command
+    pad = int(sample_rate * 0.2)
+    frames = [0] * pad
+    for index, part in enumerate(re.split(r"\[\[slnc (\d+)\]\]", text)):
+        if index % 2:
+            frames += [0] * int(sample_rate * int(part) / 1000)
+            continue
+        n = int(sample_rate * len(part.split()) * 60.0 / (rate or 175))
+        frames += [int(8000 * math.sin(2 * math.pi * 220 * k / sample_rate)) for k in range(n)]
+    frames += [0] * pad
+    pcm = struct.pack(">%dh" % len(frames), *frames)
+    comm = struct.pack(">hIh", 1, len(frames), 16) + ext80(sample_rate)
+    ssnd = struct.pack(">II", 0, 0) + pcm
+    body = (b"AIFF" + b"COMM" + struct.pack(">I", len(comm)) + comm +
+            b"SSND" + struct.pack(">I", len(ssnd)) + ssnd)
+    with open(path, "wb") as f:
+        f.write(b"FORM" + struct.pack(">I", len(body)) + body)
+'''
+
+_STUB_SAY = _AIFF_WRITER + r'''
+import os, sys, time
+
+def main():
+    args, voice, rate, out, text = sys.argv[1:], None, 175, None, []
+    i = 0
+    while i < len(args):
+        if args[i] in ("-v", "-r", "-o"):
+            flag, value = args[i], args[i + 1]
+            if flag == "-v":
+                voice = value
+            elif flag == "-r":
+                rate = int(value)
+            else:
+                out = value
+            i += 2
+            continue
+        if not args[i].startswith("--"):
+            text.append(args[i])
+        i += 1
+    if voice == "?":
+        time.sleep(float(os.environ.get("STUB_LIST_DELAY", "0")))
+        print("Alex                en_US    # Most people recognize me by my voice.")
+        print("Monica              es_ES    # Hola, me llamo Monica.")
+        return
+    time.sleep(float(os.environ.get("STUB_LOAD_DELAY", "0")))
+    text = " ".join(text) or sys.stdin.read()
+    time.sleep(float(os.environ.get("STUB_SYNTH_DELAY", "0")))
+    if out:
+        render_aiff(out, text, rate)
+
+main()
+'''
+
+_STUB_WORKER = _AIFF_WRITER + r'''
+import json, os, sys, time
+
+def main():
+    time.sleep(float(os.environ.get("STUB_LOAD_DELAY", "0")))
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        response = {"id": request.get("id"), "ok": True}
+        if request.get("op") in ("synthesize", "speak"):
+            time.sleep(float(os.environ.get("STUB_SYNTH_DELAY", "0")))
+            if request.get("output"):
+                render_aiff(request["output"], request["text"], request.get("rate") or 175)
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+main()
+'''
+
+
+def _write_script(path: Path, source: str) -> Path:
+    path.write_text(f"#!{sys.executable}\n{source}")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return path
+
+
+def write_stub_say(directory: Path) -> Path:
+    """Write an executable stub `say` into directory"""
+    return _write_script(directory / "say", _STUB_SAY)
+
+
+def write_stub_worker(directory: Path) -> Path:
+    """Write an executable stub pooled worker into directory"""
+    return _write_script(directory / "stub-synthesis-worker", _STUB_WORKER)
+
+
+@contextmanager
+def stub_environment(load_delay: float = 0.0, synth_delay: float = 0.0,
+                     list_delay: float = 0.0) -> Iterator[Path]:
+    """Put stub executables first on PATH for the duration of the block"""
+    saved = {key: os.environ.get(key)
+             for key in ("PATH", "STUB_LOAD_DELAY", "STUB_SYNTH_DELAY", "STUB_LIST_DELAY")}
+    with tempfile.TemporaryDirectory(prefix="tts-notify-bench-") as tmp:
+        directory = Path(tmp)
+        write_stub_say(directory)
+        write_stub_worker(directory)
+        os.environ["PATH"] = f"{directory}{os.pathsep}{os.environ.get('PATH', '')}"
+        os.environ["STUB_LOAD_DELAY"] = str(load_delay)
+        os.environ["STUB_SYNTH_DELAY"] = str(synth_delay)
+        os.environ["STUB_LIST_DELAY"] = str(list_delay)
+        try:
+            yield directory
+        finally:
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+def add_src_to_path() -> None:
+    """Make the tts_notify package importable from a source checkout"""
+    src = Path(__file__).resolve().parent.parent / "src"
+    if str(src) not in sys.path:
+        sys.path.insert(0, str(src))
+
+
+def use_temporary_cache() -> Path:
+    """
+    Point XDG_CACHE_HOME at a fresh temporary directory so benchmark runs
+    never touch the user's synthesis cache or calibrate the duration model
+    of the real engine. Call before importing tts_notify.
+    """
+    cache = Path(tempfile.mkdtemp(prefix="tts-notify-bench-cache-"))
+    os.environ["XDG_CACHE_HOME"] = str(cache)
+    return cache
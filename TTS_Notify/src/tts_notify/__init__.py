@@ -21,6 +21,9 @@ for path in paths_to_add:
     if path not in sys.path:
         sys.path.insert(0, path)
 
+# Where the process was started; user-supplied relative paths resolve against it
+launch_dir = Path.cwd()
+
 # Also add to current working directory for imports
 os.chdir(project_root)
 
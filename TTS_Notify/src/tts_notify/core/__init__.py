@@ -7,12 +7,36 @@ including voice management, TTS engines, and configuration.
 
 from .config_manager import TTSConfig, config_manager
 from .voice_system import VoiceManager, VoiceFilter, MacOSVoiceDetector
-from .tts_engine import TTSEngine, MacOSTTSEngine, engine_registry
-from .models import Voice, TTSRequest, TTSResponse, Gender, VoiceQuality, Language, AudioFormat
+from .tts_engine import TTSEngine, MacOSTTSEngine, EngineGroup, EngineRegistry, engine_registry, create_engine, get_engine
+from .synthetic_engine import SyntheticTTSEngine
+from .synthesis_cache import SynthesisCache
+from .worker_pool import SynthesisWorkerPool
+from .segmenter import TextSegmenter
+from .output_capture import OutputCapture
+from .audio_io import AudioInfo, AudioReader, AudioWriter, read_info, write_audio
+from .audio_convert import FlacWriter, convert_audio
+from .audio_concat import AudioConcatenator, concatenate_audio
+from .document_renderer import DocumentRenderer, DocumentProgress, markdown_to_speech
+from .audio_pipeline import AudioPipeline, AudioStage, build_pipeline
+from .audio_dsp import (
+    Resampler, ChannelMixer, PitchShifter, Gain, TrimSilence,
+    LoudnessMeter, LoudnessNormalizer, measure_loudness,
+    TimeStretcher, WsolaPitchShifter, stretch_audio
+)
+from .capability_probe import CapabilityProbe, capability_probe
+from .duration_model import DurationModel, DurationEstimate, duration_model
+from .playback_queue import PlaybackQueue, playback_queue
+from .coalescer import NotificationCoalescer
+from .synthesis_batcher import SynthesisBatcher, split_on_silence
+from .batch import BatchRun, BatchItemResult
+from .circuit_breaker import CircuitBreaker, BreakerState
+from .cancellation import CancellationToken
+from .models import Voice, TTSRequest, TTSResponse, Gender, VoiceQuality, Language, AudioFormat, PlaybackPriority
 from .exceptions import (
     TTSNotifyError, VoiceError, VoiceNotFoundError, VoiceDetectionError,
-    TTSError, EngineNotAvailableError, AudioProcessingError,
-    ConfigurationError, InstallationError, PluginError, ValidationError
+    TTSError, EngineNotAvailableError, CircuitOpenError, AudioProcessingError,
+    ConfigurationError, InstallationError, PluginError, ValidationError,
+    RequestCancelledError
 )
 
 __all__ = [
@@ -28,7 +52,57 @@ __all__ = [
     # TTS Engine
     "TTSEngine",
     "MacOSTTSEngine",
+    "SyntheticTTSEngine",
+    "create_engine",
+    "get_engine",
+    "EngineGroup",
+    "EngineRegistry",
     "engine_registry",
+    "SynthesisCache",
+    "SynthesisWorkerPool",
+    "TextSegmenter",
+    "OutputCapture",
+    "AudioInfo",
+    "AudioReader",
+    "AudioWriter",
+    "read_info",
+    "write_audio",
+    "FlacWriter",
+    "convert_audio",
+    "AudioConcatenator",
+    "DocumentRenderer",
+    "DocumentProgress",
+    "markdown_to_speech",
+    "concatenate_audio",
+    "AudioPipeline",
+    "AudioStage",
+    "build_pipeline",
+    "Resampler",
+    "ChannelMixer",
+    "PitchShifter",
+    "Gain",
+    "TrimSilence",
+    "LoudnessMeter",
+    "LoudnessNormalizer",
+    "measure_loudness",
+    "TimeStretcher",
+    "WsolaPitchShifter",
+    "stretch_audio",
+    "CapabilityProbe",
+    "capability_probe",
+    "DurationModel",
+    "DurationEstimate",
+    "duration_model",
+    "PlaybackQueue",
+    "playback_queue",
+    "NotificationCoalescer",
+    "SynthesisBatcher",
+    "split_on_silence",
+    "BatchRun",
+    "BatchItemResult",
+    "CircuitBreaker",
+    "BreakerState",
+    "CancellationToken",
 
     # Models
     "Voice",
@@ -38,6 +112,7 @@ __all__ = [
     "VoiceQuality",
     "Language",
     "AudioFormat",
+    "PlaybackPriority",
 
     # Exceptions
     "TTSNotifyError",
@@ -46,9 +121,11 @@ __all__ = [
     "VoiceDetectionError",
     "TTSError",
     "EngineNotAvailableError",
+    "CircuitOpenError",
     "AudioProcessingError",
     "ConfigurationError",
     "InstallationError",
     "PluginError",
     "ValidationError",
+    "RequestCancelledError",
 ]
\ No newline at end of file
@@ -0,0 +1,239 @@
+"""
+Audio Concatenation for TTS Notify v2
+
+This module joins AIFF/AIFF-C/WAV segments (files, bytes or sample arrays)
+into one output file with short crossfades. The output header is written
+once and frames are appended as each segment streams in; only one
+crossfade window per join is ever held in memory, so joining never rewrites
+what is already on disk.
+"""
+
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Optional, Union
+import logging
+
+from .audio_convert import open_writer
+from .audio_io import AudioReader, AudioSource, float_to_pcm, require_numpy
+from .audio_pipeline import AudioPipeline
+from .exceptions import AudioProcessingError
+from .models import AudioFormat
+
+logger = logging.getLogger(__name__)
+
+CROSSFADE = 0.01            # Seconds of overlap at each join
+READ_BLOCK = 65536          # Frames read per step from a segment
+
+
+class AudioConcatenator:
+    """
+    Streaming joiner for audio segments.
+
+    The output format (rate, channels) is taken from the first segment unless
+    given; later segments are converted to it on the fly. At each join the
+    last ``crossfade`` seconds of the previous segment overlap the first of
+    the next under complementary raised-cosine fades; with a ``gap`` the two
+    are faded out/in around that much silence instead.
+    """
+
+    def __init__(self, destination: Union[str, Path, BinaryIO], format: AudioFormat = AudioFormat.WAV,
+                 sample_rate: Optional[int] = None, channels: Optional[int] = None,
+                 crossfade: float = CROSSFADE, gap: float = 0.0, sample_width: int = 2):
+        self.destination = destination
+        self.format = format
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.crossfade = max(0.0, crossfade)
+        self.gap = max(0.0, gap)
+        self.sample_width = sample_width
+
+        self._writer = None
+        self._tail = None               # Held-back end of the previous segment
+        self._segments = 0
+        self._joins = 0
+        self._start_time = time.time()
+        self._stats: Optional[Dict[str, Any]] = None
+
+    def __enter__(self) -> "AudioConcatenator":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None and self._writer is not None:
+            self.close()
+        elif self._writer is not None and self._stats is None:
+            self._writer.close()
+
+    def _open(self, sample_rate: int, channels: int) -> None:
+        self.sample_rate = self.sample_rate or sample_rate
+        self.channels = self.channels or channels
+        width = min(self.sample_width, 3) if self.format == AudioFormat.FLAC else self.sample_width
+        self._writer = open_writer(self.destination, self.format, self.sample_rate, self.channels, width)
+        self._fade_len = int(self.sample_rate * self.crossfade)
+        self._gap_len = int(self.sample_rate * self.gap)
+
+    def _write(self, block) -> None:
+        if block is None or len(block) == 0:
+            return
+        if self.format == AudioFormat.FLAC:
+            block = float_to_pcm(block, min(self.sample_width, 3))
+        self._writer.write_frames(block)
+
+    def _fades(self, length: int):
+        np = require_numpy()
+        ramp = (np.arange(length, dtype=np.float32) + 0.5) / length
+        fade_in = (np.sin(0.5 * np.pi * ramp) ** 2)[:, None]
+        return 1.0 - fade_in, fade_in
+
+    def _blocks(self, source: AudioSource):
+        """Float blocks of a segment in the output format"""
+        with AudioReader(source) as reader:
+            info = reader.info
+            if self._writer is None:
+                self._open(info.sample_rate, info.channels)
+            pipeline = None
+            if (info.sample_rate, info.channels) != (self.sample_rate, self.channels):
+                from .audio_dsp import ChannelMixer, Resampler
+                pipeline = AudioPipeline([ChannelMixer(self.channels), Resampler(self.sample_rate)])
+                pipeline.configure(info.sample_rate, info.channels)
+            for offset in range(0, info.frames, READ_BLOCK):
+                block = reader.to_float(offset, READ_BLOCK)
+                yield pipeline.process(block) if pipeline is not None else block
+            if pipeline is not None:
+                yield pipeline.flush()
+
+    def append(self, source: AudioSource) -> None:
+        """Append an AIFF/AIFF-C/WAV file or bytes"""
+        self._append_blocks(self._blocks(source))
+
+    def append_samples(self, samples, sample_rate: int) -> None:
+        """Append float samples shaped (frames, channels) or (frames,)"""
+        np = require_numpy()
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.ndim == 1:
+            samples = samples[:, None]
+        if self._writer is None:
+            self._open(sample_rate, samples.shape[1])
+        if (sample_rate, samples.shape[1]) != (self.sample_rate, self.channels):
+            from .audio_dsp import ChannelMixer, Resampler
+            pipeline = AudioPipeline([ChannelMixer(self.channels), Resampler(self.sample_rate)])
+            pipeline.configure(sample_rate, samples.shape[1])
+            samples = np.concatenate([pipeline.process(samples), pipeline.flush()])
+        self._append_blocks([samples])
+
+    def _append_blocks(self, blocks: Iterable[Any]) -> None:
+        np = require_numpy()
+        head = []
+        head_frames = 0
+        joining = self._tail is not None
+        blocks = iter(blocks)
+
+        # Gather enough of the new segment to cover the crossfade
+        for block in blocks:
+            if block is None or len(block) == 0:
+                continue
+            head.append(block)
+            head_frames += len(block)
+            if not joining or head_frames >= self._fade_len:
+                break
+        if not head:
+            return
+        segment = np.concatenate(head)
+
+        if joining:
+            self._joins += 1
+            tail, self._tail = self._tail, None
+            if self._gap_len:
+                if len(tail):
+                    fade_out, _ = self._fades(len(tail))
+                    tail = tail * fade_out
+                self._write(tail)
+                self._write(np.zeros((self._gap_len, self.channels), dtype=np.float32))
+                length = min(self._fade_len, len(segment))
+                if length:
+                    _, fade_in = self._fades(length)
+                    segment = np.concatenate([segment[:length] * fade_in, segment[length:]])
+            else:
+                length = min(len(tail), len(segment))
+                if length:
+                    fade_out, fade_in = self._fades(length)
+                    self._write(tail[:len(tail) - length])
+                    mixed = tail[len(tail) - length:] * fade_out + segment[:length] * fade_in
+                    segment = np.concatenate([mixed, segment[length:]])
+                else:
+                    self._write(tail)
+
+        self._segments += 1
+        pending = segment
+        for block in blocks:
+            if block is None or len(block) == 0:
+                continue
+            if len(block) < self._fade_len:
+                # Too short to hold a whole crossfade window on its own
+                pending = np.concatenate([pending, block])
+                continue
+            self._write(pending)
+            pending = block
+        # Hold back the crossfade window for the next join
+        keep = min(self._fade_len, len(pending))
+        self._write(pending[:len(pending) - keep])
+        self._tail = pending[len(pending) - keep:]
+
+    def abort(self) -> None:
+        """Stop joining and remove a partially written output file"""
+        if self._writer is not None and self._stats is None:
+            try:
+                self._writer.close()
+            except Exception as e:
+                logger.debug(f"Failed to close joined output: {e}")
+        self._stats = self._stats or {}
+        if isinstance(self.destination, (str, Path)):
+            Path(self.destination).unlink(missing_ok=True)
+
+    def close(self) -> Dict[str, Any]:
+        """Write the last tail, finish the header and return statistics"""
+        if self._stats is not None:
+            return self._stats
+        if self._writer is None:
+            raise AudioProcessingError("No audio segments to join")
+        if self._tail is not None:
+            self._write(self._tail)
+            self._tail = None
+        self._writer.close()
+        frames = self._writer.frames_written
+        stats = {
+            "segments": self._segments,
+            "joins": self._joins,
+            "frames": frames,
+            "duration": frames / self.sample_rate,
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "crossfade": self.crossfade,
+            "gap": self.gap,
+            "join_time": time.time() - self._start_time,
+        }
+        if isinstance(self.destination, (str, Path)):
+            stats["file_size"] = Path(self.destination).stat().st_size
+        self._stats = stats
+        return stats
+
+
+def concatenate_audio(sources: Iterable[AudioSource], destination: Union[str, Path, BinaryIO],
+                      format: AudioFormat = AudioFormat.WAV, crossfade: float = CROSSFADE,
+                      gap: float = 0.0) -> Dict[str, Any]:
+    """
+    Join audio segments into one file.
+
+    Args:
+        sources: AIFF/AIFF-C/WAV paths or bytes, in order
+        destination: Output path or binary file object
+        format: Output format (AIFF, WAV or FLAC)
+        crossfade: Overlap at each join in seconds
+        gap: Silence between segments in seconds (fades instead of overlapping)
+
+    Returns:
+        Join statistics
+    """
+    with AudioConcatenator(destination, format, crossfade=crossfade, gap=gap) as joiner:
+        for source in sources:
+            joiner.append(source)
+    return joiner.close()
@@ -0,0 +1,373 @@
+"""
+Audio Format Conversion for TTS Notify v2
+
+This module converts synthesized audio (AIFF from `say`) to the format a
+request asked for. Audio is streamed block by block from a memory-mapped
+source into the destination writer, so memory use does not depend on clip
+length. WAV and AIFF are written by audio_io; FLAC by the encoder below
+(fixed linear predictors with Rice-coded residuals, vectorized with NumPy).
+An optional AudioPipeline processes each block on the way through.
+"""
+
+import hashlib
+import struct
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+import logging
+
+from .audio_io import AudioReader, AudioSource, AudioWriter, float_to_pcm, require_numpy
+from .audio_pipeline import AudioPipeline
+from .exceptions import AudioProcessingError
+from .models import AudioFormat
+
+logger = logging.getLogger(__name__)
+
+FLAC_BLOCK_SIZE = 4096
+FLAC_MAX_RICE_PARAMETER = 14
+FLAC_SAMPLE_SIZE_CODES = {8: 0b001, 12: 0b010, 16: 0b100, 20: 0b101, 24: 0b110}
+
+
+def _crc_table(polynomial: int, width: int) -> List[int]:
+    top, mask = 1 << (width - 1), (1 << width) - 1
+    table = []
+    for byte in range(256):
+        crc = byte << (width - 8)
+        for _ in range(8):
+            crc = ((crc << 1) ^ polynomial) if crc & top else (crc << 1)
+        table.append(crc & mask)
+    return table
+
+
+_CRC8_TABLE = _crc_table(0x07, 8)
+_CRC16_TABLE = _crc_table(0x8005, 16)
+
+
+def _crc8(data: bytes) -> int:
+    crc = 0
+    for byte in data:
+        crc = _CRC8_TABLE[crc ^ byte]
+    return crc
+
+
+def _crc16(data: bytes) -> int:
+    crc = 0
+    table = _CRC16_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
+    return crc
+
+
+def _utf8_number(value: int) -> bytes:
+    """FLAC's UTF-8 style variable-length frame number"""
+    if value < 0x80:
+        return bytes([value])
+    length = 2
+    while value >= 1 << (5 * length + 1):
+        length += 1
+    tail = []
+    for _ in range(length - 1):
+        tail.append(0x80 | (value & 0x3F))
+        value >>= 6
+    return bytes([((0xFF << (8 - length)) & 0xFF) | value] + tail[::-1])
+
+
+class FlacWriter:
+    """
+    Incremental FLAC encoder for integer PCM (8, 16 or 24 bits).
+
+    Frames are encoded as soon as FLAC_BLOCK_SIZE samples per channel are
+    buffered. STREAMINFO totals and the MD5 signature are patched in on
+    close when the destination is seekable (otherwise they stay "unknown",
+    which the format allows).
+    """
+
+    def __init__(self, destination: Union[str, Path, BinaryIO], sample_rate: int = 22050,
+                 channels: int = 1, sample_width: int = 2, block_size: int = FLAC_BLOCK_SIZE):
+        self.np = require_numpy()
+        if sample_width * 8 not in FLAC_SAMPLE_SIZE_CODES:
+            raise AudioProcessingError(f"FLAC encoder does not support {sample_width * 8}-bit samples")
+        if not 1 <= channels <= 8:
+            raise AudioProcessingError(f"FLAC supports 1 to 8 channels, got {channels}")
+        self.sample_rate = int(sample_rate)
+        self.channels = channels
+        self.sample_width = sample_width
+        self.bits_per_sample = sample_width * 8
+        self.block_size = block_size
+        self.frames_written = 0
+        self._frame_number = 0
+        self._frame_sizes: List[int] = []
+        self._pending: List[Any] = []
+        self._pending_frames = 0
+        self._md5 = hashlib.md5()
+
+        if isinstance(destination, (str, Path)):
+            self.path: Optional[Path] = Path(destination)
+            self._file = open(self.path, "wb")
+            self._owns_file = True
+        else:
+            self.path = None
+            self._file = destination
+            self._owns_file = False
+        self._start = self._file.tell() if self._seekable() else 0
+        self._file.write(b"fLaC" + bytes([0x80, 0, 0, 34]) + self._streaminfo(0, 0, 0, bytes(16)))
+
+    def __enter__(self) -> "FlacWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _seekable(self) -> bool:
+        try:
+            return self._file.seekable()
+        except Exception:
+            return False
+
+    def _streaminfo(self, total: int, min_frame: int, max_frame: int, md5: bytes) -> bytes:
+        packed = ((self.sample_rate << 44) | ((self.channels - 1) << 41)
+                  | ((self.bits_per_sample - 1) << 36) | total)
+        return (struct.pack(">HH", self.block_size, self.block_size)
+                + min_frame.to_bytes(3, "big") + max_frame.to_bytes(3, "big")
+                + packed.to_bytes(8, "big") + md5)
+
+    def write_frames(self, samples) -> int:
+        """Buffer integer samples shaped (frames, channels) and encode whole blocks"""
+        np = self.np
+        samples = np.asarray(samples)
+        if samples.dtype.kind not in "iu":
+            raise AudioProcessingError("FLAC encoder expects integer PCM samples")
+        samples = samples.reshape(-1, self.channels).astype(np.int64)
+        self._pending.append(samples)
+        self._pending_frames += len(samples)
+        self.frames_written += len(samples)
+
+        if self._pending_frames >= self.block_size:
+            buffered = np.concatenate(self._pending)
+            whole = len(buffered) - len(buffered) % self.block_size
+            for start in range(0, whole, self.block_size):
+                self._write_block(buffered[start:start + self.block_size])
+            self._pending = [buffered[whole:]]
+            self._pending_frames = len(buffered) - whole
+        return len(samples)
+
+    def _write_block(self, block) -> None:
+        np = self.np
+        self._md5.update(self._little_endian(block))
+
+        header = bytearray(b"\xff\xf8")
+        header.append(0b0111 << 4)  # 16-bit block size follows; sample rate from STREAMINFO
+        header.append(((self.channels - 1) << 4) | (FLAC_SAMPLE_SIZE_CODES[self.bits_per_sample] << 1))
+        header += _utf8_number(self._frame_number)
+        header += struct.pack(">H", len(block) - 1)
+        header.append(_crc8(header))
+
+        bits = [np.unpackbits(np.frombuffer(bytes(header), dtype=np.uint8))]
+        for channel in range(self.channels):
+            bits.append(self._subframe(block[:, channel]))
+        frame = np.packbits(np.concatenate(bits)).tobytes()
+        frame += struct.pack(">H", _crc16(frame))
+
+        self._file.write(frame)
+        self._frame_sizes.append(len(frame))
+        self._frame_number += 1
+
+    def _little_endian(self, block) -> bytes:
+        """Interleaved little-endian sample bytes (what the MD5 signature covers)"""
+        if self.sample_width == 3:
+            return block.astype("<i4").view(self.np.uint8).reshape(-1, 4)[:, :3].tobytes()
+        return block.astype(f"<i{self.sample_width}").tobytes()
+
+    def _bits(self, values, width: int):
+        """Two's complement values as MSB-first bit arrays"""
+        np = self.np
+        values = np.atleast_1d(np.asarray(values, dtype=np.int64)) & ((1 << width) - 1)
+        shifts = np.arange(width - 1, -1, -1, dtype=np.int64)
+        return ((values[:, None] >> shifts) & 1).astype(np.uint8).ravel()
+
+    def _subframe(self, samples):
+        np = self.np
+        bps = self.bits_per_sample
+        if (samples == samples[0]).all():
+            # CONSTANT: runs of digital silence cost a handful of bytes
+            return np.concatenate([self._bits(0b00000000, 8), self._bits(samples[0], bps)])
+
+        best_order, best_cost, residual = 0, None, samples
+        for order in range(min(4, len(samples) - 1) + 1):
+            candidate = np.diff(samples, order) if order else samples
+            cost = int(np.abs(candidate).sum())
+            if best_cost is None or cost < best_cost:
+                best_order, best_cost, residual = order, cost, candidate
+
+        unsigned = (residual << 1) ^ (residual >> 63)  # Zigzag: 0, -1, 1, -2, ...
+        parameter, rice_bits = self._rice_parameter(unsigned)
+        verbatim_bits = len(samples) * bps
+        if rice_bits + best_order * bps + 6 >= verbatim_bits:
+            return np.concatenate([self._bits(0b00000010, 8), self._bits(samples, bps)])
+
+        return np.concatenate([
+            self._bits(0b00010000 | (best_order << 1), 8),    # FIXED, predictor order
+            self._bits(samples[:best_order], bps) if best_order else np.zeros(0, np.uint8),
+            self._bits(0, 2),                                 # Rice coding, 4-bit parameter
+            self._bits(0, 4),                                 # One partition
+            self._bits(parameter, 4),
+            self._rice(unsigned, parameter),
+        ])
+
+    def _rice_parameter(self, unsigned):
+        np = self.np
+        mean = float(unsigned.mean()) if len(unsigned) else 0.0
+        guess = min(int(np.log2(mean)) if mean >= 1 else 0, FLAC_MAX_RICE_PARAMETER)
+        best = None
+        for parameter in range(max(0, guess - 1), min(FLAC_MAX_RICE_PARAMETER, guess + 1) + 1):
+            size = int((unsigned >> parameter).sum()) + len(unsigned) * (parameter + 1)
+            if best is None or size < best[1]:
+                best = (parameter, size)
+        return best
+
+    def _rice(self, unsigned, parameter: int):
+        """Rice codes: quotient in unary (zeros then a one), remainder in binary"""
+        np = self.np
+        quotients = unsigned >> parameter
+        lengths = quotients + 1 + parameter
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        stops = starts + quotients
+        bits = np.zeros(int(lengths.sum()), dtype=np.uint8)
+        bits[stops] = 1
+        if parameter:
+            remainders = unsigned & ((1 << parameter) - 1)
+            for j in range(parameter):
+                bits[stops + 1 + j] = (remainders >> (parameter - 1 - j)) & 1
+        return bits
+
+    def close(self) -> None:
+        """Encode the final partial block and patch STREAMINFO"""
+        if self._file is None:
+            return
+        try:
+            if self._pending_frames:
+                self._write_block(self.np.concatenate(self._pending))
+            self._pending, self._pending_frames = [], 0
+            if self._seekable():
+                end = self._file.tell()
+                self._file.seek(self._start + 8)
+                self._file.write(self._streaminfo(self.frames_written, min(self._frame_sizes, default=0),
+                                                  max(self._frame_sizes, default=0), self._md5.digest()))
+                self._file.seek(end)
+            self._file.flush()
+        finally:
+            if self._owns_file:
+                self._file.close()
+            self._file = None
+
+
+def flac_available() -> bool:
+    """FLAC encoding needs NumPy"""
+    try:
+        require_numpy()
+    except AudioProcessingError:
+        return False
+    return True
+
+
+def convertible_formats() -> List[AudioFormat]:
+    """Output formats this module can produce on this host"""
+    formats = [AudioFormat.AIFF, AudioFormat.WAV]
+    if flac_available():
+        formats.append(AudioFormat.FLAC)
+    return formats
+
+
+def open_writer(destination: Union[str, Path, BinaryIO], format: AudioFormat, sample_rate: int,
+                channels: int = 1, sample_width: int = 2, expected_frames: Optional[int] = None):
+    """Create an AudioWriter or FlacWriter for an output format"""
+    if format == AudioFormat.FLAC:
+        return FlacWriter(destination, sample_rate, channels, min(sample_width, 3))
+    if format in (AudioFormat.AIFF, AudioFormat.WAV):
+        return AudioWriter(destination, format.value, sample_rate, channels, sample_width,
+                           expected_frames=expected_frames)
+    raise AudioProcessingError(f"No encoder available for '{format.value}'")
+
+
+def convert_audio(source: AudioSource, destination: Union[str, Path, BinaryIO],
+                  format: AudioFormat, block_frames: int = FLAC_BLOCK_SIZE,
+                  pipeline: Optional[AudioPipeline] = None) -> Dict[str, Any]:
+    """
+    Convert AIFF/AIFF-C/WAV audio to another format, one block at a time.
+
+    Args:
+        source: Input file path or audio bytes
+        destination: Output path or binary file object
+        format: Output format (AIFF, WAV or FLAC)
+        block_frames: Frames read and encoded per step
+        pipeline: Optional processing stages applied to each block
+
+    Returns:
+        Conversion statistics
+    """
+    start_time = time.time()
+    if isinstance(source, (str, Path)) and isinstance(destination, (str, Path)):
+        if Path(destination).exists() and Path(destination).resolve() == Path(source).resolve():
+            # Truncating a file that is memory-mapped for reading would crash the process
+            raise AudioProcessingError("Cannot convert an audio file onto itself", file_path=str(source))
+    with AudioReader(source) as reader:
+        info = reader.info
+        sample_rate, channels = info.sample_rate, info.channels
+        if pipeline is not None:
+            sample_rate, channels = pipeline.configure(sample_rate, channels)
+            if not pipeline.active:
+                pipeline = None
+            else:
+                pipeline.prepare(reader)
+
+        # Integer PCM keeps its width (FLAC tops out at 24 bits); float becomes 16-bit
+        if info.encoding == "float":
+            sample_width = 2
+        elif format == AudioFormat.FLAC:
+            sample_width = min(info.sample_width, 3)
+        else:
+            sample_width = info.sample_width
+
+        with open_writer(destination, format, sample_rate, channels, sample_width,
+                         expected_frames=info.frames if pipeline is None else None) as writer:
+
+            def write_float(block) -> None:
+                if block is None or len(block) == 0:
+                    return
+                if format == AudioFormat.FLAC:
+                    block = float_to_pcm(block, sample_width)
+                writer.write_frames(block)
+
+            # Same width, signedness and byte order: copy the raw bytes
+            raw_copy = (pipeline is None and format != AudioFormat.FLAC and info.encoding == "int"
+                        and info.sample_width > 1 and sample_width == info.sample_width
+                        and writer.byte_order == info.byte_order)
+            native_int = (pipeline is None and info.encoding == "int" and info.dtype is not None
+                          and sample_width == info.sample_width)
+
+            for offset in range(0, info.frames, block_frames):
+                if raw_copy:
+                    writer.write_frames(reader.read_raw(offset, block_frames))
+                elif native_int:
+                    writer.write_frames(reader.frames(offset, block_frames))
+                elif pipeline is not None:
+                    write_float(pipeline.process(reader.to_float(offset, block_frames)))
+                else:
+                    write_float(reader.to_float(offset, block_frames))
+            if pipeline is not None:
+                write_float(pipeline.flush())
+            frames_out = writer.frames_written
+
+    stats = {
+        "converted_from": info.container,
+        "converted_to": format.value,
+        "frames": frames_out,
+        "sample_rate": sample_rate,
+        "channels": channels,
+        "conversion_time": time.time() - start_time,
+    }
+    if pipeline is not None:
+        stats["pipeline"] = pipeline.get_stats()
+    if isinstance(destination, (str, Path)):
+        stats["file_size"] = Path(destination).stat().st_size
+    return stats
@@ -0,0 +1,727 @@
+"""
+Audio DSP Stages for TTS Notify v2
+
+This module provides the vectorized (NumPy) processing stages used by the
+audio pipeline: a streaming polyphase resampler, a channel mixer, a
+delay-line pitch shifter, a gain stage, a silence trimmer, a
+BS.1770-style loudness meter and normalizer, and WSOLA time-stretching
+(with a pitch shift built on it).
+"""
+
+import io
+from fractions import Fraction
+from functools import lru_cache
+from math import gcd, pi, tan
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from .audio_io import AudioReader, AudioSource, require_numpy
+from .audio_pipeline import AudioPipeline, AudioStage
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=32)
+def polyphase_filter(up: int, down: int, zero_crossings: int = 10, beta: float = 5.0):
+    """
+    Kaiser-windowed sinc lowpass for rational resampling, split into phases.
+
+    Returns:
+        (phases, delay): phases[p, k] multiplies input sample base - k for
+        output phase p; delay is the filter's group delay in upsampled samples
+    """
+    np = require_numpy()
+    max_rate = max(up, down)
+    half = zero_crossings * max_rate
+    n = np.arange(2 * half + 1, dtype=np.float64)
+    taps = np.sinc((n - half) / max_rate) / max_rate * np.kaiser(2 * half + 1, beta) * up
+
+    per_phase = -(-len(taps) // up)
+    padded = np.zeros(per_phase * up)
+    padded[:len(taps)] = taps
+    phases = padded.reshape(per_phase, up).T.astype(np.float32)
+    phases.setflags(write=False)
+    return phases, half
+
+
+class Resampler(AudioStage):
+    """
+    Streaming polyphase resampler (rational ratio target/source).
+
+    Output sample m is computed directly from the input samples around
+    m * source/target, so only the output rate's samples are ever evaluated.
+    The stage holds back one filter length of input between blocks.
+    """
+
+    def __init__(self, target_rate: int, zero_crossings: int = 10):
+        self.name = f"resample:{target_rate}"
+        self.target_rate = int(target_rate)
+        self.zero_crossings = zero_crossings
+        self.source_rate = self.target_rate
+        self.up = self.down = 1
+        self._samples_in = 0
+        self._samples_out = 0
+
+    def configure(self, sample_rate: int, channels: int) -> Tuple[int, int]:
+        np = require_numpy()
+        self.source_rate = int(sample_rate)
+        divisor = gcd(self.target_rate, self.source_rate)
+        self.up, self.down = self.target_rate // divisor, self.source_rate // divisor
+        self.channels = channels
+        if self.active:
+            self._phases, self._delay = polyphase_filter(self.up, self.down, self.zero_crossings)
+            self._taps = self._phases.shape[1]
+            self._buffer = np.zeros((self._taps - 1, channels), dtype=np.float32)
+            # Global input index of self._buffer[0]
+            self._buffer_start = -(self._taps - 1)
+            self._received = 0
+            self._produced = 0
+        return self.target_rate, channels
+
+    @property
+    def active(self) -> bool:
+        return self.up != self.down
+
+    def _expected_output(self, count: int) -> int:
+        return -(-count * self.up // self.down)
+
+    def _emit(self, limit: int):
+        """Compute every output sample whose filter window is fully buffered"""
+        np = require_numpy()
+        available_end = self._buffer_start + len(self._buffer)
+        # Output m needs input up to (m * down + delay) // up
+        last = (available_end * self.up - self._delay - 1) // self.down
+        stop = min(last + 1, limit)
+        if stop <= self._produced:
+            return np.zeros((0, self.channels), dtype=np.float32)
+
+        positions = np.arange(self._produced, stop, dtype=np.int64) * self.down + self._delay
+        base = positions // self.up
+        phase = positions % self.up
+        local = base - self._buffer_start
+        windows = self._buffer[local[:, None] - np.arange(self._taps)[None, :]]
+        output = np.einsum("mk,mkc->mc", self._phases[phase], windows)
+        self._produced = stop
+
+        # Drop input no later output can reach
+        next_base = (stop * self.down + self._delay) // self.up
+        keep_from = max(0, next_base - (self._taps - 1) - self._buffer_start)
+        if keep_from:
+            self._buffer = self._buffer[keep_from:]
+            self._buffer_start += keep_from
+        return output.astype(np.float32, copy=False)
+
+    def process(self, block):
+        np = require_numpy()
+        block = np.asarray(block, dtype=np.float32).reshape(-1, self.channels)
+        self._buffer = np.concatenate([self._buffer, block])
+        self._received += len(block)
+        self._samples_in += len(block)
+        output = self._emit(self._expected_output(self._received))
+        self._samples_out += len(output)
+        return output
+
+    def flush(self):
+        np = require_numpy()
+        # Zero-pad past the end so the last outputs see a full window
+        self._buffer = np.concatenate([self._buffer, np.zeros((self._taps, self.channels), dtype=np.float32)])
+        output = self._emit(self._expected_output(self._received))
+        self._samples_out += len(output)
+        return output
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "source_rate": self.source_rate,
+            "target_rate": self.target_rate,
+            "ratio": f"{self.up}/{self.down}",
+            "samples_in": self._samples_in,
+            "samples_out": self._samples_out,
+        }
+
+
+class ChannelMixer(AudioStage):
+    """Mix to a target channel count (mono downmix averages, upmix duplicates)"""
+
+    def __init__(self, target_channels: int):
+        self.name = f"channels:{target_channels}"
+        self.target_channels = int(target_channels)
+        self.source_channels = self.target_channels
+
+    def configure(self, sample_rate: int, channels: int) -> Tuple[int, int]:
+        self.source_channels = channels
+        return sample_rate, self.target_channels
+
+    @property
+    def active(self) -> bool:
+        return self.source_channels != self.target_channels
+
+    def process(self, block):
+        np = require_numpy()
+        block = np.asarray(block, dtype=np.float32).reshape(-1, self.source_channels)
+        if self.target_channels == 1:
+            return block.mean(axis=1, keepdims=True)
+        if self.source_channels == 1:
+            return np.repeat(block, self.target_channels, axis=1)
+        if self.source_channels > self.target_channels:
+            return block[:, :self.target_channels]
+        # Pad extra channels with a copy of the last one
+        extra = np.repeat(block[:, -1:], self.target_channels - self.source_channels, axis=1)
+        return np.concatenate([block, extra], axis=1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"source_channels": self.source_channels, "target_channels": self.target_channels}
+
+
+class PitchShifter(AudioStage):
+    """
+    Streaming pitch shift that keeps the duration (two-tap delay line).
+
+    Two read heads sweep a delay line at ``ratio`` times the input speed and
+    are crossfaded with complementary Hann weights, so each head jumps back
+    only while it is silent. Latency is at most one window.
+    """
+
+    def __init__(self, ratio: float, window: float = 0.04):
+        self.name = f"pitch:{ratio:.3f}"
+        self.ratio = float(ratio)
+        self.window = window
+        self._samples = 0
+
+    def configure(self, sample_rate: int, channels: int) -> Tuple[int, int]:
+        np = require_numpy()
+        self.channels = channels
+        self._span = max(2, int(sample_rate * self.window))
+        # Keep a full sweep of history plus one sample for interpolation
+        self._history = np.zeros((self._span + 2, channels), dtype=np.float32)
+        self._phase = 0.0
+        return sample_rate, channels
+
+    @property
+    def active(self) -> bool:
+        return abs(self.ratio - 1.0) > 1e-6
+
+    def process(self, block):
+        np = require_numpy()
+        block = np.asarray(block, dtype=np.float32).reshape(-1, self.channels)
+        count = len(block)
+        if count == 0:
+            return block
+        buffer = np.concatenate([self._history, block])
+        offset = len(self._history)
+
+        # Delay falls (ratio > 1) or grows (ratio < 1) by 1 - ratio samples per sample
+        step = (1.0 - self.ratio) / self._span
+        ramp = self._phase + step * np.arange(count, dtype=np.float64)
+        output = np.zeros((count, self.channels), dtype=np.float32)
+        for shift in (0.0, 0.5):
+            phase = (ramp + shift) % 1.0
+            position = offset + np.arange(count) - phase * self._span
+            index = position.astype(np.int64)
+            frac = (position - index).astype(np.float32)[:, None]
+            upper = np.minimum(index + 1, len(buffer) - 1)
+            sample = buffer[index] * (1.0 - frac) + buffer[upper] * frac
+            weight = (np.sin(np.pi * phase) ** 2).astype(np.float32)[:, None]
+            output += weight * sample
+
+        self._phase = (self._phase + step * count) % 1.0
+        self._history = buffer[-offset:]
+        self._samples += count
+        return output
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"ratio": self.ratio, "window": self.window, "samples": self._samples}
+
+
+class Gain(AudioStage):
+    """Scale samples by a linear factor (TTSRequest.volume)"""
+
+    def __init__(self, factor: float):
+        self.name = f"gain:{factor:.3f}"
+        self.factor = float(factor)
+
+    @property
+    def active(self) -> bool:
+        return abs(self.factor - 1.0) > 1e-6
+
+    def process(self, block):
+        np = require_numpy()
+        return np.asarray(block, dtype=np.float32) * np.float32(self.factor)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"factor": self.factor}
+
+
+class TrimSilence(AudioStage):
+    """
+    Drop leading and trailing silence, keeping ``padding`` seconds of each.
+
+    Audio is scored in fixed frames (RMS across channels) against a dBFS
+    threshold. Leading frames are discarded until the first loud frame;
+    quiet frames after speech are held back and only released when more
+    speech follows, so whatever is still held at flush is the trailing
+    silence.
+    """
+
+    def __init__(self, threshold_db: float = -50.0, padding: float = 0.03, frame: float = 0.01):
+        self.name = f"trim:{threshold_db:g}:{padding:g}"
+        self.threshold_db = float(threshold_db)
+        self.padding = float(padding)
+        self.frame = frame
+
+    def configure(self, sample_rate: int, channels: int) -> Tuple[int, int]:
+        np = require_numpy()
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._frame_len = max(1, int(sample_rate * self.frame))
+        self._pad_len = int(sample_rate * self.padding)
+        self._threshold = np.float32(10 ** (self.threshold_db / 20))
+        self._carry = np.zeros((0, channels), dtype=np.float32)
+        self._lead = np.zeros((0, channels), dtype=np.float32)
+        self._held: List[Any] = []
+        self._started = False
+        self._samples_in = 0
+        self._leading = 0
+        self._trailing = 0
+        return sample_rate, channels
+
+    def _release(self, *parts):
+        np = require_numpy()
+        chunks = [part for part in parts if len(part)]
+        if not chunks:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        return np.concatenate(chunks)
+
+    def process(self, block):
+        np = require_numpy()
+        block = np.asarray(block, dtype=np.float32).reshape(-1, self.channels)
+        self._samples_in += len(block)
+        buffer = np.concatenate([self._carry, block]) if len(self._carry) else block
+        usable = len(buffer) // self._frame_len * self._frame_len
+        frames, self._carry = buffer[:usable], buffer[usable:]
+        if usable == 0:
+            return self._release()
+
+        energy = np.sqrt((frames.reshape(-1, self._frame_len * self.channels) ** 2).mean(axis=1))
+        loud = np.flatnonzero(energy > self._threshold)
+
+        prefix = []
+        if not self._started:
+            if len(loud) == 0:
+                lead = np.concatenate([self._lead, frames])
+                self._leading += len(lead) - min(len(lead), self._pad_len)
+                self._lead = lead[len(lead) - min(len(lead), self._pad_len):]
+                return self._release()
+            onset = loud[0] * self._frame_len
+            lead = np.concatenate([self._lead, frames[:onset]])
+            kept = min(len(lead), self._pad_len)
+            self._leading += len(lead) - kept
+            prefix = [lead[len(lead) - kept:]]
+            self._lead = self._lead[:0]
+            self._started = True
+            frames, loud = frames[onset:], loud - loud[0]
+
+        if len(loud) == 0:
+            self._held.append(frames)
+            return self._release(*prefix)
+        end = (loud[-1] + 1) * self._frame_len
+        output = self._release(*prefix, *self._held, frames[:end])
+        self._held = [frames[end:]]
+        return output
+
+    def flush(self):
+        if not self._started:
+            # Nothing above the threshold: keep the padding only
+            self._leading += len(self._carry)
+            return self._release(self._lead)
+        tail = self._release(*self._held, self._carry)
+        kept = min(len(tail), self._pad_len)
+        self._trailing += len(tail) - kept
+        self._held, self._carry = [], self._carry[:0]
+        return tail[:kept]
+
+    def get_stats(self) -> Dict[str, Any]:
+        rate = getattr(self, "sample_rate", 0) or 1
+        return {
+            "leading_trimmed": round(self._leading / rate, 4),
+            "trailing_trimmed": round(self._trailing / rate, 4),
+            "input_duration": round(self._samples_in / rate, 4),
+            "threshold_db": self.threshold_db,
+        }
+
+
+# BS.1770 K-weighting: a high shelf (head effects) then a high pass (RLB)
+K_SHELF = (1681.974450955533, 3.999843853973347, 0.7071752369554196)   # Hz, dB, Q
+K_HIGHPASS = (38.13547087602444, 0.5003270373238773)                   # Hz, Q
+LOUDNESS_OFFSET = -0.691
+ABSOLUTE_GATE = -70.0       # LUFS
+RELATIVE_GATE = -10.0       # LU below the absolute-gated loudness
+METER_HOP = 0.1             # Seconds per energy chunk (400 ms blocks = 4 chunks)
+
+
+@lru_cache(maxsize=32)
+def k_weighting(size: int, sample_rate: int):
+    """Power response of the K-weighting filter at the rfft bins of a ``size``-sample chunk"""
+    np = require_numpy()
+    # Bilinear-transform form that reproduces the 48 kHz coefficients of BS.1770
+    frequency, gain_db, q = K_SHELF
+    k = tan(pi * frequency / sample_rate)
+    vh = 10 ** (gain_db / 20)
+    vb = vh ** 0.4996667741545416
+    shelf_b = [vh + vb * k / q + k * k, 2 * (k * k - vh), vh - vb * k / q + k * k]
+    shelf_a = [1 + k / q + k * k, 2 * (k * k - 1), 1 - k / q + k * k]
+
+    frequency, q = K_HIGHPASS
+    k = tan(pi * frequency / sample_rate)
+    highpass_b = [1.0, -2.0, 1.0]
+    highpass_a = [1 + k / q + k * k, 2 * (k * k - 1), 1 - k / q + k * k]
+
+    z = np.exp(-1j * 2 * pi * np.fft.rfftfreq(size))
+    response = np.ones_like(z)
+    for b, a in ((shelf_b, shelf_a), (highpass_b, highpass_a)):
+        response *= (b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)
+
+    # Parseval weights: interior bins stand for two conjugate bins
+    parseval = np.full(len(z), 2.0)
+    parseval[0] = 1.0
+    if size % 2 == 0:
+        parseval[-1] = 1.0
+    weights = (np.abs(response) ** 2 * parseval / size ** 2).astype(np.float64)
+    weights.setflags(write=False)
+    return weights
+
+
+def gated_loudness(energies) -> float:
+    """Integrated loudness (LUFS) from 100 ms chunk energies, with BS.1770 gating"""
+    np = require_numpy()
+    energies = np.asarray(energies, dtype=np.float64)
+    if len(energies) == 0:
+        return float("-inf")
+    if len(energies) < 4:
+        blocks = energies.mean(keepdims=True)
+    else:
+        # 400 ms blocks with 75% overlap
+        blocks = np.convolve(energies, np.full(4, 0.25), mode="valid")
+    with np.errstate(divide="ignore"):
+        levels = LOUDNESS_OFFSET + 10 * np.log10(blocks)
+    gated = blocks[levels > ABSOLUTE_GATE]
+    if len(gated) == 0:
+        return float("-inf")
+    threshold = LOUDNESS_OFFSET + 10 * np.log10(gated.mean()) + RELATIVE_GATE
+    gated = blocks[(levels > ABSOLUTE_GATE) & (levels > threshold)]
+    return float(LOUDNESS_OFFSET + 10 * np.log10(gated.mean()))
+
+
+class LoudnessMeter(AudioStage):
+    """
+    Pass-through stage measuring integrated loudness (LUFS) and sample peak.
+
+    K-weighting is applied in the frequency domain to each 100 ms chunk, and
+    chunk energies are averaged (not summed) across channels so the reading
+    does not change when a clip is mixed between mono and stereo.
+    """
+
+    name = "meter"
+
+    def configure(self, sample_rate: int, channels: int) -> Tuple[int, int]:
+        np = require_numpy()
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._hop = max(1, int(sample_rate * METER_HOP))
+        self._carry = np.zeros((0, channels), dtype=np.float32)
+        self._energies: List[float] = []
+        self._peak = 0.0
+        self._samples = 0
+        return sample_rate, channels
+
+    def process(self, block):
+        np = require_numpy()
+        block = np.asarray(block, dtype=np.float32).reshape(-1, self.channels)
+        if len(block) == 0:
+            return block
+        self._samples += len(block)
+        self._peak = max(self._peak, float(np.abs(block).max()))
+        buffer = np.concatenate([self._carry, block]) if len(self._carry) else block
+        usable = len(buffer) // self._hop * self._hop
+        if usable:
+            chunks = buffer[:usable].reshape(-1, self._hop, self.channels)
+            spectra = np.abs(np.fft.rfft(chunks, axis=1)) ** 2
+            energy = np.einsum("mkc,k->m", spectra, k_weighting(self._hop, self.sample_rate)) / self.channels
+            self._energies.extend(energy.tolist())
+        self._carry = buffer[usable:]
+        return block
+
+    @property
+    def loudness(self) -> float:
+        """Integrated loudness in LUFS (-inf for silence)"""
+        np = require_numpy()
+        energies = self._energies
+        if not energies and len(self._carry):
+            # Shorter than one chunk: measure what there is
+            size = len(self._carry)
+            spectra = np.abs(np.fft.rfft(self._carry, axis=0)) ** 2
+            energies = [float(np.einsum("kc,k->", spectra, k_weighting(size, self.sample_rate)) / self.channels)]
+        return gated_loudness(energies)
+
+    @property
+    def peak_db(self) -> float:
+        """Sample peak in dBFS"""
+        np = require_numpy()
+        with np.errstate(divide="ignore"):
+            return float(20 * np.log10(self._peak)) if self._peak > 0 else float("-inf")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "lufs": round(self.loudness, 2),
+            "peak_db": round(self.peak_db, 2),
+            "duration": round(self._samples / (getattr(self, "sample_rate", 0) or 1), 4),
+        }
+
+
+def measure_loudness(source: AudioSource, block_frames: int = 65536) -> Dict[str, Any]:
+    """
+    Measure the integrated loudness of an audio file or bytes.
+
+    Returns:
+        {"lufs", "peak_db", "duration"}
+    """
+    meter = LoudnessMeter()
+    with AudioReader(source) as reader:
+        meter.configure(reader.info.sample_rate, reader.info.channels)
+        for offset in range(0, reader.info.frames, block_frames):
+            meter.process(reader.to_float(offset, block_frames))
+    return meter.get_stats()
+
+
+class LoudnessNormalizer(AudioStage):
+    """
+    Bring a clip to a target integrated loudness (two-pass).
+
+    The loudness of the source is measured in ``prepare`` before any block
+    is processed (or passed in, e.g. from the synthesis cache); the gain is
+    limited by ``max_gain_db`` and so that the peak stays under ``ceiling_db``.
+    """
+
+    needs_source = True
+
+    def __init__(self, target_lufs: float = -16.0, max_gain_db: float = 20.0,
+                 ceiling_db: float = -1.0, measured: Optional[Dict[str, float]] = None):
+        self.name = f"loudnorm:{target_lufs:g}"
+        self.target_lufs = float(target_lufs)
+        self.max_gain_db = max_gain_db
+        self.ceiling_db = ceiling_db
+        self.measured = measured
+        self.gain_db = 0.0
+
+    def prepare(self, reader: AudioReader, block_frames: int = 65536) -> None:
+        """Measure the source unless its loudness is already known"""
+        if self.measured is None:
+            meter = LoudnessMeter()
+            meter.configure(reader.info.sample_rate, reader.info.channels)
+            for offset in range(0, reader.info.frames, block_frames):
+                meter.process(reader.to_float(offset, block_frames))
+            self.measured = {"lufs": meter.loudness, "peak_db": meter.peak_db}
+
+        lufs, peak_db = self.measured["lufs"], self.measured["peak_db"]
+        if lufs == float("-inf"):
+            self.gain_db = 0.0
+        else:
+            self.gain_db = min(self.target_lufs - lufs, self.max_gain_db, self.ceiling_db - peak_db)
+
+    def process(self, block):
+        np = require_numpy()
+        return np.asarray(block, dtype=np.float32) * np.float32(10 ** (self.gain_db / 20))
+
+    def get_stats(self) -> Dict[str, Any]:
+        measured = self.measured or {"lufs": float("-inf"), "peak_db": float("-inf")}
+        return {
+            "source_lufs": round(measured["lufs"], 2),
+            "source_peak_db": round(measured["peak_db"], 2),
+            "target_lufs": self.target_lufs,
+            "gain_db": round(self.gain_db, 2),
+            "lufs": round(measured["lufs"] + self.gain_db, 2),
+        }
+
+
+class TimeStretcher(AudioStage):
+    """
+    WSOLA time-scale modification: change speed, keep pitch.
+
+    Output frames of ``frame`` seconds are overlap-added at a fixed hop of
+    half a frame with a Hann window. Each frame is read from the input near
+    its nominal position (``speed`` times further along than in the output),
+    shifted by up to ``search`` seconds to the offset that best continues
+    the previous frame's waveform (normalized cross-correlation).
+    """
+
+    def __init__(self, speed: float, frame: float = 0.03, search: float = 0.01):
+        self.name = f"stretch:{speed:.4f}"
+        self.speed = float(speed)
+        self.frame = frame
+        self.search = search
+        self._samples_in = 0
+        self._samples_out = 0
+
+    def configure(self, sample_rate: int, channels: int) -> Tuple[int, int]:
+        np = require_numpy()
+        self.channels = channels
+        self._size = max(4, int(sample_rate * self.frame) // 2 * 2)
+        self._hop = self._size // 2
+        self._delta = max(1, int(sample_rate * self.search))
+        # Periodic Hann: overlapping at half a frame sums to exactly one
+        self._window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(self._size) / self._size)).astype(np.float32)[:, None]
+        self._buffer = np.zeros((0, channels), dtype=np.float32)
+        self._buffer_start = 0
+        self._accumulator = np.zeros((self._size, channels), dtype=np.float32)
+        self._frame_index = 0
+        self._previous: Optional[int] = None
+        self._received = 0
+        self._emitted = 0
+        return sample_rate, channels
+
+    @property
+    def active(self) -> bool:
+        return abs(self.speed - 1.0) > 1e-6
+
+    def _segment(self, start: int, length: int):
+        """Input samples [start, start + length) in global positions (zeros before 0)"""
+        np = require_numpy()
+        local = start - self._buffer_start
+        if local >= 0:
+            return self._buffer[local:local + length]
+        head = np.zeros((min(-local, length), self.channels), dtype=np.float32)
+        return np.concatenate([head, self._buffer[:max(0, length + local)]])
+
+    def _choose(self, nominal: int) -> int:
+        """Input position for the next frame, near nominal"""
+        np = require_numpy()
+        if self._previous is None:
+            return nominal
+        target = self._segment(self._previous + self._hop, self._size).sum(axis=1)
+        low = max(0, nominal - self._delta)
+        region = self._segment(low, nominal + self._delta - low + self._size).sum(axis=1)
+        correlation = np.correlate(region, target, mode="valid")
+        energy = np.convolve(region * region, np.ones(self._size, dtype=np.float32), mode="valid")
+        score = correlation / np.sqrt(energy + 1e-9)
+        return low + int(np.argmax(score))
+
+    def _run(self, available_end: int, limit: Optional[int] = None):
+        np = require_numpy()
+        output = []
+        while limit is None or self._emitted + sum(len(block) for block in output) < limit:
+            nominal = int(round(self._frame_index * self._hop * self.speed))
+            needed = max(nominal + self._delta, (self._previous or 0) + self._hop) + self._size
+            if needed > available_end:
+                break
+            position = self._choose(nominal)
+            self._accumulator += self._window * self._segment(position, self._size)
+            output.append(self._accumulator[:self._hop].copy())
+            self._accumulator = np.concatenate([self._accumulator[self._hop:],
+                                                np.zeros((self._hop, self.channels), dtype=np.float32)])
+            self._previous = position
+            self._frame_index += 1
+
+            # Drop input that no later frame can reach
+            next_nominal = int(round(self._frame_index * self._hop * self.speed))
+            keep_from = min(next_nominal - self._delta, position + self._hop) - self._buffer_start
+            if keep_from > 0:
+                self._buffer = self._buffer[keep_from:]
+                self._buffer_start += keep_from
+        if not output:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        return np.concatenate(output)
+
+    def process(self, block):
+        np = require_numpy()
+        block = np.asarray(block, dtype=np.float32).reshape(-1, self.channels)
+        self._buffer = np.concatenate([self._buffer, block])
+        self._received += len(block)
+        self._samples_in += len(block)
+        output = self._run(self._buffer_start + len(self._buffer))
+        self._emitted += len(output)
+        self._samples_out += len(output)
+        return output
+
+    def flush(self):
+        np = require_numpy()
+        expected = int(round(self._received / self.speed))
+        # Pad with silence so every remaining output frame can be completed
+        padding = np.zeros((2 * (self._size + self._delta) + int(self._hop * self.speed), self.channels),
+                           dtype=np.float32)
+        end = self._buffer_start + len(self._buffer) + len(padding)
+        self._buffer = np.concatenate([self._buffer, padding])
+        output = self._run(end, limit=expected)
+        if self._emitted + len(output) < expected:
+            output = np.concatenate([output, self._accumulator])
+        output = output[:max(0, expected - self._emitted)]
+        self._emitted += len(output)
+        self._samples_out += len(output)
+        return output
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"speed": self.speed, "samples_in": self._samples_in, "samples_out": self._samples_out}
+
+
+class WsolaPitchShifter(AudioStage):
+    """
+    Pitch shift by WSOLA time-stretch followed by resampling.
+
+    The clip is stretched by the pitch ratio (pitch kept) and then resampled
+    back to its original length (pitch scaled). The ratio is rounded to a
+    fraction with a small denominator so the resampler stays cheap. Slower
+    than PitchShifter but free of its periodic crossfade modulation.
+    """
+
+    def __init__(self, ratio: float, max_denominator: int = 64):
+        self.name = f"pitch-wsola:{ratio:.3f}"
+        self.ratio = Fraction(ratio).limit_denominator(max_denominator)
+
+    def configure(self, sample_rate: int, channels: int) -> Tuple[int, int]:
+        self.channels = channels
+        self._stretcher = TimeStretcher(1 / float(self.ratio))
+        self._stretcher.configure(sample_rate, channels)
+        # Rates are only labels here: read ratio.numerator samples per ratio.denominator
+        self._resampler = Resampler(self.ratio.denominator)
+        self._resampler.configure(self.ratio.numerator, channels)
+        self._chain = AudioPipeline([self._stretcher, self._resampler])
+        self._chain.channels = channels
+        self._received = 0
+        self._emitted = 0
+        return sample_rate, channels
+
+    @property
+    def active(self) -> bool:
+        return self.ratio != 1
+
+    def process(self, block):
+        np = require_numpy()
+        block = np.asarray(block, dtype=np.float32).reshape(-1, self.channels)
+        self._received += len(block)
+        output = self._chain.process(block)
+        output = output[:max(0, self._received - self._emitted)]
+        self._emitted += len(output)
+        return output
+
+    def flush(self):
+        np = require_numpy()
+        output = self._chain.flush()
+        missing = self._received - self._emitted
+        # Keep the duration exact: trim or pad the last few samples
+        output = output[:max(0, missing)]
+        if len(output) < missing:
+            output = np.concatenate([output, np.zeros((missing - len(output), self.channels), dtype=np.float32)])
+        self._emitted += len(output)
+        return output
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"ratio": float(self.ratio), "method": "wsola"}
+
+
+def stretch_audio(source: AudioSource, speed: float, format=None) -> bytes:
+    """Time-stretch AIFF/WAV audio (speed > 1 is faster) and return the encoded result"""
+    from .audio_convert import convert_audio
+    from .models import AudioFormat
+
+    output = io.BytesIO()
+    convert_audio(source, output, format or AudioFormat.AIFF,
+                  pipeline=AudioPipeline([TimeStretcher(speed)]))
+    return output.getvalue()
@@ -0,0 +1,161 @@
+"""
+Audio Pipeline for TTS Notify v2
+
+This module chains post-synthesis processing stages (resampling, channel
+mixing, ...) over float32 sample blocks. Stages see audio one block at a
+time and keep whatever state they need between blocks, so a pipeline runs
+in constant memory however long the clip is.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from .audio_io import require_numpy
+
+logger = logging.getLogger(__name__)
+
+
+class AudioStage:
+    """
+    One block-wise processing step.
+
+    ``configure`` is called once with the incoming format and returns the
+    outgoing one; two-pass stages (``needs_source``) then get
+    ``prepare(reader)`` with the source audio; ``process`` maps a float32 block shaped (frames, channels)
+    to the next block (whose length may differ); ``flush`` returns any
+    samples still held back at the end of the stream.
+    """
+
+    name = "stage"
+    # Stages that must see the whole source first get ``prepare(reader)``
+    needs_source = False
+
+    def configure(self, sample_rate: int, channels: int) -> Tuple[int, int]:
+        return sample_rate, channels
+
+    @property
+    def active(self) -> bool:
+        """False when the stage would leave the audio unchanged"""
+        return True
+
+    def process(self, block):
+        return block
+
+    def flush(self):
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class AudioPipeline:
+    """An ordered chain of AudioStage objects"""
+
+    def __init__(self, stages: Optional[List[AudioStage]] = None):
+        self.stages = list(stages or [])
+        self.sample_rate: Optional[int] = None
+        self.channels: Optional[int] = None
+
+    def configure(self, sample_rate: int, channels: int) -> Tuple[int, int]:
+        """Propagate the input format through every stage; returns the output format"""
+        for stage in self.stages:
+            sample_rate, channels = stage.configure(sample_rate, channels)
+        self.sample_rate, self.channels = sample_rate, channels
+        return sample_rate, channels
+
+    @property
+    def active(self) -> bool:
+        return any(stage.active for stage in self.stages)
+
+    def prepare(self, reader) -> None:
+        """Give two-pass stages a look at the source before processing starts"""
+        for stage in self._active_stages():
+            if stage.needs_source:
+                stage.prepare(reader)
+
+    def _active_stages(self) -> List[AudioStage]:
+        return [stage for stage in self.stages if stage.active]
+
+    def process(self, block):
+        for stage in self._active_stages():
+            block = stage.process(block)
+            if block is None or len(block) == 0:
+                return block
+        return block
+
+    def flush(self):
+        """Drain every stage in order, pushing each tail through the stages after it"""
+        np = require_numpy()
+        stages = self._active_stages()
+        tails = []
+        for index, stage in enumerate(stages):
+            tail = stage.flush()
+            for later in stages[index + 1:]:
+                if tail is None or len(tail) == 0:
+                    break
+                tail = later.process(tail)
+            if tail is not None and len(tail):
+                tails.append(tail)
+        if not tails:
+            return np.zeros((0, self.channels or 1), dtype=np.float32)
+        return np.concatenate(tails)
+
+    def signature(self) -> str:
+        """Identifies the pipeline settings (part of synthesis cache keys)"""
+        return ";".join(stage.name for stage in self.stages)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistics per active stage, keyed by stage kind ("resample", "trim", ...)"""
+        return {stage.name.partition(":")[0]: stage.get_stats() for stage in self._active_stages()}
+
+
+def numpy_available() -> bool:
+    try:
+        require_numpy()
+    except Exception:
+        return False
+    return True
+
+
+def effects_requested(request) -> bool:
+    """True if a TTSRequest asks for pitch or volume changes (applied by the pipeline)"""
+    return any(value is not None and abs(value - 1.0) > 1e-6
+               for value in (request.pitch, request.volume))
+
+
+def build_pipeline(config, request=None) -> Optional[AudioPipeline]:
+    """
+    Build the post-synthesis pipeline from a TTSConfig and, optionally, a TTSRequest.
+
+    Returns:
+        The pipeline, or None if post-processing is disabled or NumPy is missing
+    """
+    if not getattr(config, "TTS_NOTIFY_AUDIO_PIPELINE", True):
+        return None
+    if not numpy_available():
+        if request is not None and effects_requested(request):
+            logger.warning("Pitch and volume need NumPy (pip install tts-notify[audio]); ignoring them")
+        else:
+            logger.debug("Audio pipeline disabled: NumPy is not installed")
+        return None
+
+    from .audio_dsp import (
+        ChannelMixer, Gain, LoudnessNormalizer, PitchShifter, Resampler, TrimSilence, WsolaPitchShifter
+    )
+
+    stages: List[AudioStage] = [ChannelMixer(getattr(config, "TTS_NOTIFY_CHANNELS", 1))]
+    if getattr(config, "TTS_NOTIFY_TRIM_SILENCE", False):
+        stages.append(TrimSilence(getattr(config, "TTS_NOTIFY_TRIM_THRESHOLD_DB", -50.0),
+                                  getattr(config, "TTS_NOTIFY_TRIM_PADDING", 0.03)))
+    if request is not None and request.pitch is not None:
+        if getattr(config, "TTS_NOTIFY_PITCH_METHOD", "wsola") == "delay":
+            stages.append(PitchShifter(request.pitch))
+        else:
+            stages.append(WsolaPitchShifter(request.pitch))
+    if getattr(config, "TTS_NOTIFY_LOUDNESS_NORMALIZE", False):
+        # Before the volume stage, so request volume stays relative to the target
+        stages.append(LoudnessNormalizer(getattr(config, "TTS_NOTIFY_LOUDNESS_TARGET", -16.0)))
+    if request is not None and request.volume is not None:
+        stages.append(Gain(request.volume))
+    stages.append(Resampler(getattr(config, "TTS_NOTIFY_SAMPLE_RATE", 22050)))
+    return AudioPipeline(stages)
@@ -0,0 +1,173 @@
+"""
+Batch Processing for TTS Notify v2
+
+This module runs many TTS requests with bounded concurrency and delivers
+per-item results as they complete (or in submission order), together with
+aggregate throughput statistics.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+import logging
+
+from .models import TTSResponse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of one item in a batch"""
+    index: int
+    item: Any
+    response: Optional[TTSResponse] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.error is None and self.response is not None and self.response.success
+
+
+@dataclass
+class BatchStats:
+    """Aggregate throughput of a batch"""
+    submitted: int = 0
+    completed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    audio_bytes: int = 0
+    busy_time: float = 0.0
+    elapsed: float = 0.0
+    max_concurrent: int = 0
+    peak_in_flight: int = 0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.completed / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def parallelism(self) -> float:
+        """Average number of items in flight (busy time / wall time)"""
+        return self.busy_time / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["items_per_second"] = self.items_per_second
+        data["audio_bytes_per_second"] = self.audio_bytes / self.elapsed if self.elapsed > 0 else 0.0
+        data["parallelism"] = self.parallelism
+        return data
+
+
+class BatchRun:
+    """
+    Async-iterable batch of TTS operations.
+
+    Iterate to receive BatchItemResult objects as they finish (ordered=False)
+    or in submission order (ordered=True); ``stats`` is updated live.
+    """
+
+    def __init__(self, operation: Callable[[Any], Awaitable[TTSResponse]],
+                 items: Iterable[Any], max_concurrent: int = 5, ordered: bool = True):
+        self._operation = operation
+        self._items = items
+        self.max_concurrent = max(1, max_concurrent)
+        self.ordered = ordered
+        self.stats = BatchStats(max_concurrent=self.max_concurrent)
+        self._started = False
+
+    def __aiter__(self) -> AsyncIterator[BatchItemResult]:
+        if self._started:
+            raise RuntimeError("A BatchRun can only be iterated once")
+        self._started = True
+        return self._run()
+
+    async def collect(self) -> List[BatchItemResult]:
+        """Run the whole batch and return results in submission order"""
+        results = [result async for result in self]
+        results.sort(key=lambda result: result.index)
+        return results
+
+    async def _execute(self, index: int, item: Any) -> BatchItemResult:
+        start_time = time.time()
+        try:
+            response = await self._operation(item)
+            result = BatchItemResult(index=index, item=item, response=response,
+                                     error=None if response.success else response.error)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Batch item {index} failed: {e}")
+            result = BatchItemResult(index=index, item=item, error=str(e))
+        result.elapsed = time.time() - start_time
+        return result
+
+    def _record(self, result: BatchItemResult) -> None:
+        self.stats.completed += 1
+        self.stats.busy_time += result.elapsed
+        if result.success:
+            self.stats.succeeded += 1
+            if result.response.audio_data:
+                self.stats.audio_bytes += len(result.response.audio_data)
+            elif result.response.metadata.get("file_size"):
+                self.stats.audio_bytes += result.response.metadata["file_size"]
+        else:
+            self.stats.failed += 1
+
+    async def _run(self) -> AsyncIterator[BatchItemResult]:
+        start_time = time.time()
+        source = enumerate(self._items)
+        exhausted = False
+        running: Set[asyncio.Task] = set()
+        finished: Dict[int, BatchItemResult] = {}
+        next_to_yield = 0
+        # Ordered mode: bound how far we run ahead of a slow head item
+        look_ahead = self.max_concurrent * 4
+
+        def launch() -> None:
+            nonlocal exhausted
+            while not exhausted and len(running) < self.max_concurrent:
+                if self.ordered and self.stats.submitted >= next_to_yield + look_ahead:
+                    return
+                try:
+                    index, item = next(source)
+                except StopIteration:
+                    exhausted = True
+                    return
+                running.add(asyncio.ensure_future(self._execute(index, item)))
+                self.stats.submitted += 1
+                self.stats.peak_in_flight = max(self.stats.peak_in_flight, len(running))
+
+        try:
+            launch()
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                running.difference_update(done)
+
+                ready: List[BatchItemResult] = []
+                for task in done:
+                    result = task.result()
+                    self._record(result)
+                    if self.ordered:
+                        finished[result.index] = result
+                    else:
+                        ready.append(result)
+
+                if self.ordered:
+                    while next_to_yield in finished:
+                        ready.append(finished.pop(next_to_yield))
+                        next_to_yield += 1
+
+                launch()
+                self.stats.elapsed = time.time() - start_time
+                for result in ready:
+                    yield result
+
+            logger.info(f"Batch finished: {self.stats.succeeded}/{self.stats.completed} succeeded, "
+                        f"{self.stats.items_per_second:.1f} items/s")
+        finally:
+            self.stats.elapsed = time.time() - start_time
+            for task in running:
+                task.cancel()
@@ -0,0 +1,98 @@
+"""
+Request Cancellation for TTS Notify v2
+
+This module provides the cancellation token carried by a TTSRequest. The
+caller that owns a request (an HTTP handler, an MCP tool call) cancels the
+token when its client goes away; the engine runs the request's work in a
+task bound to the token, so cancelling it interrupts whatever the request is
+waiting on and kills any `say`/player process it started, freeing the
+concurrency slot immediately.
+"""
+
+import asyncio
+import threading
+from typing import Awaitable, Callable, List, Optional, TypeVar
+import logging
+
+from .exceptions import RequestCancelledError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CancellationToken:
+    """Cancellation flag shared by a request and everything derived from it"""
+
+    def __init__(self):
+        self.reason: Optional[str] = None
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    def cancel(self, reason: str = "Request cancelled") -> bool:
+        """Cancel the token (thread-safe); returns False if it was already cancelled"""
+        with self._lock:
+            if self.reason is not None:
+                return False
+            self.reason = reason
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.debug(f"Cancellation callback failed: {e}")
+        return True
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Call callback on cancellation (now, if already cancelled); returns a remover"""
+        with self._lock:
+            if self.reason is None:
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self) -> None:
+        if self.reason is not None:
+            raise RequestCancelledError(self.reason)
+
+    async def run(self, awaitable: Awaitable[T]) -> T:
+        """
+        Await work in its own task, cancelling that task when the token is cancelled.
+
+        Raises:
+            RequestCancelledError: The token was cancelled before or during the work
+        """
+        if self.reason is not None:
+            # Never started: close the coroutine so it is not reported as unawaited
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            self.raise_if_cancelled()
+
+        loop = asyncio.get_running_loop()
+        task = asyncio.ensure_future(awaitable)
+
+        def cancel_task() -> None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # Loop already closed
+
+        remove = self.add_callback(cancel_task)
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if self.reason is not None and task.cancelled():
+                raise RequestCancelledError(self.reason) from None
+            raise
+        finally:
+            remove()
@@ -0,0 +1,271 @@
+"""
+Capability Probe for TTS Notify v2
+
+This module provides a single service for the system capability checks
+(`say -v ?`, `which say`, `<engine> --version`) that engines, detectors and
+the configuration manager need. Successful probe results are cached with a
+TTL and persisted across process restarts; failures and timeouts are only
+remembered in memory for a short time, so one slow probe cannot mark an
+engine unavailable for long. Concurrent async probes for the same command
+share one subprocess.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of running one probe command"""
+    command: List[str]
+    found: bool
+    returncode: Optional[int] = None
+    stdout: str = ""
+    stderr: str = ""
+    timed_out: bool = False
+    executable: Optional[str] = None
+    executable_mtime: Optional[float] = None
+    timestamp: float = field(default_factory=time.time)
+    duration: float = 0.0
+
+    @property
+    def available(self) -> bool:
+        """The command exists and exited successfully"""
+        return self.found and not self.timed_out and self.returncode == 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProbeResult":
+        return cls(**data)
+
+
+class CapabilityProbe:
+    """Cached, persistent, async-capable system capability probes"""
+
+    # Common probes
+    SAY_VOICES = ["say", "-v", "?"]
+
+    def __init__(self, ttl: float = 300, cache_file: Optional[Path] = None, persist: bool = True,
+                 failure_ttl: float = 10):
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.cache_file = cache_file or self.default_cache_file()
+        self.persist = persist
+        self._results: Dict[str, ProbeResult] = {}
+        self._in_flight: Dict[str, "asyncio.Future[ProbeResult]"] = {}
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "subprocesses": 0}
+        self._load()
+
+    @staticmethod
+    def default_cache_file() -> Path:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME")
+        base = Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+        return base / "tts-notify" / "capabilities.json"
+
+    def configure(self, ttl: Optional[float] = None, persist: Optional[bool] = None,
+                  failure_ttl: Optional[float] = None) -> None:
+        """Adjust TTLs or persistence at runtime"""
+        if ttl is not None:
+            self.ttl = ttl
+        if failure_ttl is not None:
+            self.failure_ttl = failure_ttl
+        if persist is not None:
+            self.persist = persist
+
+    @staticmethod
+    def _key(command: List[str]) -> str:
+        return "\x1f".join(command)
+
+    @staticmethod
+    def _resolve(command: List[str]) -> Dict[str, Any]:
+        """Locate the executable without spawning anything"""
+        executable = shutil.which(command[0])
+        mtime = None
+        if executable:
+            try:
+                mtime = os.stat(executable).st_mtime
+            except OSError:
+                executable = None
+        return {"executable": executable, "executable_mtime": mtime}
+
+    def _fresh(self, key: str, resolved: Dict[str, Any]) -> Optional[ProbeResult]:
+        """Return a cached result if it is within its TTL and the binary is unchanged"""
+        result = self._results.get(key)
+        if result is None:
+            return None
+        ttl = self.ttl if result.available else self.failure_ttl
+        if time.time() - result.timestamp >= ttl:
+            return None
+        if (result.executable != resolved["executable"] or
+                result.executable_mtime != resolved["executable_mtime"]):
+            return None
+        return result
+
+    def _load(self) -> None:
+        if not self.persist:
+            return
+        try:
+            data = json.loads(self.cache_file.read_text())
+            for key, entry in data.items():
+                result = ProbeResult.from_dict(entry)
+                if result.available:
+                    self._results[key] = result
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable capability cache {self.cache_file}: {e}")
+
+    def _save(self) -> None:
+        if not self.persist:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_file.with_suffix(f".tmp{os.getpid()}")
+            # Failures are transient (a slow or busy system); never carry them into a restart
+            payload = {key: result.to_dict() for key, result in self._results.items() if result.available}
+            tmp_path.write_text(json.dumps(payload))
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            logger.debug(f"Failed to persist capability cache: {e}")
+
+    def _store(self, key: str, result: ProbeResult) -> ProbeResult:
+        with self._lock:
+            self._results[key] = result
+            self._save()
+        return result
+
+    def _lookup(self, command: List[str]):
+        resolved = self._resolve(command)
+        key = self._key(command)
+        with self._lock:
+            cached = self._fresh(key, resolved)
+            if cached is not None:
+                self.stats["hits"] += 1
+            else:
+                self.stats["misses"] += 1
+        return key, resolved, cached
+
+    def probe(self, command: List[str], timeout: float = 5) -> ProbeResult:
+        """Run (or reuse) a probe synchronously"""
+        key, resolved, cached = self._lookup(command)
+        if cached is not None:
+            return cached
+        if resolved["executable"] is None:
+            return self._store(key, ProbeResult(command=command, found=False, **resolved))
+
+        start_time = time.time()
+        self.stats["subprocesses"] += 1
+        try:
+            completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+            result = ProbeResult(
+                command=command, found=True, returncode=completed.returncode,
+                stdout=completed.stdout, stderr=completed.stderr, **resolved
+            )
+        except subprocess.TimeoutExpired:
+            result = ProbeResult(command=command, found=True, timed_out=True, **resolved)
+        except (FileNotFoundError, PermissionError) as e:
+            result = ProbeResult(command=command, found=False, stderr=str(e), **resolved)
+        result.duration = time.time() - start_time
+        return self._store(key, result)
+
+    async def probe_async(self, command: List[str], timeout: float = 5) -> ProbeResult:
+        """Run (or reuse) a probe without blocking the event loop"""
+        key, resolved, cached = self._lookup(command)
+        if cached is not None:
+            return cached
+        if resolved["executable"] is None:
+            return self._store(key, ProbeResult(command=command, found=False, **resolved))
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None and not in_flight.done():
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._run_async(command, timeout, resolved)
+            future.set_result(result)
+            return self._store(key, result)
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else is waiting
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def _run_async(self, command: List[str], timeout: float,
+                         resolved: Dict[str, Any]) -> ProbeResult:
+        start_time = time.time()
+        self.stats["subprocesses"] += 1
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except (FileNotFoundError, PermissionError) as e:
+            return ProbeResult(command=command, found=False, stderr=str(e), **resolved)
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return ProbeResult(command=command, found=True, timed_out=True,
+                               duration=time.time() - start_time, **resolved)
+
+        return ProbeResult(
+            command=command, found=True, returncode=process.returncode,
+            stdout=stdout.decode(errors="replace"), stderr=stderr.decode(errors="replace"),
+            duration=time.time() - start_time, **resolved
+        )
+
+    async def warm_up(self, commands: Optional[List[List[str]]] = None) -> Dict[str, ProbeResult]:
+        """Run several probes concurrently, e.g. during startup"""
+        commands = commands or [self.SAY_VOICES]
+        results = await asyncio.gather(*[self.probe_async(c) for c in commands])
+        return {" ".join(c): r for c, r in zip(commands, results)}
+
+    def which(self, name: str) -> Optional[str]:
+        """Locate an executable on PATH (no subprocess)"""
+        return shutil.which(name)
+
+    def say_available(self) -> bool:
+        return self.probe(self.SAY_VOICES).available
+
+    def invalidate(self, command: Optional[List[str]] = None) -> None:
+        """Forget one cached probe, or all of them"""
+        with self._lock:
+            if command is None:
+                self._results.clear()
+            else:
+                self._results.pop(self._key(command), None)
+            self._save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "cached_probes": len(self._results),
+                "ttl": self.ttl,
+                "cache_file": str(self.cache_file) if self.persist else None,
+            }
+
+
+# Global capability probe instance
+capability_probe = CapabilityProbe()
@@ -0,0 +1,151 @@
+"""
+Circuit Breaker for TTS Notify v2
+
+This module tracks the recent error rate and timeouts of a TTS engine and
+stops sending it requests while it is failing. A broken or hanging `say`
+then costs one fast rejection instead of a full process timeout per request.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from enum import Enum
+from typing import Any, Deque, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BreakerState(Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"        # Requests flow normally
+    OPEN = "open"            # Requests are rejected immediately
+    HALF_OPEN = "half_open"  # A few trial requests decide what comes next
+
+
+@dataclass
+class BreakerStats:
+    """Circuit breaker counters"""
+    successes: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    rejected: int = 0
+    opened: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class CircuitBreaker:
+    """Error-rate and timeout driven circuit breaker"""
+
+    def __init__(self, name: str, error_rate: float = 0.5, window: int = 20, min_calls: int = 5,
+                 consecutive_timeouts: int = 2, reset_timeout: float = 30.0,
+                 half_open_calls: int = 1, call_timeout: Optional[float] = None):
+        self.name = name
+        self.error_rate_threshold = error_rate
+        self.min_calls = min_calls
+        self.consecutive_timeouts_threshold = consecutive_timeouts
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.call_timeout = call_timeout
+        self.state = BreakerState.CLOSED
+        self.stats = BreakerStats()
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._consecutive_timeouts = 0
+        self._opened_at: Optional[float] = None
+        self._trials = 0
+
+    @classmethod
+    def from_config(cls, name: str, config) -> "CircuitBreaker":
+        """Build a circuit breaker from a TTSConfig"""
+        return cls(
+            name,
+            error_rate=getattr(config, "TTS_NOTIFY_BREAKER_ERROR_RATE", 0.5),
+            window=getattr(config, "TTS_NOTIFY_BREAKER_WINDOW", 20),
+            min_calls=getattr(config, "TTS_NOTIFY_BREAKER_MIN_CALLS", 5),
+            consecutive_timeouts=getattr(config, "TTS_NOTIFY_BREAKER_TIMEOUTS", 2),
+            reset_timeout=getattr(config, "TTS_NOTIFY_BREAKER_RESET_TIMEOUT", 30.0),
+            call_timeout=getattr(config, "TTS_NOTIFY_BREAKER_CALL_TIMEOUT", None) or None
+        )
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a trial request through"""
+        if self.state is not BreakerState.OPEN or self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.time())
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (reserves a half-open trial)"""
+        if self.state is BreakerState.OPEN:
+            if self.retry_after() > 0:
+                self.stats.rejected += 1
+                return False
+            self.state = BreakerState.HALF_OPEN
+            self._trials = 0
+            logger.info(f"Circuit breaker for '{self.name}' half-open, sending a trial request")
+
+        if self.state is BreakerState.HALF_OPEN:
+            if self._trials >= self.half_open_calls:
+                self.stats.rejected += 1
+                return False
+            self._trials += 1
+        return True
+
+    def record_success(self) -> None:
+        self.stats.successes += 1
+        self._outcomes.append(True)
+        self._consecutive_timeouts = 0
+        if self.state is BreakerState.HALF_OPEN:
+            self._close()
+
+    def record_failure(self, timeout: bool = False) -> None:
+        self.stats.failures += 1
+        self._outcomes.append(False)
+        if timeout:
+            self.stats.timeouts += 1
+            self._consecutive_timeouts += 1
+        else:
+            self._consecutive_timeouts = 0
+
+        if self.state is BreakerState.HALF_OPEN:
+            self._open("trial request failed")
+        elif self._consecutive_timeouts >= self.consecutive_timeouts_threshold:
+            self._open(f"{self._consecutive_timeouts} consecutive timeouts")
+        elif (len(self._outcomes) >= self.min_calls
+              and self.error_rate >= self.error_rate_threshold):
+            self._open(f"error rate {self.error_rate:.0%}")
+
+    def record_ignored(self) -> None:
+        """Release a half-open trial slot without judging the engine"""
+        if self.state is BreakerState.HALF_OPEN and self._trials > 0:
+            self._trials -= 1
+
+    def _open(self, reason: str) -> None:
+        if self.state is not BreakerState.OPEN:
+            self.stats.opened += 1
+        self.state = BreakerState.OPEN
+        self._opened_at = time.time()
+        logger.warning(f"Circuit breaker for '{self.name}' opened: {reason}")
+
+    def _close(self) -> None:
+        self.state = BreakerState.CLOSED
+        self._outcomes.clear()
+        self._consecutive_timeouts = 0
+        self._opened_at = None
+        logger.info(f"Circuit breaker for '{self.name}' closed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "error_rate": self.error_rate,
+            "retry_after": self.retry_after(),
+            "call_timeout": self.call_timeout,
+            **self.stats.to_dict(),
+        }
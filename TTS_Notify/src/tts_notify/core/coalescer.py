@@ -0,0 +1,293 @@
+"""
+Notification Coalescer for TTS Notify v2
+
+This module merges identical notifications that arrive within a short
+window into a single utterance. Bursty sources (CI jobs, agent hooks) often
+fire the same message many times in a few seconds; only the first one is
+synthesized and spoken, the rest share its result. Spoken notifications can
+opt in to fuzzy matching that also ignores numbers; synthesized audio is
+only ever shared between requests with the same text.
+"""
+
+import asyncio
+import difflib
+import json
+import os
+import re
+import time
+import unicodedata
+from dataclasses import dataclass, asdict, replace
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import logging
+
+from .models import TTSRequest, TTSResponse
+from .synthesis_cache import SynthesisCache
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CoalescerStats:
+    """Coalescing counters"""
+    leaders: int = 0
+    suppressed: int = 0
+    shared_suppressed: int = 0
+    saved_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _Entry:
+    """An utterance other duplicates can attach to"""
+    text: str
+    started_at: float
+    future: "asyncio.Future[TTSResponse]"
+    suppressed: int = 0
+
+
+class NotificationCoalescer:
+    """Merge duplicate requests arriving within a time window"""
+
+    _PUNCTUATION_RE = re.compile(r"[^\w\s#]")
+    _NUMBER_RE = re.compile(r"\d+")
+
+    def __init__(self, window: float = 2.0, similarity: float = 1.0,
+                 shared_file: Optional[Path] = None, shared: bool = True):
+        self.window = window
+        self.similarity = similarity
+        self.shared = shared and fcntl is not None
+        self.shared_file = shared_file or self.default_shared_file()
+        self.stats = CoalescerStats()
+        self._entries: Dict[str, List[_Entry]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def default_shared_file() -> Path:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME")
+        base = Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+        return base / "tts-notify" / "coalesce.json"
+
+    @classmethod
+    def from_config(cls, config) -> "NotificationCoalescer":
+        """Build a coalescer from a TTSConfig"""
+        return cls(
+            window=getattr(config, "TTS_NOTIFY_COALESCE_WINDOW", 2.0),
+            similarity=getattr(config, "TTS_NOTIFY_COALESCE_SIMILARITY", 1.0),
+            shared=getattr(config, "TTS_NOTIFY_COALESCE_SHARED", True)
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    @property
+    def fuzzy(self) -> bool:
+        """Near-identical spoken notifications merge too (similarity below 1.0)"""
+        return self.similarity < 1.0
+
+    @classmethod
+    def normalize(cls, text: str) -> str:
+        """Reduce text to a fuzzy comparison form (case, punctuation, numbers)"""
+        text = unicodedata.normalize("NFC", text).casefold()
+        text = cls._NUMBER_RE.sub("#", text)
+        text = cls._PUNCTUATION_RE.sub(" ", text)
+        return " ".join(text.split())
+
+    @staticmethod
+    def _group(op: str, request: TTSRequest) -> str:
+        """Only requests that would sound the same may be merged"""
+        return "\x1f".join([
+            op,
+            request.voice.id,
+            "" if request.rate is None else str(request.rate),
+            "" if request.pitch is None else f"{request.pitch:.3f}",
+            "" if request.volume is None else f"{request.volume:.3f}",
+            request.output_format.value,
+            request.priority.value,
+        ])
+
+    def _fuzzy_for(self, op: str) -> bool:
+        """Only speech may merge inexactly; synthesized audio is returned to the caller"""
+        return op == "speak" and self.fuzzy
+
+    def _key(self, op: str, text: str) -> str:
+        return self.normalize(text) if self._fuzzy_for(op) else SynthesisCache.normalize_text(text)
+
+    def _similar(self, a: str, b: str, fuzzy: bool) -> bool:
+        if a == b:
+            return True
+        if not fuzzy:
+            return False
+        return difflib.SequenceMatcher(None, a, b).ratio() >= self.similarity
+
+    def _live(self, entry: _Entry, now: float) -> bool:
+        return not entry.future.done() or now - entry.started_at < self.window
+
+    def _find(self, group: str, text: str, now: float, fuzzy: bool) -> Optional[_Entry]:
+        """Drop expired entries and return one matching text, if any"""
+        entries = [e for e in self._entries.get(group, []) if self._live(e, now)]
+        if entries:
+            self._entries[group] = entries
+        else:
+            self._entries.pop(group, None)
+        for entry in entries:
+            if self._similar(entry.text, text, fuzzy):
+                return entry
+        return None
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._entries = {}
+
+    async def submit(self, op: str, request: TTSRequest,
+                     run: Callable[[TTSRequest], Awaitable[TTSResponse]]) -> TTSResponse:
+        """
+        Run a request unless a matching one is already in its window.
+
+        Args:
+            op: Operation name ("speak" or "synthesize"); only equal ops merge
+            request: The incoming request
+            run: Coroutine function performing the real work
+
+        Returns:
+            The response, with "coalesced" and "suppressed_count" in metadata
+        """
+        if not self.enabled:
+            return await run(request)
+
+        self._bind_loop()
+        group = self._group(op, request)
+        fuzzy = self._fuzzy_for(op)
+        text = self._key(op, request.text)
+
+        while True:
+            now = time.time()
+            entry = self._find(group, text, now, fuzzy)
+            if entry is None:
+                break
+
+            entry.suppressed += 1
+            self.stats.suppressed += 1
+            suppressed = entry.suppressed
+            try:
+                response = await asyncio.shield(entry.future)
+            except asyncio.CancelledError:
+                if entry.future.cancelled():
+                    # The leader was cancelled: retry, possibly as new leader
+                    entry.suppressed -= 1
+                    self.stats.suppressed -= 1
+                    continue
+                raise
+
+            self.stats.saved_seconds += response.duration or 0.0
+            return replace(response, metadata={
+                **response.metadata,
+                "coalesced": True,
+                "suppressed_count": suppressed,
+                "coalesce_window": self.window,
+            })
+
+        if op == "speak" and self.shared:
+            suppressed = self._claim_shared(group, text, now, fuzzy)
+            if suppressed:
+                self.stats.shared_suppressed += 1
+                logger.info(f"Suppressed duplicate notification spoken by another process ({suppressed} so far)")
+                return TTSResponse(success=True, duration=0.0, metadata={
+                    "coalesced": True,
+                    "suppressed_count": suppressed,
+                    "coalesce_window": self.window,
+                    "coalesced_across_processes": True,
+                })
+
+        return await self._lead(group, text, now, request, run)
+
+    async def _lead(self, group: str, text: str, now: float, request: TTSRequest,
+                    run: Callable[[TTSRequest], Awaitable[TTSResponse]]) -> TTSResponse:
+        """Perform the request and publish its result to followers"""
+        entry = _Entry(text=text, started_at=now, future=self._loop.create_future())
+        self._entries.setdefault(group, []).append(entry)
+        self.stats.leaders += 1
+
+        try:
+            response = await run(request)
+        except asyncio.CancelledError:
+            self._forget(group, entry)
+            entry.future.cancel()
+            raise
+        except BaseException as e:
+            self._forget(group, entry)
+            entry.future.set_exception(e)
+            # Followers (if any) re-raise it; avoid "never retrieved" noise
+            entry.future.exception()
+            raise
+
+        if not response.success:
+            # Let the next duplicate try again instead of sharing the failure
+            self._forget(group, entry)
+        entry.future.set_result(response)
+        response.metadata = {
+            **response.metadata,
+            "coalesced": False,
+            "suppressed_count": entry.suppressed,
+        }
+        return response
+
+    def _forget(self, group: str, entry: _Entry) -> None:
+        entries = self._entries.get(group, [])
+        if entry in entries:
+            entries.remove(entry)
+
+    def _claim_shared(self, group: str, text: str, now: float, fuzzy: bool) -> int:
+        """
+        Record an utterance in the cross-process state file.
+
+        Returns:
+            0 if this process should speak, else the number of duplicates
+            suppressed so far by the process that spoke first
+        """
+        try:
+            self.shared_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.shared_file, "a+") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "[]")
+                except ValueError:
+                    state = []
+
+                state = [e for e in state if now - e.get("t", 0) < self.window]
+                suppressed = 0
+                for entry in state:
+                    if entry.get("g") == group and self._similar(entry.get("x", ""), text, fuzzy):
+                        entry["n"] = entry.get("n", 0) + 1
+                        suppressed = entry["n"]
+                        break
+                else:
+                    state.append({"g": group, "x": text, "t": now, "n": 0})
+
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                return suppressed
+        except OSError as e:
+            logger.debug(f"Cross-process coalescing unavailable: {e}")
+            return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats.to_dict(),
+            "window": self.window,
+            "similarity": self.similarity,
+            "shared": self.shared,
+            "active": sum(len(entries) for entries in self._entries.values()),
+        }
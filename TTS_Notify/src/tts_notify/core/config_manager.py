@@ -12,6 +12,8 @@ from dataclasses import dataclass, field
 from pydantic import BaseModel, Field, validator
 
 from .exceptions import ConfigurationError
+from .capability_probe import capability_probe
+from .duration_model import duration_model
 
 
 class TTSConfig(BaseModel):
@@ -36,14 +38,91 @@ class TTSConfig(BaseModel):
     TTS_NOTIFY_LOG_LEVEL: str = Field(default="INFO", pattern=r"^(DEBUG|INFO|WARN|ERROR)$", description="Logging level")
     TTS_NOTIFY_MAX_CONCURRENT: int = Field(default=5, ge=1, le=50, description="Max concurrent requests")
     TTS_NOTIFY_TIMEOUT: int = Field(default=60, ge=5, le=300, description="Operation timeout in seconds")
+    TTS_NOTIFY_ADAPTIVE_TIMEOUT: bool = Field(default=True, description="Scale per-request timeouts with the predicted duration")
+    TTS_NOTIFY_TIMEOUT_MARGIN: float = Field(default=3.0, ge=1.0, le=20.0, description="Adaptive timeout as a multiple of the predicted time")
+    TTS_NOTIFY_TIMEOUT_MIN: float = Field(default=5.0, ge=1.0, le=300.0, description="Shortest adaptive timeout in seconds")
+    TTS_NOTIFY_TIMEOUT_MAX: float = Field(default=900.0, ge=5.0, le=7200.0, description="Longest adaptive timeout in seconds")
     TTS_NOTIFY_CACHE_TTL: int = Field(default=300, ge=30, le=3600, description="Cache TTL in seconds")
+    TTS_NOTIFY_PROBE_CACHE_PERSIST: bool = Field(default=True, description="Persist capability probe results across restarts")
+    TTS_NOTIFY_PROBE_FAILURE_TTL: float = Field(default=10.0, ge=0.0, le=300.0, description="Seconds a failed or timed-out probe is remembered")
     TTS_NOTIFY_MAX_TEXT_LENGTH: int = Field(default=5000, ge=100, le=50000, description="Max text length")
 
+    # Synthesis cache settings
+    TTS_NOTIFY_SYNTH_CACHE_ENABLED: bool = Field(default=True, description="Cache synthesized audio")
+    TTS_NOTIFY_SYNTH_CACHE_DIR: str = Field(default="", description="Synthesis cache directory (default: ~/.cache/tts-notify/synthesis)")
+    TTS_NOTIFY_SYNTH_CACHE_MEMORY_ITEMS: int = Field(default=128, ge=0, le=10000, description="Max clips kept in memory")
+    TTS_NOTIFY_SYNTH_CACHE_MAX_MB: int = Field(default=256, ge=1, le=102400, description="Max on-disk cache size in MB")
+
+    # Synthesis worker pool settings
+    TTS_NOTIFY_WORKER_POOL_ENABLED: bool = Field(default=False, description="Dispatch synthesis to long-lived workers")
+    TTS_NOTIFY_WORKER_POOL_MIN: int = Field(default=1, ge=0, le=32, description="Minimum pooled workers")
+    TTS_NOTIFY_WORKER_POOL_MAX: int = Field(default=4, ge=1, le=32, description="Maximum pooled workers")
+    TTS_NOTIFY_WORKER_MAX_JOBS: int = Field(default=500, ge=1, description="Jobs before a worker is recycled")
+    TTS_NOTIFY_WORKER_COMMAND: str = Field(default="", description="Worker command line (default: bundled worker)")
+
+    # Engine registry settings
+    TTS_NOTIFY_ENGINE: str = Field(default="macos", description="Engine used by the CLI, API and MCP servers (macos, synthetic or a plugin)")
+    TTS_NOTIFY_ENGINE_INSTANCES: int = Field(default=1, ge=1, le=64, description="Engine instances per registered engine group")
+    TTS_NOTIFY_ENGINE_EJECT_AFTER: int = Field(default=3, ge=1, le=100, description="Consecutive failures before an instance is ejected")
+    TTS_NOTIFY_ENGINE_INIT_TIMEOUT: float = Field(default=10.0, ge=0.1, le=300.0, description="Per-engine timeout for initialize, cleanup and info calls")
+    TTS_NOTIFY_ENGINE_INFO_TTL: float = Field(default=5.0, ge=0.0, le=3600.0, description="Seconds the engine info snapshot is reused")
+    TTS_NOTIFY_ENGINE_READMIT_AFTER: float = Field(default=10.0, ge=0.0, le=3600.0, description="Seconds before an ejected instance is probed again")
+
+    # Circuit breaker settings
+    TTS_NOTIFY_ENGINE_FALLBACK: bool = Field(default=True, description="Fall back to another registered engine on failure")
+    TTS_NOTIFY_BREAKER_ERROR_RATE: float = Field(default=0.5, ge=0.05, le=1.0, description="Error rate that opens the circuit breaker")
+    TTS_NOTIFY_BREAKER_WINDOW: int = Field(default=20, ge=1, le=1000, description="Recent calls considered for the error rate")
+    TTS_NOTIFY_BREAKER_MIN_CALLS: int = Field(default=5, ge=1, le=1000, description="Calls needed before the error rate is trusted")
+    TTS_NOTIFY_BREAKER_TIMEOUTS: int = Field(default=2, ge=1, le=100, description="Consecutive timeouts that open the circuit breaker")
+    TTS_NOTIFY_BREAKER_RESET_TIMEOUT: float = Field(default=30.0, ge=0.0, le=3600.0, description="Seconds an open breaker waits before a trial request")
+    TTS_NOTIFY_BREAKER_CALL_TIMEOUT: float = Field(default=0.0, ge=0.0, le=300.0, description="Per-call timeout enforced by the breaker (0 = engine timeout)")
+
+    # Plugin settings
+    TTS_NOTIFY_PLUGINS_ENABLED: bool = Field(default=True, description="Discover engine and voice detector plugins via entry points")
+    TTS_NOTIFY_PLUGINS_DISABLED: str = Field(default="", description="Comma-separated plugin names to ignore")
+
+    # Playback queue settings
+    TTS_NOTIFY_PLAYBACK_QUEUE: bool = Field(default=True, description="Serialize speak() through a process-wide priority queue")
+    TTS_NOTIFY_PLAYBACK_PREFETCH: bool = Field(default=True, description="Pre-render the next queued item while one plays")
+    TTS_NOTIFY_PLAYBACK_REQUEUE_PREEMPTED: bool = Field(default=True, description="Requeue items interrupted by urgent ones (they restart from the beginning)")
+    TTS_NOTIFY_PLAYBACK_MAX_DEPTH: int = Field(default=100, ge=1, le=10000, description="Max items waiting for playback")
+    TTS_NOTIFY_PLAYBACK_PLAYER: str = Field(default="afplay", description="Command used to play pre-rendered audio")
+
+    # Duplicate-notification coalescing
+    TTS_NOTIFY_COALESCE_WINDOW: float = Field(default=2.0, ge=0.0, le=300.0, description="Merge duplicate notifications within this many seconds (0 disables)")
+    TTS_NOTIFY_COALESCE_SIMILARITY: float = Field(default=1.0, ge=0.5, le=1.0, description="Text similarity ratio treated as a duplicate spoken notification (1.0 = exact text only)")
+    TTS_NOTIFY_COALESCE_SHARED: bool = Field(default=True, description="Also coalesce across processes (e.g. repeated CLI runs)")
+
+    # Short-request synthesis batching
+    TTS_NOTIFY_BATCH_WINDOW: float = Field(default=0.0, ge=0.0, le=10.0, description="Render short requests queued within this many seconds in one say call (0 disables)")
+    TTS_NOTIFY_BATCH_MAX_SIZE: int = Field(default=16, ge=2, le=256, description="Max requests rendered by one batched say call")
+    TTS_NOTIFY_BATCH_MAX_WORDS: int = Field(default=30, ge=1, le=1000, description="Only requests with at most this many words are batched")
+    TTS_NOTIFY_BATCH_GAP: float = Field(default=0.75, ge=0.2, le=5.0, description="Silence in seconds separating batched texts (split point)")
+
+    # Synthetic engine settings (benchmarking without macOS)
+    TTS_NOTIFY_SYNTHETIC_LATENCY: float = Field(default=0.05, ge=0.0, le=60.0, description="Simulated per-call engine latency in seconds")
+    TTS_NOTIFY_SYNTHETIC_JITTER: float = Field(default=0.0, ge=0.0, le=60.0, description="Uniform random +/- jitter added to the latency")
+    TTS_NOTIFY_SYNTHETIC_PLAYBACK_SCALE: float = Field(default=1.0, ge=0.0, le=10.0, description="Simulated playback time as a fraction of the audio duration")
+    TTS_NOTIFY_SYNTHETIC_SEED: int = Field(default=0, description="Seed for the simulated jitter")
+
     # Format and output settings
     TTS_NOTIFY_OUTPUT_FORMAT: str = Field(default="aiff", pattern=r"^(aiff|wav|mp3|ogg|m4a|flac)$", description="Audio output format")
     TTS_NOTIFY_OUTPUT_DIR: str = Field(default="", description="Output directory (default: Desktop)")
-    TTS_NOTIFY_SAMPLE_RATE: int = Field(default=22050, description="Sample rate in Hz")
+    TTS_NOTIFY_SAMPLE_RATE: int = Field(default=22050, ge=4000, le=192000, description="Sample rate in Hz")
     TTS_NOTIFY_CHANNELS: int = Field(default=1, ge=1, le=2, description="Audio channels (1=mono, 2=stereo)")
+    TTS_NOTIFY_AUDIO_PIPELINE: bool = Field(default=True, description="Post-process synthesized audio to the configured sample rate and channels (needs NumPy)")
+    TTS_NOTIFY_PITCH_METHOD: str = Field(default="wsola", pattern=r"^(wsola|delay)$", description="Pitch shift method: wsola (cleaner) or delay (lower latency)")
+    TTS_NOTIFY_RATE_VARIANT_TOLERANCE: float = Field(default=0.0, ge=0.0, le=0.5, description="Derive a request from a cached clip whose rate differs by up to this fraction (0 disables)")
+    TTS_NOTIFY_TRIM_SILENCE: bool = Field(default=False, description="Trim leading/trailing silence from synthesized audio")
+    TTS_NOTIFY_TRIM_THRESHOLD_DB: float = Field(default=-50.0, ge=-120.0, le=0.0, description="Level (dBFS) below which audio counts as silence")
+    TTS_NOTIFY_TRIM_PADDING: float = Field(default=0.03, ge=0.0, le=1.0, description="Seconds of silence kept at each end when trimming")
+    TTS_NOTIFY_LOUDNESS_NORMALIZE: bool = Field(default=False, description="Normalize synthesized audio to a target loudness")
+    TTS_NOTIFY_LOUDNESS_TARGET: float = Field(default=-16.0, ge=-70.0, le=0.0, description="Target integrated loudness in LUFS")
+    TTS_NOTIFY_CONCAT_CROSSFADE: float = Field(default=0.01, ge=0.0, le=1.0, description="Crossfade in seconds when joining segments into one file")
+    TTS_NOTIFY_CONCAT_GAP: float = Field(default=0.0, ge=0.0, le=10.0, description="Silence in seconds between joined segments")
+    TTS_NOTIFY_DOCUMENT_SHARD_CHARS: int = Field(default=1200, ge=100, le=100000, description="Upper bound in characters per shard when rendering documents")
+    TTS_NOTIFY_DOCUMENT_CONCURRENCY: int = Field(default=0, ge=0, le=256, description="Shards rendered in parallel for documents (0 = CPU count)")
+    TTS_NOTIFY_CAPTURE_MODE: str = Field(default="auto", pattern=r"^(auto|memfd|tempfile)$", description="How synthesized audio is captured in memory")
 
     # Interface-specific settings
     TTS_NOTIFY_CLI_FORMAT: str = Field(default="table", pattern=r"^(table|json|yaml|csv)$", description="CLI output format")
@@ -213,6 +292,13 @@ class ConfigManager:
                         config_dict.update(yaml_config)
                         config = TTSConfig(**config_dict)
 
+            capability_probe.configure(
+                ttl=config.TTS_NOTIFY_CACHE_TTL,
+                persist=config.TTS_NOTIFY_PROBE_CACHE_PERSIST,
+                failure_ttl=config.TTS_NOTIFY_PROBE_FAILURE_TTL
+            )
+            duration_model.configure(config)
+
             self._config = config
             return config
 
@@ -334,14 +420,11 @@ class ConfigManager:
         issues.extend(config_errors)
 
         # Validate system requirements
-        try:
-            import subprocess
-            result = subprocess.run(["say", "-v", "?"],
-                                   capture_output=True, text=True, timeout=5)
-            if result.returncode != 0:
-                issues.append("macOS 'say' command is not working properly")
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+        result = capability_probe.probe(capability_probe.SAY_VOICES)
+        if not result.found:
             issues.append("macOS 'say' command is not available")
+        elif not result.available:
+            issues.append("macOS 'say' command is not working properly")
 
         # Validate output directory
         if config.TTS_NOTIFY_OUTPUT_DIR:
@@ -0,0 +1,330 @@
+"""
+Document Rendering for TTS Notify v2
+
+This module renders long documents (release notes, reports, markdown) into
+one audio file. Markdown is reduced to speakable text, the text is cut into
+shards at paragraph or sentence boundaries, shards are rendered in parallel
+and the results are joined in order with short crossfades. Each shard is
+kept in a shard directory under a name derived from its text and the render
+settings, so an interrupted or edited document resumes by rendering only
+the shards that are missing.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, asdict, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+import logging
+
+from .audio_concat import AudioConcatenator
+from .audio_io import read_info
+from .audio_pipeline import build_pipeline
+from .config_manager import config_manager
+from .exceptions import AudioProcessingError, RequestCancelledError, TTSError, ValidationError
+from .models import AudioFormat, TTSRequest, TTSResponse
+from .segmenter import TextSegmenter
+
+if TYPE_CHECKING:
+    from .tts_engine import TTSEngine
+
+logger = logging.getLogger(__name__)
+
+_CODE_FENCE_RE = re.compile(r"^\s*(```|~~~).*?^\s*\1[^\n]*$", re.MULTILINE | re.DOTALL)
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_HTML_TAG_RE = re.compile(r"</?[A-Za-z][^>]*>|<https?://[^>]+>")
+_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_LINK_RE = re.compile(r"\[([^\]]+)\](?:\([^)]*\)|\[[^\]]*\])")
+_LINK_DEFINITION_RE = re.compile(r"^\s*\[[^\]]+\]:\s+\S+.*$", re.MULTILINE)
+_HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+(.*?)[\s#]*$")
+_RULE_RE = re.compile(r"^\s*([-*_=])(\s*\1){2,}\s*$")
+_LIST_ITEM_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(?:\[[ xX]\]\s+)?")
+_QUOTE_RE = re.compile(r"^\s*(?:>\s?)+")
+_TABLE_RULE_RE = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+_STRONG_RE = re.compile(r"(\*\*|__|~~)(?=\S)(.+?)(?<=\S)\1")
+_EMPHASIS_RE = re.compile(r"(?<!\w)([*_])(?=\S)(.+?)(?<=\S)\1(?!\w)")
+_INLINE_CODE_RE = re.compile(r"`+([^`]+)`+")
+_STOPS = ".!?:;…"
+# Files this renderer writes into a shard directory; nothing else is ever removed
+_SHARD_NAME_RE = re.compile(r"^[0-9a-f]{24}(?:\.partial)?\.(?:aiff|wav)$")
+
+
+def _ensure_stop(line: str) -> str:
+    """End a line with punctuation so say pauses after it"""
+    line = line.strip()
+    return line if not line or line[-1] in _STOPS else f"{line}."
+
+
+def markdown_to_speech(text: str) -> str:
+    """
+    Reduce markdown to plain text that reads naturally.
+
+    Code blocks, images' URLs, HTML and rules are dropped; headings, list
+    items and table rows become sentences of their own; links keep their
+    text; emphasis and inline code markers are removed.
+    """
+    text = _CODE_FENCE_RE.sub("", text)
+    text = _HTML_COMMENT_RE.sub("", text)
+    text = _LINK_DEFINITION_RE.sub("", text)
+
+    lines = []
+    for line in text.splitlines():
+        if _RULE_RE.match(line) or _TABLE_RULE_RE.match(line) and "-" in line:
+            lines.append("")
+            continue
+        heading = _HEADING_RE.match(line)
+        if heading:
+            # Headings stand alone, with a pause after them
+            lines.extend(["", _ensure_stop(heading.group(1)), ""])
+            continue
+        line = _QUOTE_RE.sub("", line)
+        if _LIST_ITEM_RE.match(line):
+            line = _ensure_stop(_LIST_ITEM_RE.sub("", line))
+        elif line.strip().startswith("|"):
+            cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+            line = _ensure_stop(", ".join(cell for cell in cells if cell))
+        lines.append(line)
+
+    text = "\n".join(lines)
+    text = _IMAGE_RE.sub(r"\1", text)
+    text = _LINK_RE.sub(r"\1", text)
+    text = _HTML_TAG_RE.sub("", text)
+    text = _STRONG_RE.sub(r"\2", text)
+    text = _EMPHASIS_RE.sub(r"\2", text)
+    text = _INLINE_CODE_RE.sub(r"\1", text)
+    return re.sub(r"\n\s*\n\s*(\n\s*)+", "\n\n", text).strip()
+
+
+@dataclass
+class DocumentProgress:
+    """Live progress of a document render"""
+    shards: int = 0
+    rendered: int = 0
+    resumed: int = 0
+    failed: int = 0
+    chars: int = 0
+    chars_done: int = 0
+    chars_resumed: int = 0
+    audio_seconds: float = 0.0
+    elapsed: float = 0.0
+    phase: str = "rendering"        # rendering, joining, done, failed
+
+    @property
+    def completed(self) -> int:
+        return self.rendered + self.resumed
+
+    @property
+    def fraction(self) -> float:
+        """Share of the document's text rendered so far"""
+        return self.chars_done / self.chars if self.chars else 1.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Seconds left at the rate shards have rendered so far"""
+        rendered = self.chars_done - self.chars_resumed
+        if rendered <= 0 or self.elapsed <= 0:
+            return None
+        return (self.chars - self.chars_done) * self.elapsed / rendered
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["completed"] = self.completed
+        data["fraction"] = round(self.fraction, 4)
+        data["eta"] = self.eta
+        return data
+
+
+ProgressCallback = Callable[[DocumentProgress], None]
+
+
+class DocumentRenderer:
+    """Render a long document in parallel shards and join them into one file"""
+
+    def __init__(self, engine: "TTSEngine", shard_chars: Optional[int] = None,
+                 max_concurrent: Optional[int] = None, progress: Optional[ProgressCallback] = None):
+        self.engine = engine
+        self.shard_chars = shard_chars or self._config_value("TTS_NOTIFY_DOCUMENT_SHARD_CHARS", 1200)
+        self.max_concurrent = (max_concurrent or self._config_value("TTS_NOTIFY_DOCUMENT_CONCURRENCY", 0)
+                               or os.cpu_count() or 1)
+        self._progress_callback = progress
+
+    @staticmethod
+    def _config_value(name: str, default: Any) -> Any:
+        try:
+            return getattr(config_manager.get_config(), name, default)
+        except Exception:
+            return default
+
+    @staticmethod
+    def default_shard_dir(output_path: Path) -> Path:
+        return output_path.with_name(f".{output_path.name}.shards")
+
+    def _fingerprint(self, request: TTSRequest, segment_format: AudioFormat) -> str:
+        """Everything besides the text that changes a shard's audio"""
+        try:
+            pipeline = build_pipeline(config_manager.get_config(), request)
+        except Exception:
+            pipeline = None
+        return json.dumps([
+            self.engine.name, request.voice.id, request.rate, request.pitch, request.volume,
+            segment_format.value, pipeline.signature() if pipeline else "",
+        ])
+
+    @staticmethod
+    def _shard_path(shard_dir: Path, fingerprint: str, text: str, segment_format: AudioFormat) -> Path:
+        digest = hashlib.sha256(f"{fingerprint}\x1f{text}".encode("utf-8")).hexdigest()[:24]
+        return shard_dir / f"{digest}.{segment_format.value}"
+
+    @staticmethod
+    def _complete(path: Path) -> Optional[float]:
+        """Duration of a finished shard file, or None if it must be rendered"""
+        try:
+            info = read_info(path)
+        except (OSError, AudioProcessingError):
+            return None
+        return info.duration if info.frames > 0 else None
+
+    def _report(self, progress: DocumentProgress, start_time: float) -> None:
+        progress.elapsed = time.time() - start_time
+        if self._progress_callback is not None:
+            try:
+                self._progress_callback(progress)
+            except Exception as e:
+                logger.debug(f"Document progress callback failed: {e}")
+
+    async def render(self, request: TTSRequest, output_path: Path, markdown: bool = True,
+                     shard_dir: Optional[Path] = None, resume: bool = True,
+                     keep_shards: bool = False) -> TTSResponse:
+        """
+        Render request.text into output_path.
+
+        Returns:
+            A TTSResponse with file_path; metadata holds join statistics,
+            shard counts and the final progress
+        """
+        start_time = time.time()
+        output_path = Path(output_path)
+        output_format = request.output_format
+        if output_format not in self.engine._supported_formats:
+            raise ValidationError(f"Format '{output_format.value}' is not supported by engine '{self.engine.name}'")
+        if not output_path.suffix:
+            output_path = output_path.with_suffix(f".{output_format.value}")
+
+        text = markdown_to_speech(request.text) if markdown else request.text
+        shards = TextSegmenter.split_into_shards(text, self.shard_chars)
+        if not shards:
+            raise ValidationError("Document has no speakable text", field="text")
+
+        # Shards travel as uncompressed audio; only the joined file is encoded
+        segment_format = (AudioFormat.AIFF if AudioFormat.AIFF in self.engine._supported_formats
+                          else AudioFormat.WAV)
+        default_dir = self.default_shard_dir(output_path)
+        shard_dir = Path(shard_dir) if shard_dir else default_dir
+        owns_dir = shard_dir == default_dir or not shard_dir.exists()
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        fingerprint = self._fingerprint(request, segment_format)
+        paths = [self._shard_path(shard_dir, fingerprint, shard, segment_format) for shard in shards]
+
+        # Shards with the same text share a file, which is rendered once
+        owners: Dict[Path, List[int]] = {}
+        for index, path in enumerate(paths):
+            owners.setdefault(path, []).append(index)
+
+        progress = DocumentProgress(shards=len(shards), chars=sum(len(shard) for shard in shards))
+        pending = []
+        for path, indices in owners.items():
+            duration = self._complete(path) if resume else None
+            if duration is None:
+                pending.append(path)
+                continue
+            chars = sum(len(shards[index]) for index in indices)
+            progress.resumed += len(indices)
+            progress.chars_done += chars
+            progress.chars_resumed += chars
+            progress.audio_seconds += duration * len(indices)
+        if progress.resumed:
+            logger.info(f"Resuming document render: {progress.resumed}/{len(shards)} shards already rendered")
+        self._report(progress, start_time)
+
+        # Render into partial files so an interrupted shard is never mistaken for a finished one
+        partials = [path.with_suffix(f".partial{path.suffix}") for path in pending]
+        batch = self.engine.save_many(
+            [replace(request, text=shards[owners[path][0]], output_format=segment_format) for path in pending],
+            partials, max_concurrent=self.max_concurrent, ordered=False
+        )
+        errors = []
+        async for result in batch:
+            path, partial = pending[result.index], partials[result.index]
+            indices = owners[path]
+            if not result.success:
+                progress.failed += len(indices)
+                errors.append(f"shard {indices[0] + 1}: {result.error or result.response.error}")
+                partial.unlink(missing_ok=True)
+            else:
+                os.replace(partial, path)
+                progress.rendered += len(indices)
+                progress.chars_done += sum(len(shards[index]) for index in indices)
+                progress.audio_seconds += (self._complete(path) or 0.0) * len(indices)
+            self._report(progress, start_time)
+
+        if errors:
+            if request.cancel_token is not None:
+                request.cancel_token.raise_if_cancelled()
+            progress.phase = "failed"
+            self._report(progress, start_time)
+            error_msg = f"{len(errors)} of {len(shards)} shards failed ({'; '.join(errors[:3])}); rerun to resume"
+            logger.error(error_msg)
+            return TTSResponse(success=False, error=error_msg, metadata={"progress": progress.to_dict()})
+
+        progress.phase = "joining"
+        self._report(progress, start_time)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        settings = self.engine._join_settings()
+        joiner = AudioConcatenator(output_path, output_format,
+                                   crossfade=settings["crossfade"], gap=settings["gap"])
+        try:
+            for path in paths:
+                if request.cancel_token is not None:
+                    request.cancel_token.raise_if_cancelled()
+                await asyncio.to_thread(joiner.append, path)
+            stats = await asyncio.to_thread(joiner.close)
+        except RequestCancelledError:
+            joiner.abort()
+            raise
+        except Exception as e:
+            joiner.abort()
+            raise TTSError(f"Failed to join document shards: {e}", engine_name=self.engine.name)
+
+        self._finish_shards(shard_dir, set(paths), keep_shards, owns_dir)
+        progress.phase = "done"
+        self._report(progress, start_time)
+        duration = time.time() - start_time
+        logger.info(f"Rendered document of {len(shards)} shards ({progress.resumed} resumed) "
+                    f"into '{output_path}' in {duration:.2f}s")
+        return TTSResponse(success=True, file_path=output_path, duration=duration, format=output_format,
+                           metadata={**stats, "shards": len(shards), "resumed": progress.resumed,
+                                     "max_concurrent": self.max_concurrent,
+                                     "shard_dir": str(shard_dir) if keep_shards else None,
+                                     "progress": progress.to_dict()})
+
+    @staticmethod
+    def _finish_shards(shard_dir: Path, current: set, keep: bool, owns_dir: bool) -> None:
+        """
+        Remove this renderer's shard files, or only those of earlier document
+        versions when keeping shards. Files not named like a shard are left
+        alone, and the directory is removed only if the renderer created it.
+        """
+        for path in shard_dir.iterdir():
+            if not _SHARD_NAME_RE.match(path.name) or not path.is_file():
+                continue
+            if not keep or path not in current:
+                path.unlink(missing_ok=True)
+        if not keep and owns_dir:
+            try:
+                shard_dir.rmdir()
+            except OSError as e:
+                logger.debug(f"Keeping shard directory {shard_dir}: {e}")
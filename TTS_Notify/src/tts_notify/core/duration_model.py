@@ -0,0 +1,307 @@
+"""
+Duration Model for TTS Notify v2
+
+This module predicts how long a request's speech will last and how long
+rendering it will take, from the text length, voice and rate. Predictions
+start from nominal speaking rates and are calibrated online from observed
+runs: per voice, audio duration is fitted against words at the requested
+rate (giving the voice's real words per minute); per engine, synthesis time
+is fitted against audio duration. Engines derive per-request timeouts from
+the predictions, and schedulers can use them to weigh queued work.
+Calibration is persisted across process restarts; writes are batched and
+made from a background thread, never on the event loop.
+"""
+
+import atexit
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 175              # WPM used by say when no rate is given
+MIN_SAMPLES = 3                 # Observations before a fit replaces the prior
+EXTRAPOLATION = 2.0             # Trust a fit up to this multiple of the largest x seen
+DECAY = 0.95                    # Per-observation forgetting factor
+SAVE_DELAY = 5.0                # Seconds observations are batched before persisting
+
+_WORD = re.compile(r"\w+")
+_PAUSE = re.compile(r"[.!?;:]+|,")
+
+
+def speech_units(text: str) -> float:
+    """Word count plus short allowances for punctuation pauses"""
+    words = len(_WORD.findall(text))
+    pauses = sum(0.25 if mark == "," else 0.5 for mark in _PAUSE.findall(text))
+    return max(1.0, words + pauses)
+
+
+class OnlineFit:
+    """Exponentially weighted least-squares fit of y = intercept + slope * x"""
+
+    def __init__(self, intercept: float, slope: float, decay: float = DECAY):
+        self.prior = (intercept, slope)
+        self.decay = decay
+        self.samples = 0
+        self.max_x = 0.0
+        self._sums = [0.0] * 5      # w, wx, wy, wxx, wxy
+
+    def add(self, x: float, y: float) -> None:
+        self.samples += 1
+        self.max_x = max(self.max_x, x)
+        w, wx, wy, wxx, wxy = (value * self.decay for value in self._sums)
+        self._sums = [w + 1, wx + x, wy + y, wxx + x * x, wxy + x * y]
+
+    @property
+    def calibrated(self) -> bool:
+        return self.samples >= MIN_SAMPLES
+
+    def covers(self, x: float) -> bool:
+        """Calibrated and x is not far beyond the observed range"""
+        return self.calibrated and x <= EXTRAPOLATION * self.max_x
+
+    def coefficients(self) -> Tuple[float, float]:
+        """(intercept, slope), falling back to the prior until calibrated"""
+        if not self.calibrated:
+            return self.prior
+        w, wx, wy, wxx, wxy = self._sums
+        spread = w * wxx - wx * wx
+        if spread <= 1e-9 * max(1.0, w * wxx):
+            # All observations at one x: keep the prior intercept, fit the slope through it
+            intercept = self.prior[0]
+            slope = (wy - w * intercept) / wx if wx > 0 else self.prior[1]
+        else:
+            slope = (w * wxy - wx * wy) / spread
+            intercept = (wy - slope * wx) / w
+        return max(0.0, intercept), max(1e-3, slope)
+
+    def predict(self, x: float) -> float:
+        intercept, slope = self.coefficients()
+        return intercept + slope * x
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"samples": self.samples, "max_x": self.max_x, "sums": self._sums}
+
+    def load(self, data: Dict[str, Any]) -> None:
+        self.samples = int(data["samples"])
+        self.max_x = float(data.get("max_x", 0.0))
+        self._sums = [float(value) for value in data["sums"]][:5]
+
+
+@dataclass
+class DurationEstimate:
+    """Predicted duration and timeouts for one request"""
+    units: float                # Words plus pause allowances
+    audio_duration: float       # Seconds of speech
+    synthesis_time: float       # Seconds to render to a file
+    overhead: float             # Fixed per-run cost (process start, voice load)
+    calibrated: bool            # Fitted from observations covering this length
+    timeouts: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "units": self.units,
+            "audio_duration": round(self.audio_duration, 3),
+            "synthesis_time": round(self.synthesis_time, 3),
+            "overhead": round(self.overhead, 3),
+            "calibrated": self.calibrated,
+            "timeouts": {op: round(value, 1) for op, value in self.timeouts.items()},
+        }
+
+
+class DurationModel:
+    """Online-calibrated predictor of speech and synthesis durations"""
+
+    # Priors: say speaks close to the requested WPM and renders ~10x realtime
+    AUDIO_PRIOR = (0.2, 1.0)        # seconds = 0.2 + 1.0 * (units * 60 / rate)
+    SYNTH_PRIOR = (0.5, 0.1)        # seconds = 0.5 + 0.1 * audio seconds
+
+    def __init__(self, adaptive: bool = True, base_timeout: float = 60.0, margin: float = 3.0,
+                 min_timeout: float = 5.0, max_timeout: float = 900.0,
+                 cache_file: Optional[Path] = None, persist: bool = True,
+                 save_delay: float = SAVE_DELAY):
+        self.adaptive = adaptive
+        self.base_timeout = base_timeout
+        self.margin = margin
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.cache_file = cache_file or self.default_cache_file()
+        self.persist = persist
+        self.save_delay = save_delay
+        self._voices: Dict[str, OnlineFit] = {}
+        self._engines: Dict[str, OnlineFit] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty = False
+        self.stats = {"observations": 0, "estimates": 0, "saves": 0}
+        self._load()
+        if persist:
+            atexit.register(self.flush)
+
+    @staticmethod
+    def default_cache_file() -> Path:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME")
+        base = Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+        return base / "tts-notify" / "durations.json"
+
+    def configure(self, config) -> None:
+        """Update timeout policy from a TTSConfig"""
+        self.adaptive = getattr(config, "TTS_NOTIFY_ADAPTIVE_TIMEOUT", self.adaptive)
+        self.base_timeout = getattr(config, "TTS_NOTIFY_TIMEOUT", self.base_timeout)
+        self.margin = getattr(config, "TTS_NOTIFY_TIMEOUT_MARGIN", self.margin)
+        self.min_timeout = getattr(config, "TTS_NOTIFY_TIMEOUT_MIN", self.min_timeout)
+        self.max_timeout = max(self.min_timeout, getattr(config, "TTS_NOTIFY_TIMEOUT_MAX", self.max_timeout))
+
+    @staticmethod
+    def _voice_key(engine: str, voice: str) -> str:
+        return f"{engine}\x1f{voice.lower()}"
+
+    def _fit(self, table: Dict[str, OnlineFit], key: str, prior: Tuple[float, float]) -> OnlineFit:
+        fit = table.get(key)
+        if fit is None:
+            fit = table[key] = OnlineFit(*prior)
+        return fit
+
+    def estimate(self, engine: str, text: str, voice: str, rate: Optional[int] = None) -> DurationEstimate:
+        """Predict audio duration, synthesis time and per-operation timeouts"""
+        units = speech_units(text)
+        nominal = units * 60.0 / (rate or DEFAULT_RATE)
+        with self._lock:
+            self.stats["estimates"] += 1
+            voice_fit = self._fit(self._voices, self._voice_key(engine, voice), self.AUDIO_PRIOR)
+            engine_fit = self._fit(self._engines, engine, self.SYNTH_PRIOR)
+            audio = voice_fit.predict(nominal)
+            synthesis = engine_fit.predict(audio)
+            overhead = engine_fit.coefficients()[0]
+            # Far longer than anything observed: predictions are extrapolated
+            calibrated = voice_fit.covers(nominal) and engine_fit.covers(audio)
+
+        estimate = DurationEstimate(units=units, audio_duration=audio, synthesis_time=synthesis,
+                                    overhead=overhead, calibrated=calibrated)
+        estimate.timeouts = {
+            "synthesize": self._timeout(synthesis, calibrated),
+            "speak": self._timeout(overhead + audio, calibrated),
+            "play": self._timeout(audio, calibrated),
+        }
+        return estimate
+
+    def _timeout(self, expected: float, calibrated: bool) -> float:
+        if not self.adaptive:
+            return float(self.base_timeout)
+        timeout = max(self.min_timeout, expected * self.margin)
+        if not calibrated:
+            # Never cut a run shorter than the fixed timeout before the model has data
+            timeout = max(timeout, self.base_timeout)
+        return min(self.max_timeout, timeout)
+
+    def observe(self, engine: str, text: str, voice: str, rate: Optional[int],
+                audio_duration: float, synthesis_time: float) -> None:
+        """Calibrate from a completed render of text into audio_duration seconds"""
+        if audio_duration <= 0 or synthesis_time <= 0:
+            return
+        nominal = speech_units(text) * 60.0 / (rate or DEFAULT_RATE)
+        with self._lock:
+            self.stats["observations"] += 1
+            self._fit(self._voices, self._voice_key(engine, voice), self.AUDIO_PRIOR).add(nominal, audio_duration)
+            self._fit(self._engines, engine, self.SYNTH_PRIOR).add(audio_duration, synthesis_time)
+            self._schedule_save()
+
+    def voice_wpm(self, engine: str, voice: str, rate: Optional[int] = None) -> float:
+        """Measured words per minute of a voice at a requested rate"""
+        with self._lock:
+            fit = self._fit(self._voices, self._voice_key(engine, voice), self.AUDIO_PRIOR)
+            return (rate or DEFAULT_RATE) / fit.coefficients()[1]
+
+    def reset(self) -> None:
+        """Forget all calibration"""
+        with self._lock:
+            self._voices.clear()
+            self._engines.clear()
+            self._schedule_save()
+
+    def _load(self) -> None:
+        if not self.persist:
+            return
+        try:
+            data = json.loads(self.cache_file.read_text())
+            for table, prior, name in ((self._voices, self.AUDIO_PRIOR, "voices"),
+                                       (self._engines, self.SYNTH_PRIOR, "engines")):
+                for key, entry in data.get(name, {}).items():
+                    self._fit(table, key, prior).load(entry)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.debug(f"Ignoring unreadable duration calibration {self.cache_file}: {e}")
+
+    def _schedule_save(self) -> None:
+        """Mark calibration dirty and persist it shortly from a timer thread (lock held)"""
+        if not self.persist:
+            return
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self) -> None:
+        """Write pending calibration to the cache file now (blocking)"""
+        # Writers take turns so an older snapshot never replaces a newer one
+        with self._save_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                payload = {
+                    "voices": {key: fit.to_dict() for key, fit in self._voices.items()},
+                    "engines": {key: fit.to_dict() for key, fit in self._engines.items()},
+                }
+                self.stats["saves"] += 1
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.cache_file.with_suffix(f".tmp{os.getpid()}")
+                tmp_path.write_text(json.dumps(payload))
+                os.replace(tmp_path, self.cache_file)
+            except OSError as e:
+                logger.debug(f"Failed to persist duration calibration: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            voices = {}
+            for key, fit in self._voices.items():
+                intercept, slope = fit.coefficients()
+                voices[key.replace("\x1f", "/")] = {
+                    "samples": fit.samples,
+                    "calibrated": fit.calibrated,
+                    "wpm_factor": round(1.0 / slope, 3),
+                    "padding": round(intercept, 3),
+                }
+            engines = {}
+            for key, fit in self._engines.items():
+                intercept, slope = fit.coefficients()
+                engines[key] = {
+                    "samples": fit.samples,
+                    "calibrated": fit.calibrated,
+                    "overhead": round(intercept, 3),
+                    "realtime_factor": round(1.0 / slope, 1),
+                }
+            return {
+                **self.stats,
+                "adaptive": self.adaptive,
+                "margin": self.margin,
+                "voices": voices,
+                "engines": engines,
+                "cache_file": str(self.cache_file) if self.persist else None,
+            }
+
+
+# Global duration model instance
+duration_model = DurationModel()
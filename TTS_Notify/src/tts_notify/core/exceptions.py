@@ -62,6 +62,22 @@ class EngineNotAvailableError(TTSError):
         super().__init__(message, engine_name=engine_name, reason=reason)
 
 
+class CircuitOpenError(EngineNotAvailableError):
+    """Exception raised when an engine's circuit breaker is rejecting requests"""
+
+    def __init__(self, engine_name: str, retry_after: float):
+        super().__init__(engine_name, f"circuit breaker open, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class RequestCancelledError(TTSNotifyError):
+    """Exception raised when a request is cancelled through its cancellation token"""
+
+    def __init__(self, reason: str = "Request cancelled"):
+        super().__init__(reason)
+        self.reason = reason
+
+
 class AudioProcessingError(TTSNotifyError):
     """Exception raised for audio processing errors"""
 
@@ -9,6 +9,8 @@ from enum import Enum
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+from .cancellation import CancellationToken
+
 
 class Gender(Enum):
     """Voice gender enumeration"""
@@ -50,6 +52,18 @@ class AudioFormat(Enum):
     FLAC = "flac"
 
 
+class PlaybackPriority(Enum):
+    """Playback queue priority classes"""
+    URGENT = "urgent"
+    NORMAL = "normal"
+    BULK = "bulk"
+
+    @property
+    def rank(self) -> int:
+        """Lower rank plays first"""
+        return {"urgent": 0, "normal": 1, "bulk": 2}[self.value]
+
+
 @dataclass
 class Voice:
     """Voice information model"""
@@ -128,6 +142,9 @@ class TTSRequest:
     output_format: AudioFormat = AudioFormat.AIFF
     output_path: Optional[Path] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    priority: PlaybackPriority = PlaybackPriority.NORMAL
+    # Cancelling it stops the request and any process it started
+    cancel_token: Optional[CancellationToken] = field(default=None, compare=False, repr=False)
 
     def __post_init__(self):
         """Validate request parameters"""
@@ -150,6 +167,13 @@ class TTSRequest:
         if self.metadata is None:
             self.metadata = {}
 
+        if isinstance(self.priority, str):
+            try:
+                self.priority = PlaybackPriority(self.priority.lower())
+            except ValueError:
+                from .exceptions import ValidationError
+                raise ValidationError("Priority must be urgent, normal or bulk", field="priority", value=self.priority)
+
 
 @dataclass
 class TTSResponse:
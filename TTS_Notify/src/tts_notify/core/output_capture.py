@@ -0,0 +1,139 @@
+"""
+Output Capture for TTS Notify v2
+
+This module captures audio written by a synthesis engine without a round
+trip through the shared temporary filesystem. On Linux the engine writes
+into an anonymous in-memory file (memfd) addressed through /proc.
+
+macOS has no memfd, and shm_open objects have no path `say` could write to.
+A named pipe (FIFO) does not work either: `say` seeks back to patch its
+AIFF header, and the engine re-reads the rendered file for duration
+calibration and post-processing. On macOS and other platforms the capture
+is therefore a temporary file in the per-user temporary directory. It is
+read back as soon as `say` exits and deleted at once, so its pages are
+normally still in the buffer cache and rarely reach the disk.
+"""
+
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+import logging
+
+from .exceptions import AudioProcessingError
+
+logger = logging.getLogger(__name__)
+
+
+class OutputCapture(ABC):
+    """Base class: a seekable path an engine can write to, read back as a buffer"""
+
+    mode = "base"
+
+    def __init__(self):
+        self.bytes_read = 0
+        self.bytes_on_disk = 0
+
+    @property
+    @abstractmethod
+    def path(self) -> Path:
+        """Path the engine writes its output to"""
+        pass
+
+    @abstractmethod
+    def read(self) -> bytes:
+        """Return everything the engine wrote"""
+        pass
+
+    def close(self) -> None:
+        """Release the underlying buffer or file"""
+
+    def __enter__(self) -> "OutputCapture":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @staticmethod
+    def memfd_supported() -> bool:
+        return hasattr(os, "memfd_create") and Path(f"/proc/{os.getpid()}/fd").is_dir()
+
+    @classmethod
+    def create(cls, suffix: str = ".aiff", mode: str = "auto") -> "OutputCapture":
+        """
+        Create the cheapest capture available.
+
+        Args:
+            suffix: File suffix for the temporary file fallback
+            mode: "auto", "memfd" or "tempfile"
+
+        Returns:
+            An OutputCapture ready to be written through its path
+        """
+        if mode not in ("auto", "memfd", "tempfile"):
+            raise AudioProcessingError(f"Unknown capture mode '{mode}'")
+        if mode == "memfd" and not cls.memfd_supported():
+            raise AudioProcessingError("memfd capture is not supported on this platform")
+        if mode != "tempfile" and cls.memfd_supported():
+            return MemfdCapture()
+        return TempFileCapture(suffix)
+
+
+class MemfdCapture(OutputCapture):
+    """Capture into an anonymous in-memory file (Linux memfd)"""
+
+    mode = "memfd"
+
+    def __init__(self, name: str = "tts-notify-capture"):
+        super().__init__()
+        self._fd: Optional[int] = os.memfd_create(name, os.MFD_CLOEXEC)
+        # Any process of the same user can open this path for writing,
+        # including say subprocesses and pooled workers
+        self._path = Path(f"/proc/{os.getpid()}/fd/{self._fd}")
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def read(self) -> bytes:
+        if self._fd is None:
+            raise AudioProcessingError("Capture buffer already closed")
+        size = os.fstat(self._fd).st_size
+        data = os.pread(self._fd, size, 0)
+        self.bytes_read += len(data)
+        return data
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class TempFileCapture(OutputCapture):
+    """Capture through a temporary file (macOS and other platforms without memfd)"""
+
+    mode = "tempfile"
+
+    def __init__(self, suffix: str = ".aiff"):
+        super().__init__()
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_file:
+            self._path = Path(temp_file.name)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def read(self) -> bytes:
+        data = self._path.read_bytes()
+        self.bytes_on_disk += len(data)
+        self.bytes_read += len(data)
+        return data
+
+    def close(self) -> None:
+        try:
+            self._path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug(f"Failed to remove capture file {self._path}: {e}")
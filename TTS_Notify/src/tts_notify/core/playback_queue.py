@@ -0,0 +1,419 @@
+"""
+Playback Queue for TTS Notify v2
+
+This module serializes speech playback for the whole process so that
+concurrent speak() calls from the API, MCP server and CLI never talk over
+each other. Items are ordered by priority class (urgent, normal, bulk),
+urgent items preempt a non-urgent utterance that is playing, and the next
+item is pre-rendered while the current one plays.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import logging
+
+from .exceptions import RequestCancelledError
+from .models import TTSRequest, TTSResponse, PlaybackPriority
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PlaybackQueueStats:
+    """Playback queue counters"""
+    enqueued: int = 0
+    played: int = 0
+    failed: int = 0
+    preempted: int = 0
+    requeued: int = 0
+    cancelled: int = 0
+    rejected: int = 0
+    prefetch_hits: int = 0
+    prefetch_misses: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class PlaybackItem:
+    """A request waiting for (or holding) the playback device"""
+    request: TTSRequest
+    target: Any
+    seq: int
+    future: "asyncio.Future[TTSResponse]"
+    enqueued_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    prepared: Optional[Path] = None
+    prefetch_task: Optional["asyncio.Task[Optional[Path]]"] = None
+    preemptions: int = 0
+
+    @property
+    def priority(self) -> PlaybackPriority:
+        return self.request.priority
+
+    def heap_entry(self) -> Tuple[int, int, "PlaybackItem"]:
+        return (self.priority.rank, self.seq, self)
+
+
+class PlaybackQueue:
+    """
+    Process-wide priority queue in front of speech playback.
+
+    A target (normally a TTS engine) must provide:
+
+    - ``start_playback(request, prepared)`` returning an asyncio subprocess
+      that plays the request, from a pre-rendered file when one is given
+    - ``prepare_playback(request)`` returning a pre-rendered file or None
+    - ``release_playback(prepared)`` to discard a pre-rendered file
+    - optionally ``needs_render(request)``, true when a request must be
+      played from a pre-rendered file even without prefetch
+    - optionally ``estimate_duration(request)``, whose "play"/"speak"
+      timeouts replace the fixed playback timeout
+    """
+
+    def __init__(self, prefetch: bool = True, requeue_preempted: bool = True,
+                 max_depth: int = 100, timeout: float = 60.0, wait_samples: int = 256):
+        self.prefetch = prefetch
+        self.requeue_preempted = requeue_preempted
+        self.max_depth = max_depth
+        self.timeout = timeout
+        self.stats = PlaybackQueueStats()
+        self._waits: Dict[str, Deque[float]] = {
+            p.value: deque(maxlen=wait_samples) for p in PlaybackPriority
+        }
+        self._seq = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._heap: List[Tuple[int, int, PlaybackItem]] = []
+        self._current: Optional[PlaybackItem] = None
+        self._consumer: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._interrupt: Optional[asyncio.Event] = None
+
+    @classmethod
+    def from_config(cls, config) -> "PlaybackQueue":
+        """Build a playback queue from a TTSConfig"""
+        queue = cls()
+        queue.apply_config(config)
+        return queue
+
+    def apply_config(self, config) -> None:
+        """Update tunables from a TTSConfig"""
+        self.prefetch = getattr(config, "TTS_NOTIFY_PLAYBACK_PREFETCH", self.prefetch)
+        self.requeue_preempted = getattr(config, "TTS_NOTIFY_PLAYBACK_REQUEUE_PREEMPTED",
+                                         self.requeue_preempted)
+        self.max_depth = getattr(config, "TTS_NOTIFY_PLAYBACK_MAX_DEPTH", self.max_depth)
+        self.timeout = getattr(config, "TTS_NOTIFY_TIMEOUT", self.timeout)
+
+    def _bind_loop(self) -> None:
+        """Attach to the running event loop, starting the consumer if needed"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Items queued on a previous (closed) loop can never be served
+            self._loop = loop
+            self._heap = []
+            self._current = None
+            self._consumer = None
+            self._wakeup = asyncio.Event()
+            self._interrupt = asyncio.Event()
+        if self._consumer is None or self._consumer.done():
+            self._consumer = loop.create_task(self._run())
+
+    async def submit(self, request: TTSRequest, target: Any) -> TTSResponse:
+        """Queue a request for playback and wait until it has been spoken"""
+        self._bind_loop()
+
+        if len(self._heap) >= self.max_depth:
+            self.stats.rejected += 1
+            return TTSResponse(success=False, error=f"Playback queue is full ({self.max_depth} items)")
+
+        item = PlaybackItem(
+            request=request,
+            target=target,
+            seq=next(self._seq),
+            future=self._loop.create_future()
+        )
+        heapq.heappush(self._heap, item.heap_entry())
+        self.stats.enqueued += 1
+
+        current = self._current
+        if (current is not None and item.priority is PlaybackPriority.URGENT
+                and current.priority is not PlaybackPriority.URGENT):
+            logger.debug(f"Urgent item {item.seq} preempts item {current.seq}")
+            self._interrupt.set()
+        elif current is not None:
+            self._start_prefetch()
+        self._wakeup.set()
+
+        try:
+            return await item.future
+        except asyncio.CancelledError:
+            # The caller gave up: stop the item if it is playing right now,
+            # else drop any pre-rendering it has started
+            if self._current is item:
+                self._interrupt.set()
+            else:
+                self._release(item)
+            raise
+
+    def depth(self) -> Dict[str, int]:
+        """Number of waiting items per priority class"""
+        counts = {p.value: 0 for p in PlaybackPriority}
+        for _, _, item in self._heap:
+            if not item.future.done():
+                counts[item.priority.value] += 1
+        return counts
+
+    def wait_times(self) -> Dict[str, Dict[str, float]]:
+        """Recent queue wait statistics per priority class (seconds)"""
+        summary = {}
+        for priority, samples in self._waits.items():
+            ordered = sorted(samples)
+            if not ordered:
+                summary[priority] = {"count": 0, "avg": 0.0, "p95": 0.0, "max": 0.0}
+                continue
+            summary[priority] = {
+                "count": len(ordered),
+                "avg": sum(ordered) / len(ordered),
+                "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                "max": ordered[-1],
+            }
+        return summary
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, wait times and counters"""
+        depth = self.depth()
+        current = self._current
+        return {
+            **self.stats.to_dict(),
+            "depth": sum(depth.values()),
+            "depth_by_priority": depth,
+            "wait_times": self.wait_times(),
+            "playing": current.priority.value if current is not None else None,
+            "prefetch": self.prefetch,
+        }
+
+    async def stop(self) -> None:
+        """Stop the consumer and fail every waiting item"""
+        if self._consumer is not None and not self._consumer.done():
+            if self._current is not None:
+                self._interrupt.set()
+            self._consumer.cancel()
+            try:
+                await self._consumer
+            except asyncio.CancelledError:
+                pass
+        self._consumer = None
+
+        while self._heap:
+            _, _, item = heapq.heappop(self._heap)
+            self._release(item)
+            if not item.future.done():
+                item.future.set_result(TTSResponse(success=False, error="Playback queue stopped"))
+
+    async def _run(self) -> None:
+        """Consumer loop: play the highest priority item, one at a time"""
+        while True:
+            while not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+
+            _, _, item = heapq.heappop(self._heap)
+            if item.future.done():
+                self.stats.cancelled += 1
+                self._release(item)
+                continue
+
+            try:
+                await self._play(item)
+            except asyncio.CancelledError:
+                self._release(item)
+                if not item.future.done():
+                    item.future.set_result(TTSResponse(success=False, error="Playback queue stopped"))
+                raise
+            except Exception as e:
+                logger.error(f"Playback of item {item.seq} failed: {e}")
+                self._release(item)
+                self._resolve(item, TTSResponse(success=False, error=f"Playback failed: {e}"))
+            finally:
+                self._current = None
+
+    def _timeout_for(self, item: PlaybackItem, prepared: bool) -> float:
+        """Predicted playback timeout for an item, else the configured one"""
+        estimate = getattr(item.target, "estimate_duration", None)
+        if estimate is None:
+            return self.timeout
+        try:
+            return estimate(item.request).timeouts["play" if prepared else "speak"]
+        except Exception as e:
+            logger.debug(f"No duration estimate for item {item.seq}: {e}")
+            return self.timeout
+
+    async def _play(self, item: PlaybackItem) -> None:
+        """Play one item, honoring preemption, cancellation and timeout"""
+        if item.started_at is None:
+            item.started_at = time.time()
+            self._waits[item.priority.value].append(item.started_at - item.enqueued_at)
+
+        # Current from here on, so an urgent item arriving while this one is
+        # being prepared still gets ahead of it
+        self._current = item
+        self._interrupt.clear()
+        prepared = await self._take_prepared(item)
+        if item.future.done():
+            self.stats.cancelled += 1
+            self._release(item)
+            return
+        if self._interrupt.is_set():
+            # Not started yet: back in line (keeping its rendered audio) behind the urgent item
+            heapq.heappush(self._heap, item.heap_entry())
+            return
+
+        self._start_prefetch()
+
+        timeout = self._timeout_for(item, prepared is not None)
+        play_start = time.time()
+        process = await item.target.start_playback(item.request, prepared)
+        playing = asyncio.ensure_future(process.communicate())
+        interrupted = asyncio.ensure_future(self._interrupt.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {playing, interrupted},
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            interrupted.cancel()
+
+        if playing not in done:
+            if process.returncode is None:
+                process.kill()
+            await playing
+
+            if item.future.done():
+                self.stats.cancelled += 1
+                self._release(item)
+            elif not done:
+                self.stats.failed += 1
+                self._release(item)
+                self._resolve(item, TTSResponse(
+                    success=False,
+                    error=f"Playback timed out after {timeout:.1f} seconds"
+                ))
+            else:
+                self._preempted(item)
+            return
+
+        _, stderr = playing.result()
+        self._release(item)
+        if process.returncode == 0:
+            self.stats.played += 1
+            self._resolve(item, TTSResponse(
+                success=True,
+                duration=time.time() - item.enqueued_at,
+                metadata={
+                    "priority": item.priority.value,
+                    "queue_wait": item.started_at - item.enqueued_at,
+                    "play_time": time.time() - play_start,
+                    "prefetched": prepared is not None,
+                    "preemptions": item.preemptions,
+                }
+            ))
+        else:
+            self.stats.failed += 1
+            error_msg = stderr.decode(errors="replace") if stderr else "Unknown error"
+            self._resolve(item, TTSResponse(success=False, error=error_msg))
+
+    def _preempted(self, item: PlaybackItem) -> None:
+        """Handle an item interrupted by an urgent one"""
+        self.stats.preempted += 1
+        item.preemptions += 1
+        if self.requeue_preempted:
+            # Same sequence number: it plays again from the start, ahead of its priority class
+            self.stats.requeued += 1
+            heapq.heappush(self._heap, item.heap_entry())
+            logger.debug(f"Requeued preempted item {item.seq}")
+        else:
+            self._release(item)
+            self._resolve(item, TTSResponse(
+                success=False,
+                error="Playback preempted by an urgent item",
+                metadata={"priority": item.priority.value, "preempted": True}
+            ))
+
+    async def _take_prepared(self, item: PlaybackItem) -> Optional[Path]:
+        """Use the pre-rendered file for an item if prefetch produced one"""
+        if item.prepared is not None:
+            return item.prepared
+        if item.prefetch_task is None:
+            if self.prefetch:
+                self.stats.prefetch_misses += 1
+            # Some requests (pitch, volume) can only be played from rendered audio
+            needs_render = getattr(item.target, "needs_render", None)
+            if needs_render is not None and needs_render(item.request):
+                try:
+                    item.prepared = await item.target.prepare_playback(item.request)
+                except RequestCancelledError:
+                    item.prepared = None
+                return item.prepared
+            return None
+
+        task = item.prefetch_task
+        try:
+            item.prepared = await task
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            item.prepared = None
+        except Exception as e:
+            logger.debug(f"Prefetch for item {item.seq} failed: {e}")
+            item.prepared = None
+        item.prefetch_task = None
+
+        if item.prepared is not None:
+            self.stats.prefetch_hits += 1
+        else:
+            self.stats.prefetch_misses += 1
+        return item.prepared
+
+    def _start_prefetch(self) -> None:
+        """Pre-render the item that will play next"""
+        if not self.prefetch or not self._heap:
+            return
+        _, _, upcoming = self._heap[0]
+        if (upcoming.prepared is not None or upcoming.prefetch_task is not None
+                or upcoming.future.done()
+                or not hasattr(upcoming.target, "prepare_playback")):
+            return
+        upcoming.prefetch_task = asyncio.ensure_future(
+            upcoming.target.prepare_playback(upcoming.request)
+        )
+
+    def _release(self, item: PlaybackItem) -> None:
+        """Discard any pre-rendered audio held by an item"""
+        task = item.prefetch_task
+        item.prefetch_task = None
+        if task is not None:
+            if task.done():
+                if not task.cancelled() and task.exception() is None and task.result() is not None:
+                    item.target.release_playback(task.result())
+            else:
+                task.cancel()
+        if item.prepared is not None:
+            item.target.release_playback(item.prepared)
+            item.prepared = None
+
+    @staticmethod
+    def _resolve(item: PlaybackItem, response: TTSResponse) -> None:
+        if not item.future.done():
+            item.future.set_result(response)
+
+
+# Global playback queue shared by every engine in the process
+playback_queue = PlaybackQueue()
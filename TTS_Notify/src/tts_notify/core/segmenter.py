@@ -0,0 +1,133 @@
+"""
+Text Segmenter for TTS Notify v2
+
+This module splits long text into speakable segments (paragraphs, sentences,
+clauses) so that synthesis can be parallelized and streamed.
+"""
+
+import re
+from typing import List
+
+
+class TextSegmenter:
+    """Split text into segments at natural speech boundaries"""
+
+    _PARAGRAPH_RE = re.compile(r"\n\s*\n+")
+    # Closing quotes and brackets are captured so they stay with their sentence
+    _SENTENCE_RE = re.compile(r"(?<=[.!?…。！？])([\"'»)\]]*)\s+")
+    _CLAUSE_RE = re.compile(r"(?<=[,;:—])\s+")
+
+    @classmethod
+    def split_paragraphs(cls, text: str) -> List[str]:
+        """Split text on blank lines"""
+        return [p.strip() for p in cls._PARAGRAPH_RE.split(text) if p.strip()]
+
+    @classmethod
+    def _paragraph_sentences(cls, paragraph: str) -> List[str]:
+        """Split one paragraph into sentences"""
+        parts = cls._SENTENCE_RE.split(paragraph)
+        # split() interleaves each sentence with the closing marks that follow it
+        sentences = [sentence + closing for sentence, closing in zip(parts[::2], parts[1::2] + [""])]
+        return [s.strip() for s in sentences if s.strip()]
+
+    @classmethod
+    def split_sentences(cls, text: str) -> List[str]:
+        """Split text into sentences, keeping paragraph breaks as boundaries"""
+        sentences = []
+        for paragraph in cls.split_paragraphs(text):
+            sentences.extend(cls._paragraph_sentences(paragraph))
+        return sentences
+
+    @classmethod
+    def _split_long(cls, sentence: str, max_chars: int) -> List[str]:
+        """Break a sentence longer than max_chars at clauses, then words"""
+        if len(sentence) <= max_chars:
+            return [sentence]
+
+        pieces = []
+        for clause in cls._CLAUSE_RE.split(sentence):
+            if len(clause) <= max_chars:
+                pieces.append(clause)
+                continue
+            current = ""
+            for word in clause.split():
+                if current and len(current) + 1 + len(word) > max_chars:
+                    pieces.append(current)
+                    current = word
+                else:
+                    current = f"{current} {word}" if current else word
+            if current:
+                pieces.append(current)
+
+        return cls._pack(pieces, max_chars)
+
+    @staticmethod
+    def _pack(pieces: List[str], max_chars: int) -> List[str]:
+        """Greedily join consecutive pieces while staying under max_chars"""
+        packed: List[str] = []
+        for piece in pieces:
+            if packed and len(packed[-1]) + 1 + len(piece) <= max_chars:
+                packed[-1] = f"{packed[-1]} {piece}"
+            else:
+                packed.append(piece)
+        return packed
+
+    @classmethod
+    def split_into_segments(cls, text: str, max_chars: int = 400,
+                            first_max_chars: int = 160) -> List[str]:
+        """
+        Split text into speakable segments.
+
+        Args:
+            text: Text to split
+            max_chars: Upper bound for each segment
+            first_max_chars: Tighter bound for the head segment so the
+                first audio is ready as early as possible
+
+        Returns:
+            Ordered list of non-empty segments
+        """
+        sentences = cls.split_sentences(text)
+        if not sentences:
+            return []
+
+        head_limit = min(first_max_chars, max_chars)
+        head = cls._split_long(sentences[0], head_limit)
+        segments = head[:1]
+
+        rest: List[str] = head[1:]
+        for sentence in sentences[1:]:
+            rest.extend(cls._split_long(sentence, max_chars))
+        return segments + cls._pack(rest, max_chars)
+
+    @classmethod
+    def split_into_shards(cls, text: str, max_chars: int = 1200) -> List[str]:
+        """
+        Split a long document into shards for parallel rendering.
+
+        Whole paragraphs are packed together up to max_chars (kept apart by
+        blank lines); longer paragraphs are split at sentences, then clauses.
+
+        Returns:
+            Ordered list of non-empty shards
+        """
+        shards: List[str] = []
+        current: List[str] = []
+        size = 0
+        for paragraph in cls.split_paragraphs(text):
+            if len(paragraph) > max_chars:
+                pieces: List[str] = []
+                for sentence in cls._paragraph_sentences(paragraph):
+                    pieces.extend(cls._split_long(sentence, max_chars))
+                parts = cls._pack(pieces, max_chars)
+            else:
+                parts = [paragraph]
+            for part in parts:
+                if current and size + 2 + len(part) > max_chars:
+                    shards.append("\n\n".join(current))
+                    current, size = [], 0
+                current.append(part)
+                size += len(part) + (2 if size else 0)
+        if current:
+            shards.append("\n\n".join(current))
+        return shards
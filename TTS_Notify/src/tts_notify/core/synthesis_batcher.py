@@ -0,0 +1,316 @@
+"""
+Synthesis Batching for TTS Notify v2
+
+This module renders many short texts with one `say` invocation. Requests
+with the same voice and rate that queue up within a short window are
+joined into a single text, separated by embedded silence commands; the
+combined audio is split back into one clip per request by vectorized
+silence detection. Spawning `say` and loading a voice costs more than
+rendering a one-line notification, so a batch of N saves N - 1 of those
+startups. Each request's clip then goes through its own post-processing.
+"""
+
+import asyncio
+import os
+import re
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import logging
+
+from .audio_io import AudioReader, encode_audio, require_numpy
+from .duration_model import speech_units
+from .models import TTSRequest
+
+logger = logging.getLogger(__name__)
+
+FRAME = 0.01                # Seconds per analysis frame
+MARKER_SHARE = 0.6          # A separator gap is at least this share of the marker
+PLAUSIBILITY = 3.0          # Clip length may differ this much from its text's share
+
+_EMBEDDED_COMMAND = re.compile(r"\[\[")
+
+
+def split_on_silence(samples, sample_rate: int, count: int, min_gap: float,
+                     threshold_db: float = -50.0) -> Optional[List[Tuple[int, int]]]:
+    """
+    Find the ``count - 1`` longest interior silences and cut around them.
+
+    Each clip keeps as much silence at its edges as the whole recording
+    has at its own start and end, so clips match standalone renders.
+
+    Args:
+        samples: Float audio shaped (frames, channels)
+        sample_rate: Sample rate of samples
+        count: Number of clips expected
+        min_gap: Shortest silence (seconds) accepted as a separator
+        threshold_db: RMS level (dBFS) below which a frame is silent
+
+    Returns:
+        (start, end) sample ranges, one per clip, or None if there are
+        fewer than ``count - 1`` separators
+    """
+    np = require_numpy()
+    if count <= 1:
+        return [(0, len(samples))]
+
+    frame_len = max(1, int(sample_rate * FRAME))
+    frames = len(samples) // frame_len
+    if frames == 0:
+        return None
+    blocks = np.asarray(samples[:frames * frame_len], dtype=np.float32).reshape(frames, -1)
+    silent = np.sqrt((blocks ** 2).mean(axis=1)) <= 10 ** (threshold_db / 20)
+
+    # Run boundaries: +1 where a silent run starts, -1 where it ends
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    interior = (starts > 0) & (ends < frames)
+    leading = int(ends[0]) if len(starts) and starts[0] == 0 else 0
+    trailing = int(frames - starts[-1]) if len(ends) and ends[-1] == frames else 0
+    starts, ends = starts[interior], ends[interior]
+    lengths = ends - starts
+    candidates = np.flatnonzero(lengths * FRAME >= min_gap)
+    if len(candidates) < count - 1:
+        return None
+
+    # The separators are the longest gaps; keep them in time order
+    chosen = candidates[np.argsort(lengths[candidates], kind="stable")[::-1][:count - 1]]
+    chosen.sort()
+    half = lengths[chosen] // 2
+    clip_ends = (starts[chosen] + np.minimum(trailing, half)) * frame_len
+    clip_starts = (ends[chosen] - np.minimum(leading, half)) * frame_len
+    bounds = [0] + [int(start) for start in clip_starts]
+    finals = [int(end) for end in clip_ends] + [len(samples)]
+    return list(zip(bounds, finals))
+
+
+@dataclass
+class BatcherStats:
+    """Batching counters"""
+    batches: int = 0
+    batched_requests: int = 0
+    spawns_saved: int = 0
+    singles: int = 0
+    split_failures: int = 0
+    render_failures: int = 0
+    cancelled_batches: int = 0
+    render_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _Member:
+    """One request waiting in a batch"""
+    request: TTSRequest
+    future: "asyncio.Future[Optional[Tuple[bytes, Dict[str, Any]]]]"
+    abandoned: bool = False
+
+
+@dataclass
+class _Batch:
+    """Requests sharing a voice and rate, rendered together"""
+    key: str
+    members: List[_Member] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+    task: Optional["asyncio.Task[None]"] = None
+
+
+# Renders one request's text into an AIFF file with the engine's raw command
+RenderFn = Callable[[TTSRequest, Path], Awaitable[bool]]
+
+
+class SynthesisBatcher:
+    """Group short requests into one engine invocation and split the result"""
+
+    def __init__(self, window: float = 0.0, max_size: int = 16, max_words: int = 30,
+                 gap: float = 0.75, threshold_db: float = -50.0):
+        self.window = window
+        self.max_size = max(1, max_size)
+        self.max_words = max_words
+        self.gap = gap
+        self.threshold_db = threshold_db
+        self.stats = BatcherStats()
+        self._pending: Dict[str, _Batch] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def from_config(cls, config) -> "SynthesisBatcher":
+        """Build a batcher from a TTSConfig"""
+        return cls(
+            window=getattr(config, "TTS_NOTIFY_BATCH_WINDOW", 0.0),
+            max_size=getattr(config, "TTS_NOTIFY_BATCH_MAX_SIZE", 16),
+            max_words=getattr(config, "TTS_NOTIFY_BATCH_MAX_WORDS", 30),
+            gap=getattr(config, "TTS_NOTIFY_BATCH_GAP", 0.75),
+            threshold_db=getattr(config, "TTS_NOTIFY_TRIM_THRESHOLD_DB", -50.0)
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0 and self.max_size > 1
+
+    def accepts(self, request: TTSRequest) -> bool:
+        """Short plain-text requests only; embedded commands would disturb the separators"""
+        if not self.enabled or len(request.text.split()) > self.max_words:
+            return False
+        if _EMBEDDED_COMMAND.search(request.text):
+            return False
+        try:
+            require_numpy()
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _group(request: TTSRequest) -> str:
+        """say's raw output depends only on voice, rate and text"""
+        return f"{request.voice.id}\x1f{'' if request.rate is None else request.rate}"
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = {}
+
+    async def submit(self, request: TTSRequest,
+                     render: RenderFn) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """
+        Queue a request for the next batch of its voice and rate.
+
+        Args:
+            request: The incoming request (see ``accepts``)
+            render: Coroutine function rendering a request's text to an AIFF path
+
+        Returns:
+            (AIFF bytes of this request's clip, batch metadata), or None when
+            the request should be rendered on its own (alone in its window,
+            or the batch could not be split reliably)
+        """
+        self._bind_loop()
+        key = self._group(request)
+        batch = self._pending.get(key)
+        if batch is None:
+            # The window runs from the first request, so a steady stream cannot hold a batch open
+            batch = self._pending[key] = _Batch(key=key)
+            batch.timer = self._loop.call_later(self.window, self._flush, batch, render)
+
+        member = _Member(request=request, future=self._loop.create_future())
+        batch.members.append(member)
+        if len(batch.members) >= self.max_size:
+            self._flush(batch, render)
+
+        try:
+            return await asyncio.shield(member.future)
+        except asyncio.CancelledError:
+            member.abandoned = True
+            if batch.task is None:
+                # Not started yet: just leave the batch
+                batch.members.remove(member)
+                if not batch.members:
+                    self._discard(batch)
+            elif all(m.abandoned for m in batch.members) and not batch.task.done():
+                # Nobody wants the result any more: kill the render
+                self.stats.cancelled_batches += 1
+                batch.task.cancel()
+            raise
+
+    def _discard(self, batch: _Batch) -> None:
+        if batch.timer is not None:
+            batch.timer.cancel()
+        if self._pending.get(batch.key) is batch:
+            del self._pending[batch.key]
+
+    def _flush(self, batch: _Batch, render: RenderFn) -> None:
+        """Close a batch to new members and start rendering it"""
+        self._discard(batch)
+        if batch.task is not None or not batch.members:
+            return
+        batch.task = self._loop.create_task(self._run(batch, render))
+
+    async def _run(self, batch: _Batch, render: RenderFn) -> None:
+        members = list(batch.members)
+        results: List[Optional[Tuple[bytes, Dict[str, Any]]]] = [None] * len(members)
+        try:
+            if len(members) == 1:
+                self.stats.singles += 1
+            else:
+                results = await self._render_batch(members, render)
+        except asyncio.CancelledError:
+            for member in members:
+                if not member.future.done():
+                    member.future.cancel()
+            raise
+        except Exception as e:
+            logger.warning(f"Batch render of {len(members)} requests failed, rendering them one by one: {e}")
+            self.stats.render_failures += 1
+        for member, result in zip(members, results):
+            if not member.future.done():
+                member.future.set_result(result)
+
+    async def _render_batch(self, members: List[_Member],
+                            render: RenderFn) -> List[Optional[Tuple[bytes, Dict[str, Any]]]]:
+        first = members[0].request
+        separator = f" [[slnc {int(self.gap * 1000)}]] "
+        combined = TTSRequest(text=separator.join(m.request.text for m in members),
+                              voice=first.voice, rate=first.rate)
+
+        fd, name = tempfile.mkstemp(suffix=".aiff", prefix="tts-notify-batch-")
+        os.close(fd)
+        path = Path(name)
+        try:
+            start = time.time()
+            if not await render(combined, path):
+                self.stats.render_failures += 1
+                return [None] * len(members)
+            elapsed = time.time() - start
+            clips = await asyncio.to_thread(self._split, path, [m.request.text for m in members])
+        finally:
+            path.unlink(missing_ok=True)
+
+        if clips is None:
+            self.stats.split_failures += 1
+            logger.info(f"Could not split a batch of {len(members)} requests; rendering them one by one")
+            return [None] * len(members)
+
+        self.stats.batches += 1
+        self.stats.batched_requests += len(members)
+        self.stats.spawns_saved += len(members) - 1
+        self.stats.render_seconds += elapsed
+        logger.info(f"Rendered {len(members)} requests in one invocation in {elapsed:.2f}s")
+        return [(clip, {"batch": {"size": len(members), "position": index, "render_time": round(elapsed, 3)}})
+                for index, clip in enumerate(clips)]
+
+    def _split(self, path: Path, texts: List[str]) -> Optional[List[bytes]]:
+        """Cut the combined render into per-text AIFF clips (blocking)"""
+        with AudioReader(path) as reader:
+            info = reader.info
+            samples = reader.to_float()
+        spans = split_on_silence(samples, info.sample_rate, len(texts), self.gap * MARKER_SHARE,
+                                 self.threshold_db)
+        if spans is None or not self._plausible(spans, texts, info.sample_rate):
+            return None
+        return [encode_audio(samples[start:end], info.sample_rate, "aiff") for start, end in spans]
+
+    @staticmethod
+    def _plausible(spans: List[Tuple[int, int]], texts: List[str], sample_rate: int) -> bool:
+        """Reject splits whose clip lengths do not track their texts (a pause inside a text won)"""
+        units = [speech_units(text) for text in texts]
+        lengths = [(end - start) / sample_rate for start, end in spans]
+        per_unit = sum(lengths) / sum(units)
+        for length, count in zip(lengths, units):
+            expected = count * per_unit
+            if not expected / PLAUSIBILITY - 0.5 <= length <= expected * PLAUSIBILITY + 0.5:
+                return False
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats.to_dict(),
+            "window": self.window,
+            "max_size": self.max_size,
+            "max_words": self.max_words,
+            "pending": sum(len(batch.members) for batch in self._pending.values()),
+        }
@@ -0,0 +1,356 @@
+"""
+Synthesis Cache for TTS Notify v2
+
+This module provides a content-addressed cache for synthesized audio.
+Entries are keyed on a hash of the normalized text and every synthesis
+parameter, and live in a bounded in-memory LRU tier backed by a size-capped
+on-disk tier. Small per-entry metadata (such as the measured loudness) is
+kept in a JSON sidecar next to the audio.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Optional, Any
+import logging
+
+from .models import TTSRequest
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss/eviction counters for the synthesis cache"""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def evictions(self) -> int:
+        return self.memory_evictions + self.disk_evictions
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = asdict(self)
+        stats["hits"] = self.hits
+        stats["evictions"] = self.evictions
+        lookups = self.hits + self.misses
+        stats["hit_ratio"] = self.hits / lookups if lookups else 0.0
+        return stats
+
+
+class SynthesisCache:
+    """Two-tier (memory LRU + disk) content-addressed audio cache"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_memory_items: int = 128,
+        max_memory_bytes: int = 32 * 1024 * 1024,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        use_hardlinks: bool = True
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else self.default_cache_dir()
+        self.max_memory_items = max_memory_items
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.use_hardlinks = use_hardlinks
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self.stats = CacheStats()
+
+        self._load_disk_index()
+
+    @staticmethod
+    def default_cache_dir() -> Path:
+        """Get the default on-disk cache directory"""
+        xdg_cache = os.environ.get("XDG_CACHE_HOME")
+        base = Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+        return base / "tts-notify" / "synthesis"
+
+    @classmethod
+    def from_config(cls, config, namespace: Optional[str] = None) -> Optional["SynthesisCache"]:
+        """Build a cache from a TTSConfig, or None if caching is disabled"""
+        if not getattr(config, "TTS_NOTIFY_SYNTH_CACHE_ENABLED", True):
+            return None
+        cache_dir = getattr(config, "TTS_NOTIFY_SYNTH_CACHE_DIR", "") or None
+        cache_dir = Path(cache_dir).expanduser() if cache_dir else cls.default_cache_dir()
+        if namespace:
+            # Engines with different output must not share entries
+            cache_dir = cache_dir / namespace
+        return cls(
+            cache_dir=cache_dir,
+            max_memory_items=getattr(config, "TTS_NOTIFY_SYNTH_CACHE_MEMORY_ITEMS", 128),
+            max_disk_bytes=getattr(config, "TTS_NOTIFY_SYNTH_CACHE_MAX_MB", 256) * 1024 * 1024,
+        )
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize text so that equivalent requests share a cache key"""
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    @classmethod
+    def make_key(cls, request: TTSRequest, variant: str = "") -> str:
+        """Build the content address for a request (variant: post-processing settings)"""
+        parts = [
+            cls.normalize_text(request.text),
+            request.voice.id,
+            "" if request.rate is None else str(request.rate),
+            "" if request.pitch is None else f"{request.pitch:.3f}",
+            "" if request.volume is None else f"{request.volume:.3f}",
+            request.output_format.value,
+        ]
+        if variant:
+            parts.append(variant)
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.audio"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _remove_entry_files(self, key: str) -> None:
+        self._meta.pop(key, None)
+        for path in (self._entry_path(key), self._meta_path(key)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug(f"Failed to remove cache file {path}: {e}")
+
+    def _load_disk_index(self) -> None:
+        """Rebuild the disk LRU index from files left by previous runs"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            entries = []
+            for path in self.cache_dir.glob("*.audio"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, path.stem, stat.st_size))
+        except OSError as e:
+            logger.warning(f"Synthesis cache directory unavailable ({self.cache_dir}): {e}")
+            return
+
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def _remember(self, key: str, data: bytes) -> None:
+        """Insert into the memory tier, evicting least recently used entries"""
+        if len(data) > self.max_memory_bytes or self.max_memory_items <= 0:
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while (len(self._memory) > self.max_memory_items or
+               self._memory_bytes > self.max_memory_bytes):
+            evicted_key, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            if evicted_key not in self._disk:
+                self._meta.pop(evicted_key, None)
+            self.stats.memory_evictions += 1
+
+    def _evict_disk(self) -> None:
+        """Drop least recently used disk entries until under the byte cap"""
+        while self._disk and self._disk_bytes > self.max_disk_bytes:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self.stats.disk_evictions += 1
+            self._remove_entry_files(key)
+
+    def _touch_disk(self, key: str) -> Optional[Path]:
+        """Mark a disk entry as recently used and return its path"""
+        if key not in self._disk:
+            return None
+        path = self._entry_path(key)
+        if not path.exists():
+            self._disk_bytes -= self._disk.pop(key)
+            self._meta.pop(key, None)
+            return None
+        self._disk.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get cached audio bytes, or None on a miss"""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+                self.stats.memory_hits += 1
+                return data
+
+            path = self._touch_disk(key)
+            if path is not None:
+                try:
+                    data = path.read_bytes()
+                except OSError:
+                    data = None
+                if data is not None:
+                    self._remember(key, data)
+                    self.stats.disk_hits += 1
+                    return data
+
+            self.stats.misses += 1
+            return None
+
+    def copy_to(self, key: str, output_path: Path) -> bool:
+        """Materialize a cached entry at output_path (hardlink, else copy)"""
+        with self._lock:
+            path = self._touch_disk(key)
+            if path is None:
+                data = self._memory.get(key)
+                if data is None:
+                    self.stats.misses += 1
+                    return False
+                self._memory.move_to_end(key)
+                if output_path.exists() or output_path.is_symlink():
+                    output_path.unlink()
+                output_path.write_bytes(data)
+                self.stats.memory_hits += 1
+                return True
+
+            if output_path.exists() or output_path.is_symlink():
+                output_path.unlink()
+            if self.use_hardlinks:
+                try:
+                    os.link(path, output_path)
+                    self.stats.disk_hits += 1
+                    return True
+                except OSError:
+                    pass
+            shutil.copyfile(path, output_path)
+            self.stats.disk_hits += 1
+            return True
+
+    def put(self, key: str, data: bytes, meta: Optional[Dict[str, Any]] = None) -> None:
+        """Store audio bytes (and optional metadata) in both tiers"""
+        with self._lock:
+            self._remember(key, data)
+            self._write_disk(key, data=data)
+            self._write_meta(key, meta)
+            self.stats.stores += 1
+
+    def put_file(self, key: str, source_path: Path, meta: Optional[Dict[str, Any]] = None) -> None:
+        """Store an audio file in the disk tier (copied, never linked)"""
+        with self._lock:
+            self._write_disk(key, source_path=source_path)
+            self._write_meta(key, meta)
+            self.stats.stores += 1
+
+    def _write_meta(self, key: str, meta: Optional[Dict[str, Any]]) -> None:
+        if not meta:
+            self._meta.pop(key, None)
+            try:
+                self._meta_path(key).unlink()
+            except OSError:
+                pass
+            return
+        self._meta[key] = dict(meta)
+        if key not in self._disk:
+            return
+        try:
+            self._meta_path(key).write_text(json.dumps(meta), encoding="utf-8")
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Failed to write cache metadata for {key}: {e}")
+
+    def get_meta(self, key: str) -> Dict[str, Any]:
+        """Metadata stored with an entry (empty if none), without touching counters"""
+        with self._lock:
+            meta = self._meta.get(key)
+            if meta is None and key in self._disk:
+                try:
+                    meta = json.loads(self._meta_path(key).read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    meta = {}
+                self._meta[key] = meta
+            return dict(meta or {})
+
+    def _write_disk(self, key: str, data: Optional[bytes] = None,
+                    source_path: Optional[Path] = None) -> None:
+        size = len(data) if data is not None else source_path.stat().st_size
+        if size > self.max_disk_bytes:
+            return
+
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix(f".tmp{os.getpid()}")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            if data is not None:
+                tmp_path.write_bytes(data)
+            else:
+                shutil.copyfile(source_path, tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write synthesis cache entry: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return
+
+        if key in self._disk:
+            self._disk_bytes -= self._disk.pop(key)
+        self._disk[key] = size
+        self._disk_bytes += size
+        self._evict_disk()
+
+    def contains(self, key: str) -> bool:
+        """Check for an entry without touching counters or recency"""
+        with self._lock:
+            return key in self._memory or key in self._disk
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for key in list(self._disk):
+                self._remove_entry_files(key)
+            self._meta.clear()
+            self._disk.clear()
+            self._disk_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counters and tier occupancy"""
+        with self._lock:
+            stats = self.stats.to_dict()
+            stats.update({
+                "memory_items": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_items": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "max_memory_items": self.max_memory_items,
+                "max_disk_bytes": self.max_disk_bytes,
+                "cache_dir": str(self.cache_dir),
+            })
+            return stats
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Synthesis Worker for TTS Notify v2
+
+Long-lived worker process used by SynthesisWorkerPool. Reads one JSON
+request per line on stdin and writes one JSON response per line on stdout
+(see worker_pool.py for the protocol).
+
+When PyObjC is installed the worker keeps NSSpeechSynthesizer instances
+loaded between requests; otherwise it falls back to running `say`, which
+gains nothing over spawning it directly (the pool is not started without
+PyObjC unless a custom worker command is configured).
+This module is executed as a script and must not import the package.
+"""
+
+import json
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Optional
+
+
+class SayBackend:
+    """Fallback backend that runs the say command per request"""
+
+    def __init__(self, command: str = "say"):
+        self.command = command
+
+    def _build_args(self, request: Dict[str, Any]) -> list:
+        args = [self.command]
+        if request.get("voice"):
+            args.extend(["-v", request["voice"]])
+        if request.get("rate"):
+            args.extend(["-r", str(request["rate"])])
+        if request.get("output"):
+            args.extend(["-o", request["output"]])
+        args.append(request["text"])
+        return args
+
+    def run(self, request: Dict[str, Any]) -> None:
+        result = subprocess.run(self._build_args(request), capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"say exited with {result.returncode}")
+
+
+class AppKitBackend:
+    """Backend that keeps NSSpeechSynthesizer voices loaded (macOS + PyObjC)"""
+
+    def __init__(self):
+        from AppKit import NSSpeechSynthesizer
+        from Foundation import NSURL, NSDate, NSRunLoop
+
+        self._synth_class = NSSpeechSynthesizer
+        self._url_class = NSURL
+        self._date_class = NSDate
+        self._run_loop = NSRunLoop.currentRunLoop()
+        self._synths: Dict[Optional[str], Any] = {}
+        self._default_rates: Dict[Optional[str], float] = {}
+        self._voice_ids = {}
+        for identifier in NSSpeechSynthesizer.availableVoices():
+            attributes = NSSpeechSynthesizer.attributesForVoice_(identifier)
+            name = str(attributes.get("VoiceName", identifier))
+            self._voice_ids[name.lower()] = identifier
+
+    def _synth_for(self, voice: Optional[str]):
+        key = voice.lower() if voice else None
+        if key not in self._synths:
+            identifier = self._voice_ids.get(key) if key else None
+            if key and identifier is None:
+                raise RuntimeError(f"Voice '{voice}' not found")
+            synth = self._synth_class.alloc().initWithVoice_(identifier)
+            self._synths[key] = synth
+            self._default_rates[key] = synth.rate()
+        return self._synths[key]
+
+    def run(self, request: Dict[str, Any]) -> None:
+        voice = request.get("voice")
+        synth = self._synth_for(voice)
+        # Synthesizers are reused: a request without a rate must not inherit the last one
+        default_rate = self._default_rates[voice.lower() if voice else None]
+        synth.setRate_(float(request["rate"]) if request.get("rate") else default_rate)
+
+        if request.get("output"):
+            url = self._url_class.fileURLWithPath_(request["output"])
+            started = synth.startSpeakingString_toURL_(request["text"], url)
+        else:
+            started = synth.startSpeakingString_(request["text"])
+        if not started:
+            raise RuntimeError("NSSpeechSynthesizer refused the request")
+
+        while synth.isSpeaking():
+            self._run_loop.runUntilDate_(self._date_class.dateWithTimeIntervalSinceNow_(0.01))
+
+
+def create_backend():
+    """Pick the fastest available backend"""
+    try:
+        return AppKitBackend()
+    except Exception:
+        return SayBackend()
+
+
+def handle(backend, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute one protocol request"""
+    op = request.get("op")
+    if op == "ping":
+        return {"ok": True, "backend": backend.__class__.__name__}
+    if op not in ("synthesize", "speak"):
+        return {"ok": False, "error": f"Unknown op: {op}"}
+    if op == "synthesize" and not request.get("output"):
+        return {"ok": False, "error": "synthesize requires an output path"}
+    if op == "speak":
+        request = dict(request, output=None)
+
+    start_time = time.time()
+    try:
+        backend.run(request)
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+    return {"ok": True, "elapsed": time.time() - start_time}
+
+
+def main() -> None:
+    backend = create_backend()
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = {"ok": False, "error": f"Parse error: {e}"}
+        else:
+            response = handle(backend, request)
+            response["id"] = request.get("id")
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
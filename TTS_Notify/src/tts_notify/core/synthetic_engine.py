@@ -0,0 +1,217 @@
+"""
+Synthetic TTS Engine for TTS Notify v2
+
+This module provides a deterministic stand-in for the macOS `say` command so
+the engine pipeline (synthesis cache, coalescer, playback queue, segmented
+streaming, API and MCP servers) can be benchmarked and load-tested on hosts
+without macOS. Output is real AIFF/WAV audio whose duration scales with the
+word count and speech rate; only the process boundary is simulated.
+"""
+
+import asyncio
+import math
+import random
+import subprocess
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from .audio_io import encode_audio
+from .config_manager import config_manager
+from .models import AudioFormat, Gender, Language, TTSRequest, Voice, VoiceQuality
+from .synthesis_cache import SynthesisCache
+from .tts_engine import MacOSTTSEngine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 175          # Words per minute when the request has no rate
+EDGE_PADDING = 0.1          # Seconds of silence before and after the speech
+WORD_GAP = 0.2              # Fraction of each word slot left silent
+AMPLITUDE = 8000            # Peak sample value (16-bit)
+RAMP = 0.005                # Attack/release time per word in seconds
+
+
+class SimulatedPlayback:
+    """Process-like handle for a simulated playback (see PlaybackQueue)"""
+
+    def __init__(self, duration: float):
+        self.duration = duration
+        self.returncode: Optional[int] = None
+        self._killed = asyncio.Event()
+
+    async def communicate(self) -> Tuple[bytes, bytes]:
+        try:
+            await asyncio.wait_for(self._killed.wait(), timeout=self.duration)
+            self.returncode = -9
+        except asyncio.TimeoutError:
+            self.returncode = 0
+        return b"", b""
+
+    async def wait(self) -> int:
+        await self.communicate()
+        return self.returncode
+
+    def kill(self) -> None:
+        self._killed.set()
+
+    def terminate(self) -> None:
+        self.kill()
+
+
+class SyntheticTTSEngine(MacOSTTSEngine):
+    """
+    Deterministic synthetic engine for benchmarking on any host.
+
+    Subclasses MacOSTTSEngine so requests take exactly the same path through
+    the cache, coalescer and playback queue; only running `say`/`afplay` is
+    replaced by generated audio, a simulated latency and a timed wait.
+    """
+
+    # Silent audio must never stand in for a failing real engine
+    fallback_eligible = False
+    _native_formats = (AudioFormat.AIFF, AudioFormat.WAV)
+
+    def __init__(
+        self,
+        latency: Optional[float] = None,
+        jitter: Optional[float] = None,
+        playback_scale: Optional[float] = None,
+        sample_rate: Optional[int] = None,
+        seed: Optional[int] = None,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.name = "synthetic"
+        self.command = "synthetic"
+        self._worker_pool = None
+        self._player = "synthetic"
+        self.latency = latency if latency is not None else self._config_value("TTS_NOTIFY_SYNTHETIC_LATENCY", 0.05)
+        self.jitter = jitter if jitter is not None else self._config_value("TTS_NOTIFY_SYNTHETIC_JITTER", 0.0)
+        self.playback_scale = (playback_scale if playback_scale is not None
+                               else self._config_value("TTS_NOTIFY_SYNTHETIC_PLAYBACK_SCALE", 1.0))
+        self.sample_rate = sample_rate or self._config_value("TTS_NOTIFY_SAMPLE_RATE", 22050)
+        seed = seed if seed is not None else self._config_value("TTS_NOTIFY_SYNTHETIC_SEED", 0)
+        self._random = random.Random(seed)
+        self._stats = {"renders": 0, "playbacks": 0, "audio_seconds": 0.0, "simulated_latency": 0.0}
+
+    @staticmethod
+    def _build_cache() -> Optional[SynthesisCache]:
+        """Keep synthetic audio apart from real `say` output in the cache"""
+        try:
+            return SynthesisCache.from_config(config_manager.get_config(), namespace="synthetic")
+        except Exception as e:
+            logger.warning(f"Synthesis cache disabled: {e}")
+            return None
+
+    @staticmethod
+    def _build_worker_pool():
+        """Never start `say` workers for an engine that does not use them"""
+        return None
+
+    def is_available(self) -> bool:
+        """The synthetic engine runs everywhere"""
+        return True
+
+    async def initialize(self) -> None:
+        self._initialized = True
+        logger.info("Synthetic TTS engine initialized")
+
+    async def cleanup(self) -> None:
+        self._initialized = False
+
+    async def get_supported_voices(self) -> List[Voice]:
+        """A small fixed voice list; any voice id is accepted when speaking"""
+        return [
+            Voice(id="Synthetic", name="Synthetic", language=Language.ENGLISH, locale="en_US",
+                  gender=Gender.UNKNOWN, quality=VoiceQuality.BASIC, engine_name=self.name,
+                  sample_rate=self.sample_rate, supported_formats=["aiff", "wav"]),
+            Voice(id="Sintetica", name="Sintetica", language=Language.SPANISH, locale="es_ES",
+                  gender=Gender.UNKNOWN, quality=VoiceQuality.BASIC, engine_name=self.name,
+                  sample_rate=self.sample_rate, supported_formats=["aiff", "wav"]),
+        ]
+
+    async def get_engine_info(self) -> Dict[str, Any]:
+        info = await super().get_engine_info()
+        info["synthetic"] = {
+            "latency": self.latency,
+            "jitter": self.jitter,
+            "playback_scale": self.playback_scale,
+            "sample_rate": self.sample_rate,
+            **self._stats,
+        }
+        return info
+
+    @staticmethod
+    def _audio_seconds(text: str, rate: Optional[int] = None) -> float:
+        """Audio duration in seconds for a text at a speech rate"""
+        words = max(1, len(text.split()))
+        return words * 60.0 / (rate or DEFAULT_RATE) + 2 * EDGE_PADDING
+
+    def render_samples(self, text: str, voice_id: str = "", rate: Optional[int] = None) -> array:
+        """Generate deterministic 16-bit mono PCM for a text"""
+        sample_rate = self.sample_rate
+        slot = int(sample_rate * 60.0 / (rate or DEFAULT_RATE))
+        voiced = slot - int(slot * WORD_GAP)
+        ramp = max(1, min(int(sample_rate * RAMP), voiced // 2))
+        padding = array("h", bytes(2 * int(sample_rate * EDGE_PADDING)))
+        gap = array("h", bytes(2 * (slot - voiced)))
+
+        samples = array("h", padding)
+        for word in text.split() or [text]:
+            # Each word gets its own pitch, derived from the word and voice
+            frequency = 110 + zlib.crc32(f"{voice_id}:{word}".encode()) % 330
+            step = 2 * math.pi * frequency / sample_rate
+            samples.extend(array("h", [
+                int(AMPLITUDE * min(1.0, k / ramp, (voiced - k) / ramp) * math.sin(step * k))
+                for k in range(voiced)
+            ]))
+            samples.extend(gap)
+        samples.extend(padding)
+        return samples
+
+    def render(self, text: str, voice_id: str = "", rate: Optional[int] = None,
+               format: AudioFormat = AudioFormat.AIFF) -> bytes:
+        """Render text to encoded audio"""
+        samples = self.render_samples(text, voice_id, rate)
+        return encode_audio(samples, self.sample_rate, "wav" if format == AudioFormat.WAV else "aiff")
+
+    async def _simulate_latency(self) -> None:
+        delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+        self._stats["simulated_latency"] += delay
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _build_worker_payload(self, op: str, request: TTSRequest,
+                              output_path: Optional[Path] = None) -> Dict[str, Any]:
+        payload = super()._build_worker_payload(op, request, output_path)
+        native = request.output_format in self._native_formats
+        payload["format"] = request.output_format.value if native else AudioFormat.AIFF.value
+        return payload
+
+    async def _execute(self, cmd: List[str], payload: Dict[str, Any],
+                       timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        """Simulate a say invocation: render to the output path or wait out the playback"""
+        await self._simulate_latency()
+        duration = self._audio_seconds(payload["text"], payload.get("rate"))
+        if payload.get("output"):
+            audio = self.render(payload["text"], payload["voice"], payload.get("rate"),
+                                AudioFormat(payload.get("format", "aiff")))
+            Path(payload["output"]).write_bytes(audio)
+            self._stats["renders"] += 1
+        else:
+            await asyncio.sleep(duration * self.playback_scale)
+            self._stats["playbacks"] += 1
+        self._stats["audio_seconds"] += duration
+        return subprocess.CompletedProcess(args=cmd, returncode=0, stdout=b"", stderr=b"")
+
+    async def start_playback(self, request: TTSRequest,
+                             prepared: Optional[Path] = None) -> SimulatedPlayback:
+        """Start a simulated playback lasting as long as the audio would"""
+        if prepared is None:
+            await self._simulate_latency()
+        duration = self._audio_seconds(request.text, request.rate)
+        self._stats["playbacks"] += 1
+        self._stats["audio_seconds"] += duration
+        return SimulatedPlayback(duration * self.playback_scale)
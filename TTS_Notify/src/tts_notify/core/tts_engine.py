@@ -6,24 +6,75 @@ Provides a common interface for different TTS providers with async support.
 """
 
 import asyncio
+import math
+import os
+import re
+import shutil
 import subprocess
+import tempfile
 import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any, AsyncGenerator
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union, Any, AsyncGenerator
 import logging
 
 from .models import TTSRequest, TTSResponse, Voice, AudioFormat
-from .exceptions import TTSError, EngineNotAvailableError, ValidationError
+from .exceptions import (
+    TTSError, EngineNotAvailableError, CircuitOpenError, ValidationError, RequestCancelledError, VoiceNotFoundError
+)
+from .synthesis_cache import SynthesisCache
+from .worker_pool import SynthesisWorkerPool
+from .segmenter import TextSegmenter
+from .output_capture import OutputCapture
+from .capability_probe import capability_probe
+from .playback_queue import PlaybackQueue, playback_queue
+from .coalescer import NotificationCoalescer
+from .synthesis_batcher import SynthesisBatcher
+from .batch import BatchRun
+from .circuit_breaker import CircuitBreaker
+from .duration_model import DurationEstimate, duration_model
+from .audio_concat import CROSSFADE, AudioConcatenator
+from .document_renderer import DocumentRenderer, ProgressCallback
+from .audio_convert import convert_audio, convertible_formats
+from .audio_dsp import stretch_audio
+from .audio_io import AudioReader, read_info, stream_header
+from .audio_pipeline import AudioPipeline, build_pipeline, effects_requested, numpy_available
+from .config_manager import config_manager
 
 logger = logging.getLogger(__name__)
 
+# Failures caused by the request rather than the engine, e.g. say's "Voice `Foo' not found."
+_CLIENT_ERROR_RE = re.compile(r"\bvoice\b.*\bnot found\b|\bnot supported by engine\b", re.IGNORECASE)
+
+
+def _is_client_error(response: TTSResponse) -> bool:
+    """Whether an unsuccessful response is the caller's mistake and says nothing about engine health"""
+    return bool(response.metadata.get("client_error")) or bool(_CLIENT_ERROR_RE.search(response.error or ""))
+
+
+def _detach_output(path: Path) -> None:
+    """Never write through a hardlink shared with a cache entry: unlink it first"""
+    if path.is_file() and path.stat().st_nlink > 1:
+        path.unlink()
+
+
+def _kill_process(process) -> None:
+    """Kill a child process that may already have exited"""
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+
 
 class TTSEngine(ABC):
     """Abstract base class for TTS engines with async support"""
 
+    # Whether EngineRegistry may use this engine as a fallback for another
+    fallback_eligible = True
+
     def __init__(self, name: str):
         self.name = name
         self._initialized = False
@@ -69,7 +120,35 @@ class TTSEngine(ABC):
         pass
 
     async def stream(self, request: TTSRequest) -> AsyncGenerator[bytes, None]:
-        """Stream audio data as it's generated (optional implementation)"""
+        """
+        Stream audio data as it's generated (optional implementation).
+
+        The chunks always concatenate to one valid audio file. With segmented
+        streaming (AIFF and WAV only), a single header with open-ended sizes
+        comes first, followed by each segment's sample frames as it is ready.
+        """
+        if self._streaming_enabled() and request.output_format in (AudioFormat.AIFF, AudioFormat.WAV):
+            container = request.output_format.value
+            byte_order = "little" if container == "wav" else "big"
+            stream_format = None
+            async for response in self.stream_segments(request):
+                if not response.success:
+                    raise TTSError(response.error or "Segment synthesis failed", engine_name=self.name)
+                with AudioReader(response.audio_data) as reader:
+                    info = reader.info
+                    segment_format = (info.sample_rate, info.channels, info.sample_width)
+                    if info.encoding == "float" or info.byte_order != byte_order:
+                        raise TTSError(f"Segment audio ({info.compression}, {info.byte_order}-endian) "
+                                       f"cannot be streamed as {container}", engine_name=self.name)
+                    if stream_format is None:
+                        stream_format = segment_format
+                        yield stream_header(container, *segment_format)
+                    elif segment_format != stream_format:
+                        raise TTSError(f"Segment format {segment_format} differs from the stream's "
+                                       f"{stream_format}", engine_name=self.name)
+                    yield bytes(reader.read_raw())
+            return
+
         # Default implementation uses synthesize and yields chunks
         response = await self.synthesize(request)
         if response.success and response.audio_data:
@@ -78,13 +157,279 @@ class TTSEngine(ABC):
             for i in range(0, len(response.audio_data), chunk_size):
                 yield response.audio_data[i:i + chunk_size]
 
+    @staticmethod
+    async def _cancellable(request: TTSRequest, operation: Awaitable[TTSResponse]) -> TTSResponse:
+        """Await an operation, stopping it as soon as request.cancel_token is cancelled"""
+        if request.cancel_token is None:
+            return await operation
+        return await request.cancel_token.run(operation)
+
+    @staticmethod
+    def _streaming_enabled() -> bool:
+        try:
+            return config_manager.get_config().TTS_NOTIFY_STREAMING
+        except Exception:
+            return False
+
+    @staticmethod
+    def _max_concurrent() -> int:
+        try:
+            return config_manager.get_config().TTS_NOTIFY_MAX_CONCURRENT
+        except Exception:
+            return 5
+
+    async def stream_segments(
+        self,
+        request: TTSRequest,
+        max_concurrent: Optional[int] = None,
+        max_segment_chars: int = 400
+    ) -> AsyncGenerator[TTSResponse, None]:
+        """
+        Synthesize text segment by segment and yield responses in order.
+
+        Segments are synthesized concurrently (up to max_concurrent, default
+        TTS_NOTIFY_MAX_CONCURRENT) and each one is yielded as soon as it and
+        every segment before it are ready, so the first audio arrives after
+        synthesizing only the head segment. Every response carries
+        time_to_first_chunk and elapsed in its metadata; the last one also
+        carries total_time.
+        """
+        start_time = time.time()
+        segments = TextSegmenter.split_into_segments(request.text, max_chars=max_segment_chars)
+        window = max(1, max_concurrent or self._max_concurrent())
+        semaphore = asyncio.Semaphore(window)
+
+        async def synthesize_segment(index: int) -> TTSResponse:
+            async with semaphore:
+                segment_request = replace(
+                    request,
+                    text=segments[index],
+                    metadata={**request.metadata, "segment_index": index}
+                )
+                return await self.synthesize(segment_request)
+
+        pending: Dict[int, asyncio.Task] = {}
+        next_to_start = 0
+        first_chunk_time: Optional[float] = None
+        try:
+            for index in range(len(segments)):
+                # Keep a bounded look-ahead window of in-flight segments
+                while next_to_start < len(segments) and next_to_start < index + window:
+                    pending[next_to_start] = asyncio.create_task(synthesize_segment(next_to_start))
+                    next_to_start += 1
+
+                response = await pending.pop(index)
+                now = time.time()
+                if first_chunk_time is None:
+                    first_chunk_time = now - start_time
+
+                response.metadata.update({
+                    "segment_index": index,
+                    "segment_count": len(segments),
+                    "segment_chars": len(segments[index]),
+                    "time_to_first_chunk": first_chunk_time,
+                    "elapsed": now - start_time,
+                })
+                if index == len(segments) - 1:
+                    response.metadata["total_time"] = now - start_time
+                    logger.info(f"Streamed {len(segments)} segments: first chunk after "
+                                f"{first_chunk_time:.2f}s, total {now - start_time:.2f}s")
+                yield response
+        finally:
+            for task in pending.values():
+                task.cancel()
+
+    def synthesize_many(
+        self,
+        requests: Iterable[TTSRequest],
+        max_concurrent: Optional[int] = None,
+        ordered: bool = True
+    ) -> BatchRun:
+        """
+        Synthesize many requests with bounded concurrency.
+
+        Args:
+            requests: Requests to synthesize (any iterable, consumed lazily)
+            max_concurrent: Items in flight (default TTS_NOTIFY_MAX_CONCURRENT)
+            ordered: Yield results in submission order instead of as they finish
+
+        Returns:
+            A BatchRun; iterate it for per-item results, read .stats for throughput
+        """
+        return BatchRun(self.synthesize, requests,
+                        max_concurrent=max_concurrent or self._max_concurrent(), ordered=ordered)
+
+    def save_many(
+        self,
+        requests: Iterable[TTSRequest],
+        output_paths: Optional[Iterable[Path]] = None,
+        max_concurrent: Optional[int] = None,
+        ordered: bool = True
+    ) -> BatchRun:
+        """
+        Save many requests to files with bounded concurrency.
+
+        Args:
+            requests: Requests to render
+            output_paths: Destination per request (default: request.output_path)
+            max_concurrent: Items in flight (default TTS_NOTIFY_MAX_CONCURRENT)
+            ordered: Yield results in submission order instead of as they finish
+
+        Returns:
+            A BatchRun whose items are (request, output_path) pairs
+        """
+        if output_paths is not None:
+            items = zip(requests, output_paths)
+        else:
+            items = ((request, request.output_path) for request in requests)
+
+        async def save_item(item) -> TTSResponse:
+            request, output_path = item
+            if output_path is None:
+                raise ValidationError("Request has no output path", field="output_path")
+            return await self.save(request, Path(output_path))
+
+        return BatchRun(save_item, items,
+                        max_concurrent=max_concurrent or self._max_concurrent(), ordered=ordered)
+
+    @staticmethod
+    def _join_settings() -> Dict[str, float]:
+        try:
+            config = config_manager.get_config()
+            return {"crossfade": config.TTS_NOTIFY_CONCAT_CROSSFADE, "gap": config.TTS_NOTIFY_CONCAT_GAP}
+        except Exception:
+            return {"crossfade": CROSSFADE, "gap": 0.0}
+
+    async def save_joined(
+        self,
+        requests: Union[TTSRequest, Iterable[TTSRequest]],
+        output_path: Path,
+        output_format: Optional[AudioFormat] = None,
+        crossfade: Optional[float] = None,
+        gap: Optional[float] = None,
+        max_concurrent: Optional[int] = None
+    ) -> TTSResponse:
+        """
+        Render into a single file joined with short crossfades.
+
+        A single request is split into segments (see stream_segments); a
+        list of requests becomes one segment each, in order. Segments are
+        synthesized concurrently and appended to the output as they arrive.
+
+        Args:
+            requests: One long request, or several requests to join
+            output_path: Destination file
+            output_format: Output format (default: the first request's)
+            crossfade: Overlap at each join in seconds (default TTS_NOTIFY_CONCAT_CROSSFADE)
+            gap: Silence between segments in seconds (default TTS_NOTIFY_CONCAT_GAP)
+            max_concurrent: Segments in flight (default TTS_NOTIFY_MAX_CONCURRENT)
+
+        Returns:
+            A TTSResponse with file_path and join statistics in metadata
+        """
+        start_time = time.time()
+        output_path = Path(output_path)
+        # Segments travel as uncompressed audio; only the joined file is encoded
+        segment_format = AudioFormat.AIFF if AudioFormat.AIFF in self._supported_formats else AudioFormat.WAV
+
+        if isinstance(requests, TTSRequest):
+            first = requests
+            responses = self.stream_segments(replace(requests, output_format=segment_format), max_concurrent)
+        else:
+            requests = [replace(request, output_format=segment_format) for request in requests]
+            if not requests:
+                raise ValidationError("No requests to join", field="requests")
+            first = requests[0]
+
+            async def batch_responses():
+                async for result in self.synthesize_many(requests, max_concurrent=max_concurrent):
+                    yield result.response or TTSResponse(success=False, error=result.error)
+
+            responses = batch_responses()
+
+        output_format = output_format or first.output_format
+        if output_format not in self._supported_formats:
+            raise ValidationError(f"Format '{output_format.value}' is not supported by engine '{self.name}'")
+        if not output_path.suffix:
+            output_path = output_path.with_suffix(f".{output_format.value}")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        settings = self._join_settings()
+        joiner = AudioConcatenator(
+            output_path, output_format,
+            crossfade=settings["crossfade"] if crossfade is None else crossfade,
+            gap=settings["gap"] if gap is None else gap
+        )
+        try:
+            async for response in responses:
+                if not response.success:
+                    if first.cancel_token is not None:
+                        first.cancel_token.raise_if_cancelled()
+                    raise TTSError(response.error or "Segment synthesis failed", engine_name=self.name)
+                await asyncio.to_thread(joiner.append, response.audio_data)
+            stats = await asyncio.to_thread(joiner.close)
+        except RequestCancelledError:
+            joiner.abort()
+            raise
+        except Exception as e:
+            joiner.abort()
+            error_msg = f"Failed to render joined audio: {e}"
+            logger.error(error_msg)
+            return TTSResponse(success=False, error=error_msg)
+
+        duration = time.time() - start_time
+        logger.info(f"Joined {stats['segments']} segments into '{output_path}' in {duration:.2f}s")
+        return TTSResponse(success=True, file_path=output_path, duration=duration,
+                           format=output_format, metadata=stats)
+
+    async def render_document(
+        self,
+        request: TTSRequest,
+        output_path: Path,
+        markdown: bool = True,
+        shard_dir: Optional[Path] = None,
+        resume: bool = True,
+        keep_shards: bool = False,
+        shard_chars: Optional[int] = None,
+        max_concurrent: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> TTSResponse:
+        """
+        Render a long document into one file from shards rendered in parallel.
+
+        The text (markdown unless markdown=False) is split into shards at
+        paragraph and sentence boundaries; shards are saved into shard_dir
+        concurrently and joined in order. Shards already in shard_dir from an
+        interrupted or earlier run are reused when resume is set.
+
+        Args:
+            request: The document; voice, rate, effects and output_format apply to every shard
+            output_path: Destination file
+            markdown: Reduce markdown syntax to speakable text first
+            shard_dir: Where shards are kept (default: hidden directory next to output_path)
+            resume: Reuse shards rendered by a previous run
+            keep_shards: Keep shard_dir after a successful join
+            shard_chars: Upper bound per shard (default TTS_NOTIFY_DOCUMENT_SHARD_CHARS)
+            max_concurrent: Shards in flight (default TTS_NOTIFY_DOCUMENT_CONCURRENCY, else CPU count)
+            progress: Called with a DocumentProgress after every shard and phase change
+
+        Returns:
+            A TTSResponse with file_path; on failure the finished shards stay for a resumed run
+        """
+        self.validate_request(request)
+        renderer = DocumentRenderer(self, shard_chars=shard_chars, max_concurrent=max_concurrent,
+                                    progress=progress)
+        return await self._cancellable(request, renderer.render(
+            request, output_path, markdown=markdown, shard_dir=shard_dir,
+            resume=resume, keep_shards=keep_shards))
+
     def validate_request(self, request: TTSRequest) -> None:
         """Validate TTS request"""
         if not isinstance(request, TTSRequest):
             raise ValidationError("Request must be a TTSRequest instance")
 
         # Validate format compatibility
-        if request.output_format not in asyncio.run(self.get_supported_formats()):
+        if request.output_format not in self._supported_formats:
             raise ValidationError(f"Format '{request.output_format.value}' is not supported by engine '{self.name}'")
 
         # Validate rate limits (maintain v1.5.0 behavior)
@@ -92,6 +437,14 @@ class TTSEngine(ABC):
             raise ValidationError("Rate must be between 100 and 300 WPM for optimal performance",
                               field="rate", value=request.rate)
 
+    def estimate_duration(self, request: TTSRequest) -> DurationEstimate:
+        """Predicted speech duration, synthesis time and per-operation timeouts"""
+        return duration_model.estimate(self.name, request.text, request.voice.id, request.rate)
+
+    def share_components(self, source: "TTSEngine") -> None:
+        """Adopt the shared state (caches, queues) of another instance in the same EngineGroup"""
+        pass
+
     async def get_engine_info(self) -> Dict[str, Any]:
         """Get engine information and capabilities"""
         return {
@@ -112,22 +465,21 @@ class SubprocessTTSEngine(TTSEngine):
     def __init__(self, name: str, command: str):
         super().__init__(name)
         self.command = command
-        self._process_timeout = 60  # Default timeout in seconds
+        self._process_timeout = 60  # Fallback for commands without a request
+
+    def _timeout_for(self, request: TTSRequest, op: str) -> float:
+        """Per-request timeout for "synthesize", "speak" or "play" (see DurationModel)"""
+        return self.estimate_duration(request).timeouts[op]
 
     def is_available(self) -> bool:
-        """Check if the command is available"""
-        try:
-            subprocess.run([self.command, "--version"],
-                         capture_output=True, timeout=5, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+        """Check if the command is available (cached, see CapabilityProbe)"""
+        return capability_probe.probe([self.command, "--version"]).available
 
     async def _run_command(
         self,
         args: List[str],
         input_data: Optional[bytes] = None,
-        timeout: Optional[int] = None
+        timeout: Optional[float] = None
     ) -> subprocess.CompletedProcess:
         """Run a subprocess command asynchronously"""
         cmd = [self.command] + args
@@ -136,11 +488,11 @@ class SubprocessTTSEngine(TTSEngine):
         try:
             process = await asyncio.create_subprocess_exec(
                 *cmd,
+                stdin=asyncio.subprocess.PIPE if input_data is not None else None,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                input=input_data
+                stderr=asyncio.subprocess.PIPE
             )
-            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+            stdout, stderr = await asyncio.wait_for(process.communicate(input_data), timeout=timeout)
 
             return subprocess.CompletedProcess(
                 args=cmd,
@@ -153,7 +505,12 @@ class SubprocessTTSEngine(TTSEngine):
             if 'process' in locals():
                 process.kill()
                 await process.wait()
-            raise TTSError(f"Command timed out after {timeout} seconds", engine_name=self.name)
+            raise TTSError(f"Command timed out after {timeout:.1f} seconds", engine_name=self.name)
+        except asyncio.CancelledError:
+            # The request was cancelled: do not leave the child running
+            if 'process' in locals():
+                _kill_process(process)
+            raise
 
     def _build_voice_args(self, voice: Voice) -> List[str]:
         """Build command arguments for voice selection"""
@@ -184,42 +541,240 @@ class SubprocessTTSEngine(TTSEngine):
 class MacOSTTSEngine(SubprocessTTSEngine):
     """macOS TTS engine using native say command (enhanced from v1.5.0)"""
 
-    def __init__(self):
+    # Formats the engine writes itself; others go through audio_convert
+    _native_formats = (AudioFormat.AIFF,)
+
+    def __init__(
+        self,
+        cache: Optional[SynthesisCache] = None,
+        worker_pool: Optional[SynthesisWorkerPool] = None,
+        capture_mode: Optional[str] = None,
+        playback: Optional[PlaybackQueue] = None,
+        coalescer: Optional[NotificationCoalescer] = None,
+        batcher: Optional[SynthesisBatcher] = None
+    ):
         super().__init__("macos", "say")
-        self._supported_formats = [AudioFormat.AIFF]  # macOS say only supports AIFF
+        # say writes AIFF; WAV (and FLAC with NumPy) are converted after synthesis
+        self._supported_formats = convertible_formats()
+        self._cache = cache if cache is not None else self._build_cache()
+        self._worker_pool = worker_pool if worker_pool is not None else self._build_worker_pool()
+        self._capture_mode = capture_mode or self._config_value("TTS_NOTIFY_CAPTURE_MODE", "auto")
+        self._playback_queue = playback if playback is not None else self._build_playback_queue()
+        self._player = capability_probe.which(self._config_value("TTS_NOTIFY_PLAYBACK_PLAYER", "afplay"))
+        self._coalescer = coalescer if coalescer is not None else self._build_coalescer()
+        self._batcher = batcher if batcher is not None else self._build_batcher()
+        self._voice_manager = None
+
+    @staticmethod
+    def _config_value(name: str, default: Any) -> Any:
+        try:
+            return getattr(config_manager.get_config(), name, default)
+        except Exception:
+            return default
+
+    @staticmethod
+    def _build_cache() -> Optional[SynthesisCache]:
+        """Build the synthesis cache from configuration"""
+        try:
+            return SynthesisCache.from_config(config_manager.get_config())
+        except Exception as e:
+            logger.warning(f"Synthesis cache disabled: {e}")
+            return None
+
+    @staticmethod
+    def _build_worker_pool() -> Optional[SynthesisWorkerPool]:
+        """Build the synthesis worker pool from configuration"""
+        try:
+            return SynthesisWorkerPool.from_config(config_manager.get_config())
+        except Exception as e:
+            logger.warning(f"Synthesis worker pool disabled: {e}")
+            return None
+
+    @staticmethod
+    def _build_playback_queue() -> Optional[PlaybackQueue]:
+        """Attach to the process-wide playback queue unless disabled"""
+        try:
+            config = config_manager.get_config()
+        except Exception as e:
+            logger.warning(f"Using default playback queue settings: {e}")
+            return playback_queue
+        if not getattr(config, "TTS_NOTIFY_PLAYBACK_QUEUE", True):
+            return None
+        playback_queue.apply_config(config)
+        return playback_queue
+
+    @staticmethod
+    def _build_coalescer() -> Optional[NotificationCoalescer]:
+        """Build the duplicate-notification coalescer from configuration"""
+        try:
+            return NotificationCoalescer.from_config(config_manager.get_config())
+        except Exception as e:
+            logger.warning(f"Notification coalescing disabled: {e}")
+            return None
+
+    @staticmethod
+    def _build_batcher() -> Optional[SynthesisBatcher]:
+        """Build the short-request synthesis batcher from configuration"""
+        try:
+            return SynthesisBatcher.from_config(config_manager.get_config())
+        except Exception as e:
+            logger.warning(f"Synthesis batching disabled: {e}")
+            return None
+
+    def _build_audio_pipeline(self, request: TTSRequest) -> Optional[AudioPipeline]:
+        """Post-synthesis processing stages for a request (None when disabled)"""
+        try:
+            return build_pipeline(config_manager.get_config(), request)
+        except Exception as e:
+            logger.warning(f"Audio pipeline disabled: {e}")
+            return None
+
+    def _cache_key(self, request: TTSRequest) -> Optional[str]:
+        """Synthesis cache key, including the post-processing settings"""
+        if self._cache is None:
+            return None
+        pipeline = self._build_audio_pipeline(request)
+        return self._cache.make_key(request, pipeline.signature() if pipeline else "")
+
+    def _rate_candidates(self, request: TTSRequest) -> List[int]:
+        """Cached rates that may stand in for request.rate, nearest first"""
+        tolerance = self._config_value("TTS_NOTIFY_RATE_VARIANT_TOLERANCE", 0.0)
+        if (not tolerance or self._cache is None or request.rate is None
+                or request.output_format not in (AudioFormat.AIFF, AudioFormat.WAV) or not numpy_available()):
+            return []
+        low = math.ceil(request.rate / (1 + tolerance))
+        high = math.floor(request.rate * (1 + tolerance))
+        rates = [rate for rate in range(low, high + 1) if rate != request.rate]
+        return sorted(rates, key=lambda rate: abs(math.log(rate / request.rate)))
+
+    async def _rate_variant(self, request: TTSRequest, cache_key: str) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """
+        Derive a request from the same text cached at another rate.
+
+        Probes the cache keys of every rate within TTS_NOTIFY_RATE_VARIANT_TOLERANCE
+        (nearest first), time-stretches the first clip found and caches the
+        result under the request's own key. Clips that were themselves derived
+        are never used as a source, so quality does not degrade over chains.
+        """
+        candidates = self._rate_candidates(request)
+        if not candidates:
+            return None
+        pipeline = self._build_audio_pipeline(request)
+        signature = pipeline.signature() if pipeline else ""
+
+        for rate in candidates:
+            source_key = self._cache.make_key(replace(request, rate=rate), signature)
+            if not self._cache.contains(source_key):
+                continue
+            meta = self._cache.get_meta(source_key)
+            if "rate_variant" in meta:
+                continue
+            source = self._cache.get(source_key)
+            if source is None:
+                continue
+
+            speed = request.rate / rate
+            try:
+                audio_data = await asyncio.to_thread(stretch_audio, source, speed, request.output_format)
+            except Exception as e:
+                logger.warning(f"Failed to derive a {request.rate} WPM variant from {rate} WPM: {e}")
+                return None
+            # Stretching keeps the loudness, so the measurement carries over
+            meta = {**meta, "rate_variant": {"source_rate": rate, "speed": round(speed, 4)}}
+            self._cache.put(cache_key, audio_data, meta=meta)
+            return audio_data, meta
+        return None
+
+    @staticmethod
+    def _cache_meta(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Render results worth keeping with a cache entry (measured loudness)"""
+        stages = metadata.get("pipeline", {})
+        loudness = stages.get("loudnorm")
+        if not loudness:
+            return {}
+        loudness = dict(loudness)
+        volume = stages.get("gain", {}).get("factor")
+        if volume is not None:
+            # The request volume is applied after normalization
+            loudness["lufs"] = round(loudness["lufs"] + 20 * math.log10(volume), 2) if volume > 0 else float("-inf")
+        return {"loudness": loudness}
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get synthesis cache hit/miss/eviction counters"""
+        if self._cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._cache.get_stats()}
+
+    def share_components(self, source: TTSEngine) -> None:
+        """Group members use one cache index, coalescer and batcher"""
+        if isinstance(source, MacOSTTSEngine):
+            self._cache = source._cache
+            self._coalescer = source._coalescer
+            self._batcher = source._batcher
+
+    async def get_engine_info(self) -> Dict[str, Any]:
+        """Get engine information including synthesis cache statistics"""
+        info = await super().get_engine_info()
+        info["synthesis_cache"] = self.get_cache_stats()
+        info["worker_pool"] = (self._worker_pool.get_stats() if self._worker_pool
+                               else {"enabled": False})
+        info["playback_queue"] = (self._playback_queue.get_stats() if self._playback_queue
+                                  else {"enabled": False})
+        info["coalescer"] = (self._coalescer.get_stats() if self._coalescer
+                             else {"enabled": False})
+        info["batcher"] = (self._batcher.get_stats() if self._batcher and self._batcher.enabled
+                           else {"enabled": False})
+        info["duration_model"] = duration_model.get_stats()
+        return info
 
     async def initialize(self) -> None:
         """Initialize the macOS TTS engine"""
         if not self.is_available():
             raise EngineNotAvailableError("macOS TTS", "say command not available")
+        if self._worker_pool is not None:
+            await self._worker_pool.start()
         self._initialized = True
         logger.info("macOS TTS engine initialized successfully")
 
     async def cleanup(self) -> None:
         """Cleanup resources used by the macOS TTS engine"""
+        if self._worker_pool is not None:
+            await self._worker_pool.stop()
+        await asyncio.to_thread(duration_model.flush)
         self._initialized = False
         logger.info("macOS TTS engine cleaned up")
 
     def is_available(self) -> bool:
-        """Check if macOS say command is available"""
-        try:
-            result = subprocess.run([self.command, "-v", "?"],
-                                 capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+        """Check if macOS say command is available (cached, see CapabilityProbe)"""
+        return capability_probe.probe([self.command, "-v", "?"]).available
 
     async def get_supported_voices(self) -> List[Voice]:
         """Get supported voices by delegating to voice manager"""
-        from core.voice_system import VoiceManager
-        voice_manager = VoiceManager()
-        return await voice_manager.get_all_voices()
+        # Reuse one manager so its voice cache survives between calls
+        if self._voice_manager is None:
+            from .voice_system import VoiceManager
+            self._voice_manager = VoiceManager()
+        return await self._voice_manager.get_all_voices()
 
     async def speak(self, request: TTSRequest) -> TTSResponse:
         """Convert text to speech and play it using macOS say command"""
-        start_time = time.time()
         self.validate_request(request)
+        if self._coalescer is not None:
+            return await self._cancellable(request, self._coalescer.submit("speak", request, self._speak))
+        return await self._cancellable(request, self._speak(request))
 
+    async def _speak(self, request: TTSRequest) -> TTSResponse:
+        """Speak a validated request (after coalescing)"""
+        start_time = time.time()
+
+        # Serialize playback with every other speaker in the process
+        if self._playback_queue is not None:
+            return await self._playback_queue.submit(request, self)
+
+        if self.needs_render(request):
+            return await self._speak_rendered(request, start_time)
+
+        timeout = self._timeout_for(request, "speak")
         try:
             # Build command arguments
             cmd = self._build_voice_args(request.voice)
@@ -231,8 +786,8 @@ class MacOSTTSEngine(SubprocessTTSEngine):
             # Add text to speak
             cmd.append(request.text)
 
-            # Execute the command asynchronously
-            completed_process = await self._run_command(cmd)
+            # Execute on a pooled worker or as a one-off say process
+            completed_process = await self._execute(cmd, self._build_worker_payload("speak", request), timeout)
 
             if completed_process.returncode == 0:
                 duration = time.time() - start_time
@@ -240,7 +795,7 @@ class MacOSTTSEngine(SubprocessTTSEngine):
                 return TTSResponse(
                     success=True,
                     duration=duration,
-                    format=AudioFormat.AIFF
+                    format=request.output_format
                 )
             else:
                 error_msg = completed_process.stderr.decode() if completed_process.stderr else "Unknown error"
@@ -251,7 +806,7 @@ class MacOSTTSEngine(SubprocessTTSEngine):
                 )
 
         except asyncio.TimeoutError:
-            error_msg = f"Speech timed out after {self._process_timeout} seconds"
+            error_msg = f"Speech timed out after {timeout:.1f} seconds"
             logger.error(error_msg)
             return TTSResponse(success=False, error=error_msg)
         except Exception as e:
@@ -259,103 +814,228 @@ class MacOSTTSEngine(SubprocessTTSEngine):
             logger.error(error_msg)
             return TTSResponse(success=False, error=error_msg)
 
+    async def _speak_rendered(self, request: TTSRequest, start_time: float) -> TTSResponse:
+        """Render, post-process and play a request that say cannot speak as-is"""
+        prepared = await self.prepare_playback(request)
+        if prepared is None:
+            return TTSResponse(success=False, error="Failed to render audio for playback")
+        try:
+            process = await self.start_playback(request, prepared)
+            timeout = self._timeout_for(request, "play")
+            try:
+                _, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+            except asyncio.CancelledError:
+                _kill_process(process)
+                raise
+            except asyncio.TimeoutError:
+                process.kill()
+                error_msg = f"Speech timed out after {timeout:.1f} seconds"
+                logger.error(error_msg)
+                return TTSResponse(success=False, error=error_msg)
+        finally:
+            self.release_playback(prepared)
+
+        if process.returncode != 0:
+            error_msg = stderr.decode() if stderr else "Unknown error"
+            logger.error(f"Failed to play rendered speech: {error_msg}")
+            return TTSResponse(success=False, error=error_msg)
+        return TTSResponse(success=True, duration=time.time() - start_time, format=request.output_format)
+
     async def synthesize(self, request: TTSRequest) -> TTSResponse:
         """Convert text to speech and return audio data"""
-        # macOS say command doesn't directly support returning audio data
-        # We need to save to a temporary file and read it back
-        import tempfile
-        import os
-
-        start_time = time.time()
         self.validate_request(request)
+        if self._coalescer is not None:
+            return await self._cancellable(request, self._coalescer.submit("synthesize", request, self._synthesize))
+        return await self._cancellable(request, self._synthesize(request))
+
+    async def _synthesize(self, request: TTSRequest) -> TTSResponse:
+        """Synthesize a validated request (after coalescing)"""
+        # macOS say command doesn't directly support returning audio data,
+        # so it writes into a capture buffer (memfd where available)
+        start_time = time.time()
 
-        with tempfile.NamedTemporaryFile(suffix=".aiff", delete=False) as temp_file:
-            temp_path = Path(temp_file.name)
-
-        try:
-            # Save to temporary file first
-            save_response = await self.save(request, temp_path)
-
-            if save_response.success and temp_path.exists():
-                # Read the audio data
-                audio_data = temp_path.read_bytes()
+        # Serve repeated phrases straight from the synthesis cache
+        cache_key = self._cache_key(request)
+        if cache_key is not None:
+            audio_data = self._cache.get(cache_key)
+            if audio_data is not None:
                 duration = time.time() - start_time
+                logger.info(f"Served {len(audio_data)} cached bytes for voice '{request.voice.id}' in {duration:.3f}s")
+                return TTSResponse(
+                    success=True,
+                    audio_data=audio_data,
+                    duration=duration,
+                    format=request.output_format,
+                    metadata={**self._cache.get_meta(cache_key), "file_size": len(audio_data), "cache_hit": True}
+                )
 
-                logger.info(f"Successfully synthesized {len(audio_data)} bytes using voice '{request.voice.id}'")
-
+            # Or time-stretch the same text cached at a nearby rate
+            variant = await self._rate_variant(request, cache_key)
+            if variant is not None:
+                audio_data, meta = variant
+                duration = time.time() - start_time
+                logger.info(f"Derived {len(audio_data)} bytes from a cached clip at "
+                            f"{meta['rate_variant']['source_rate']} WPM in {duration:.3f}s")
                 return TTSResponse(
                     success=True,
                     audio_data=audio_data,
-                    file_path=temp_path,
                     duration=duration,
-                    format=AudioFormat.AIFF
+                    format=request.output_format,
+                    metadata={**meta, "file_size": len(audio_data), "cache_hit": True}
                 )
-            else:
-                return save_response
+
+        try:
+            with OutputCapture.create(suffix=f".{request.output_format.value}", mode=self._capture_mode) as capture:
+                save_response = await self._render(request, capture.path)
+                if not save_response.success:
+                    return save_response
+
+                # Read the audio data
+                audio_data = capture.read()
+                duration = time.time() - start_time
+
+            if cache_key is not None:
+                self._cache.put(cache_key, audio_data, meta=self._cache_meta(save_response.metadata))
+
+            logger.info(f"Successfully synthesized {len(audio_data)} bytes using voice '{request.voice.id}'")
+
+            return TTSResponse(
+                success=True,
+                audio_data=audio_data,
+                duration=duration,
+                format=request.output_format,
+                metadata={
+                    **save_response.metadata,
+                    "file_size": len(audio_data),
+                    "cache_hit": False,
+                    "capture_mode": capture.mode
+                }
+            )
 
         except Exception as e:
             error_msg = f"Failed to synthesize audio: {str(e)}"
             logger.error(error_msg)
             return TTSResponse(success=False, error=error_msg)
-        finally:
-            # Clean up temporary file
-            if temp_path.exists():
-                try:
-                    temp_path.unlink()
-                except Exception:
-                    pass
 
     async def save(self, request: TTSRequest, output_path: Path) -> TTSResponse:
         """Convert text to speech and save to file using macOS say command"""
-        start_time = time.time()
         self.validate_request(request)
+        return await self._cancellable(request, self._save(request, output_path))
+
+    async def _save(self, request: TTSRequest, output_path: Path) -> TTSResponse:
+        """Save a validated request"""
+        start_time = time.time()
 
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Add .aiff extension if not present
+        # Add the format extension if not present
         if not output_path.suffix.lower():
-            output_path = output_path.with_suffix(".aiff")
-
-        try:
-            # Build command arguments
-            cmd = self._build_voice_args(request.voice)
-
-            # Add rate if specified
-            if request.rate is not None:
-                cmd.extend(self._build_rate_args(request.rate))
-
-            # Add output file argument
-            cmd.extend(["-o", str(output_path)])
-
-            # Add text to speak
-            cmd.append(request.text)
-
-            # Execute the command asynchronously
-            completed_process = await self._run_command(cmd)
-
-            if completed_process.returncode == 0 and output_path.exists():
-                duration = time.time() - start_time
-                file_size = output_path.stat().st_size
-
-                logger.info(f"Successfully saved audio to '{output_path}' ({file_size} bytes) in {duration:.2f}s")
+            output_path = output_path.with_suffix(f".{request.output_format.value}")
 
+        cache_key = self._cache_key(request)
+        if cache_key is not None:
+            try:
+                if self._cache.copy_to(cache_key, output_path):
+                    duration = time.time() - start_time
+                    file_size = output_path.stat().st_size
+                    logger.info(f"Served cached audio to '{output_path}' ({file_size} bytes) in {duration:.3f}s")
+                    return TTSResponse(
+                        success=True,
+                        file_path=output_path,
+                        duration=duration,
+                        format=request.output_format,
+                        metadata={**self._cache.get_meta(cache_key), "file_size": file_size, "cache_hit": True}
+                    )
+            except OSError as e:
+                logger.warning(f"Failed to serve cached audio to '{output_path}': {e}")
+
+            variant = await self._rate_variant(request, cache_key)
+            if variant is not None:
+                audio_data, meta = variant
+                _detach_output(output_path)
+                output_path.write_bytes(audio_data)
                 return TTSResponse(
                     success=True,
                     file_path=output_path,
-                    duration=duration,
-                    format=AudioFormat.AIFF,
-                    metadata={"file_size": file_size}
-                )
-            else:
-                error_msg = completed_process.stderr.decode() if completed_process.stderr else "Unknown error"
-                logger.error(f"Failed to save audio: {error_msg}")
-                return TTSResponse(
-                    success=False,
-                    file_path=output_path,
-                    error=error_msg
+                    duration=time.time() - start_time,
+                    format=request.output_format,
+                    metadata={**meta, "file_size": len(audio_data), "cache_hit": True}
                 )
 
+        response = await self._render(request, output_path, start_time)
+        if response.success and cache_key is not None:
+            try:
+                self._cache.put_file(cache_key, output_path, meta=self._cache_meta(response.metadata))
+            except OSError as e:
+                logger.warning(f"Failed to cache audio from '{output_path}': {e}")
+            response.metadata["cache_hit"] = False
+        return response
+
+    async def _render(self, request: TTSRequest, output_path: Path,
+                      start_time: Optional[float] = None) -> TTSResponse:
+        """Run the say command to render a request into output_path"""
+        start_time = start_time or time.time()
+
+        _detach_output(output_path)
+
+        # say only writes AIFF; other formats are converted from a temporary file
+        render_path = output_path
+        if request.output_format not in self._native_formats:
+            fd, name = tempfile.mkstemp(suffix=".aiff", prefix="tts-notify-render-")
+            os.close(fd)
+            render_path = Path(name)
+
+        try:
+            # Short requests may share one say invocation with others of the same voice and rate
+            batch_meta = await self._render_batched(request, render_path)
+            if batch_meta is None:
+                # Build command arguments
+                cmd = self._build_voice_args(request.voice)
+
+                # Add rate if specified
+                if request.rate is not None:
+                    cmd.extend(self._build_rate_args(request.rate))
+
+                # Add output file argument
+                cmd.extend(["-o", str(render_path)])
+
+                # Add text to speak
+                cmd.append(request.text)
+
+                # Execute on a pooled worker or as a one-off say process
+                payload = self._build_worker_payload("synthesize", request, render_path)
+                render_start = time.time()
+                completed_process = await self._execute(cmd, payload, self._timeout_for(request, "synthesize"))
+
+                if completed_process.returncode != 0 or not render_path.exists():
+                    error_msg = completed_process.stderr.decode() if completed_process.stderr else "Unknown error"
+                    logger.error(f"Failed to save audio: {error_msg}")
+                    return TTSResponse(
+                        success=False,
+                        file_path=output_path,
+                        error=error_msg
+                    )
+                self._observe(request, render_path, time.time() - render_start)
+
+            metadata = await asyncio.to_thread(self._post_process, request, render_path, output_path)
+            if batch_meta is not None:
+                metadata.update(batch_meta)
+
+            duration = time.time() - start_time
+            file_size = output_path.stat().st_size
+            metadata["file_size"] = file_size
+
+            logger.info(f"Successfully saved audio to '{output_path}' ({file_size} bytes) in {duration:.2f}s")
+
+            return TTSResponse(
+                success=True,
+                file_path=output_path,
+                duration=duration,
+                format=request.output_format,
+                metadata=metadata
+            )
+
         except Exception as e:
             error_msg = f"Failed to save audio: {str(e)}"
             logger.error(error_msg)
@@ -364,6 +1044,149 @@ class MacOSTTSEngine(SubprocessTTSEngine):
                 file_path=output_path,
                 error=error_msg
             )
+        finally:
+            if render_path != output_path:
+                render_path.unlink(missing_ok=True)
+
+    async def _render_batched(self, request: TTSRequest, render_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Render a short request as part of a batch into render_path.
+
+        Returns:
+            Batch metadata, or None if the request must be rendered on its own
+        """
+        if self._batcher is None or not self._batcher.accepts(request):
+            return None
+        batched = await self._batcher.submit(request, self._render_batch)
+        if batched is None:
+            return None
+        clip, meta = batched
+        render_path.write_bytes(clip)
+        return meta
+
+    async def _render_batch(self, request: TTSRequest, render_path: Path) -> bool:
+        """Run say for a batcher's combined request (no post-processing)"""
+        cmd = self._build_voice_args(request.voice)
+        if request.rate is not None:
+            cmd.extend(self._build_rate_args(request.rate))
+        cmd.extend(["-o", str(render_path), request.text])
+        payload = self._build_worker_payload("synthesize", request, render_path)
+        completed_process = await self._execute(cmd, payload, self._timeout_for(request, "synthesize"))
+        if completed_process.returncode != 0:
+            error_msg = completed_process.stderr.decode() if completed_process.stderr else "Unknown error"
+            logger.warning(f"Batch render failed: {error_msg}")
+        return completed_process.returncode == 0 and render_path.exists()
+
+    def _observe(self, request: TTSRequest, render_path: Path, synthesis_time: float) -> None:
+        """Calibrate the duration model from say's raw output"""
+        try:
+            audio_duration = read_info(render_path).duration
+        except Exception as e:
+            logger.debug(f"Cannot measure rendered audio for calibration: {e}")
+            return
+        duration_model.observe(self.name, request.text, request.voice.id, request.rate,
+                               audio_duration, synthesis_time)
+
+    def _post_process(self, request: TTSRequest, render_path: Path, output_path: Path) -> Dict[str, Any]:
+        """Run the audio pipeline and format conversion on rendered audio (blocking)"""
+        pipeline = self._build_audio_pipeline(request)
+        if render_path != output_path:
+            return convert_audio(render_path, output_path, request.output_format, pipeline=pipeline)
+        if pipeline is None:
+            return {}
+
+        info = read_info(render_path)
+        pipeline.configure(info.sample_rate, info.channels)
+        if not pipeline.active:
+            return {}
+        # Rendered in the requested format already: process through a temporary copy
+        fd, name = tempfile.mkstemp(suffix=render_path.suffix or ".aiff", prefix="tts-notify-post-")
+        os.close(fd)
+        processed = Path(name)
+        try:
+            stats = convert_audio(render_path, processed, request.output_format, pipeline=pipeline)
+            shutil.copyfile(processed, output_path)
+        finally:
+            processed.unlink(missing_ok=True)
+        return stats
+
+    def needs_render(self, request: TTSRequest) -> bool:
+        """True if playing a request needs post-processed audio (pitch, volume)"""
+        return self._player is not None and effects_requested(request) and numpy_available()
+
+    async def prepare_playback(self, request: TTSRequest) -> Optional[Path]:
+        """Pre-render a queued request so it starts playing immediately"""
+        if self._player is None:
+            return None
+
+        fd, name = tempfile.mkstemp(suffix=".aiff", prefix="tts-notify-play-")
+        os.close(fd)
+        prepared = Path(name)
+        try:
+            response = await self.save(request, prepared)
+        except BaseException:
+            self.release_playback(prepared)
+            raise
+        if not response.success:
+            self.release_playback(prepared)
+            return None
+        return prepared
+
+    async def start_playback(self, request: TTSRequest,
+                             prepared: Optional[Path] = None) -> asyncio.subprocess.Process:
+        """Start playing a request, from pre-rendered audio when available"""
+        if prepared is not None and self._player is not None:
+            cmd = [self._player, str(prepared)]
+        else:
+            cmd = [self.command] + self._build_voice_args(request.voice)
+            if request.rate is not None:
+                cmd.extend(self._build_rate_args(request.rate))
+            cmd.append(request.text)
+
+        return await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+
+    def release_playback(self, prepared: Path) -> None:
+        """Remove a pre-rendered playback file"""
+        try:
+            prepared.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug(f"Failed to remove playback file {prepared}: {e}")
+
+    def _build_worker_payload(self, op: str, request: TTSRequest,
+                              output_path: Optional[Path] = None) -> Dict[str, Any]:
+        """Build a worker pool protocol message for a request"""
+        payload = {"op": op, "text": request.text, "voice": request.voice.id}
+        if request.rate is not None:
+            payload["rate"] = request.rate
+        if output_path is not None:
+            payload["output"] = str(output_path)
+        return payload
+
+    async def _execute(self, cmd: List[str], payload: Dict[str, Any],
+                       timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        """Dispatch to the worker pool when it is running, else spawn say"""
+        timeout = timeout or self._process_timeout
+        if self._worker_pool is None or not self._worker_pool.running:
+            return await self._run_command(cmd, timeout=timeout)
+
+        try:
+            response = await self._worker_pool.submit(payload, timeout=timeout)
+        except OSError as e:
+            # No worker could be spawned (bad worker command): the job never ran
+            logger.warning(f"Synthesis worker pool unavailable ({e}); spawning say instead")
+            return await self._run_command(cmd, timeout=timeout)
+        return subprocess.CompletedProcess(
+            args=[self.command] + cmd,
+            returncode=0 if response.get("ok") else 1,
+            stdout=b"",
+            stderr=(response.get("error") or "").encode()
+        )
 
     def _build_voice_args(self, voice: Voice) -> List[str]:
         """Build command arguments for voice selection"""
@@ -375,12 +1198,12 @@ class MacOSTTSEngine(SubprocessTTSEngine):
 
     def _build_pitch_args(self, pitch: float) -> List[str]:
         """Build command arguments for pitch (not supported by macOS say)"""
-        # macOS say doesn't support pitch adjustment
+        # Applied to the rendered audio by the pipeline instead (see PitchShifter)
         return []
 
     def _build_volume_args(self, volume: float) -> List[str]:
         """Build command arguments for volume (not supported by macOS say)"""
-        # macOS say doesn't support volume adjustment via command line
+        # Applied to the rendered audio by the pipeline instead (see Gain)
         return []
 
     def _build_format_args(self, format: AudioFormat, output_path: Path) -> List[str]:
@@ -391,80 +1214,715 @@ class MacOSTTSEngine(SubprocessTTSEngine):
         return ["-o", str(output_path)]
 
 
+@dataclass
+class EngineInstance:
+    """One member of an EngineGroup with its routing state"""
+    engine: TTSEngine
+    outstanding: int = 0
+    outstanding_work: float = 0.0    # Predicted seconds of work in flight
+    completed: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ejected_at: Optional[float] = None
+    ejections: int = 0
+    probing: bool = False
+
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_at is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "engine": repr(self.engine),
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "outstanding_work": round(self.outstanding_work, 3),
+            "completed": self.completed,
+            "failures": self.failures,
+            "ejections": self.ejections,
+        }
+
+
+class EngineGroup(TTSEngine):
+    """
+    Several interchangeable engine instances behind one name.
+
+    Each request goes to the healthy instance with the least predicted work
+    outstanding (see DurationModel), so one long text does not count the
+    same as a short notification. An instance failing eject_after times in a row is ejected and
+    re-admitted once a probe (is_available) succeeds after readmit_after
+    seconds.
+    """
+
+    def __init__(self, name: str, engines: List[TTSEngine],
+                 eject_after: int = 3, readmit_after: float = 10.0):
+        if not engines:
+            raise ValidationError("An engine group needs at least one engine")
+        super().__init__(name)
+        self.instances = [EngineInstance(engine) for engine in engines]
+        self.eject_after = eject_after
+        self.readmit_after = readmit_after
+        self._supported_formats = list(engines[0]._supported_formats)
+        self._next = 0
+
+    def add(self, engine: TTSEngine) -> None:
+        """Add another instance to the group"""
+        self.instances.append(EngineInstance(engine))
+
+    async def initialize(self) -> None:
+        """Initialize all instances concurrently"""
+        results = await asyncio.gather(
+            *[instance.engine.initialize() for instance in self.instances],
+            return_exceptions=True
+        )
+        for instance, result in zip(self.instances, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Ejecting {instance.engine!r}: initialization failed: {result}")
+                self._eject(instance)
+            else:
+                instance.engine._initialized = True
+        if all(not instance.healthy for instance in self.instances):
+            raise EngineNotAvailableError(self.name, "no instance could be initialized")
+        self._initialized = True
+
+    async def cleanup(self) -> None:
+        """Cleanup all instances concurrently"""
+        await asyncio.gather(
+            *[instance.engine.cleanup() for instance in self.instances],
+            return_exceptions=True
+        )
+        for instance in self.instances:
+            instance.engine._initialized = False
+        self._initialized = False
+
+    def is_available(self) -> bool:
+        return any(instance.engine.is_available() for instance in self.instances)
+
+    async def get_supported_voices(self) -> List[Voice]:
+        return await self.instances[0].engine.get_supported_voices()
+
+    def validate_request(self, request: TTSRequest) -> None:
+        self.instances[0].engine.validate_request(request)
+
+    def estimate_duration(self, request: TTSRequest) -> DurationEstimate:
+        return self.instances[0].engine.estimate_duration(request)
+
+    async def speak(self, request: TTSRequest) -> TTSResponse:
+        estimate = self.estimate_duration(request)
+        return await self._route(lambda engine: engine.speak(request),
+                                 estimate.overhead + estimate.audio_duration)
+
+    async def synthesize(self, request: TTSRequest) -> TTSResponse:
+        return await self._route(lambda engine: engine.synthesize(request),
+                                 self.estimate_duration(request).synthesis_time)
+
+    async def save(self, request: TTSRequest, output_path: Path) -> TTSResponse:
+        return await self._route(lambda engine: engine.save(request, output_path),
+                                 self.estimate_duration(request).synthesis_time)
+
+    def _eject(self, instance: EngineInstance) -> None:
+        if instance.healthy:
+            instance.ejected_at = time.time()
+            instance.ejections += 1
+            logger.warning(f"Ejected {instance.engine!r} from engine group '{self.name}'")
+
+    async def _probe(self, instance: EngineInstance) -> None:
+        """Re-admit an ejected instance if it answers a health probe"""
+        instance.probing = True
+        try:
+            available = await asyncio.to_thread(instance.engine.is_available)
+        except Exception:
+            available = False
+        finally:
+            instance.probing = False
+
+        if available:
+            instance.ejected_at = None
+            instance.consecutive_failures = 0
+            logger.info(f"Re-admitted {instance.engine!r} to engine group '{self.name}'")
+        else:
+            # Wait another readmit_after period before the next probe
+            instance.ejected_at = time.time()
+
+    async def _acquire(self) -> EngineInstance:
+        """Pick the healthy instance with the least predicted work outstanding"""
+        now = time.time()
+        due = [instance for instance in self.instances
+               if not instance.healthy and not instance.probing
+               and now - instance.ejected_at >= self.readmit_after]
+        probes = [asyncio.ensure_future(self._probe(instance)) for instance in due]
+
+        healthy = [instance for instance in self.instances if instance.healthy]
+        if not healthy and probes:
+            await asyncio.gather(*probes)
+            healthy = [instance for instance in self.instances if instance.healthy]
+        if not healthy:
+            raise EngineNotAvailableError(self.name, "all instances are ejected")
+
+        # Rotate the starting point so ties spread across instances
+        self._next = (self._next + 1) % len(healthy)
+        rotated = healthy[self._next:] + healthy[:self._next]
+        return min(rotated, key=lambda instance: (instance.outstanding_work, instance.outstanding))
+
+    def _record(self, instance: EngineInstance, ok: bool) -> None:
+        instance.completed += 1
+        if ok:
+            instance.consecutive_failures = 0
+            return
+        instance.failures += 1
+        instance.consecutive_failures += 1
+        if instance.consecutive_failures >= self.eject_after and \
+                sum(1 for other in self.instances if other.healthy) > 1:
+            self._eject(instance)
+        elif instance.consecutive_failures >= self.eject_after:
+            logger.warning(f"Keeping last healthy instance of '{self.name}' despite failures")
+
+    async def _route(self, operation, work: float = 0.0) -> TTSResponse:
+        instance = await self._acquire()
+        instance.outstanding += 1
+        instance.outstanding_work += work
+        try:
+            response = await operation(instance.engine)
+        except (ValidationError, VoiceNotFoundError, RequestCancelledError):
+            raise
+        except Exception:
+            self._record(instance, False)
+            raise
+        finally:
+            instance.outstanding -= 1
+            instance.outstanding_work = max(0.0, instance.outstanding_work - work)
+        if response.success or not _is_client_error(response):
+            self._record(instance, response.success)
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-instance routing and health state"""
+        return {
+            "instances": [instance.to_dict() for instance in self.instances],
+            "healthy": sum(1 for instance in self.instances if instance.healthy),
+            "outstanding": sum(instance.outstanding for instance in self.instances),
+        }
+
+    async def get_engine_info(self) -> Dict[str, Any]:
+        """Engine information from the first instance plus group state"""
+        info = await self.instances[0].engine.get_engine_info()
+        info.update({"name": self.name, "initialized": self._initialized,
+                     "group": self.get_stats()})
+        return info
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name='{self.name}', instances={len(self.instances)})"
+
+
+class GuardedEngine(TTSEngine):
+    """
+    Registry view of an engine that applies its circuit breaker.
+
+    Requests fail fast while the breaker is open and fall back to another
+    registered engine when one exists. Everything else is delegated to the
+    wrapped engine.
+    """
+
+    def __init__(self, engine: TTSEngine, registry: "EngineRegistry"):
+        # Not calling TTSEngine.__init__: state lives on the wrapped engine
+        self.name = engine.name
+        self.engine = engine
+        self._registry = registry
+
+    @property
+    def _initialized(self) -> bool:
+        return self.engine._initialized
+
+    @_initialized.setter
+    def _initialized(self, value: bool) -> None:
+        self.engine._initialized = value
+
+    @property
+    def _supported_formats(self) -> List[AudioFormat]:
+        return self.engine._supported_formats
+
+    async def initialize(self) -> None:
+        await self.engine.initialize()
+
+    async def cleanup(self) -> None:
+        await self.engine.cleanup()
+
+    def is_available(self) -> bool:
+        return self.engine.is_available()
+
+    async def get_supported_voices(self) -> List[Voice]:
+        return await self.engine.get_supported_voices()
+
+    def validate_request(self, request: TTSRequest) -> None:
+        self.engine.validate_request(request)
+
+    def estimate_duration(self, request: TTSRequest) -> DurationEstimate:
+        return self.engine.estimate_duration(request)
+
+    async def speak(self, request: TTSRequest) -> TTSResponse:
+        return await self._registry.execute(self.name, "speak", request)
+
+    async def synthesize(self, request: TTSRequest) -> TTSResponse:
+        return await self._registry.execute(self.name, "synthesize", request)
+
+    async def save(self, request: TTSRequest, output_path: Path) -> TTSResponse:
+        return await self._registry.execute(self.name, "save", request, output_path)
+
+    async def get_engine_info(self) -> Dict[str, Any]:
+        info = await self.engine.get_engine_info()
+        info["circuit_breaker"] = self._registry.get_breaker(self.name).to_dict()
+        return info
+
+    def __getattr__(self, item: str) -> Any:
+        # Engine-specific helpers (get_cache_stats, prepare_playback, ...)
+        if item == "engine":
+            raise AttributeError(item)
+        return getattr(self.engine, item)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.engine!r})"
+
+
 class EngineRegistry:
     """Registry for managing TTS engines"""
 
     def __init__(self):
         self._engines: Dict[str, TTSEngine] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._guarded: Dict[str, GuardedEngine] = {}
         self._default_engine: Optional[str] = None
+        self._info_snapshot: Optional[Dict[str, Dict[str, Any]]] = None
+        self._info_snapshot_time = 0.0
+        self._lazy: Dict[str, Callable[[], TTSEngine]] = {}
+        self._lazy_groups: Set[str] = set()
+        self._pending_init: Dict[str, Optional[asyncio.Future]] = {}
+        self._plugins_discovered = False
 
     def register(self, engine: TTSEngine, is_default: bool = False) -> None:
         """Register a TTS engine"""
         self._engines[engine.name] = engine
+        self._breakers[engine.name] = self._build_breaker(engine.name)
+        self._guarded.pop(engine.name, None)
+        self._info_snapshot = None
         if is_default or self._default_engine is None:
             self._default_engine = engine.name
         logger.info(f"Registered TTS engine: {engine.name}")
 
+    @staticmethod
+    def _build_breaker(name: str) -> CircuitBreaker:
+        try:
+            return CircuitBreaker.from_config(name, config_manager.get_config())
+        except Exception as e:
+            logger.warning(f"Using default circuit breaker settings for '{name}': {e}")
+            return CircuitBreaker(name)
+
+    def get_breaker(self, name: Optional[str] = None) -> CircuitBreaker:
+        """Get the circuit breaker guarding an engine"""
+        name = name or self._default_engine
+        if name not in self._breakers:
+            raise EngineNotAvailableError(str(name), "not registered")
+        return self._breakers[name]
+
+    def register_instances(
+        self,
+        factory: Callable[[], TTSEngine],
+        count: Optional[int] = None,
+        is_default: bool = False
+    ) -> EngineGroup:
+        """
+        Register several instances of an engine behind one name.
+
+        Args:
+            factory: Callable creating one engine instance
+            count: Number of instances (default TTS_NOTIFY_ENGINE_INSTANCES)
+            is_default: Make this group the default engine
+
+        Returns:
+            The EngineGroup routing requests across the instances
+        """
+        config = config_manager.get_config()
+        count = count or getattr(config, "TTS_NOTIFY_ENGINE_INSTANCES", 1)
+        engines = [factory() for _ in range(max(1, count))]
+        for engine in engines[1:]:
+            engine.share_components(engines[0])
+        group = EngineGroup(
+            engines[0].name,
+            engines,
+            eject_after=getattr(config, "TTS_NOTIFY_ENGINE_EJECT_AFTER", 3),
+            readmit_after=getattr(config, "TTS_NOTIFY_ENGINE_READMIT_AFTER", 10.0)
+        )
+        self.register(group, is_default=is_default)
+        return group
+
+    def add_instance(self, engine: TTSEngine) -> EngineGroup:
+        """Add an engine as another instance of the group with its name"""
+        existing = self._engines.get(engine.name)
+        if isinstance(existing, EngineGroup):
+            existing.add(engine)
+            return existing
+
+        group = EngineGroup(engine.name, [existing, engine] if existing else [engine])
+        self._engines[engine.name] = group
+        self._breakers.setdefault(engine.name, self._build_breaker(engine.name))
+        self._guarded.pop(engine.name, None)
+        self._info_snapshot = None
+        if self._default_engine is None:
+            self._default_engine = engine.name
+        logger.info(f"Engine '{engine.name}' now has {len(group.instances)} instances")
+        return group
+
+    def register_lazy(self, name: str, factory: Callable[[], TTSEngine], is_default: bool = False,
+                      instances: bool = False) -> None:
+        """
+        Register an engine that is created and initialized on first use.
+
+        Args:
+            name: Engine name
+            factory: Zero-argument callable creating the engine (imports happen here)
+            is_default: Make this engine the default
+            instances: Create TTS_NOTIFY_ENGINE_INSTANCES instances behind one
+                EngineGroup (see register_instances) when that is more than one
+        """
+        if name in self._engines:
+            return
+        self._lazy[name] = factory
+        if instances:
+            self._lazy_groups.add(name)
+        self._info_snapshot = None
+        if is_default or self._default_engine is None:
+            self._default_engine = name
+        logger.debug(f"Registered lazy TTS engine: {name}")
+
+    def discover_plugins(self) -> List[str]:
+        """Register engine plugins from entry points (imports nothing)"""
+        self._plugins_discovered = True
+        try:
+            from ..plugins import plugin_manager
+        except ImportError as e:
+            logger.debug(f"Plugin discovery unavailable: {e}")
+            return []
+        names = []
+        for name, factory in plugin_manager.engine_factories().items():
+            if name not in self._engines and name not in self._lazy:
+                self.register_lazy(name, factory)
+                names.append(name)
+        return names
+
+    def _materialize(self, name: str) -> bool:
+        """Create a lazily registered engine"""
+        if name not in self._lazy and not self._plugins_discovered:
+            self.discover_plugins()
+        factory = self._lazy.pop(name, None)
+        if factory is None:
+            return False
+
+        def build() -> TTSEngine:
+            # The engine is stored under the name it was registered with
+            engine = factory()
+            engine.name = name
+            return engine
+
+        was_default = self._default_engine == name
+        grouped = name in self._lazy_groups and self._lifecycle_setting("TTS_NOTIFY_ENGINE_INSTANCES", 1) > 1
+        self._lazy_groups.discard(name)
+        try:
+            if grouped:
+                self.register_instances(build, is_default=was_default)
+            else:
+                self.register(build(), is_default=was_default)
+        except Exception as e:
+            raise EngineNotAvailableError(name, f"failed to load: {e}")
+        self._pending_init[name] = None
+        return True
+
+    async def _ensure_initialized(self, name: str) -> None:
+        """Initialize a lazily created engine once, on its first request"""
+        if name not in self._pending_init:
+            return
+        engine = self._engines[name]
+        task = self._pending_init[name]
+        if task is None:
+            task = asyncio.ensure_future(engine.initialize())
+            self._pending_init[name] = task
+        try:
+            await asyncio.shield(task)
+        except Exception:
+            if self._pending_init.get(name) is task:
+                self._pending_init[name] = None
+            raise
+        engine._initialized = True
+        self._pending_init.pop(name, None)
+
     def unregister(self, name: str) -> None:
         """Unregister a TTS engine"""
+        self._lazy_groups.discard(name)
+        if self._lazy.pop(name, None) is not None and self._default_engine == name:
+            self._default_engine = next(iter(self._engines.keys()), None)
         if name in self._engines:
             del self._engines[name]
+            self._breakers.pop(name, None)
+            self._guarded.pop(name, None)
+            self._pending_init.pop(name, None)
+            self._info_snapshot = None
             if self._default_engine == name:
                 self._default_engine = next(iter(self._engines.keys()), None)
             logger.info(f"Unregistered TTS engine: {name}")
 
-    def get(self, name: Optional[str] = None) -> TTSEngine:
-        """Get a TTS engine by name"""
+    def get(self, name: Optional[str] = None, guarded: bool = True) -> TTSEngine:
+        """Get a TTS engine by name (behind its circuit breaker unless guarded=False)"""
+        if name is None and not self._plugins_discovered:
+            self.discover_plugins()
         if name is None:
             name = self._default_engine
 
         if name is None:
             raise EngineNotAvailableError("No TTS engine available and no default set")
 
-        if name not in self._engines:
+        if name not in self._engines and not self._materialize(name):
             raise EngineNotAvailableError(f"TTS engine '{name}' not registered")
 
-        return self._engines[name]
+        if not guarded:
+            return self._engines[name]
+        if name not in self._guarded:
+            self._guarded[name] = GuardedEngine(self._engines[name], self)
+        return self._guarded[name]
+
+    @staticmethod
+    def _is_timeout(response: TTSResponse) -> bool:
+        return bool(response.metadata.get("timeout")) or "timed out" in (response.error or "").lower()
+
+    def _candidates(self, primary: str) -> List[str]:
+        """Primary engine first, then fallbacks (default engine first)"""
+        try:
+            fallback = config_manager.get_config().TTS_NOTIFY_ENGINE_FALLBACK
+        except Exception:
+            fallback = True
+        if not fallback:
+            return [primary]
+        others = sorted((n for n in self._engines
+                         if n != primary and self._engines[n].fallback_eligible),
+                        key=lambda n: n != self._default_engine)
+        return [primary] + others
+
+    async def execute(self, name: Optional[str], operation: str,
+                      request: TTSRequest, *args) -> TTSResponse:
+        """
+        Run an engine operation through circuit breakers.
+
+        Args:
+            name: Engine name (default engine if None)
+            operation: "speak", "synthesize" or "save"
+            request: The request
+            *args: Extra operation arguments (output path for save)
+
+        Returns:
+            The first successful response, else the primary engine's failure
+
+        Raises:
+            CircuitOpenError: Every candidate engine is rejecting requests
+        """
+        primary = name or self._default_engine
+        if primary not in self._engines and not self._materialize(str(primary)):
+            raise EngineNotAvailableError(str(primary), "not registered")
+
+        last_response: Optional[TTSResponse] = None
+        last_error: Optional[Exception] = None
+        for candidate in self._candidates(primary):
+            breaker = self._breakers[candidate]
+            if not breaker.allow():
+                last_error = last_error or CircuitOpenError(candidate, breaker.retry_after())
+                continue
+
+            try:
+                await self._ensure_initialized(candidate)
+                call = getattr(self._engines[candidate], operation)(request, *args)
+                if breaker.call_timeout:
+                    response = await asyncio.wait_for(call, timeout=breaker.call_timeout)
+                else:
+                    response = await call
+            except (ValidationError, VoiceNotFoundError):
+                # The caller's mistake, not a fault of the engine
+                breaker.record_ignored()
+                if candidate == primary:
+                    raise
+                continue
+            except (asyncio.CancelledError, RequestCancelledError):
+                # Cancelled by the caller, not a fault of the engine
+                breaker.record_ignored()
+                raise
+            except asyncio.TimeoutError:
+                breaker.record_failure(timeout=True)
+                last_error = last_error or TTSError(
+                    f"Engine call timed out after {breaker.call_timeout} seconds", engine_name=candidate
+                )
+                continue
+            except Exception as e:
+                breaker.record_failure()
+                last_error = last_error or e
+                continue
+
+            if response.success:
+                breaker.record_success()
+                if candidate != primary:
+                    logger.info(f"Engine '{primary}' unavailable, served by fallback '{candidate}'")
+                    response.metadata.update({"engine": candidate, "fallback_from": primary})
+                return response
+
+            if _is_client_error(response):
+                breaker.record_ignored()
+            else:
+                breaker.record_failure(timeout=self._is_timeout(response))
+            last_response = last_response or response
+
+        if last_response is not None:
+            return last_response
+        raise last_error
 
     def list_available(self) -> List[str]:
-        """List available engine names"""
-        return list(self._engines.keys())
+        """List available engine names, including not-yet-loaded plugins"""
+        if not self._plugins_discovered:
+            self.discover_plugins()
+        return list(self._engines.keys()) + [name for name in self._lazy if name not in self._engines]
 
-    async def initialize_all(self) -> None:
-        """Initialize all registered engines"""
-        for name, engine in self._engines.items():
-            if not engine._initialized:
-                try:
-                    await engine.initialize()
-                    engine._initialized = True
-                except Exception as e:
-                    logger.warning(f"Failed to initialize engine '{name}': {e}")
+    @staticmethod
+    def _lifecycle_setting(name: str, default: float) -> float:
+        try:
+            return getattr(config_manager.get_config(), name, default)
+        except Exception:
+            return default
+
+    async def _run_all(self, action: str, engines: Dict[str, TTSEngine],
+                       timeout: float) -> Dict[str, bool]:
+        """Run initialize/cleanup on engines concurrently, each with a timeout"""
+        async def run_one(name: str, engine: TTSEngine) -> bool:
+            try:
+                await asyncio.wait_for(getattr(engine, action)(), timeout=timeout)
+                return True
+            except asyncio.TimeoutError:
+                logger.warning(f"Timed out after {timeout}s during {action} of engine '{name}'")
+            except Exception as e:
+                logger.warning(f"Failed to {action} engine '{name}': {e}")
+            return False
 
-    async def cleanup_all(self) -> None:
-        """Cleanup all registered engines"""
-        for name, engine in self._engines.items():
-            if engine._initialized:
-                try:
-                    await engine.cleanup()
-                    engine._initialized = False
-                except Exception as e:
-                    logger.warning(f"Failed to cleanup engine '{name}': {e}")
+        results = await asyncio.gather(*[run_one(name, engine) for name, engine in engines.items()])
+        self._info_snapshot = None
+        return dict(zip(engines.keys(), results))
+
+    async def initialize_all(self) -> Dict[str, bool]:
+        """Initialize all registered engines concurrently"""
+        pending = {name: engine for name, engine in self._engines.items() if not engine._initialized}
+        results = await self._run_all(
+            "initialize", pending, self._lifecycle_setting("TTS_NOTIFY_ENGINE_INIT_TIMEOUT", 10.0)
+        )
+        for name, ok in results.items():
+            if ok:
+                pending[name]._initialized = True
+                self._pending_init.pop(name, None)
+        return results
+
+    async def cleanup_all(self) -> Dict[str, bool]:
+        """Cleanup all registered engines concurrently"""
+        pending = {name: engine for name, engine in self._engines.items() if engine._initialized}
+        results = await self._run_all(
+            "cleanup", pending, self._lifecycle_setting("TTS_NOTIFY_ENGINE_INIT_TIMEOUT", 10.0)
+        )
+        for name, ok in results.items():
+            if ok:
+                pending[name]._initialized = False
+        return results
 
     async def get_engine_info(self, name: Optional[str] = None) -> Dict[str, Any]:
         """Get information about an engine"""
         engine = self.get(name)
         return await engine.get_engine_info()
 
-    async def get_all_engine_info(self) -> Dict[str, Dict[str, Any]]:
-        """Get information about all engines"""
+    async def get_all_engine_info(self, refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Get information about all engines.
+
+        Engine info is gathered concurrently (each call bounded by
+        TTS_NOTIFY_ENGINE_INIT_TIMEOUT) and cached for TTS_NOTIFY_ENGINE_INFO_TTL
+        seconds; circuit breaker state is always current.
+        """
+        ttl = self._lifecycle_setting("TTS_NOTIFY_ENGINE_INFO_TTL", 5.0)
+        snapshot = self._info_snapshot
+        if refresh or snapshot is None or time.time() - self._info_snapshot_time >= ttl:
+            timeout = self._lifecycle_setting("TTS_NOTIFY_ENGINE_INIT_TIMEOUT", 10.0)
+
+            async def info_for(engine: TTSEngine) -> Dict[str, Any]:
+                try:
+                    return await asyncio.wait_for(engine.get_engine_info(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    return {"error": f"Timed out after {timeout}s"}
+                except Exception as e:
+                    return {"error": str(e)}
+
+            engines = dict(self._engines)
+            results = await asyncio.gather(*[info_for(engine) for engine in engines.values()])
+            snapshot = dict(zip(engines.keys(), results))
+            self._info_snapshot = snapshot
+            self._info_snapshot_time = time.time()
+
         info = {}
-        for name, engine in self._engines.items():
-            try:
-                info[name] = await engine.get_engine_info()
-            except Exception as e:
-                info[name] = {"error": str(e)}
+        for name, engine_info in snapshot.items():
+            info[name] = dict(engine_info)
+            if name in self._breakers:
+                info[name]["circuit_breaker"] = self._breakers[name].to_dict()
+        # Plugins that have not been used yet are listed without importing them
+        for name in self._lazy:
+            info.setdefault(name, {"name": name, "loaded": False})
         return info
 
 
-# Global engine registry instance
-engine_registry = EngineRegistry()
\ No newline at end of file
+def create_engine(name: Optional[str] = None) -> TTSEngine:
+    """
+    Create a standalone engine by name.
+
+    Args:
+        name: "macos", "synthetic" or an engine plugin name (default: TTS_NOTIFY_ENGINE)
+
+    Returns:
+        A new, uninitialized engine
+    """
+    if name is None:
+        try:
+            name = getattr(config_manager.get_config(), "TTS_NOTIFY_ENGINE", "macos")
+        except Exception:
+            name = "macos"
+    if name == "macos":
+        return MacOSTTSEngine()
+    if name == "synthetic":
+        from .synthetic_engine import SyntheticTTSEngine
+        return SyntheticTTSEngine()
+
+    from ..plugins import plugin_manager
+    if name in plugin_manager.engines():
+        return plugin_manager.create_engine(name)
+    raise EngineNotAvailableError(name, "unknown engine")
+
+
+def get_engine(name: Optional[str] = None) -> TTSEngine:
+    """
+    Get an engine from the global registry, behind its circuit breaker.
+
+    Requests fall back to other engines while it is failing, and built-in
+    engines run as TTS_NOTIFY_ENGINE_INSTANCES instances when configured.
+
+    Args:
+        name: Engine name (default: TTS_NOTIFY_ENGINE)
+
+    Returns:
+        The guarded engine; it is initialized on its first request
+    """
+    if name is None:
+        try:
+            name = getattr(config_manager.get_config(), "TTS_NOTIFY_ENGINE", "macos")
+        except Exception:
+            name = "macos"
+    return engine_registry.get(name)
+
+
+# Global engine registry instance; built-in engines are created on first use
+engine_registry = EngineRegistry()
+engine_registry.register_lazy("macos", lambda: create_engine("macos"), is_default=True, instances=True)
+engine_registry.register_lazy("synthetic", lambda: create_engine("synthetic"), instances=True)
@@ -6,7 +6,6 @@ Handles voice detection, searching, categorization, and filtering with caching.
 """
 
 import asyncio
-import subprocess
 import unicodedata
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
@@ -19,6 +18,7 @@ import logging
 from .models import Voice, Gender, VoiceQuality, Language
 from .exceptions import VoiceDetectionError, VoiceNotFoundError, ValidationError
 from .config_manager import config_manager
+from .capability_probe import capability_probe
 
 logger = logging.getLogger(__name__)
 
@@ -170,13 +170,8 @@ class MacOSVoiceDetector(VoiceDetector):
         self._cache_timestamp = 0
 
     def is_available(self) -> bool:
-        """Check if say command is available"""
-        try:
-            subprocess.run([self._say_command, "-v", "?"],
-                         capture_output=True, timeout=5, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+        """Check if say command is available (cached, see CapabilityProbe)"""
+        return capability_probe.probe([self._say_command, "-v", "?"]).available
 
     async def detect_voices(self) -> List[Voice]:
         """Detect macOS system voices with caching"""
@@ -189,18 +184,13 @@ class MacOSVoiceDetector(VoiceDetector):
             return self._cache.copy()
 
         try:
-            # Run say -v ? to get voice list
-            process = await asyncio.create_subprocess_exec(
-                self._say_command, "-v", "?",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, stderr = await process.communicate()
+            # Run say -v ? to get voice list (shared with availability checks)
+            result = await capability_probe.probe_async([self._say_command, "-v", "?"])
 
-            if process.returncode != 0:
-                raise VoiceDetectionError("macOS TTS", stderr.decode() if stderr else "Unknown error")
+            if not result.available:
+                raise VoiceDetectionError("macOS TTS", result.stderr or "Unknown error")
 
-            voices = self._parse_voice_list(stdout.decode())
+            voices = self._parse_voice_list(result.stdout)
 
             # Update cache
             self._cache = voices
@@ -342,6 +332,7 @@ class VoiceManager:
         self._cache_ttl = cache_ttl
         self._cache_timestamp = 0
         self._filter = VoiceFilter()
+        self._plugins_loaded = False
 
         # Register default detectors
         self._register_default_detectors()
@@ -354,6 +345,28 @@ class VoiceManager:
             self._detectors.append(macos_detector)
             logger.info("Registered macOS voice detector")
 
+    def _load_plugin_detectors(self):
+        """Import detector plugins the first time voices are needed"""
+        if self._plugins_loaded:
+            return
+        self._plugins_loaded = True
+        try:
+            from ..plugins import plugin_manager
+            factories = plugin_manager.detector_factories()
+        except Exception as e:
+            logger.debug(f"Voice detector plugins unavailable: {e}")
+            return
+
+        for name, factory in factories.items():
+            try:
+                detector = factory()
+            except Exception as e:
+                logger.warning(f"Failed to load voice detector plugin '{name}': {e}")
+                continue
+            if detector.is_available():
+                self._detectors.append(detector)
+                logger.info(f"Registered voice detector plugin: {name}")
+
     def register_detector(self, detector: VoiceDetector):
         """Register a custom voice detector"""
         self._detectors.append(detector)
@@ -378,6 +391,7 @@ class VoiceManager:
             logger.debug("Using cached voices (refresh not needed)")
             return
 
+        self._load_plugin_detectors()
         voices = []
         detector_count = 0
 
@@ -0,0 +1,390 @@
+"""
+Synthesis Worker Pool for TTS Notify v2
+
+This module manages a pool of long-lived synthesis worker processes.
+Workers speak a line-delimited JSON protocol over stdin/stdout, so process
+spawn and voice loading are paid once per worker instead of once per request.
+
+Protocol (one JSON object per line):
+    request:  {"id": 1, "op": "synthesize", "text": "...", "voice": "Alex",
+               "rate": 175, "output": "/path/out.aiff"}
+              {"id": 2, "op": "speak", "text": "...", "voice": "Alex"}
+              {"id": 3, "op": "ping"}
+    response: {"id": 1, "ok": true}
+              {"id": 1, "ok": false, "error": "..."}
+"""
+
+import asyncio
+import importlib.util
+import itertools
+import json
+import os
+import shlex
+import signal
+import sys
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+import logging
+
+from .exceptions import TTSError
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_command() -> List[str]:
+    """Command line for the bundled synthesis worker"""
+    return [sys.executable, str(Path(__file__).with_name("synthesis_worker.py"))]
+
+
+def appkit_available() -> bool:
+    """Whether the bundled worker can keep voices loaded (macOS with PyObjC)"""
+    try:
+        return importlib.util.find_spec("AppKit") is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@dataclass
+class WorkerPoolStats:
+    """Lifecycle and throughput counters for the worker pool"""
+    spawned: int = 0
+    recycled: int = 0
+    failed: int = 0
+    health_checks: int = 0
+    jobs_completed: int = 0
+    jobs_failed: int = 0
+    jobs_cancelled: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class SynthesisWorker:
+    """A single long-lived worker process"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, command: List[str]):
+        self.command = command
+        self.worker_id = next(self._ids)
+        self.jobs_done = 0
+        self.started_at = 0.0
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._request_ids = itertools.count(1)
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process else None
+
+    async def start(self) -> None:
+        """Spawn the worker process"""
+        self._process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            # Own process group, so kill() also reaches the say it is running
+            start_new_session=True
+        )
+        self.started_at = time.time()
+
+    async def request(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send one request and wait for its response"""
+        if not self.alive:
+            raise TTSError(f"Synthesis worker {self.worker_id} is not running")
+
+        message = dict(payload, id=next(self._request_ids))
+        self._process.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+        await self._process.stdin.drain()
+
+        while True:
+            line = await asyncio.wait_for(self._process.stdout.readline(), timeout=timeout)
+            if not line:
+                raise TTSError(f"Synthesis worker {self.worker_id} exited unexpectedly")
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                logger.debug(f"Ignoring non-protocol output from worker {self.worker_id}: {line!r}")
+                continue
+            if response.get("id") == message["id"]:
+                return response
+
+    async def ping(self, timeout: float = 5.0) -> bool:
+        """Health check: the worker must answer a ping"""
+        try:
+            response = await self.request({"op": "ping"}, timeout=timeout)
+            return bool(response.get("ok"))
+        except Exception:
+            return False
+
+    def kill(self) -> None:
+        """Kill the worker and whatever it is running right now"""
+        if not self.alive:
+            return
+        try:
+            os.killpg(self._process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            try:
+                self._process.kill()
+            except ProcessLookupError:
+                pass
+
+    async def stop(self, timeout: float = 2.0) -> None:
+        """Ask the worker to exit, killing it if it does not"""
+        if self._process is None:
+            return
+        process, self._process = self._process, None
+        if process.returncode is not None:
+            return
+        try:
+            process.stdin.close()
+            await asyncio.wait_for(process.wait(), timeout=timeout)
+        except (asyncio.TimeoutError, ConnectionError, OSError):
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+
+class SynthesisWorkerPool:
+    """Pool of long-lived synthesis workers with recycling and health checks"""
+
+    def __init__(
+        self,
+        command: Optional[List[str]] = None,
+        min_size: int = 1,
+        max_size: int = 4,
+        max_jobs_per_worker: int = 500,
+        health_check_interval: float = 30.0,
+        request_timeout: float = 60.0
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Worker pool requires 0 <= min_size <= max_size and max_size >= 1")
+
+        self.command = command or default_worker_command()
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.health_check_interval = health_check_interval
+        self.request_timeout = request_timeout
+
+        self._idle: List[SynthesisWorker] = []
+        self._busy: Dict[int, SynthesisWorker] = {}
+        self._checking: List[SynthesisWorker] = []
+        self._spawning = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._running = False
+        self.stats = WorkerPoolStats()
+
+    @classmethod
+    def from_config(cls, config) -> Optional["SynthesisWorkerPool"]:
+        """Build a pool from a TTSConfig, or None if the pool is disabled"""
+        if not getattr(config, "TTS_NOTIFY_WORKER_POOL_ENABLED", False):
+            return None
+        command = getattr(config, "TTS_NOTIFY_WORKER_COMMAND", "")
+        if not command and not appkit_available():
+            # The bundled worker would fall back to spawning say per job: only an extra hop
+            logger.warning("Synthesis worker pool requires PyObjC (pip install 'tts-notify[pyobjc]'); "
+                           "not starting it")
+            return None
+        return cls(
+            command=shlex.split(command) if command else None,
+            min_size=getattr(config, "TTS_NOTIFY_WORKER_POOL_MIN", 1),
+            max_size=getattr(config, "TTS_NOTIFY_WORKER_POOL_MAX", 4),
+            max_jobs_per_worker=getattr(config, "TTS_NOTIFY_WORKER_MAX_JOBS", 500),
+            request_timeout=getattr(config, "TTS_NOTIFY_TIMEOUT", 60),
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self._idle) + len(self._busy) + len(self._checking) + self._spawning
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    async def start(self) -> None:
+        """Spawn the minimum number of workers and start health checks"""
+        if self._running:
+            return
+        self._condition = asyncio.Condition()
+        self._running = True
+        await asyncio.gather(*[self._spawn_idle() for _ in range(self.min_size)])
+        if self.health_check_interval > 0:
+            self._health_task = asyncio.create_task(self._health_loop())
+        logger.info(f"Synthesis worker pool started with {len(self._idle)} workers")
+
+    async def stop(self) -> None:
+        """Stop health checks and all workers"""
+        if not self._running:
+            return
+        self._running = False
+        if self._health_task:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+        workers = self._idle + self._checking + list(self._busy.values())
+        self._idle, self._checking, self._busy = [], [], {}
+        await asyncio.gather(*[w.stop() for w in workers], return_exceptions=True)
+        async with self._condition:
+            self._condition.notify_all()
+        logger.info("Synthesis worker pool stopped")
+
+    async def _spawn(self) -> SynthesisWorker:
+        worker = SynthesisWorker(self.command)
+        try:
+            await worker.start()
+        except Exception:
+            self.stats.failed += 1
+            raise
+        self.stats.spawned += 1
+        return worker
+
+    async def _spawn_idle(self) -> None:
+        self._spawning += 1
+        try:
+            worker = await self._spawn()
+        except Exception as e:
+            logger.warning(f"Failed to spawn synthesis worker: {e}")
+            return
+        finally:
+            self._spawning -= 1
+        async with self._condition:
+            self._idle.append(worker)
+            self._condition.notify()
+
+    async def _acquire(self) -> SynthesisWorker:
+        """Get an idle worker, growing the pool up to max_size"""
+        async with self._condition:
+            while True:
+                if not self._running:
+                    raise TTSError("Synthesis worker pool is not running")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive:
+                        self._busy[worker.worker_id] = worker
+                        return worker
+                    self.stats.failed += 1
+                if self.size < self.max_size:
+                    self._spawning += 1
+                    break
+                await self._condition.wait()
+
+        try:
+            worker = await self._spawn()
+        finally:
+            self._spawning -= 1
+        self._busy[worker.worker_id] = worker
+        return worker
+
+    async def _release(self, worker: SynthesisWorker, healthy: bool) -> None:
+        """Return a worker to the pool, recycling it when worn out or broken"""
+        self._busy.pop(worker.worker_id, None)
+        recycle = (not healthy or not worker.alive or not self._running or
+                   worker.jobs_done >= self.max_jobs_per_worker)
+        if recycle:
+            if healthy and worker.alive:
+                self.stats.recycled += 1
+            await worker.stop()
+            if self._running and self.size < self.min_size:
+                await self._spawn_idle()
+        else:
+            self._idle.append(worker)
+
+        if self._condition:
+            async with self._condition:
+                self._condition.notify()
+
+    async def submit(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Run one request on a pooled worker and return its response"""
+        timeout = timeout or self.request_timeout
+        worker = await self._acquire()
+        healthy = False
+        try:
+            response = await worker.request(payload, timeout=timeout)
+            worker.jobs_done += 1
+            healthy = True
+        except asyncio.TimeoutError:
+            self.stats.jobs_failed += 1
+            worker.kill()
+            raise TTSError(f"Synthesis worker {worker.worker_id} timed out after {timeout} seconds")
+        except asyncio.CancelledError:
+            # The job cannot be withdrawn from a busy worker; replace the worker instead
+            self.stats.jobs_cancelled += 1
+            worker.kill()
+            raise
+        except Exception:
+            self.stats.jobs_failed += 1
+            raise
+        finally:
+            await self._release(worker, healthy)
+
+        if response.get("ok"):
+            self.stats.jobs_completed += 1
+        else:
+            self.stats.jobs_failed += 1
+        return response
+
+    async def health_check(self) -> int:
+        """Ping idle workers, replace dead ones and refill to min_size"""
+        self.stats.health_checks += 1
+        async with self._condition:
+            self._checking, self._idle = self._idle, []
+
+        candidates = self._checking
+        results = await asyncio.gather(*[w.ping() for w in candidates])
+        self._checking = []
+        replaced = 0
+        for worker, ok in zip(candidates, results):
+            if ok:
+                self._idle.append(worker)
+            else:
+                replaced += 1
+                self.stats.failed += 1
+                await worker.stop()
+
+        while self._running and self.size < self.min_size:
+            before = self.size
+            await self._spawn_idle()
+            if self.size == before:
+                break
+
+        if replaced:
+            logger.warning(f"Health check replaced {replaced} unresponsive synthesis workers")
+        async with self._condition:
+            self._condition.notify_all()
+        return replaced
+
+    async def _health_loop(self) -> None:
+        while self._running:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.health_check()
+            except Exception as e:
+                logger.warning(f"Worker pool health check failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool occupancy and counters"""
+        stats = self.stats.to_dict()
+        stats.update({
+            "running": self._running,
+            "idle": len(self._idle),
+            "busy": len(self._busy),
+            "size": self.size,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "max_jobs_per_worker": self.max_jobs_per_worker,
+        })
+        return stats
@@ -5,4 +5,12 @@ This package provides extensible plugin architecture for TTS engines,
 voice processors, and output handlers.
 """
 
-__all__ = []
\ No newline at end of file
+from .loader import PluginManager, PluginSpec, plugin_manager, ENGINE_GROUP, DETECTOR_GROUP
+
+__all__ = [
+    "PluginManager",
+    "PluginSpec",
+    "plugin_manager",
+    "ENGINE_GROUP",
+    "DETECTOR_GROUP",
+]
@@ -0,0 +1,217 @@
+"""
+Plugin Loader for TTS Notify v2
+
+This module discovers TTS engines and voice detectors published by installed
+distributions through package entry points:
+
+    [project.entry-points."tts_notify.engines"]
+    espeak = "tts_notify_espeak:ESpeakEngine"
+
+    [project.entry-points."tts_notify.voice_detectors"]
+    espeak = "tts_notify_espeak:ESpeakVoiceDetector"
+
+Discovery only reads distribution metadata. A plugin module is imported the
+first time the plugin is used, so start-up cost does not grow with the
+number of installed plugins.
+"""
+
+import time
+from dataclasses import dataclass, field
+from importlib import metadata
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+ENGINE_GROUP = "tts_notify.engines"
+DETECTOR_GROUP = "tts_notify.voice_detectors"
+
+
+@dataclass
+class PluginSpec:
+    """A discovered (not necessarily imported) plugin"""
+    name: str
+    group: str
+    value: str
+    distribution: Optional[str] = None
+    entry_point: Any = field(default=None, repr=False)
+    plugin_class: Optional[type] = field(default=None, repr=False)
+    load_time: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.plugin_class is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "group": self.group,
+            "value": self.value,
+            "distribution": self.distribution,
+            "loaded": self.loaded,
+            "load_time": self.load_time,
+            "error": self.error,
+        }
+
+
+class PluginManager:
+    """Entry-point based discovery with import on first use"""
+
+    def __init__(self, enabled: Optional[bool] = None, disabled: Optional[List[str]] = None):
+        self._enabled = enabled
+        self._disabled = disabled
+        self._specs: Dict[str, Dict[str, PluginSpec]] = {}
+        self._discovered = False
+
+    def _settings(self):
+        """Read plugin settings lazily so importing this module stays cheap"""
+        enabled, disabled = self._enabled, self._disabled
+        if enabled is None or disabled is None:
+            try:
+                from ..core.config_manager import config_manager
+                config = config_manager.get_config()
+                if enabled is None:
+                    enabled = getattr(config, "TTS_NOTIFY_PLUGINS_ENABLED", True)
+                if disabled is None:
+                    raw = getattr(config, "TTS_NOTIFY_PLUGINS_DISABLED", "")
+                    disabled = [name.strip() for name in raw.split(",") if name.strip()]
+            except Exception:
+                enabled = True if enabled is None else enabled
+                disabled = [] if disabled is None else disabled
+        return enabled, disabled
+
+    def discover(self, refresh: bool = False) -> None:
+        """Read entry points for all plugin groups (no plugin imports)"""
+        if self._discovered and not refresh:
+            return
+        self._discovered = True
+        self._specs = {ENGINE_GROUP: {}, DETECTOR_GROUP: {}}
+
+        enabled, disabled = self._settings()
+        if not enabled:
+            logger.debug("Plugin discovery disabled")
+            return
+
+        start_time = time.time()
+        for group in (ENGINE_GROUP, DETECTOR_GROUP):
+            try:
+                entry_points = metadata.entry_points(group=group)
+            except Exception as e:
+                logger.warning(f"Failed to read entry points for '{group}': {e}")
+                continue
+            for entry_point in entry_points:
+                if entry_point.name in disabled:
+                    continue
+                if entry_point.name in self._specs[group]:
+                    logger.warning(f"Duplicate plugin '{entry_point.name}' in '{group}', keeping the first")
+                    continue
+                dist = getattr(entry_point, "dist", None)
+                self._specs[group][entry_point.name] = PluginSpec(
+                    name=entry_point.name,
+                    group=group,
+                    value=entry_point.value,
+                    distribution=getattr(dist, "name", None),
+                    entry_point=entry_point
+                )
+        logger.debug(f"Discovered {sum(len(s) for s in self._specs.values())} plugins "
+                     f"in {(time.time() - start_time) * 1000:.1f}ms")
+
+    def add(self, group: str, name: str, target: Any) -> PluginSpec:
+        """
+        Register a plugin without an installed distribution.
+
+        Args:
+            group: ENGINE_GROUP or DETECTOR_GROUP
+            name: Plugin name
+            target: The plugin class, or a "module:attr" string imported on first use
+
+        Returns:
+            The registered PluginSpec
+        """
+        self.discover()
+        if isinstance(target, str):
+            spec = PluginSpec(name=name, group=group, value=target,
+                              entry_point=metadata.EntryPoint(name=name, value=target, group=group))
+        else:
+            spec = PluginSpec(name=name, group=group,
+                              value=f"{target.__module__}:{target.__qualname__}",
+                              plugin_class=target, load_time=0.0)
+        self._specs.setdefault(group, {})[name] = spec
+        return spec
+
+    def specs(self, group: str) -> Dict[str, PluginSpec]:
+        self.discover()
+        return dict(self._specs.get(group, {}))
+
+    def engines(self) -> Dict[str, PluginSpec]:
+        return self.specs(ENGINE_GROUP)
+
+    def detectors(self) -> Dict[str, PluginSpec]:
+        return self.specs(DETECTOR_GROUP)
+
+    def load_class(self, group: str, name: str) -> type:
+        """Import a plugin class, validating its base class"""
+        from ..core.exceptions import PluginError
+
+        spec = self.specs(group).get(name)
+        if spec is None:
+            raise PluginError(f"Plugin '{name}' not found in '{group}'", plugin_name=name)
+        if spec.plugin_class is not None:
+            return spec.plugin_class
+
+        start_time = time.time()
+        try:
+            plugin_class = spec.entry_point.load()
+        except Exception as e:
+            spec.error = str(e)
+            raise PluginError(f"Failed to import plugin '{name}' ({spec.value}): {e}", plugin_name=name)
+
+        base = self._base_class(group)
+        if not (isinstance(plugin_class, type) and issubclass(plugin_class, base)):
+            spec.error = f"not a {base.__name__} subclass"
+            raise PluginError(f"Plugin '{name}' ({spec.value}) is not a {base.__name__} subclass",
+                              plugin_name=name)
+
+        spec.plugin_class = plugin_class
+        spec.load_time = time.time() - start_time
+        spec.error = None
+        logger.info(f"Loaded plugin '{name}' from {spec.value} in {spec.load_time * 1000:.1f}ms")
+        return plugin_class
+
+    @staticmethod
+    def _base_class(group: str) -> type:
+        if group == ENGINE_GROUP:
+            from ..core.tts_engine import TTSEngine
+            return TTSEngine
+        from ..core.voice_system import VoiceDetector
+        return VoiceDetector
+
+    def create_engine(self, name: str):
+        """Import and instantiate an engine plugin"""
+        engine = self.load_class(ENGINE_GROUP, name)()
+        if engine.name != name:
+            logger.debug(f"Engine plugin '{name}' reports name '{engine.name}'; registering as '{name}'")
+            engine.name = name
+        return engine
+
+    def create_detector(self, name: str):
+        """Import and instantiate a voice detector plugin"""
+        return self.load_class(DETECTOR_GROUP, name)()
+
+    def engine_factories(self) -> Dict[str, Callable[[], Any]]:
+        """Zero-argument factories for every engine plugin"""
+        return {name: (lambda name=name: self.create_engine(name)) for name in self.engines()}
+
+    def detector_factories(self) -> Dict[str, Callable[[], Any]]:
+        """Zero-argument factories for every voice detector plugin"""
+        return {name: (lambda name=name: self.create_detector(name)) for name in self.detectors()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        self.discover()
+        return {group: [spec.to_dict() for spec in specs.values()]
+                for group, specs in self._specs.items()}
+
+
+# Global plugin manager instance
+plugin_manager = PluginManager()
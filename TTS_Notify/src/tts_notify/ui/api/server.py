@@ -8,10 +8,11 @@ Provides comprehensive text-to-speech functionality via HTTP endpoints.
 
 import asyncio
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Request
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
@@ -19,11 +20,17 @@ from pydantic import BaseModel, Field
 # Import from the new modular architecture
 from core.config_manager import config_manager
 from core.voice_system import VoiceManager, VoiceFilter
-from core.tts_engine import MacOSTTSEngine
+from core.tts_engine import get_engine
 from core.models import TTSRequest, AudioFormat, Voice, Gender, VoiceQuality, Language
-from core.exceptions import TTSNotifyError, VoiceNotFoundError, ValidationError, TTSError
+from core.cancellation import CancellationToken
+from core.exceptions import TTSNotifyError, VoiceNotFoundError, ValidationError, TTSError, RequestCancelledError
 from utils.logger import setup_logging, get_logger
 
+# Seconds between checks for a client that went away mid-request
+DISCONNECT_POLL_INTERVAL = 0.1
+# Non-standard status (as in nginx) for requests the client abandoned
+CLIENT_CLOSED_REQUEST = 499
+
 
 # Pydantic models for API
 class SpeakRequest(BaseModel):
@@ -87,7 +94,7 @@ class TTSNotifyAPIServer:
     def __init__(self):
         self.config_manager = config_manager
         self.voice_manager = VoiceManager()
-        self.tts_engine = MacOSTTSEngine()
+        self.tts_engine = get_engine()
         self.logger = None
 
         # Load configuration
@@ -133,6 +140,26 @@ class TTSNotifyAPIServer:
             allow_headers=["*"],
         )
 
+    @asynccontextmanager
+    async def _cancel_on_disconnect(self, http_request: Request) -> AsyncIterator[CancellationToken]:
+        """Yield a cancellation token that is cancelled when the client disconnects"""
+        token = CancellationToken()
+
+        async def watch() -> None:
+            while not token.cancelled:
+                if await http_request.is_disconnected():
+                    token.cancel("Client disconnected")
+                    if self.logger:
+                        self.logger.info(f"Client disconnected, cancelled {http_request.url.path}")
+                    return
+                await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+        watcher = asyncio.create_task(watch())
+        try:
+            yield token
+        finally:
+            watcher.cancel()
+
     def _register_routes(self):
         """Register API routes"""
 
@@ -221,40 +248,46 @@ class TTSNotifyAPIServer:
                 raise HTTPException(status_code=500, detail="Internal server error")
 
         @self.app.post("/speak", response_model=SpeakResponse)
-        async def speak_text(request: SpeakRequest):
+        async def speak_text(request: SpeakRequest, http_request: Request):
             """Convert text to speech and play it"""
+            async with self._cancel_on_disconnect(http_request) as cancel_token:
+                return await speak(request, cancel_token)
+
+        async def speak(request: SpeakRequest, cancel_token: CancellationToken) -> SpeakResponse:
             try:
-                # Create TTS request
+                # Create TTS request (validated on construction)
+                voice = await self.voice_manager.find_voice(
+                    request.voice or getattr(self.config, 'TTS_NOTIFY_VOICE', 'monica'))
                 tts_request = TTSRequest(
                     text=request.text,
-                    voice_name=request.voice or getattr(self.config, 'TTS_NOTIFY_VOICE', 'monica'),
+                    voice=voice,
                     rate=request.rate or getattr(self.config, 'TTS_NOTIFY_RATE', 175),
                     pitch=request.pitch or getattr(self.config, 'TTS_NOTIFY_PITCH', 1.0),
                     volume=request.volume or getattr(self.config, 'TTS_NOTIFY_VOLUME', 1.0),
-                    language=getattr(self.config, 'TTS_NOTIFY_LANGUAGE', 'es')
+                    cancel_token=cancel_token
                 )
 
-                # Validate request
-                validation_errors = tts_request.validate()
-                if validation_errors:
-                    error_msg = "; ".join(validation_errors)
-                    raise HTTPException(status_code=400, detail=f"Validation error: {error_msg}")
-
                 # Speak text
                 response = await self.tts_engine.speak(tts_request)
+                if not response.success:
+                    raise TTSError(response.error or "Speech failed")
 
                 result = SpeakResponse(
                     success=True,
-                    voice_used=response.voice_used,
-                    actual_rate=response.actual_rate,
-                    message=f"Text spoken successfully with voice '{response.voice_used}'"
+                    voice_used=voice.name,
+                    actual_rate=tts_request.rate,
+                    message=f"Text spoken successfully with voice '{voice.name}'"
                 )
 
                 if self.logger:
-                    self.logger.info(f"API speak_text: {request.text[:50]}... -> {response.voice_used}")
+                    self.logger.info(f"API speak_text: {request.text[:50]}... -> {voice.name}")
 
                 return result
 
+            except RequestCancelledError as e:
+                if self.logger:
+                    self.logger.info(f"API speak_text cancelled: {e}")
+                raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail=str(e))
             except (VoiceNotFoundError, ValidationError, TTSError) as e:
                 if self.logger:
                     self.logger.error(f"API speak_text error: {e}")
@@ -265,8 +298,12 @@ class TTSNotifyAPIServer:
                 raise HTTPException(status_code=500, detail="Internal server error")
 
         @self.app.post("/save", response_model=SaveAudioResponse)
-        async def save_audio(request: SaveAudioRequest, background_tasks: BackgroundTasks):
+        async def save_audio(request: SaveAudioRequest, background_tasks: BackgroundTasks, http_request: Request):
             """Convert text to audio file and return it"""
+            async with self._cancel_on_disconnect(http_request) as cancel_token:
+                return await save(request, cancel_token)
+
+        async def save(request: SaveAudioRequest, cancel_token: CancellationToken) -> SaveAudioResponse:
             try:
                 # Validate format
                 try:
@@ -278,26 +315,24 @@ class TTSNotifyAPIServer:
                 output_dir = Path(getattr(self.config, 'TTS_NOTIFY_OUTPUT_DIR', Path.home() / "Desktop"))
                 output_path = output_dir / f"{request.filename}.{audio_format.value}"
 
-                # Create TTS request
+                # Create TTS request (validated on construction)
+                voice = await self.voice_manager.find_voice(
+                    request.voice or getattr(self.config, 'TTS_NOTIFY_VOICE', 'monica'))
                 tts_request = TTSRequest(
                     text=request.text,
-                    voice_name=request.voice or getattr(self.config, 'TTS_NOTIFY_VOICE', 'monica'),
+                    voice=voice,
                     rate=request.rate or getattr(self.config, 'TTS_NOTIFY_RATE', 175),
                     pitch=request.pitch or getattr(self.config, 'TTS_NOTIFY_PITCH', 1.0),
                     volume=request.volume or getattr(self.config, 'TTS_NOTIFY_VOLUME', 1.0),
-                    language=getattr(self.config, 'TTS_NOTIFY_LANGUAGE', 'es'),
                     output_format=audio_format,
-                    output_path=str(output_path)
+                    output_path=output_path,
+                    cancel_token=cancel_token
                 )
 
-                # Validate request
-                validation_errors = tts_request.validate()
-                if validation_errors:
-                    error_msg = "; ".join(validation_errors)
-                    raise HTTPException(status_code=400, detail=f"Validation error: {error_msg}")
-
                 # Save audio
-                response = await self.tts_engine.synthesize(tts_request)
+                response = await self.tts_engine.save(tts_request, output_path)
+                if not response.success:
+                    raise TTSError(response.error or "Saving audio failed")
 
                 # Schedule cleanup of old files (optional)
                 if self.logger:
@@ -311,6 +346,10 @@ class TTSNotifyAPIServer:
                     message=f"Audio saved successfully to {output_path}"
                 )
 
+            except RequestCancelledError as e:
+                if self.logger:
+                    self.logger.info(f"API save_audio cancelled: {e}")
+                raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail=str(e))
             except (VoiceNotFoundError, ValidationError, TTSError) as e:
                 if self.logger:
                     self.logger.error(f"API save_audio error: {e}")
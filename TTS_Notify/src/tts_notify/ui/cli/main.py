@@ -10,13 +10,15 @@ import argparse
 import asyncio
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 # Import from the new modular architecture
+from ... import launch_dir
 from ...core.config_manager import config_manager
 from ...core.voice_system import VoiceManager, VoiceFilter
-from ...core.tts_engine import MacOSTTSEngine
+from ...core.tts_engine import get_engine
 from ...core.models import TTSRequest, AudioFormat
+from ...core.document_renderer import DocumentProgress
 from ...core.exceptions import TTSNotifyError, VoiceNotFoundError, ValidationError, TTSError
 from ...utils.logger import setup_logging, get_logger
 
@@ -27,7 +29,7 @@ class TTSNotifyCLI:
     def __init__(self):
         self.config_manager = config_manager
         self.voice_manager = VoiceManager()
-        self.tts_engine = MacOSTTSEngine()
+        self.tts_engine = get_engine()
         self.logger = None
 
     def setup_logging(self):
@@ -54,6 +56,7 @@ Ejemplos:
   tts-notify --list --lang es_ES
   tts-notify "Test" --save output_file
   tts-notify --mcp-config                 # Mostrar configuración MCP para Claude Desktop
+  tts-notify document NOTAS.md -o notas.wav  # Renderizar un documento largo en paralelo
 
 Para búsqueda flexible de voces:
   tts-notify "Test" --voice angelica     # Encuentra Angélica
@@ -155,6 +158,47 @@ Para búsqueda flexible de voces:
 
         return parser
 
+    def create_document_parser(self) -> argparse.ArgumentParser:
+        """Create the parser for the document subcommand"""
+        parser = argparse.ArgumentParser(
+            prog="tts-notify document",
+            description="Renderiza un documento largo (markdown o texto) en un solo archivo de audio, "
+                        "sintetizando fragmentos en paralelo. Si se interrumpe, al repetir el comando "
+                        "se reanuda omitiendo los fragmentos ya renderizados."
+        )
+        parser.add_argument("input", help="Archivo a renderizar ('-' para leer de stdin)")
+        parser.add_argument("--output", "-o", help="Archivo de salida (default: nombre de la entrada con el formato elegido)")
+        parser.add_argument("--voice", "-v", help="Voz a utilizar")
+        parser.add_argument("--rate", "-r", type=int, help="Velocidad de habla (palabras por minuto, 100-300)")
+        parser.add_argument("--pitch", type=float, help="Tono de la voz (0.5-2.0)")
+        parser.add_argument("--volume", type=float, help="Volumen (0.0-1.0)")
+        parser.add_argument(
+            "--format",
+            choices=["aiff", "wav", "flac"],
+            default="wav",
+            help="Formato del archivo de salida (default: wav)"
+        )
+        parser.add_argument("--jobs", "-j", type=int, help="Fragmentos en paralelo (default: número de CPUs)")
+        parser.add_argument("--shard-chars", type=int, help="Tamaño máximo de cada fragmento en caracteres")
+        parser.add_argument("--shard-dir", help="Directorio de fragmentos (default: oculto junto a la salida)")
+        parser.add_argument("--plain", action="store_true", help="Tratar la entrada como texto plano, no markdown")
+        parser.add_argument("--no-resume", action="store_true", help="Renderizar de nuevo todos los fragmentos")
+        parser.add_argument("--keep-shards", action="store_true", help="Conservar los fragmentos al terminar")
+        parser.add_argument("--profile", help="Usar perfil de configuración predefinido")
+        return parser
+
+    def parse_args(self, argv: Optional[List[str]] = None) -> argparse.Namespace:
+        """Parse the command line, dispatching the document subcommand to its own parser"""
+        argv = sys.argv[1:] if argv is None else argv
+        # A subparser would swallow texts to speak, so the subcommand is matched by hand
+        if argv and argv[0] == "document":
+            args = self.create_document_parser().parse_args(argv[1:])
+            args.command = "document"
+            return args
+        args = self.create_parser().parse_args(argv)
+        args.command = None
+        return args
+
     async def list_voices(self, compact: bool = False, gender: Optional[str] = None,
                          language: Optional[str] = None) -> None:
         """List available voices with optional filtering"""
@@ -246,16 +290,27 @@ Para búsqueda flexible de voces:
 
             voice_to_use = voice or getattr(config, 'TTS_NOTIFY_VOICE', 'monica')
             rate_to_use = str(rate or getattr(config, 'TTS_NOTIFY_RATE', 175))
-            pitch_to_use = str(pitch or getattr(config, 'TTS_NOTIFY_PITCH', 1.0))
+            pitch_to_use = pitch or getattr(config, 'TTS_NOTIFY_PITCH', 1.0)
+            volume_to_use = volume or getattr(config, 'TTS_NOTIFY_VOLUME', 1.0)
+
+            # say has no pitch/volume options: the engine applies them to rendered audio
+            if pitch_to_use != 1.0 or volume_to_use != 1.0:
+                request = TTSRequest(
+                    text=text,
+                    voice=await self.voice_manager.find_voice(voice_to_use),
+                    rate=int(rate_to_use),
+                    pitch=pitch_to_use,
+                    volume=volume_to_use
+                )
+                response = await self.tts_engine.speak(request)
+                if not response.success:
+                    print(f"❌ Error: {response.error}")
+                    sys.exit(1)
+                print(f"✅ Texto reproducido con voz: {voice_to_use}")
+                return
 
             # Build say command
-            cmd = ['say', '-v', voice_to_use, '-r', rate_to_use]
-
-            # Only add pitch if different from 1.0
-            if pitch_to_use != '1.0':
-                cmd.extend(['-p', pitch_to_use])
-
-            cmd.append(text)
+            cmd = ['say', '-v', voice_to_use, '-r', rate_to_use, text]
 
             # Execute TTS
             result = subprocess.run(cmd, capture_output=True, text=True)
@@ -297,17 +352,18 @@ Para búsqueda flexible de voces:
             # Create TTS request
             request = TTSRequest(
                 text=text,
-                voice_name=voice or getattr(config, 'TTS_NOTIFY_VOICE', 'monica'),
+                voice=await self.voice_manager.find_voice(voice or getattr(config, 'TTS_NOTIFY_VOICE', 'monica')),
                 rate=rate or getattr(config, 'TTS_NOTIFY_RATE', 175),
                 pitch=pitch or getattr(config, 'TTS_NOTIFY_PITCH', 1.0),
                 volume=volume or getattr(config, 'TTS_NOTIFY_VOLUME', 1.0),
-                language=getattr(config, 'TTS_NOTIFY_LANGUAGE', 'es'),
                 output_format=AudioFormat(audio_format),
-                output_path=str(output_path)
+                output_path=output_path
             )
 
             # Save audio
-            response = await self.tts_engine.synthesize(request)
+            response = await self.tts_engine.save(request, output_path)
+            if not response.success:
+                raise TTSError(response.error or "Saving audio failed")
 
             print(f"✅ Audio guardado en: {output_path}")
 
@@ -323,6 +379,76 @@ Para búsqueda flexible de voces:
                 self.logger.exception("Unexpected error in save_audio")
             sys.exit(1)
 
+    @staticmethod
+    def _print_progress(progress: DocumentProgress) -> None:
+        """Print document render progress on one updating line"""
+        width = 30
+        filled = int(width * progress.fraction)
+        line = (f"[{'#' * filled}{'.' * (width - filled)}] {progress.completed}/{progress.shards} fragmentos "
+                f"{progress.fraction:4.0%}  audio {progress.audio_seconds / 60:5.1f} min  {progress.elapsed:5.1f}s")
+        if progress.resumed:
+            line += f"  ({progress.resumed} reanudados)"
+        if progress.eta is not None and progress.phase == "rendering":
+            line += f"  quedan ~{progress.eta:.0f}s"
+        if progress.phase == "joining":
+            line += "  uniendo..."
+        end = "\n" if progress.phase in ("done", "failed") or not sys.stderr.isatty() else ""
+        print(f"\r{line}", end=end, file=sys.stderr, flush=True)
+
+    async def render_document(self, args: argparse.Namespace) -> None:
+        """Render a document file into one audio file"""
+        try:
+            config = self.config_manager.get_config()
+            if args.input == "-":
+                text = sys.stdin.read()
+                default_output = launch_dir / "document"
+            else:
+                source = launch_dir / args.input
+                text = source.read_text(encoding="utf-8")
+                default_output = source.with_suffix("")
+            output_path = launch_dir / args.output if args.output else default_output.with_suffix(f".{args.format}")
+            shard_dir = launch_dir / args.shard_dir if args.shard_dir else None
+
+            request = TTSRequest(
+                text=text,
+                voice=await self.voice_manager.find_voice(args.voice or getattr(config, 'TTS_NOTIFY_VOICE', 'monica')),
+                rate=args.rate or getattr(config, 'TTS_NOTIFY_RATE', 175),
+                pitch=args.pitch,
+                volume=args.volume,
+                output_format=AudioFormat(args.format)
+            )
+
+            await self.tts_engine.initialize()
+            try:
+                response = await self.tts_engine.render_document(
+                    request,
+                    output_path,
+                    markdown=not args.plain,
+                    shard_dir=shard_dir,
+                    resume=not args.no_resume,
+                    keep_shards=args.keep_shards,
+                    shard_chars=args.shard_chars,
+                    max_concurrent=args.jobs,
+                    progress=self._print_progress
+                )
+            finally:
+                await self.tts_engine.cleanup()
+
+            if not response.success:
+                print(f"❌ Error: {response.error}")
+                sys.exit(1)
+            meta = response.metadata
+            print(f"✅ Documento guardado en: {response.file_path} "
+                  f"({meta.get('duration', 0) / 60:.1f} min de audio, {meta['shards']} fragmentos, "
+                  f"{meta['resumed']} reanudados, {response.duration:.1f}s)")
+
+        except OSError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        except (VoiceNotFoundError, ValidationError, TTSError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
     def show_mcp_config(self) -> None:
         """Show MCP configuration for Claude Desktop with real paths"""
         import json
@@ -414,6 +540,10 @@ Para búsqueda flexible de voces:
         # Setup logging
         self.setup_logging()
 
+        if args.command == "document":
+            await self.render_document(args)
+            return
+
         # Handle MCP configuration request
         if args.mcp_config:
             self.show_mcp_config()
@@ -455,8 +585,7 @@ Para búsqueda flexible de voces:
 async def main():
     """Main entry point for CLI"""
     cli = TTSNotifyCLI()
-    parser = cli.create_parser()
-    args = parser.parse_args()
+    args = cli.parse_args()
 
     try:
         await cli.run(args)
@@ -471,8 +600,7 @@ async def main():
 def sync_main():
     """Synchronous main entry point for CLI scripts"""
     cli = TTSNotifyCLI()
-    parser = cli.create_parser()
-    args = parser.parse_args()
+    cli.parse_args()
 
     try:
         # Run the async main function
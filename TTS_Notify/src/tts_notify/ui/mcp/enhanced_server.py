@@ -15,10 +15,43 @@ import threading
 import time
 from typing import Any, Dict, List, Optional
 
+try:
+    from ...core.duration_model import duration_model
+except ImportError:
+    # Run as a standalone script: keep the fixed timeouts
+    duration_model = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
+class TicketLock:
+    """Mutex granted in ticket order: a lock that is fair (FIFO) by construction"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+
+    def take_ticket(self) -> int:
+        """Reserve a place in line (call in arrival order)"""
+        with self._condition:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            return ticket
+
+    def acquire(self, ticket: int) -> None:
+        """Block until every earlier ticket has been released"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._serving == ticket)
+
+    def release(self) -> None:
+        with self._condition:
+            self._serving += 1
+            self._condition.notify_all()
+
+
 class EnhancedTTSNotifyMCPServer:
     """Enhanced MCP server with maximum compatibility"""
 
@@ -27,6 +60,17 @@ class EnhancedTTSNotifyMCPServer:
         self.initialized = False
         self.request_count = 0
 
+        # Tool calls run off the reader thread so notifications/cancelled can
+        # arrive while one is in flight; their say processes are tracked by id
+        self._tool_lock = TicketLock()          # One tool call at a time, in arrival order
+        self._output_lock = threading.Lock()    # Whole JSON lines on stdout
+        self._state_lock = threading.Lock()
+        self._processes: Dict[Any, subprocess.Popen] = {}
+        self._pending: set = set()              # Tool calls queued or running
+        self._cancelled: set = set()            # Subset of _pending cancelled by the client
+        self._local = threading.local()
+        self._tool_threads: List[threading.Thread] = []
+
         # Log environment variables at startup
         self.log_environment_variables()
 
@@ -128,6 +172,52 @@ class EnhancedTTSNotifyMCPServer:
             timestamp = time.strftime("%H:%M:%S")
             print(f"[{timestamp}] DEBUG: {message}", file=sys.stderr)
 
+    def command_timeout(self, text: str, voice: str, rate: Optional[int], op: str) -> float:
+        """Timeout for a say command, predicted from the text when the duration model is available"""
+        if duration_model is None:
+            return 30
+        timeout = duration_model.estimate("macos", text, voice or "", rate).timeouts[op]
+        self.log_debug(f"Timeout for {op}: {timeout:.1f}s")
+        return timeout
+
+    def run_command(self, cmd: List[str], timeout: float) -> subprocess.CompletedProcess:
+        """subprocess.run equivalent whose process is killed if the current tool call is cancelled"""
+        request_id = getattr(self._local, "request_id", None)
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        with self._state_lock:
+            self._processes[request_id] = process
+            cancelled = request_id in self._cancelled
+        if cancelled:
+            process.kill()
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+        finally:
+            with self._state_lock:
+                self._processes.pop(request_id, None)
+        return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+    def is_cancelled(self) -> bool:
+        """True if the tool call running on this thread was cancelled by the client"""
+        with self._state_lock:
+            return getattr(self._local, "request_id", None) in self._cancelled
+
+    def cancel_request(self, request_id: Any, reason: Optional[str] = None) -> None:
+        """Handle notifications/cancelled: kill the request's say process, drop its response"""
+        with self._state_lock:
+            if request_id not in self._pending:
+                # Already answered, or never seen: nothing to cancel
+                self.log_debug(f"Ignoring cancellation of inactive request {request_id}")
+                return
+            self._cancelled.add(request_id)
+            process = self._processes.get(request_id)
+        if process is not None and process.poll() is None:
+            process.kill()
+        self.log_debug(f"Cancelled request {request_id}: {reason or 'no reason given'}")
+
     def speak_text(self, text: str, voice: Optional[str] = None, rate: Optional[int] = None) -> str:
         """Speak text using macOS TTS"""
         try:
@@ -157,7 +247,8 @@ class EnhancedTTSNotifyMCPServer:
 
             self.log_debug(f"Executing command: {' '.join(cmd)}")
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            timeout = self.command_timeout(text, voice_to_use, rate, "speak")
+            result = self.run_command(cmd, timeout)
 
             if result.returncode == 0:
                 voice_used = voice_to_use
@@ -240,7 +331,14 @@ class EnhancedTTSNotifyMCPServer:
 
             self.log_debug(f"Audio save command: {' '.join(cmd)}")
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            timeout = self.command_timeout(text, voice_to_use, rate, "synthesize")
+            result = self.run_command(cmd, timeout)
+
+            if self.is_cancelled():
+                # Don't leave a truncated file behind
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                return "❌ Audio save cancelled"
 
             if result.returncode == 0:
                 self.log_debug(f"Audio saved successfully to: {output_path}")
@@ -340,6 +438,8 @@ class EnhancedTTSNotifyMCPServer:
             # Handle notifications
             if method.startswith("notifications/"):
                 self.log_debug(f"Received notification: {method}")
+                if method == "notifications/cancelled" and "requestId" in params:
+                    self.cancel_request(params["requestId"], params.get("reason"))
                 return None  # Notifications don't require responses
 
             # Handle tools list
@@ -496,6 +596,40 @@ class EnhancedTTSNotifyMCPServer:
 
         return None
 
+    def send(self, message: Dict[str, Any]) -> None:
+        """Write one JSON-RPC message to stdout"""
+        with self._output_lock:
+            print(json.dumps(message, ensure_ascii=False), flush=True)
+
+    def queue_tool_call(self, request: Dict[str, Any]) -> threading.Thread:
+        """Start a tools/call request on a worker thread, keeping its place in line"""
+        with self._state_lock:
+            self._pending.add(request.get("id"))
+        ticket = self._tool_lock.take_ticket()
+        thread = threading.Thread(target=self.handle_tool_call, args=(request, ticket), daemon=True)
+        thread.start()
+        return thread
+
+    def handle_tool_call(self, request: Dict[str, Any], ticket: int) -> None:
+        """Run a tools/call request on a worker thread and send its response unless cancelled"""
+        request_id = request.get("id")
+        self._tool_lock.acquire(ticket)
+        self._local.request_id = request_id
+        try:
+            if self.is_cancelled():
+                self.log_debug(f"Skipping cancelled request {request_id}")
+                return
+            response = self.handle_request(request)
+            # Cancelled requests get no response (MCP cancellation semantics)
+            if response is not None and not self.is_cancelled():
+                self.send(response)
+        finally:
+            self._local.request_id = None
+            with self._state_lock:
+                self._pending.discard(request_id)
+                self._cancelled.discard(request_id)
+            self._tool_lock.release()
+
     def run_stdio_enhanced(self):
         """Run MCP server with enhanced stdio communication"""
 
@@ -514,6 +648,9 @@ class EnhancedTTSNotifyMCPServer:
 
                     if not line:
                         self.log_debug("EOF received, shutting down")
+                        # Let queued tool calls finish and answer
+                        for thread in self._tool_threads:
+                            thread.join()
                         break
 
                     line = line.strip()
@@ -535,7 +672,13 @@ class EnhancedTTSNotifyMCPServer:
                             },
                             "id": None
                         }
-                        print(json.dumps(error_response), flush=True)
+                        self.send(error_response)
+                        continue
+
+                    # Tool calls can be long: run them aside so cancellations are read meanwhile
+                    if isinstance(request, dict) and request.get("method") == "tools/call" and self.initialized:
+                        thread = self.queue_tool_call(request)
+                        self._tool_threads = [t for t in self._tool_threads if t.is_alive()] + [thread]
                         continue
 
                     # Handle request
@@ -543,8 +686,7 @@ class EnhancedTTSNotifyMCPServer:
 
                     # Send response (notifications don't get responses)
                     if response is not None:
-                        response_json = json.dumps(response, ensure_ascii=False)
-                        print(response_json, flush=True)
+                        self.send(response)
                         self.log_debug(f"Sent response: {response.get('result', response.get('error', 'Unknown'))}")
 
                 except KeyboardInterrupt:
@@ -562,7 +704,7 @@ class EnhancedTTSNotifyMCPServer:
                             },
                             "id": None
                         }
-                        print(json.dumps(error_response), flush=True)
+                        self.send(error_response)
                     except:
                         pass  # If we can't even send error, just continue
 
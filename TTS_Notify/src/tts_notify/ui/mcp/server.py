@@ -18,9 +18,10 @@ from mcp.types import TextContent
 # Import from the new modular architecture
 from core.config_manager import config_manager
 from core.voice_system import VoiceManager, VoiceFilter
-from core.tts_engine import MacOSTTSEngine
+from core.tts_engine import get_engine
 from core.models import TTSRequest, AudioFormat
-from core.exceptions import TTSNotifyError, VoiceNotFoundError, ValidationError
+from core.cancellation import CancellationToken
+from core.exceptions import TTSNotifyError, VoiceNotFoundError, ValidationError, TTSError, RequestCancelledError
 from utils.logger import setup_logging, get_logger
 
 
@@ -30,7 +31,7 @@ class TTSNotifyMCPServer:
     def __init__(self):
         self.config_manager = config_manager
         self.voice_manager = VoiceManager()
-        self.tts_engine = MacOSTTSEngine()
+        self.tts_engine = get_engine()
         self.logger = None
 
         # Load configuration for MCP context
@@ -56,6 +57,15 @@ class TTSNotifyMCPServer:
         if self.logger:
             self.logger.info("TTS Notify MCP Server v2.0.0 starting up")
 
+    async def _run_cancellable(self, operation, request: TTSRequest):
+        """Await an engine call, cancelling the request's token if the client cancels the tool call"""
+        try:
+            return await operation(request)
+        except asyncio.CancelledError:
+            # notifications/cancelled: the SDK cancels this handler; stop the engine work too
+            request.cancel_token.cancel("MCP request cancelled")
+            raise
+
     def _register_tools(self):
         """Register MCP tools with FastMCP"""
 
@@ -87,33 +97,32 @@ class TTSNotifyMCPServer:
                 speech_pitch = pitch or getattr(self.config, 'TTS_NOTIFY_PITCH', 1.0)
                 speech_volume = volume or getattr(self.config, 'TTS_NOTIFY_VOLUME', 1.0)
 
-                # Create TTS request
+                # Create TTS request (validated on construction)
                 request = TTSRequest(
                     text=text,
-                    voice_name=voice_name,
+                    voice=await self.voice_manager.find_voice(voice_name),
                     rate=speech_rate,
                     pitch=speech_pitch,
                     volume=speech_volume,
-                    language=getattr(self.config, 'TTS_NOTIFY_LANGUAGE', 'es')
+                    cancel_token=CancellationToken()
                 )
 
-                # Validate request
-                validation_errors = request.validate()
-                if validation_errors:
-                    error_msg = "Errores de validación: " + "; ".join(validation_errors)
-                    if self.logger:
-                        self.logger.warning(f"MCP validation error: {error_msg}")
-                    return [TextContent(type="text", text=f"❌ Error: {error_msg}")]
-
                 # Speak text
-                response = await self.tts_engine.speak(request)
+                response = await self._run_cancellable(self.tts_engine.speak, request)
+                if not response.success:
+                    raise TTSError(response.error or "Speech failed")
 
-                result_msg = f"✅ Texto reproducido con voz '{response.voice_used}' a {response.actual_rate} WPM"
+                result_msg = f"✅ Texto reproducido con voz '{request.voice.name}' a {request.rate} WPM"
                 if self.logger:
-                    self.logger.info(f"MCP speak_text: {text[:50]}... -> {response.voice_used}")
+                    self.logger.info(f"MCP speak_text: {text[:50]}... -> {request.voice.name}")
 
                 return [TextContent(type="text", text=result_msg)]
 
+            except RequestCancelledError as e:
+                if self.logger:
+                    self.logger.info(f"MCP speak_text cancelled: {e}")
+                return [TextContent(type="text", text=f"⏹️ Cancelado: {e}")]
+
             except (VoiceNotFoundError, ValidationError, TTSError) as e:
                 error_msg = f"❌ Error TTS: {e}"
                 if self.logger:
@@ -222,28 +231,23 @@ class TTSNotifyMCPServer:
                 voice_name = voice or getattr(self.config, 'TTS_NOTIFY_VOICE', 'monica')
                 speech_rate = rate or getattr(self.config, 'TTS_NOTIFY_RATE', 175)
 
-                # Create TTS request
+                # Create TTS request (validated on construction)
                 request = TTSRequest(
                     text=text,
-                    voice_name=voice_name,
+                    voice=await self.voice_manager.find_voice(voice_name),
                     rate=speech_rate,
                     pitch=getattr(self.config, 'TTS_NOTIFY_PITCH', 1.0),
                     volume=getattr(self.config, 'TTS_NOTIFY_VOLUME', 1.0),
-                    language=getattr(self.config, 'TTS_NOTIFY_LANGUAGE', 'es'),
                     output_format=audio_format,
-                    output_path=str(output_path)
+                    output_path=output_path,
+                    cancel_token=CancellationToken()
                 )
 
-                # Validate request
-                validation_errors = request.validate()
-                if validation_errors:
-                    error_msg = "Errores de validación: " + "; ".join(validation_errors)
-                    if self.logger:
-                        self.logger.warning(f"MCP save_audio validation error: {error_msg}")
-                    return [TextContent(type="text", text=f"❌ Error: {error_msg}")]
-
                 # Save audio
-                response = await self.tts_engine.synthesize(request)
+                response = await self._run_cancellable(
+                    lambda request: self.tts_engine.save(request, output_path), request)
+                if not response.success:
+                    raise TTSError(response.error or "Saving audio failed")
 
                 result_msg = f"✅ Audio guardado en: {output_path}"
                 if self.logger:
@@ -251,6 +255,11 @@ class TTSNotifyMCPServer:
 
                 return [TextContent(type="text", text=result_msg)]
 
+            except RequestCancelledError as e:
+                if self.logger:
+                    self.logger.info(f"MCP save_audio cancelled: {e}")
+                return [TextContent(type="text", text=f"⏹️ Cancelado: {e}")]
+
             except (VoiceNotFoundError, ValidationError, TTSError) as e:
                 error_msg = f"❌ Error TTS: {e}"
                 if self.logger:
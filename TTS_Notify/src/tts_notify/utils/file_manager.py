@@ -232,11 +232,31 @@ class FileManager:
                     "extension": file_path.suffix.lower(),
                     "is_valid": self.validate_audio_file(file_path)
                 })
+                metadata.update(self._read_audio_format(file_path))
         except Exception:
             pass
 
         return metadata
 
+    @staticmethod
+    def _read_audio_format(file_path: Path) -> Dict[str, Any]:
+        """Read duration and sample format from the header (AIFF, AIFF-C and WAV)"""
+        from ..core.audio_io import read_info
+        from ..core.exceptions import AudioProcessingError
+
+        try:
+            info = read_info(file_path)
+        except AudioProcessingError:
+            return {}
+        return {
+            "container": info.container,
+            "duration": info.duration,
+            "sample_rate": info.sample_rate,
+            "channels": info.channels,
+            "bits_per_sample": info.sample_width * 8,
+            "frames": info.frames,
+        }
+
     def backup_file(self, file_path: Path, backup_dir: Optional[Path] = None) -> Optional[Path]:
         """
         Create a backup of a file.
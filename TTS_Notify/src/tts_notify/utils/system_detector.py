@@ -124,9 +124,9 @@ class SystemDetector:
     def _check_siri_voices(self) -> bool:
         """Check if Siri voices are available on macOS"""
         try:
-            result = subprocess.run(["say", "-v", "?"],
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
+            from ..core.capability_probe import capability_probe
+            result = capability_probe.probe(capability_probe.SAY_VOICES, timeout=10)
+            if result.available:
                 return "siri" in result.stdout.lower()
         except Exception:
             pass
@@ -227,18 +227,19 @@ class SystemDetector:
         capabilities = {}
 
         try:
+            # Shared with engine and voice detector checks, so `say -v ?`
+            # runs at most once per TTL
+            from ..core.capability_probe import capability_probe
+
             # Check if say command is available
-            result = subprocess.run(["which", "say"],
-                                  capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
+            if capability_probe.which("say"):
                 capabilities["native_tts_available"] = True
                 capabilities["native_command"] = "say"
                 capabilities["supported_formats"] = ["aiff"]
 
                 # Get voice count
-                voice_result = subprocess.run(["say", "-v", "?"],
-                                           capture_output=True, text=True, timeout=10)
-                if voice_result.returncode == 0:
+                voice_result = capability_probe.probe(capability_probe.SAY_VOICES, timeout=10)
+                if voice_result.available:
                     voice_count = len([line for line in voice_result.stdout.split('\n') if line.strip()])
                     capabilities["voice_count"] = voice_count
 
@@ -9,6 +9,9 @@ import os
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+# Keep caches and duration calibration of test runs out of the user's cache directory
+os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="tts-notify-tests-")
+
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -25,6 +28,73 @@ def temp_dir():
         yield Path(tmpdir)
 
 
+@pytest.fixture
+def tts_config(monkeypatch):
+    """Apply TTS_NOTIFY_* settings for one test: tts_config(TTS_NOTIFY_X=value, ...)"""
+    from tts_notify.core.config_manager import config_manager
+
+    def apply(**settings):
+        for name, value in settings.items():
+            monkeypatch.setenv(name, str(value))
+        return config_manager.reload_config()
+
+    yield apply
+    monkeypatch.undo()
+    config_manager.reload_config()
+
+
+_STUB_SAY = r'''
+import math, os, struct, sys
+
+def ext80(x):
+    e = int(math.floor(math.log2(x)))
+    return struct.pack(">HQ", e + 16383, int(x / 2 ** e * (1 << 63)))
+
+args, out, text = sys.argv[1:], None, []
+with open(os.environ["STUB_SAY_LOG"], "a") as log:
+    log.write(" ".join(args) + "\n")
+i = 0
+while i < len(args):
+    if args[i] == "-v" and args[i + 1] == "?":
+        print("Alex                en_US    # Most people recognize me by my voice.")
+        sys.exit(0)
+    if args[i] in ("-v", "-r", "-o"):
+        out = args[i + 1] if args[i] == "-o" else out
+        i += 2
+        continue
+    text.append(args[i])
+    i += 1
+frames = [int(8000 * math.sin(k / 8)) for k in range(2205 * max(1, len(" ".join(text).split())))]
+comm = struct.pack(">hIh", 1, len(frames), 16) + ext80(22050)
+ssnd = struct.pack(">II", 0, 0) + struct.pack(">%dh" % len(frames), *frames)
+body = b"AIFF" + b"COMM" + struct.pack(">I", len(comm)) + comm + b"SSND" + struct.pack(">I", len(ssnd)) + ssnd
+if out:
+    with open(out, "wb") as f:
+        f.write(b"FORM" + struct.pack(">I", len(body)) + body)
+'''
+
+
+@pytest.fixture
+def stub_say(temp_dir, monkeypatch):
+    """Put a stub `say` first on PATH; returns the log of its invocations (one line each)"""
+    import stat
+    import sys
+    from tts_notify.core.capability_probe import capability_probe
+
+    bin_dir = temp_dir / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "say"
+    script.write_text(f"#!{sys.executable}\n{_STUB_SAY}")
+    script.chmod(script.stat().st_mode | stat.S_IXUSR)
+    log = temp_dir / "say.log"
+    log.touch()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setenv("STUB_SAY_LOG", str(log))
+    capability_probe.invalidate()
+    yield log
+    capability_probe.invalidate()
+
+
 @pytest.fixture
 def mock_config_dir(temp_dir):
     """Create a mock configuration directory."""
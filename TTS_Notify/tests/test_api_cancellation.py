@@ -0,0 +1,59 @@
+"""
+REST API test: a client disconnect cancels the request and stops its playback
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+# The API server imports its siblings as top-level packages (core, utils)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src" / "tts_notify"))
+
+
+async def call_disconnecting(app, path, payload, disconnect_after):
+    """Drive the ASGI app directly; the client goes away after disconnect_after seconds"""
+    body = json.dumps(payload).encode()
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(disconnect_after)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+             "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+             "root_path": "", "headers": [(b"content-type", b"application/json")],
+             "client": ("test", 1), "server": ("test", 80)}
+    await app(scope, receive, send)
+    return next(message["status"] for message in sent if message["type"] == "http.response.start")
+
+
+def test_disconnect_cancels_speak(tts_config, monkeypatch):
+    tts_config(TTS_NOTIFY_ENGINE="synthetic", TTS_NOTIFY_SYNTHETIC_LATENCY=0,
+               TTS_NOTIFY_SYNTHETIC_PLAYBACK_SCALE=100, TTS_NOTIFY_COALESCE_WINDOW=0)
+    from api.server import CLIENT_CLOSED_REQUEST, TTSNotifyAPIServer
+    from core.models import Language, Voice
+
+    server = TTSNotifyAPIServer()
+
+    async def find_voice(name, *args, **kwargs):
+        return Voice(id="Synthetic", name="Synthetic", language=Language.ENGLISH)
+
+    monkeypatch.setattr(server.voice_manager, "find_voice", find_voice)
+
+    start = time.perf_counter()
+    status = asyncio.run(call_disconnecting(
+        server.app, "/speak", {"text": "This notification would play for minutes"}, 0.2))
+    assert status == CLIENT_CLOSED_REQUEST
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,119 @@
+"""
+Tests for joining audio segments with crossfades
+"""
+
+import io
+
+import pytest
+
+from tts_notify.core.audio_concat import AudioConcatenator, concatenate_audio
+from tts_notify.core.audio_io import AudioReader, encode_audio
+from tts_notify.core.exceptions import AudioProcessingError
+from tts_notify.core.models import AudioFormat
+
+np = pytest.importorskip("numpy")
+
+SAMPLE_RATE = 22050
+STEP = 1 / 32768
+
+
+def constant(value, frames, channels=1):
+    return np.full((frames, channels), value, dtype=np.float64)
+
+
+def tone(frequency, frames, sample_rate=SAMPLE_RATE, channels=1):
+    t = np.arange(frames) / sample_rate
+    return np.repeat((0.4 * np.sin(2 * np.pi * frequency * t))[:, None], channels, axis=1)
+
+
+def dominant_frequency(samples, sample_rate=SAMPLE_RATE):
+    spectrum = np.abs(np.fft.rfft(samples[:, 0] * np.hanning(len(samples))))
+    return np.fft.rfftfreq(len(samples), 1 / sample_rate)[int(np.argmax(spectrum))]
+
+
+def join(sources, **settings):
+    output = io.BytesIO()
+    stats = concatenate_audio(sources, output, AudioFormat.WAV, **settings)
+    with AudioReader(output.getvalue()) as reader:
+        return reader.to_float(), reader.info, stats
+
+
+def test_output_frame_count_subtracts_one_crossfade_per_join():
+    lengths = [5000, 3000, 7000]
+    sources = [encode_audio(tone(440, n), SAMPLE_RATE, "wav") for n in lengths]
+    samples, info, stats = join(sources, crossfade=0.01)
+
+    fade = int(SAMPLE_RATE * 0.01)
+    assert info.frames == stats["frames"] == sum(lengths) - 2 * fade
+    assert (stats["segments"], stats["joins"]) == (3, 2)
+    assert stats["duration"] == pytest.approx(info.frames / SAMPLE_RATE)
+
+
+@pytest.mark.parametrize("crossfade", [0.005, 0.02])
+def test_crossfade_spans_exactly_the_configured_length(crossfade):
+    first, second = constant(0.5, 4000), constant(-0.5, 4000)
+    samples, _, _ = join([encode_audio(first, SAMPLE_RATE, "wav"), encode_audio(second, SAMPLE_RATE, "wav")],
+                         crossfade=crossfade)
+
+    fade = int(SAMPLE_RATE * crossfade)
+    start = 4000 - fade
+    ramp = (np.arange(fade) + 0.5) / fade
+    fade_in = np.sin(0.5 * np.pi * ramp) ** 2
+    assert np.allclose(samples[:start, 0], 0.5, atol=STEP)
+    assert np.allclose(samples[start:4000, 0], 0.5 * (1 - fade_in) - 0.5 * fade_in, atol=STEP)
+    assert np.allclose(samples[4000:, 0], -0.5, atol=STEP)
+    assert len(samples) == 8000 - fade
+
+
+def test_gap_fades_around_silence_instead_of_overlapping():
+    first, second = constant(0.5, 4000), constant(-0.5, 4000)
+    samples, _, stats = join([encode_audio(first, SAMPLE_RATE, "wav"), encode_audio(second, SAMPLE_RATE, "wav")],
+                             crossfade=0.01, gap=0.1)
+
+    fade, gap = int(SAMPLE_RATE * 0.01), int(SAMPLE_RATE * 0.1)
+    assert len(samples) == stats["frames"] == 8000 + gap
+    assert np.allclose(samples[:4000 - fade, 0], 0.5, atol=STEP)
+    assert abs(samples[3999, 0]) < 0.01
+    assert not samples[4000:4000 + gap].any()
+    assert abs(samples[4000 + gap, 0]) < 0.01
+    assert np.allclose(samples[4000 + gap + fade:, 0], -0.5, atol=STEP)
+
+
+def test_segments_in_other_formats_are_converted():
+    first = encode_audio(tone(440, 6000), SAMPLE_RATE, "wav", sample_width=2)
+    second = encode_audio(tone(440, 8000, 16000, channels=2), 16000, "aiff", sample_width=3)
+    third = encode_audio(tone(440, 4000, 44100, channels=2), 44100, "wav", sample_width=1)
+    samples, info, stats = join([first, second, third], crossfade=0.01)
+
+    fade = int(SAMPLE_RATE * 0.01)
+    converted = [6000, -(-8000 * SAMPLE_RATE // 16000), -(-4000 * SAMPLE_RATE // 44100)]
+    assert (info.sample_rate, info.channels, info.sample_width) == (SAMPLE_RATE, 1, 2)
+    assert stats["frames"] == sum(converted) - 2 * fade
+    # The resampled middle segment keeps its pitch
+    middle = samples[converted[0]:converted[0] + converted[1] - 2 * fade]
+    assert dominant_frequency(middle) == pytest.approx(440.0, abs=5.0)
+
+
+def test_first_segment_format_can_be_overridden(temp_dir):
+    destination = temp_dir / "joined.aiff"
+    with AudioConcatenator(destination, AudioFormat.AIFF, sample_rate=16000, channels=2) as joiner:
+        joiner.append(encode_audio(tone(440, SAMPLE_RATE), SAMPLE_RATE, "wav"))
+        joiner.append_samples(tone(440, 8000)[:, 0], SAMPLE_RATE)
+    stats = joiner.close()
+
+    with AudioReader(destination) as reader:
+        assert (reader.info.sample_rate, reader.info.channels) == (16000, 2)
+        assert reader.info.frames == stats["frames"]
+    assert stats["frames"] == 16000 + -(-8000 * 16000 // SAMPLE_RATE) - int(16000 * 0.01)
+    assert stats["file_size"] == destination.stat().st_size
+
+
+def test_close_without_segments_and_abort(temp_dir):
+    with pytest.raises(AudioProcessingError):
+        AudioConcatenator(io.BytesIO()).close()
+
+    destination = temp_dir / "partial.wav"
+    joiner = AudioConcatenator(destination)
+    joiner.append(encode_audio(tone(440, 4000), SAMPLE_RATE, "wav"))
+    joiner.abort()
+    assert not destination.exists()
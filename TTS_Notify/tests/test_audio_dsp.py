@@ -0,0 +1,104 @@
+"""
+Tests for WSOLA time-stretching, pitch shifting and gain
+"""
+
+import pytest
+
+from tts_notify.core.audio_dsp import Gain, PitchShifter, TimeStretcher, WsolaPitchShifter, stretch_audio
+from tts_notify.core.audio_io import AudioReader, encode_audio
+from tts_notify.core.audio_pipeline import AudioPipeline
+from tts_notify.core.models import AudioFormat
+
+np = pytest.importorskip("numpy")
+
+SAMPLE_RATE = 22050
+
+
+def tone(frequency=220.0, seconds=1.0):
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)[:, None]
+
+
+def dominant_frequency(samples):
+    spectrum = np.abs(np.fft.rfft(samples[:, 0] * np.hanning(len(samples))))
+    return np.fft.rfftfreq(len(samples), 1 / SAMPLE_RATE)[int(np.argmax(spectrum))]
+
+
+@pytest.mark.parametrize("speed", [0.5, 0.8, 1.25, 2.0])
+def test_stretch_changes_duration_but_not_pitch(speed):
+    source = encode_audio(tone(), SAMPLE_RATE)
+    with AudioReader(stretch_audio(source, speed)) as reader:
+        samples = reader.to_float()
+        sample_rate = reader.info.sample_rate
+
+    assert sample_rate == SAMPLE_RATE
+    assert len(samples) == pytest.approx(SAMPLE_RATE / speed, rel=0.03)
+    assert dominant_frequency(samples) == pytest.approx(220.0, abs=5.0)
+
+
+def test_stretch_keeps_a_steady_level():
+    source = encode_audio(tone(seconds=2.0), SAMPLE_RATE)
+    with AudioReader(stretch_audio(source, 1.5)) as reader:
+        samples = reader.to_float()[:, 0]
+
+    # WSOLA aligns frames in phase, so the overlap-add neither cancels nor doubles
+    middle = samples[len(samples) // 4:3 * len(samples) // 4]
+    middle = middle[:len(middle) // 441 * 441]
+    rms = np.sqrt((middle.reshape(-1, 441) ** 2).mean(axis=1))
+    assert rms.min() > 0.3 and rms.max() < 0.4
+
+
+def test_stretch_encodes_requested_format():
+    source = encode_audio(tone(seconds=0.5), SAMPLE_RATE)
+    wav = stretch_audio(source, 1.25, AudioFormat.WAV)
+    assert wav[:4] == b"RIFF"
+
+
+def test_unit_speed_is_inactive():
+    assert not TimeStretcher(1.0).active
+    assert TimeStretcher(1.1).active
+
+
+def mean_frequency(samples):
+    """Power-weighted mean frequency; robust to the sidebands of PitchShifter's crossfade"""
+    power = np.abs(np.fft.rfft(samples[:, 0] * np.hanning(len(samples)))) ** 2
+    return float((power * np.fft.rfftfreq(len(samples), 1 / SAMPLE_RATE)).sum() / power.sum())
+
+
+def process_in_blocks(stage, samples, block=1000):
+    pipeline = AudioPipeline([stage])
+    pipeline.configure(SAMPLE_RATE, samples.shape[1])
+    outputs = [pipeline.process(samples[start:start + block]) for start in range(0, len(samples), block)]
+    outputs.append(pipeline.flush())
+    return np.concatenate(outputs)
+
+
+@pytest.mark.parametrize("shifter", [PitchShifter, WsolaPitchShifter])
+@pytest.mark.parametrize("ratio", [0.75, 1.25, 1.5])
+def test_pitch_shift_keeps_duration_and_scales_frequency(shifter, ratio):
+    source = tone(seconds=1.0)
+    shifted = process_in_blocks(shifter(ratio), source)
+
+    assert len(shifted) == len(source)
+    # Skip the edges, where the shifters are still filling their buffers
+    middle = shifted[SAMPLE_RATE // 8:-SAMPLE_RATE // 8]
+    assert mean_frequency(middle) == pytest.approx(220.0 * ratio, rel=0.02)
+
+
+@pytest.mark.parametrize("shifter", [PitchShifter, WsolaPitchShifter])
+def test_pitch_shift_keeps_stereo_channels_apart(shifter):
+    source = np.concatenate([tone(), -0.5 * tone()], axis=1)
+    shifted = process_in_blocks(shifter(1.25), source)
+    middle = shifted[SAMPLE_RATE // 8:-SAMPLE_RATE // 8]
+    assert np.allclose(middle[:, 1], -0.5 * middle[:, 0], atol=1e-4)
+
+
+def test_unit_pitch_is_inactive():
+    assert not PitchShifter(1.0).active and not WsolaPitchShifter(1.0).active
+    assert PitchShifter(1.1).active and WsolaPitchShifter(1.1).active
+
+
+def test_gain_scales_samples():
+    source = tone(seconds=0.1)
+    assert np.allclose(process_in_blocks(Gain(0.25), source), 0.25 * source)
+    assert not Gain(1.0).active and Gain(0.5).active
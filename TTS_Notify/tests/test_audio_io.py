@@ -0,0 +1,182 @@
+"""
+Tests for AIFF/AIFF-C/WAV reading and writing
+"""
+
+import io
+import struct
+
+import pytest
+
+from tts_notify.core.audio_io import (AudioReader, AudioWriter, encode_audio, read_info,
+                                      stream_header, write_audio, _write_extended)
+from tts_notify.core.exceptions import AudioProcessingError
+
+np = pytest.importorskip("numpy")
+
+SAMPLE_RATE = 22050
+
+
+def stereo_ramp(frames=301):
+    """Distinct, in-range values on both channels, including both extremes"""
+    left = np.linspace(-1.0, 1.0, frames)
+    return np.stack([left, -0.5 * left], axis=1).astype(np.float64)
+
+
+def tolerance(sample_width):
+    """One quantization step, or float32 resolution for 32-bit samples"""
+    return max(2.0 ** (1 - sample_width * 8) * 1.01, 1e-7)
+
+
+def aifc(codec, data, channels, bits, frames):
+    comm = (struct.pack(">hIh", channels, frames, bits) + _write_extended(SAMPLE_RATE)
+            + codec + b"\x00\x00")
+    ssnd = struct.pack(">II", 0, 0) + data
+    body = (b"AIFC" + b"FVER" + struct.pack(">II", 4, 0xA2805140)
+            + b"COMM" + struct.pack(">I", len(comm)) + comm
+            + b"SSND" + struct.pack(">I", len(ssnd)) + ssnd)
+    return b"FORM" + struct.pack(">I", len(body)) + body
+
+
+def wav(format_tag, data, channels, bits, extensible=False):
+    block_align = channels * bits // 8
+    fmt = struct.pack("<HHIIHH", 0xFFFE if extensible else format_tag, channels, SAMPLE_RATE,
+                      SAMPLE_RATE * block_align, block_align, bits)
+    if extensible:
+        fmt += struct.pack("<HHI", 22, bits, 0) + struct.pack("<H", format_tag) + bytes(14)
+    body = (b"WAVE" + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+            + b"data" + struct.pack("<I", len(data)) + data)
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+@pytest.mark.parametrize("container", ["aiff", "wav"])
+@pytest.mark.parametrize("sample_width", [1, 2, 3, 4])
+def test_pcm_round_trip(container, sample_width):
+    samples = stereo_ramp()
+    data = encode_audio(samples, SAMPLE_RATE, container, sample_width=sample_width)
+
+    with AudioReader(data) as reader:
+        info = reader.info
+        decoded = reader.to_float()
+
+    assert (info.container, info.sample_rate, info.channels) == (container, SAMPLE_RATE, 2)
+    assert info.sample_width == sample_width and info.frames == len(samples)
+    assert info.byte_order == ("little" if container == "wav" else "big")
+    assert info.encoding == ("uint" if container == "wav" and sample_width == 1 else "int")
+    assert decoded.shape == samples.shape
+    assert np.max(np.abs(decoded - samples)) <= tolerance(sample_width)
+
+
+@pytest.mark.parametrize("container", ["aiff", "wav"])
+def test_odd_sized_data_is_padded(container):
+    samples = np.linspace(-0.5, 0.5, 7)
+    data = encode_audio(samples, SAMPLE_RATE, container, sample_width=1)
+    assert len(data) % 2 == 0
+    with AudioReader(data) as reader:
+        assert reader.info.frames == 7
+        assert np.allclose(reader.to_float()[:, 0], samples, atol=tolerance(1))
+
+
+@pytest.mark.parametrize("codec,dtype", [(b"NONE", ">i2"), (b"twos", ">i2"), (b"sowt", "<i2")])
+def test_aifc_pcm_byte_orders(codec, dtype):
+    values = np.array([[0, -1], [1000, -1000], [32767, -32768]], dtype=dtype)
+    data = aifc(codec, values.tobytes(), channels=2, bits=16, frames=3)
+
+    with AudioReader(data) as reader:
+        assert reader.info.container == "aifc"
+        assert reader.info.byte_order == ("little" if codec == b"sowt" else "big")
+        assert reader.frames().tolist() == values.tolist()
+        assert reader.to_float()[2].tolist() == pytest.approx([32767 / 32768, -1.0])
+
+
+@pytest.mark.parametrize("codec,dtype", [(b"fl32", ">f4"), (b"FL32", ">f4"), (b"fl64", ">f8")])
+def test_aifc_float(codec, dtype):
+    values = np.array([[0.25], [-0.75], [1.0]], dtype=dtype)
+    data = aifc(codec, values.tobytes(), channels=1, bits=values.itemsize * 8, frames=3)
+
+    with AudioReader(data) as reader:
+        assert reader.info.encoding == "float"
+        assert reader.to_float()[:, 0].tolist() == [0.25, -0.75, 1.0]
+
+
+def test_aifc_unknown_codec_is_rejected():
+    with pytest.raises(AudioProcessingError, match="ulaw"):
+        read_info(aifc(b"ulaw", bytes(4), channels=1, bits=8, frames=4))
+
+
+@pytest.mark.parametrize("extensible", [False, True])
+def test_wav_float(extensible):
+    values = np.array([[0.5, -0.5], [-1.0, 0.125]], dtype="<f4")
+    data = wav(0x0003, values.tobytes(), channels=2, bits=32, extensible=extensible)
+
+    with AudioReader(data) as reader:
+        assert (reader.info.encoding, reader.info.compression) == ("float", "FLOAT")
+        assert reader.to_float().tolist() == values.tolist()
+
+
+def test_wav_extensible_24_bit_pcm():
+    values = [0x7FFFFF, -0x800000, 0x123456, -1]
+    raw = b"".join(value.to_bytes(3, "little", signed=True) for value in values)
+    data = wav(0x0001, raw, channels=1, bits=24, extensible=True)
+
+    with AudioReader(data) as reader:
+        assert reader.info.dtype is None
+        decoded = reader.to_float()[:, 0]
+    assert decoded.tolist() == pytest.approx([value / 2.0 ** 23 for value in values])
+
+
+def test_file_reader_returns_mmap_views(temp_dir):
+    samples = stereo_ramp()
+    path = temp_dir / "clip.aiff"
+    info = write_audio(path, samples, SAMPLE_RATE)
+    assert info.path == path and info.frames == len(samples)
+
+    reader = AudioReader(path)
+    view = reader.frames(100, 50)
+    assert view.shape == (50, 2) and view.dtype == np.dtype(">i2")
+    assert not view.flags.owndata and not view.flags.writeable
+    assert bytes(reader.read_raw(100, 50)) == view.tobytes()
+    expected = reader.to_float()[100:150]
+
+    # Closing while a view is alive must not invalidate it
+    reader.close()
+    assert np.array_equal(view.astype(np.float32) / 32768, expected)
+    assert np.max(np.abs(expected - samples[100:150])) <= tolerance(2)
+
+
+def test_frame_ranges_are_clamped():
+    data = encode_audio(stereo_ramp(10), SAMPLE_RATE)
+    with AudioReader(data) as reader:
+        assert reader.frames(8, 5).shape == (2, 2)
+        assert reader.frames(20).shape == (0, 2)
+
+
+def test_writer_patches_header_when_length_unknown():
+    buffer = io.BytesIO()
+    with AudioWriter(buffer, "wav", SAMPLE_RATE, channels=1, sample_width=2) as writer:
+        for block in np.array_split(np.linspace(-1, 1, 1000), 7):
+            writer.write_frames(block)
+    assert read_info(buffer.getvalue()).frames == 1000
+
+
+def test_stream_header_reads_to_end_of_stream():
+    pcm = encode_audio(np.linspace(-1, 1, 100), SAMPLE_RATE, "wav")[44:]
+    info = read_info(stream_header("wav", SAMPLE_RATE) + pcm)
+    assert info.data_offset == 44 and info.frames >= 100
+
+
+def test_non_seekable_writer_must_match_expected_frames():
+    class Pipe(io.RawIOBase):
+        def __init__(self):
+            self.data = bytearray()
+
+        def writable(self):
+            return True
+
+        def write(self, data):
+            self.data += data
+            return len(data)
+
+    writer = AudioWriter(Pipe(), "aiff", SAMPLE_RATE, expected_frames=10)
+    writer.write_frames(np.zeros(5))
+    with pytest.raises(AudioProcessingError, match="not seekable"):
+        writer.close()
@@ -0,0 +1,171 @@
+"""
+Tests for the block-wise audio pipeline, resampling and channel mixing
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from tts_notify.core.audio_convert import convert_audio
+from tts_notify.core.audio_dsp import ChannelMixer, Resampler, WsolaPitchShifter
+from tts_notify.core.audio_io import AudioReader, write_audio
+from tts_notify.core.audio_pipeline import AudioPipeline, AudioStage, build_pipeline
+from tts_notify.core.models import AudioFormat, Language, TTSRequest, Voice
+
+np = pytest.importorskip("numpy")
+
+SAMPLE_RATE = 22050
+
+
+def tone(frequency=440.0, frames=SAMPLE_RATE, sample_rate=SAMPLE_RATE, channels=1):
+    t = np.arange(frames) / sample_rate
+    mono = (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+    return np.repeat(mono[:, None], channels, axis=1)
+
+
+def dominant_frequency(samples, sample_rate):
+    spectrum = np.abs(np.fft.rfft(samples[:, 0] * np.hanning(len(samples))))
+    return np.fft.rfftfreq(len(samples), 1 / sample_rate)[int(np.argmax(spectrum))]
+
+
+def run_blocks(pipeline, samples, sizes):
+    """Feed samples through the pipeline in blocks of the given (cycled) sizes"""
+    outputs, start, index = [], 0, 0
+    while start < len(samples):
+        size = sizes[index % len(sizes)]
+        outputs.append(pipeline.process(samples[start:start + size]))
+        start += size
+        index += 1
+    outputs.append(pipeline.flush())
+    return np.concatenate([output for output in outputs if output is not None])
+
+
+class HoldBack(AudioStage):
+    """Delays its output by a fixed number of frames, releasing them on flush"""
+
+    def __init__(self, frames):
+        self.name = "hold"
+        self.frames = frames
+        self.held = None
+        self.seen = 0
+
+    def configure(self, sample_rate, channels):
+        self.held = np.zeros((0, channels), dtype=np.float32)
+        return sample_rate, channels
+
+    def process(self, block):
+        self.seen += len(block)
+        buffered = np.concatenate([self.held, block])
+        cut = max(0, len(buffered) - self.frames)
+        self.held = buffered[cut:]
+        return buffered[:cut]
+
+    def flush(self):
+        held, self.held = self.held, self.held[:0]
+        return held
+
+
+@pytest.mark.parametrize("source_rate,target_rate", [(22050, 16000), (44100, 48000), (16000, 22050)])
+def test_resampler_output_length_and_rate(source_rate, target_rate):
+    frames = source_rate // 2 + 123
+    resampler = Resampler(target_rate)
+    pipeline = AudioPipeline([resampler])
+    assert pipeline.configure(source_rate, 1) == (target_rate, 1)
+    assert resampler.active
+
+    output = run_blocks(pipeline, tone(1000.0, frames, source_rate), [4096])
+    assert len(output) == -(-frames * target_rate // source_rate)
+    assert dominant_frequency(output, target_rate) == pytest.approx(1000.0, abs=3.0)
+    assert resampler.get_stats()["samples_out"] == len(output)
+
+
+def test_resampler_is_continuous_across_blocks():
+    samples = tone(700.0, 9000, channels=2)
+    samples[:, 1] *= -0.5
+
+    def resample(sizes):
+        pipeline = AudioPipeline([Resampler(16000)])
+        pipeline.configure(SAMPLE_RATE, 2)
+        return run_blocks(pipeline, samples, sizes)
+
+    whole = resample([len(samples)])
+    for sizes in ([1, 7, 1000, 333], [4096], [441]):
+        assert np.allclose(resample(sizes), whole, atol=1e-6)
+
+
+def test_resampler_inactive_at_matching_rate():
+    resampler = Resampler(SAMPLE_RATE)
+    pipeline = AudioPipeline([resampler])
+    pipeline.configure(SAMPLE_RATE, 1)
+    assert not resampler.active and not pipeline.active
+
+
+@pytest.mark.parametrize("order", ["hold_first", "resample_first"])
+def test_flush_carries_tails_through_later_stages(order):
+    samples = tone(500.0, 5000)
+    reference = AudioPipeline([Resampler(16000)])
+    reference.configure(SAMPLE_RATE, 1)
+    expected = run_blocks(reference, samples, [1024])
+
+    hold = HoldBack(1500)
+    stages = [hold, Resampler(16000)] if order == "hold_first" else [Resampler(16000), hold]
+    pipeline = AudioPipeline(stages)
+    pipeline.configure(SAMPLE_RATE, 1)
+    output = run_blocks(pipeline, samples, [1024])
+
+    assert len(output) == len(expected)
+    assert np.allclose(output, expected, atol=1e-6)
+    assert hold.seen == (len(samples) if order == "hold_first" else len(expected))
+
+
+def test_channel_mixer():
+    stereo = np.array([[0.5, -0.5], [1.0, 0.0]], dtype=np.float32)
+    down = ChannelMixer(1)
+    assert down.configure(SAMPLE_RATE, 2) == (SAMPLE_RATE, 1)
+    assert down.process(stereo).tolist() == [[0.0], [0.5]]
+
+    up = ChannelMixer(2)
+    assert up.configure(SAMPLE_RATE, 1) == (SAMPLE_RATE, 2)
+    assert up.process(np.array([[0.25], [-1.0]])).tolist() == [[0.25, 0.25], [-1.0, -1.0]]
+
+    same = ChannelMixer(2)
+    same.configure(SAMPLE_RATE, 2)
+    assert not same.active
+
+
+def pipeline_config(**settings):
+    defaults = dict(TTS_NOTIFY_AUDIO_PIPELINE=True, TTS_NOTIFY_SAMPLE_RATE=16000, TTS_NOTIFY_CHANNELS=2)
+    defaults.update(settings)
+    return SimpleNamespace(**defaults)
+
+
+def test_build_pipeline_from_config_and_request():
+    voice = Voice(id="Alex", name="Alex", language=Language.ENGLISH)
+    request = TTSRequest(text="Pitched", voice=voice, pitch=1.2, volume=0.5)
+
+    assert build_pipeline(pipeline_config(TTS_NOTIFY_AUDIO_PIPELINE=False)) is None
+    pipeline = build_pipeline(pipeline_config(), request)
+    assert pipeline.signature() == "channels:2;pitch-wsola:1.200;gain:0.500;resample:16000"
+    assert isinstance(pipeline.stages[1], WsolaPitchShifter)
+    assert pipeline.configure(SAMPLE_RATE, 1) == (16000, 2)
+
+    plain = build_pipeline(pipeline_config(TTS_NOTIFY_SAMPLE_RATE=SAMPLE_RATE, TTS_NOTIFY_CHANNELS=1))
+    plain.configure(SAMPLE_RATE, 1)
+    assert not plain.active
+
+
+def test_convert_through_pipeline(temp_dir):
+    source = temp_dir / "clip.wav"
+    write_audio(source, tone(440.0, 10000), SAMPLE_RATE)
+    pipeline = build_pipeline(pipeline_config())
+
+    stats = convert_audio(source, temp_dir / "out.wav", AudioFormat.WAV, block_frames=3000, pipeline=pipeline)
+    with AudioReader(temp_dir / "out.wav") as reader:
+        info = reader.info
+        samples = reader.to_float()
+
+    assert (info.sample_rate, info.channels) == (16000, 2)
+    assert info.frames == stats["frames"] == -(-10000 * 16000 // SAMPLE_RATE)
+    assert np.array_equal(samples[:, 0], samples[:, 1])
+    assert dominant_frequency(samples, 16000) == pytest.approx(440.0, abs=3.0)
+    assert stats["pipeline"]["resample"]["samples_in"] == 10000
@@ -0,0 +1,98 @@
+"""
+Tests for bounded-concurrency batch runs
+"""
+
+import asyncio
+
+import pytest
+
+from tts_notify.core.batch import BatchRun
+from tts_notify.core.models import TTSResponse
+
+
+class Recorder:
+    """Operation that sleeps per item and tracks how many run at once"""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.active = 0
+        self.peak = 0
+        self.started = []
+
+    async def __call__(self, index):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.started.append(index)
+        try:
+            await asyncio.sleep(self.delays[index])
+        finally:
+            self.active -= 1
+        if index == 3:
+            return TTSResponse(success=False, error="voice unavailable")
+        if index == 5:
+            raise RuntimeError("synthesis crashed")
+        return TTSResponse(success=True, audio_data=b"x" * (index + 1))
+
+
+def iterate(run):
+    async def consume():
+        return [result async for result in run]
+    return asyncio.run(consume())
+
+
+def test_concurrency_is_bounded():
+    operation = Recorder([0.01] * 12)
+    run = BatchRun(operation, range(12), max_concurrent=3)
+    results = iterate(run)
+    assert len(results) == 12
+    assert operation.peak == 3
+    assert run.stats.peak_in_flight == 3
+    assert run.stats.submitted == run.stats.completed == 12
+
+
+def test_ordered_results_follow_submission_order():
+    delays = [0.08, 0.01, 0.05, 0.02, 0.03, 0.01]
+    results = iterate(BatchRun(Recorder(delays), range(6), max_concurrent=6, ordered=True))
+    assert [result.index for result in results] == list(range(6))
+
+
+def test_unordered_results_follow_completion_order():
+    delays = [0.08, 0.01, 0.05, 0.02, 0.03, 0.01]
+    results = iterate(BatchRun(Recorder(delays), range(6), max_concurrent=6, ordered=False))
+    order = [result.index for result in results]
+    assert sorted(order) == list(range(6))
+    assert order[-1] == 0
+    assert order.index(2) > order.index(4) > order.index(3)
+
+
+def test_failures_are_reported_per_item():
+    run = BatchRun(Recorder([0.0] * 7), range(7), max_concurrent=2)
+    results = asyncio.run(run.collect())
+    assert [result.success for result in results] == [True, True, True, False, True, False, True]
+    assert results[3].error == "voice unavailable" and results[3].response is not None
+    assert results[5].error == "synthesis crashed" and results[5].response is None
+    assert run.stats.succeeded == 5 and run.stats.failed == 2
+    assert run.stats.audio_bytes == sum(index + 1 for index in (0, 1, 2, 4, 6))
+
+
+def test_cancellation_propagates_and_stops_in_flight_items():
+    operation = Recorder([10.0] * 4)
+
+    async def consume():
+        task = asyncio.ensure_future(BatchRun(operation, range(4), max_concurrent=2).collect())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+
+    asyncio.run(consume())
+    assert operation.started == [0, 1]
+    assert operation.active == 0
+
+
+def test_batch_runs_only_once():
+    run = BatchRun(Recorder([0.0]), range(1))
+    iterate(run)
+    with pytest.raises(RuntimeError):
+        iterate(run)
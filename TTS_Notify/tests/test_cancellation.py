@@ -0,0 +1,93 @@
+"""
+Tests for request cancellation tokens
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tts_notify.core.cancellation import CancellationToken
+from tts_notify.core.exceptions import RequestCancelledError
+from tts_notify.core.models import Language, TTSRequest, Voice
+from tts_notify.core.synthetic_engine import SyntheticTTSEngine
+
+
+def test_cancel_runs_callbacks_once():
+    token = CancellationToken()
+    calls = []
+    token.add_callback(lambda: calls.append("first"))
+    remove = token.add_callback(lambda: calls.append("removed"))
+    remove()
+
+    assert token.cancel("client went away")
+    assert not token.cancel("again")
+    assert calls == ["first"]
+    assert token.reason == "client went away"
+
+    # Callbacks added after cancellation run immediately
+    token.add_callback(lambda: calls.append("late"))
+    assert calls == ["first", "late"]
+    with pytest.raises(RequestCancelledError):
+        token.raise_if_cancelled()
+
+
+def test_failing_callback_does_not_block_others():
+    token = CancellationToken()
+    calls = []
+    token.add_callback(lambda: 1 / 0)
+    token.add_callback(lambda: calls.append("ran"))
+    token.cancel()
+    assert calls == ["ran"]
+
+
+def test_run_returns_result_when_not_cancelled():
+    async def work():
+        await asyncio.sleep(0)
+        return 42
+
+    assert asyncio.run(CancellationToken().run(work())) == 42
+
+
+def test_run_refuses_already_cancelled_token():
+    token = CancellationToken()
+    token.cancel()
+    started = []
+
+    async def work():
+        started.append(True)
+
+    with pytest.raises(RequestCancelledError):
+        asyncio.run(token.run(work()))
+    assert not started
+
+
+def test_cancel_from_another_thread_interrupts_work():
+    token = CancellationToken()
+
+    async def run():
+        threading.Timer(0.05, token.cancel, args=("disconnected",)).start()
+        await token.run(asyncio.sleep(10))
+
+    start = time.perf_counter()
+    with pytest.raises(RequestCancelledError, match="disconnected"):
+        asyncio.run(run())
+    assert time.perf_counter() - start < 5
+
+
+def test_engine_request_stops_on_cancel():
+    engine = SyntheticTTSEngine(latency=10.0)
+    token = CancellationToken()
+    voice = Voice(id="Synthetic", name="Synthetic", language=Language.ENGLISH)
+    request = TTSRequest(text="Cancel me", voice=voice, cancel_token=token)
+
+    async def run():
+        await engine.initialize()
+        asyncio.get_running_loop().call_later(0.05, token.cancel)
+        return await engine.synthesize(request)
+
+    start = time.perf_counter()
+    with pytest.raises(RequestCancelledError):
+        asyncio.run(run())
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,45 @@
+"""
+Tests for capability probe caching and persistence
+"""
+
+import sys
+
+from tts_notify.core.capability_probe import CapabilityProbe
+
+OK = [sys.executable, "-c", "print('ok')"]
+FAILS = [sys.executable, "-c", "import sys; sys.exit(3)"]
+SLOW = [sys.executable, "-c", "import time; time.sleep(5)"]
+
+
+def test_success_is_cached_and_persisted(temp_dir):
+    cache_file = temp_dir / "capabilities.json"
+    probe = CapabilityProbe(cache_file=cache_file)
+    assert probe.probe(OK).available
+    assert probe.probe(OK).available
+    assert probe.stats["subprocesses"] == 1
+
+    restarted = CapabilityProbe(cache_file=cache_file)
+    assert restarted.probe(OK).available
+    assert restarted.stats["subprocesses"] == 0
+
+
+def test_failures_are_not_persisted(temp_dir):
+    cache_file = temp_dir / "capabilities.json"
+    probe = CapabilityProbe(cache_file=cache_file)
+    assert not probe.probe(FAILS).available
+    assert probe.probe(SLOW, timeout=0.2).timed_out
+
+    restarted = CapabilityProbe(cache_file=cache_file)
+    assert not restarted.probe(FAILS).available
+    assert restarted.stats["subprocesses"] == 1
+
+
+def test_failures_expire_after_failure_ttl(temp_dir):
+    probe = CapabilityProbe(cache_file=temp_dir / "capabilities.json", failure_ttl=60)
+    probe.probe(FAILS)
+    probe.probe(FAILS)
+    assert probe.stats["subprocesses"] == 1
+
+    probe.configure(failure_ttl=0)
+    probe.probe(FAILS)
+    assert probe.stats["subprocesses"] == 2
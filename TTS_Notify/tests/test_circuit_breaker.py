@@ -0,0 +1,163 @@
+"""
+Tests for the circuit breaker and how the engine registry feeds it
+"""
+
+import asyncio
+
+import pytest
+
+from tts_notify.core.circuit_breaker import BreakerState, CircuitBreaker
+from tts_notify.core.exceptions import CircuitOpenError, ValidationError, VoiceNotFoundError
+from tts_notify.core.models import Language, TTSRequest, TTSResponse, Voice
+from tts_notify.core.synthetic_engine import SyntheticTTSEngine
+from tts_notify.core.tts_engine import EngineRegistry, GuardedEngine
+
+
+class ScriptedEngine(SyntheticTTSEngine):
+    """Synthetic engine whose synthesize results are scripted per call"""
+
+    fallback_eligible = True
+
+    def __init__(self, outcomes, name="synthetic"):
+        super().__init__(latency=0.0)
+        self.name = name
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def synthesize(self, request):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def make_request():
+    voice = Voice(id="Synthetic", name="Synthetic", language=Language.ENGLISH)
+    return TTSRequest(text="Breaker test", voice=voice)
+
+
+def run_calls(outcomes, **breaker_settings):
+    registry = EngineRegistry()
+    engine = ScriptedEngine(outcomes)
+    registry.register(engine, is_default=True)
+    breaker = CircuitBreaker(engine.name, **breaker_settings)
+    registry._breakers[engine.name] = breaker
+
+    async def run():
+        results = []
+        for _ in outcomes:
+            try:
+                results.append(await registry.execute(None, "synthesize", make_request()))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    return breaker, asyncio.run(run())
+
+
+def test_opens_on_error_rate_and_half_opens_after_reset():
+    breaker = CircuitBreaker("engine", min_calls=2, reset_timeout=0.05)
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state is BreakerState.OPEN
+    assert not breaker.allow()
+
+    breaker._opened_at -= 1
+    assert breaker.allow()
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert not breaker.allow(), "only one trial request while half-open"
+    breaker.record_success()
+    assert breaker.state is BreakerState.CLOSED
+
+
+def test_consecutive_timeouts_open_and_failed_trial_reopens():
+    breaker = CircuitBreaker("engine", consecutive_timeouts=2, reset_timeout=0.05)
+    breaker.record_failure(timeout=True)
+    assert breaker.state is BreakerState.CLOSED
+    breaker.record_failure(timeout=True)
+    assert breaker.state is BreakerState.OPEN
+
+    breaker._opened_at -= 1
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.stats.opened == 2
+
+
+def test_ignored_call_releases_half_open_trial():
+    breaker = CircuitBreaker("engine", min_calls=1, reset_timeout=0.05)
+    breaker.record_failure()
+    breaker._opened_at -= 1
+    assert breaker.allow()
+    breaker.record_ignored()
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert breaker.allow()
+
+
+def test_engine_failures_open_the_breaker():
+    failure = TTSResponse(success=False, error="say: audio device unavailable")
+    breaker, results = run_calls([failure, failure, failure], min_calls=2)
+    assert breaker.state is BreakerState.OPEN
+    assert isinstance(results[-1], CircuitOpenError)
+
+
+@pytest.mark.parametrize("outcome", [
+    TTSResponse(success=False, error="Voice `Nobody' not found."),
+    TTSResponse(success=False, error="Bad markup", metadata={"client_error": True}),
+    ValidationError("Rate must be between 100 and 300 WPM for optimal performance"),
+    VoiceNotFoundError("Nobody"),
+])
+def test_client_errors_are_neutral(outcome):
+    breaker, results = run_calls([outcome] * 6, min_calls=2)
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.stats.failures == 0
+    assert not any(isinstance(result, CircuitOpenError) for result in results)
+
+
+def test_failures_fall_back_to_next_engine_until_breaker_opens(tts_config):
+    tts_config(TTS_NOTIFY_ENGINE_FALLBACK="true")
+    failure = TTSResponse(success=False, error="say: audio device unavailable")
+    primary = ScriptedEngine([failure] * 2, name="primary")
+    backup = ScriptedEngine([TTSResponse(success=True)] * 4, name="backup")
+    registry = EngineRegistry()
+    registry.register(primary, is_default=True)
+    registry.register(backup)
+    registry._breakers["primary"] = CircuitBreaker("primary", min_calls=2, reset_timeout=60)
+
+    engine = registry.get("primary")
+    assert isinstance(engine, GuardedEngine)
+
+    async def run():
+        return [await engine.synthesize(make_request()) for _ in range(4)]
+
+    responses = asyncio.run(run())
+    assert all(response.success for response in responses)
+    assert all(response.metadata["fallback_from"] == "primary" for response in responses)
+    # Once open, the failing engine is skipped without being called
+    assert registry.get_breaker("primary").state is BreakerState.OPEN
+    assert primary.calls == 2 and backup.calls == 4
+
+
+def test_half_open_trial_success_closes_breaker():
+    failure = TTSResponse(success=False, error="say: audio device unavailable")
+    engine = ScriptedEngine([failure, failure, TTSResponse(success=True), TTSResponse(success=True)])
+    registry = EngineRegistry()
+    registry.register(engine, is_default=True)
+    breaker = CircuitBreaker(engine.name, min_calls=2, reset_timeout=0.05)
+    registry._breakers[engine.name] = breaker
+
+    async def run():
+        for _ in range(2):
+            await registry.execute(None, "synthesize", make_request())
+        assert breaker.state is BreakerState.OPEN
+        with pytest.raises(CircuitOpenError):
+            await registry.execute(None, "synthesize", make_request())
+        await asyncio.sleep(0.1)
+        trial = await registry.execute(None, "synthesize", make_request())
+        return trial, await registry.execute(None, "synthesize", make_request())
+
+    trial, after = asyncio.run(run())
+    assert trial.success and after.success
+    assert breaker.state is BreakerState.CLOSED
+    assert engine.calls == 4
@@ -0,0 +1,84 @@
+"""
+Tests for duplicate-notification coalescing
+"""
+
+import asyncio
+
+from tts_notify.core.coalescer import NotificationCoalescer
+from tts_notify.core.models import Language, TTSRequest, TTSResponse, Voice
+
+VOICE = Voice(id="Alex", name="Alex", language=Language.ENGLISH)
+
+
+def submit_all(coalescer, op, texts):
+    """Submit texts concurrently; returns (responses, texts actually run)"""
+    ran = []
+
+    async def run(request):
+        ran.append(request.text)
+        await asyncio.sleep(0.05)
+        return TTSResponse(success=True, audio_data=request.text.encode(), duration=0.1)
+
+    async def main():
+        requests = [TTSRequest(text=text, voice=VOICE) for text in texts]
+        return await asyncio.gather(*(coalescer.submit(op, request, run) for request in requests))
+
+    return asyncio.run(main()), ran
+
+
+def test_identical_requests_merge(temp_dir):
+    coalescer = NotificationCoalescer(window=2.0, shared_file=temp_dir / "coalesce.json")
+    responses, ran = submit_all(coalescer, "synthesize", ["Build done", "Build  done", "Build done"])
+    assert ran == ["Build done"]
+    assert [r.metadata["coalesced"] for r in responses] == [False, True, True]
+    assert responses[0].metadata["suppressed_count"] == 2
+
+
+def test_synthesize_never_merges_different_numbers(temp_dir):
+    coalescer = NotificationCoalescer(window=2.0, similarity=0.9, shared_file=temp_dir / "coalesce.json")
+    texts = ["Deploy to port 8080 finished", "Deploy to port 9 finished"]
+    responses, ran = submit_all(coalescer, "synthesize", texts)
+    assert sorted(ran) == sorted(texts)
+    assert [r.audio_data for r in responses] == [text.encode() for text in texts]
+    assert not any(r.metadata["coalesced"] for r in responses)
+
+
+def test_speak_is_exact_by_default(temp_dir):
+    coalescer = NotificationCoalescer(window=2.0, shared_file=temp_dir / "coalesce.json")
+    _, ran = submit_all(coalescer, "speak", ["Build 1 done", "Build 2 done"])
+    assert sorted(ran) == ["Build 1 done", "Build 2 done"]
+
+
+def test_speak_fuzzy_matching_is_opt_in(temp_dir):
+    coalescer = NotificationCoalescer(window=2.0, similarity=0.9, shared=False)
+    _, ran = submit_all(coalescer, "speak", ["Build failed (attempt 3)", "build failed, attempt 4"])
+    assert ran == ["Build failed (attempt 3)"]
+
+
+def test_shared_claim_keeps_distinct_notifications(temp_dir):
+    shared_file = temp_dir / "coalesce.json"
+    first = NotificationCoalescer(window=2.0, shared_file=shared_file)
+    second = NotificationCoalescer(window=2.0, shared_file=shared_file)
+    _, ran_first = submit_all(first, "speak", ["Build 1 done"])
+    _, ran_second = submit_all(second, "speak", ["Build 2 done"])
+    _, ran_repeat = submit_all(second, "speak", ["Build 1 done"])
+    assert ran_first == ["Build 1 done"]
+    assert ran_second == ["Build 2 done"]
+    assert ran_repeat == []
+
+
+def test_failures_are_not_shared(temp_dir):
+    coalescer = NotificationCoalescer(window=2.0, shared=False)
+    calls = []
+
+    async def run(request):
+        calls.append(request.text)
+        return TTSResponse(success=False, error="boom")
+
+    async def main():
+        request = TTSRequest(text="Retry me", voice=VOICE)
+        await coalescer.submit("synthesize", request, run)
+        return await coalescer.submit("synthesize", request, run)
+
+    assert not asyncio.run(main()).success
+    assert calls == ["Retry me", "Retry me"]
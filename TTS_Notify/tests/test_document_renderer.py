@@ -0,0 +1,137 @@
+"""
+Tests for sharded document rendering, resume and shard directory cleanup
+"""
+
+import asyncio
+import io
+
+from tts_notify.core.audio_concat import concatenate_audio
+from tts_notify.core.document_renderer import DocumentRenderer, markdown_to_speech
+from tts_notify.core.models import AudioFormat, Language, TTSRequest, Voice
+from tts_notify.core.segmenter import TextSegmenter
+from tts_notify.core.synthetic_engine import SyntheticTTSEngine
+
+PARAGRAPHS = [f"Paragraph {i} explains change number {i} in a few short words." for i in range(6)]
+
+
+def render(temp_dir, text, engine=None, **kwargs):
+    engine = engine or SyntheticTTSEngine(latency=0.0)
+    voice = Voice(id="Synthetic", name="Synthetic", language=Language.ENGLISH)
+    request = TTSRequest(text=text, voice=voice, output_format=AudioFormat.WAV)
+    renderer = DocumentRenderer(engine, shard_chars=100, max_concurrent=2)
+    options = {key: kwargs.pop(key) for key in ("shard_dir", "resume", "keep_shards") if key in kwargs}
+
+    async def run():
+        await engine.initialize()
+        return await renderer.render(request, temp_dir / "doc.wav", **options, **kwargs)
+
+    return asyncio.run(run())
+
+
+def test_markdown_to_speech():
+    text = markdown_to_speech("# Title\n\nSee [the docs](https://x.y) and **bold** `code`.\n\n"
+                              "```\nprint(1)\n```\n\n- first item\n- second item")
+    assert text == "Title.\n\nSee the docs and bold code.\n\nfirst item.\nsecond item."
+
+
+def test_resume_reuses_shards_and_matches_full_render(temp_dir):
+    text = "\n\n".join(PARAGRAPHS)
+    first = render(temp_dir, text, keep_shards=True)
+    assert first.success, first.error
+    audio = first.file_path.read_bytes()
+
+    second = render(temp_dir, text, keep_shards=True)
+    assert second.metadata["resumed"] == second.metadata["shards"] > 1
+    assert second.file_path.read_bytes() == audio
+
+
+def test_edited_document_renders_only_changed_shards(temp_dir):
+    render(temp_dir, "\n\n".join(PARAGRAPHS), keep_shards=True)
+    edited = PARAGRAPHS[:-1] + ["The last paragraph was rewritten."]
+    response = render(temp_dir, "\n\n".join(edited), keep_shards=True)
+    progress = response.metadata["progress"]
+    assert progress["rendered"] == 1
+    assert progress["resumed"] == response.metadata["shards"] - 1
+    # The stale shard of the old last paragraph is pruned
+    assert len(list((temp_dir / ".doc.wav.shards").iterdir())) == response.metadata["shards"]
+
+
+def test_default_shard_directory_is_removed(temp_dir):
+    response = render(temp_dir, "\n\n".join(PARAGRAPHS))
+    assert response.success, response.error
+    assert not (temp_dir / ".doc.wav.shards").exists()
+
+
+def test_user_shard_directory_keeps_foreign_files(temp_dir):
+    shard_dir = temp_dir / "shared"
+    (shard_dir / "nested").mkdir(parents=True)
+    (shard_dir / "important.txt").write_text("keep me")
+    (shard_dir / "0123456789abcdef.aiff").write_bytes(b"not ours")
+
+    for keep_shards in (True, False):
+        response = render(temp_dir, "\n\n".join(PARAGRAPHS), shard_dir=shard_dir, keep_shards=keep_shards)
+        assert response.success, response.error
+        assert (shard_dir / "important.txt").read_text() == "keep me"
+        assert (shard_dir / "0123456789abcdef.aiff").exists()
+        assert (shard_dir / "nested").is_dir()
+    assert sorted(path.name for path in shard_dir.iterdir()) == [
+        "0123456789abcdef.aiff", "important.txt", "nested"]
+
+
+def test_repeated_shards_render_once(temp_dir):
+    engine = SyntheticTTSEngine(latency=0.0)
+    outputs = []
+    save_many = engine.save_many
+
+    def recording_save_many(requests, paths, **kwargs):
+        outputs.extend(paths)
+        return save_many(requests, paths, **kwargs)
+
+    engine.save_many = recording_save_many
+    text = "\n\n".join([PARAGRAPHS[0], PARAGRAPHS[1], PARAGRAPHS[0]])
+    response = render(temp_dir, text, engine=engine, keep_shards=True)
+    assert response.success, response.error
+    assert response.metadata["shards"] == 3
+    assert response.metadata["progress"]["rendered"] == 3
+    assert len(outputs) == len(set(outputs)) == 2
+    assert len(list((temp_dir / ".doc.wav.shards").iterdir())) == 2
+
+
+def test_shards_finishing_out_of_order_are_joined_in_document_order(temp_dir):
+    text = "\n\n".join(PARAGRAPHS)
+    shards = TextSegmenter.split_into_shards(text, 100)
+    assert len(shards) >= 3
+
+    # Earlier shards take longer, so they finish last
+    engine = SyntheticTTSEngine(latency=0.0)
+    save = engine.save
+    finished = []
+
+    async def slow_save(request, output_path):
+        await asyncio.sleep(0.05 * (len(shards) - shards.index(request.text)))
+        response = await save(request, output_path)
+        finished.append(shards.index(request.text))
+        return response
+
+    engine.save = slow_save
+    response = render(temp_dir, text, engine=engine, keep_shards=True)
+    assert response.success, response.error
+    assert response.metadata["shards"] == len(shards)
+    assert finished != sorted(finished)
+
+    renderer = DocumentRenderer(engine)
+    request = TTSRequest(text=text, voice=Voice(id="Synthetic", name="Synthetic", language=Language.ENGLISH),
+                         output_format=AudioFormat.WAV)
+    fingerprint = renderer._fingerprint(request, AudioFormat.AIFF)
+    shard_dir = temp_dir / ".doc.wav.shards"
+    paths = [renderer._shard_path(shard_dir, fingerprint, shard, AudioFormat.AIFF) for shard in shards]
+    settings = engine._join_settings()
+
+    def joined(order):
+        output = io.BytesIO()
+        concatenate_audio(order, output, AudioFormat.WAV, crossfade=settings["crossfade"], gap=settings["gap"])
+        return output.getvalue()
+
+    audio = response.file_path.read_bytes()
+    assert audio == joined(paths)
+    assert audio != joined(paths[::-1])
@@ -0,0 +1,64 @@
+"""
+Tests for duration prediction, online calibration and its persistence
+"""
+
+import json
+
+from tts_notify.core.duration_model import DurationModel, OnlineFit, speech_units
+
+
+def test_speech_units_count_words_and_pauses():
+    assert speech_units("one two three") == 3
+    assert speech_units("one, two. three") == 3.75
+    assert speech_units("") == 1.0
+
+
+def test_online_fit_recovers_a_line():
+    fit = OnlineFit(0.0, 1.0)
+    for x in range(1, 20):
+        fit.add(x, 0.5 + 2.0 * x)
+    intercept, slope = fit.coefficients()
+    assert abs(intercept - 0.5) < 1e-6 and abs(slope - 2.0) < 1e-6
+    assert fit.covers(30) and not fit.covers(100)
+
+
+def test_uncalibrated_timeouts_never_undercut_the_base(temp_dir):
+    model = DurationModel(cache_file=temp_dir / "durations.json", base_timeout=60.0)
+    estimate = model.estimate("macos", "short text", "Alex")
+    assert not estimate.calibrated
+    assert estimate.timeouts["synthesize"] >= 60.0
+
+
+def test_calibration_tightens_timeouts(temp_dir):
+    model = DurationModel(cache_file=temp_dir / "durations.json", base_timeout=60.0, min_timeout=1.0)
+    for words in range(5, 40, 5):
+        text = " ".join(["word"] * words)
+        model.observe("macos", text, "Alex", 175, words * 60 / 175 * 1.2, 0.2 + words * 0.01)
+    estimate = model.estimate("macos", " ".join(["word"] * 20), "Alex", 175)
+    assert estimate.calibrated
+    assert abs(estimate.audio_duration - 20 * 60 / 175 * 1.2) < 0.05
+    assert estimate.timeouts["synthesize"] < 60.0
+
+
+def test_observations_are_persisted_in_batches(temp_dir):
+    cache_file = temp_dir / "durations.json"
+    model = DurationModel(cache_file=cache_file, save_delay=60.0)
+    for _ in range(5):
+        model.observe("macos", "a few words here", "Alex", 175, 1.5, 0.3)
+    # Nothing is written per observation
+    assert not cache_file.exists()
+    model.flush()
+    assert model.stats["saves"] == 1
+    assert json.loads(cache_file.read_text())["voices"]
+
+    reloaded = DurationModel(cache_file=cache_file)
+    assert reloaded.get_stats()["voices"]["macos/alex"]["samples"] == 5
+
+
+def test_timer_persists_without_flush(temp_dir):
+    cache_file = temp_dir / "durations.json"
+    model = DurationModel(cache_file=cache_file, save_delay=0.2)
+    model.observe("macos", "a few words here", "Alex", 175, 1.5, 0.3)
+    timer = model._save_timer
+    timer.join(5)
+    assert cache_file.exists()
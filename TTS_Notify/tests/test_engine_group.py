@@ -0,0 +1,122 @@
+"""
+Tests for EngineGroup routing, ejection and registry-built instance groups
+"""
+
+import asyncio
+import subprocess
+
+from tts_notify.core.models import Language, TTSRequest, Voice
+from tts_notify.core.synthetic_engine import SyntheticTTSEngine
+from tts_notify.core.tts_engine import EngineGroup, EngineRegistry, GuardedEngine, get_engine
+
+
+class FlakyEngine(SyntheticTTSEngine):
+    """Synthetic engine that fails every render while broken"""
+
+    def __init__(self, **kwargs):
+        super().__init__(latency=0.0, **kwargs)
+        self.broken = False
+
+    def is_available(self) -> bool:
+        return not self.broken
+
+    async def _execute(self, cmd, payload, timeout=None):
+        if self.broken:
+            return subprocess.CompletedProcess(args=cmd, returncode=1, stdout=b"", stderr=b"device lost")
+        return await super()._execute(cmd, payload, timeout)
+
+
+def make_request(text="Tests passed"):
+    voice = Voice(id="Synthetic", name="Synthetic", language=Language.ENGLISH)
+    return TTSRequest(text=text, voice=voice)
+
+
+def test_concurrent_requests_spread_across_instances(tts_config):
+    tts_config(TTS_NOTIFY_COALESCE_WINDOW=0, TTS_NOTIFY_SYNTH_CACHE_ENABLED="false")
+    group = EngineGroup("synthetic", [SyntheticTTSEngine(latency=0.1) for _ in range(3)])
+
+    async def run():
+        await group.initialize()
+        return await asyncio.gather(*[group.synthesize(make_request(f"Build {i} passed")) for i in range(3)])
+
+    responses = asyncio.run(run())
+    assert all(response.success for response in responses)
+    assert [instance.completed for instance in group.instances] == [1, 1, 1]
+
+
+def test_short_request_avoids_instance_busy_with_long_text(tts_config):
+    tts_config(TTS_NOTIFY_COALESCE_WINDOW=0, TTS_NOTIFY_SYNTH_CACHE_ENABLED="false")
+    group = EngineGroup("synthetic", [SyntheticTTSEngine(latency=0.2) for _ in range(2)])
+    long_text = " ".join(["word"] * 400)
+
+    async def run():
+        await group.initialize()
+        long_task = asyncio.ensure_future(group.synthesize(make_request(long_text)))
+        await asyncio.sleep(0.05)
+        busy = next(instance for instance in group.instances if instance.outstanding)
+        await group.synthesize(make_request("Short"))
+        await long_task
+        return busy
+
+    busy = asyncio.run(run())
+    assert busy.completed == 1
+
+
+def test_failing_instance_is_ejected_and_readmitted(tts_config):
+    tts_config(TTS_NOTIFY_COALESCE_WINDOW=0, TTS_NOTIFY_SYNTH_CACHE_ENABLED="false")
+    flaky, steady = FlakyEngine(), FlakyEngine()
+    group = EngineGroup("synthetic", [flaky, steady], eject_after=2, readmit_after=0.0)
+    flaky_instance = group.instances[0]
+
+    async def run():
+        await group.initialize()
+        flaky.broken = True
+        for i in range(6):
+            await group.synthesize(make_request(f"Request {i}"))
+            if not flaky_instance.healthy:
+                break
+        ejected = not flaky_instance.healthy
+        # Probes fail while broken, then succeed once the engine recovers
+        await group.synthesize(make_request("Probe while broken"))
+        await asyncio.sleep(0.05)
+        still_ejected = not flaky_instance.healthy
+        flaky.broken = False
+        await group.synthesize(make_request("Probe after recovery"))
+        await asyncio.sleep(0.05)
+        return ejected, still_ejected
+
+    ejected, still_ejected = asyncio.run(run())
+    assert ejected and still_ejected
+    assert flaky_instance.healthy
+    assert flaky_instance.ejections == 1
+
+
+def test_lazy_engine_becomes_group_sharing_components(tts_config):
+    tts_config(TTS_NOTIFY_ENGINE_INSTANCES=3)
+    registry = EngineRegistry()
+    registry.register_lazy("synthetic", lambda: SyntheticTTSEngine(latency=0.0), instances=True)
+
+    engine = registry.get("synthetic")
+    group = registry.get("synthetic", guarded=False)
+    assert isinstance(engine, GuardedEngine) and isinstance(group, EngineGroup)
+    members = [instance.engine for instance in group.instances]
+    assert len(members) == 3
+    assert all(member._cache is members[0]._cache for member in members)
+    assert all(member._coalescer is members[0]._coalescer for member in members)
+
+    response = asyncio.run(engine.synthesize(make_request()))
+    assert response.success, response.error
+
+
+def test_single_instance_is_not_grouped(tts_config):
+    tts_config(TTS_NOTIFY_ENGINE_INSTANCES=1)
+    registry = EngineRegistry()
+    registry.register_lazy("synthetic", lambda: SyntheticTTSEngine(latency=0.0), instances=True)
+    assert isinstance(registry.get("synthetic", guarded=False), SyntheticTTSEngine)
+
+
+def test_servers_engine_comes_from_registry(tts_config):
+    tts_config(TTS_NOTIFY_ENGINE="synthetic")
+    engine = get_engine()
+    assert isinstance(engine, GuardedEngine)
+    assert engine.name == "synthetic"
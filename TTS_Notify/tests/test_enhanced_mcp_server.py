@@ -0,0 +1,74 @@
+"""
+Tests for tool-call ordering and cancellation bookkeeping in the enhanced MCP server
+"""
+
+import threading
+import time
+
+from tts_notify.ui.mcp.enhanced_server import EnhancedTTSNotifyMCPServer, TicketLock
+
+
+def test_ticket_lock_serves_in_ticket_order():
+    lock = TicketLock()
+    tickets = [lock.take_ticket() for _ in range(5)]
+    order = []
+
+    def worker(ticket):
+        lock.acquire(ticket)
+        order.append(ticket)
+        lock.release()
+
+    # Start the threads in reverse so plain lock handoff would likely reorder them
+    threads = [threading.Thread(target=worker, args=(ticket,)) for ticket in reversed(tickets)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join(timeout=5)
+    assert order == tickets
+
+
+def make_server(monkeypatch, handled):
+    server = EnhancedTTSNotifyMCPServer()
+    monkeypatch.setattr(server, "handle_request", lambda request: handled.append(request["id"]) or
+                        {"jsonrpc": "2.0", "id": request["id"], "result": {}})
+    monkeypatch.setattr(server, "send", lambda message: None)
+    return server
+
+
+def test_tool_calls_run_in_arrival_order(monkeypatch):
+    handled = []
+    server = make_server(monkeypatch, handled)
+    threads = [server.queue_tool_call({"id": i, "method": "tools/call"}) for i in range(10)]
+    for thread in threads:
+        thread.join(timeout=5)
+    assert handled == list(range(10))
+
+
+def test_cancel_of_inactive_request_is_not_kept(monkeypatch):
+    handled = []
+    server = make_server(monkeypatch, handled)
+    server.queue_tool_call({"id": 1, "method": "tools/call"}).join(timeout=5)
+
+    server.cancel_request(1, "too late")
+    server.cancel_request("unknown", "never seen")
+    assert server._cancelled == set()
+    assert server._pending == set()
+
+
+def test_cancel_of_queued_request_skips_it(monkeypatch):
+    handled = []
+    server = make_server(monkeypatch, handled)
+    gate = threading.Event()
+    original = server.handle_request
+    server.handle_request = lambda request: gate.wait(5) and original(request)
+
+    first = server.queue_tool_call({"id": 1, "method": "tools/call"})
+    second = server.queue_tool_call({"id": 2, "method": "tools/call"})
+    server.cancel_request(2, "user pressed stop")
+    gate.set()
+    first.join(timeout=5)
+    second.join(timeout=5)
+
+    assert handled == [1]
+    assert server._cancelled == set() and server._pending == set()
@@ -0,0 +1,260 @@
+"""
+Tests for the FLAC encoder, checked with a small reference decoder
+"""
+
+import hashlib
+import io
+
+import pytest
+
+from tts_notify.core.audio_convert import FlacWriter, convert_audio
+from tts_notify.core.audio_io import AudioReader, write_audio
+from tts_notify.core.exceptions import AudioProcessingError
+from tts_notify.core.models import AudioFormat
+
+np = pytest.importorskip("numpy")
+
+SAMPLE_RATE = 22050
+SUBFRAME_TYPES = {0: "CONSTANT", 1: "VERBATIM"}
+FIXED_COEFFICIENTS = [[], [1], [2, -1], [3, -3, 1], [4, -6, 4, -1]]
+
+
+def crc(data, width, polynomial):
+    """Bitwise CRC, independent of the encoder's table-driven one"""
+    value, top, mask = 0, 1 << (width - 1), (1 << width) - 1
+    for byte in data:
+        value ^= byte << (width - 8)
+        for _ in range(8):
+            value = ((value << 1) ^ polynomial) if value & top else value << 1
+            value &= mask
+    return value
+
+
+class BitReader:
+    def __init__(self, data, position=0):
+        self.data = data
+        self.position = position * 8
+
+    def read(self, count):
+        value = 0
+        for _ in range(count):
+            byte = self.data[self.position >> 3]
+            value = (value << 1) | ((byte >> (7 - (self.position & 7))) & 1)
+            self.position += 1
+        return value
+
+    def signed(self, count):
+        value = self.read(count)
+        return value - (1 << count) if count and value >> (count - 1) else value
+
+    def unary(self):
+        zeros = 0
+        while not self.read(1):
+            zeros += 1
+        return zeros
+
+    def utf8_number(self):
+        first = self.read(8)
+        length = 0
+        while first & (0x80 >> length):
+            length += 1
+        value = first & (0xFF >> (length + 1))
+        for _ in range(max(0, length - 1)):
+            value = (value << 6) | (self.read(8) & 0x3F)
+        return value
+
+    def align(self):
+        self.position = (self.position + 7) // 8 * 8
+
+    @property
+    def byte(self):
+        return self.position // 8
+
+
+def decode_flac(data):
+    """
+    Decode the subset of FLAC the encoder writes: independent channels and
+    CONSTANT, VERBATIM and FIXED subframes with Rice-coded residuals.
+
+    Returns (streaminfo, samples shaped (frames, channels), frame sizes, subframe types)
+    """
+    assert data[:4] == b"fLaC"
+    reader = BitReader(data, 4)
+    streaminfo = None
+    while True:
+        last, block_type, length = reader.read(1), reader.read(7), reader.read(24)
+        start = reader.byte
+        if block_type == 0:
+            streaminfo = {
+                "min_block": reader.read(16), "max_block": reader.read(16),
+                "min_frame": reader.read(24), "max_frame": reader.read(24),
+                "sample_rate": reader.read(20), "channels": reader.read(3) + 1,
+                "bits_per_sample": reader.read(5) + 1, "total": reader.read(36),
+                "md5": bytes(reader.read(8) for _ in range(16)),
+            }
+        reader.position = (start + length) * 8
+        if last:
+            break
+
+    bps, channels = streaminfo["bits_per_sample"], streaminfo["channels"]
+    decoded, frame_sizes, types = [], [], set()
+    while reader.byte < len(data):
+        frame_start = reader.byte
+        assert reader.read(14) == 0b11111111111110 and reader.read(2) == 0
+        size_code, rate_code = reader.read(4), reader.read(4)
+        assignment, sample_size_code = reader.read(4), reader.read(3)
+        assert reader.read(1) == 0 and rate_code == 0 and assignment < 8
+        assert assignment + 1 == channels
+        assert sample_size_code == {8: 1, 12: 2, 16: 4, 20: 5, 24: 6}[bps]
+        reader.utf8_number()
+        if size_code == 6:
+            block_size = reader.read(8) + 1
+        elif size_code == 7:
+            block_size = reader.read(16) + 1
+        else:
+            raise AssertionError(f"unexpected block size code {size_code}")
+        assert reader.read(8) == crc(data[frame_start:reader.byte - 1], 8, 0x07)
+
+        block = []
+        for _ in range(channels):
+            assert reader.read(1) == 0
+            kind = reader.read(6)
+            assert reader.read(1) == 0  # No wasted bits
+            if kind == 0:
+                samples = [reader.signed(bps)] * block_size
+            elif kind == 1:
+                samples = [reader.signed(bps) for _ in range(block_size)]
+            else:
+                order = kind - 8
+                assert 0 <= order <= 4, f"unexpected subframe type {kind}"
+                samples = [reader.signed(bps) for _ in range(order)]
+                samples += decode_fixed(reader, block_size, order, samples)
+            types.add(SUBFRAME_TYPES.get(kind, "FIXED"))
+            block.append(samples)
+
+        reader.align()
+        assert reader.read(16) == crc(data[frame_start:reader.byte - 2], 16, 0x8005)
+        frame_sizes.append(reader.byte - frame_start)
+        decoded.append(np.array(block, dtype=np.int64).T)
+
+    samples = np.concatenate(decoded) if decoded else np.zeros((0, channels), dtype=np.int64)
+    return streaminfo, samples, frame_sizes, types
+
+
+def decode_fixed(reader, block_size, order, warmup):
+    method, partition_order = reader.read(2), reader.read(4)
+    assert method in (0, 1)
+    parameter_bits = 4 if method == 0 else 5
+    residual = []
+    for partition in range(1 << partition_order):
+        count = (block_size >> partition_order) - (order if partition == 0 else 0)
+        parameter = reader.read(parameter_bits)
+        if parameter == (1 << parameter_bits) - 1:
+            width = reader.read(5)
+            residual += [reader.signed(width) for _ in range(count)]
+            continue
+        for _ in range(count):
+            value = (reader.unary() << parameter) | reader.read(parameter)
+            residual.append((value >> 1) ^ -(value & 1))
+
+    samples = list(warmup)
+    coefficients = FIXED_COEFFICIENTS[order]
+    for value in residual:
+        prediction = sum(c * samples[-1 - i] for i, c in enumerate(coefficients))
+        samples.append(prediction + value)
+    return samples[order:]
+
+
+def mixed_signal(frames, channels, sample_width, seed=1):
+    """Tone, white noise and digital silence, so every subframe type is used"""
+    bits = sample_width * 8
+    peak = (1 << (bits - 1)) - 1
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames)
+    tone = np.rint(0.6 * peak * np.sin(2 * np.pi * 440 * t / SAMPLE_RATE)).astype(np.int64)
+    columns = []
+    for channel in range(channels):
+        column = np.roll(tone, channel * 17)
+        third = frames // 3
+        column[third:2 * third] = rng.integers(-peak - 1, peak + 1, third)
+        column[2 * third:2 * third + 600] = 0
+        columns.append(column)
+    return np.stack(columns, axis=1)
+
+
+def little_endian(samples, sample_width):
+    flat = samples.reshape(-1)
+    return b"".join(int(value).to_bytes(sample_width, "little", signed=True) for value in flat)
+
+
+@pytest.mark.parametrize("sample_width", [1, 2, 3])
+@pytest.mark.parametrize("channels", [1, 2])
+def test_flac_round_trip(sample_width, channels):
+    samples = mixed_signal(256 * 9 + 37, channels, sample_width)
+    buffer = io.BytesIO()
+    with FlacWriter(buffer, SAMPLE_RATE, channels, sample_width, block_size=256) as writer:
+        for chunk in np.array_split(samples, 5):
+            writer.write_frames(chunk)
+
+    streaminfo, decoded, frame_sizes, types = decode_flac(buffer.getvalue())
+    assert np.array_equal(decoded, samples)
+    assert types == {"CONSTANT", "VERBATIM", "FIXED"}
+    assert streaminfo["sample_rate"] == SAMPLE_RATE
+    assert streaminfo["channels"] == channels
+    assert streaminfo["bits_per_sample"] == sample_width * 8
+    assert streaminfo["total"] == len(samples)
+    assert streaminfo["min_block"] == streaminfo["max_block"] == 256
+    assert (streaminfo["min_frame"], streaminfo["max_frame"]) == (min(frame_sizes), max(frame_sizes))
+    assert streaminfo["md5"] == hashlib.md5(little_endian(samples, sample_width)).digest()
+
+
+def test_flac_to_unseekable_output_leaves_totals_unknown():
+    class Pipe(io.RawIOBase):
+        def __init__(self):
+            self.data = bytearray()
+
+        def writable(self):
+            return True
+
+        def write(self, data):
+            self.data += data
+            return len(data)
+
+    samples = mixed_signal(1000, 1, 2)
+    pipe = Pipe()
+    with FlacWriter(pipe, SAMPLE_RATE, 1, 2, block_size=256) as writer:
+        writer.write_frames(samples)
+
+    streaminfo, decoded, _, _ = decode_flac(bytes(pipe.data))
+    assert np.array_equal(decoded, samples)
+    assert streaminfo["total"] == 0 and streaminfo["md5"] == bytes(16)
+
+
+def test_flac_rejects_float_samples():
+    with pytest.raises(AudioProcessingError):
+        FlacWriter(io.BytesIO()).write_frames(np.zeros(4, dtype=np.float32))
+
+
+def test_convert_aiff_to_flac(temp_dir):
+    samples = mixed_signal(5000, 2, 2)
+    source = temp_dir / "clip.aiff"
+    write_audio(source, samples.astype(np.int16), SAMPLE_RATE)
+
+    stats = convert_audio(source, temp_dir / "clip.flac", AudioFormat.FLAC, block_frames=1024)
+    streaminfo, decoded, _, _ = decode_flac((temp_dir / "clip.flac").read_bytes())
+    assert stats["frames"] == streaminfo["total"] == 5000
+    assert np.array_equal(decoded, samples)
+
+
+def test_convert_refuses_to_overwrite_its_source(temp_dir):
+    source = temp_dir / "clip.wav"
+    write_audio(source, mixed_signal(1000, 1, 2).astype(np.int16), SAMPLE_RATE)
+    original = source.read_bytes()
+    (temp_dir / "sub").mkdir()
+
+    for destination in (source, temp_dir / "sub" / ".." / "clip.wav"):
+        with pytest.raises(AudioProcessingError, match="onto itself"):
+            convert_audio(source, destination, AudioFormat.AIFF)
+    assert source.read_bytes() == original
+    with AudioReader(source) as reader:
+        assert reader.info.frames == 1000
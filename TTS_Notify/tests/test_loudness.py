@@ -0,0 +1,90 @@
+"""
+Tests for loudness measurement and normalization
+"""
+
+import io
+
+import pytest
+
+from tts_notify.core.audio_convert import convert_audio
+from tts_notify.core.audio_dsp import LoudnessNormalizer, measure_loudness
+from tts_notify.core.audio_io import encode_audio
+from tts_notify.core.audio_pipeline import AudioPipeline
+from tts_notify.core.models import AudioFormat
+
+np = pytest.importorskip("numpy")
+
+SAMPLE_RATE = 22050
+
+
+def tone(amplitude, seconds=3.0, frequency=997.0):
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t))[:, None]
+
+
+def clip(samples, sample_width=3):
+    return encode_audio(samples, SAMPLE_RATE, "wav", sample_width=sample_width)
+
+
+def normalize(samples, **settings):
+    stage = LoudnessNormalizer(**settings)
+    output = io.BytesIO()
+    convert_audio(clip(samples), output, AudioFormat.WAV, pipeline=AudioPipeline([stage]))
+    return measure_loudness(output.getvalue()), stage
+
+
+def test_sine_reads_its_reference_loudness():
+    # BS.1770 calibration: a full-scale 997 Hz sine reads -3.01 LUFS
+    assert measure_loudness(clip(tone(1.0 - 1e-6)))["lufs"] == pytest.approx(-3.01, abs=0.1)
+    quiet = measure_loudness(clip(tone(0.1)))
+    assert quiet["lufs"] == pytest.approx(-23.01, abs=0.1)
+    assert quiet["peak_db"] == pytest.approx(-20.0, abs=0.01)
+
+
+def test_reading_ignores_channel_count_and_silence():
+    mono = measure_loudness(clip(tone(0.1)))["lufs"]
+    stereo = measure_loudness(clip(np.repeat(tone(0.1), 2, axis=1)))["lufs"]
+    gapped = measure_loudness(clip(np.concatenate([tone(0.1), np.zeros((SAMPLE_RATE * 3, 1))])))["lufs"]
+    assert stereo == pytest.approx(mono, abs=0.01)
+    # Gating drops the silent half (ungated it would read 3 dB lower); only the
+    # blocks straddling the end of the tone still count
+    assert gapped == pytest.approx(mono, abs=0.3)
+
+
+@pytest.mark.parametrize("amplitude", [0.03, 0.1, 0.3])
+def test_normalizer_reaches_target(amplitude):
+    measured, stage = normalize(tone(amplitude), target_lufs=-16.0)
+    assert measured["lufs"] == pytest.approx(-16.0, abs=0.1)
+    assert stage.get_stats()["lufs"] == pytest.approx(-16.0, abs=0.1)
+
+
+def test_normalizer_respects_peak_ceiling():
+    # Quiet speech-like level with one loud click: the click limits the gain
+    samples = tone(0.05)
+    samples[SAMPLE_RATE] = 0.7
+    measured, stage = normalize(samples, target_lufs=-10.0, ceiling_db=-1.0)
+
+    assert measured["peak_db"] <= -1.0 + 0.01
+    assert measured["peak_db"] == pytest.approx(-1.0, abs=0.05)
+    assert measured["lufs"] < -10.0 - 3
+    assert stage.gain_db == pytest.approx(-1.0 - 20 * np.log10(0.7), abs=0.01)
+
+
+def test_normalizer_gain_is_capped():
+    measured, stage = normalize(tone(0.001), target_lufs=-16.0, max_gain_db=20.0)
+    assert stage.gain_db == 20.0
+    assert measured["lufs"] == pytest.approx(-63.01 + 20.0, abs=0.2)
+
+
+def test_silence_is_left_alone():
+    measured, stage = normalize(np.zeros((SAMPLE_RATE, 1)))
+    assert stage.gain_db == 0.0
+    assert measured["lufs"] == float("-inf")
+
+
+def test_known_loudness_skips_measurement():
+    stage = LoudnessNormalizer(-16.0, measured={"lufs": -26.0, "peak_db": -12.0})
+    output = io.BytesIO()
+    convert_audio(clip(tone(0.1)), output, AudioFormat.WAV, pipeline=AudioPipeline([stage]))
+    assert stage.gain_db == pytest.approx(10.0)
+    assert measure_loudness(output.getvalue())["peak_db"] == pytest.approx(-10.0, abs=0.01)
@@ -0,0 +1,41 @@
+"""
+Tests for capturing engine output into memory
+"""
+
+import pytest
+
+from tts_notify.core.exceptions import AudioProcessingError
+from tts_notify.core.output_capture import MemfdCapture, OutputCapture, TempFileCapture
+
+
+def write_through(capture, data):
+    with open(capture.path, "wb") as writer:
+        writer.write(data)
+    return capture.read()
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        OutputCapture()
+
+
+def test_tempfile_capture_round_trip():
+    with OutputCapture.create(suffix=".aiff", mode="tempfile") as capture:
+        assert isinstance(capture, TempFileCapture)
+        assert write_through(capture, b"audio" * 100) == b"audio" * 100
+        path = capture.path
+    assert capture.bytes_on_disk == 500
+    assert not path.exists()
+
+
+@pytest.mark.skipif(not OutputCapture.memfd_supported(), reason="memfd is Linux-only")
+def test_memfd_capture_never_touches_disk():
+    with OutputCapture.create(mode="auto") as capture:
+        assert isinstance(capture, MemfdCapture)
+        assert write_through(capture, b"audio" * 100) == b"audio" * 100
+    assert capture.bytes_on_disk == 0
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(AudioProcessingError):
+        OutputCapture.create(mode="pipe")
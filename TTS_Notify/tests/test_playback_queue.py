@@ -0,0 +1,142 @@
+"""
+Tests for the priority playback queue
+"""
+
+import asyncio
+from pathlib import Path
+
+from tts_notify.core.models import Language, PlaybackPriority, TTSRequest, Voice
+from tts_notify.core.playback_queue import PlaybackQueue
+from tts_notify.core.synthetic_engine import SimulatedPlayback
+
+
+class RecordingTarget:
+    """Playback target that plays for a fixed time per text and records what happened"""
+
+    def __init__(self, durations=None, prepare_delay=0.0, render=False):
+        self.durations = durations or {}
+        self.prepare_delay = prepare_delay
+        self.render = render
+        self.started = []
+        self.prepared = []
+        self.released = []
+
+    def needs_render(self, request):
+        return self.render
+
+    async def start_playback(self, request, prepared=None):
+        self.started.append(request.text)
+        return SimulatedPlayback(self.durations.get(request.text, 0.05))
+
+    async def prepare_playback(self, request):
+        await asyncio.sleep(self.prepare_delay)
+        self.prepared.append(request.text)
+        return Path(f"/tmp/{request.text}.aiff")
+
+    def release_playback(self, prepared):
+        self.released.append(prepared)
+
+
+def make_request(text, priority=PlaybackPriority.NORMAL):
+    voice = Voice(id="Synthetic", name="Synthetic", language=Language.ENGLISH)
+    return TTSRequest(text=text, voice=voice, priority=priority)
+
+
+async def submit_later(queue, target, text, priority=PlaybackPriority.NORMAL, delay=0.02):
+    await asyncio.sleep(delay)
+    return await queue.submit(make_request(text, priority), target)
+
+
+def test_waiting_items_play_by_priority_then_arrival():
+    queue = PlaybackQueue(prefetch=False)
+    target = RecordingTarget({"first": 0.2})
+
+    async def run():
+        first = asyncio.ensure_future(queue.submit(make_request("first"), target))
+        await asyncio.sleep(0.05)
+        later = [queue.submit(make_request(text, priority), target) for text, priority in [
+            ("bulk", PlaybackPriority.BULK), ("normal-1", PlaybackPriority.NORMAL),
+            ("normal-2", PlaybackPriority.NORMAL)]]
+        return await asyncio.gather(first, *later)
+
+    responses = asyncio.run(run())
+    assert all(response.success for response in responses)
+    assert target.started == ["first", "normal-1", "normal-2", "bulk"]
+
+
+def test_urgent_preempts_and_requeued_item_restarts():
+    queue = PlaybackQueue(prefetch=False, requeue_preempted=True)
+    target = RecordingTarget({"long": 0.5})
+
+    async def run():
+        return await asyncio.gather(
+            queue.submit(make_request("long"), target),
+            submit_later(queue, target, "alert", PlaybackPriority.URGENT, delay=0.1))
+
+    long, alert = asyncio.run(run())
+    assert target.started == ["long", "alert", "long"]
+    assert long.success and long.metadata["preemptions"] == 1
+    assert alert.success
+    assert queue.stats.preempted == 1 and queue.stats.requeued == 1
+
+
+def test_preempted_item_fails_without_requeue():
+    queue = PlaybackQueue(prefetch=False, requeue_preempted=False)
+    target = RecordingTarget({"long": 0.5})
+
+    async def run():
+        return await asyncio.gather(
+            queue.submit(make_request("long"), target),
+            submit_later(queue, target, "alert", PlaybackPriority.URGENT, delay=0.1))
+
+    long, alert = asyncio.run(run())
+    assert target.started == ["long", "alert"]
+    assert not long.success and long.metadata["preempted"]
+    assert alert.success
+
+
+def test_urgent_item_gets_ahead_of_one_being_prepared():
+    # "next" is still rendering when the urgent item arrives: it must not start first
+    queue = PlaybackQueue(prefetch=False)
+    target = RecordingTarget(prepare_delay=0.2, render=True)
+
+    async def run():
+        return await asyncio.gather(
+            queue.submit(make_request("next"), target),
+            submit_later(queue, target, "alert", PlaybackPriority.URGENT, delay=0.05))
+
+    responses = asyncio.run(run())
+    assert all(response.success for response in responses)
+    assert target.started == ["alert", "next"]
+    # The rendered audio of the postponed item is reused, not rendered twice
+    assert target.prepared.count("next") == 1
+
+
+def test_next_item_is_prefetched_while_current_plays():
+    queue = PlaybackQueue(prefetch=True)
+    target = RecordingTarget({"first": 0.2})
+
+    async def run():
+        return await asyncio.gather(
+            queue.submit(make_request("first"), target),
+            submit_later(queue, target, "second", delay=0.05))
+
+    first, second = asyncio.run(run())
+    assert second.metadata["prefetched"] and not first.metadata["prefetched"]
+    assert target.prepared == ["second"]
+    assert queue.stats.prefetch_hits == 1
+    assert Path("/tmp/second.aiff") in target.released
+
+
+def test_no_prefetch_when_disabled():
+    queue = PlaybackQueue(prefetch=False)
+    target = RecordingTarget({"first": 0.2})
+
+    async def run():
+        return await asyncio.gather(
+            queue.submit(make_request("first"), target),
+            submit_later(queue, target, "second", delay=0.05))
+
+    _, second = asyncio.run(run())
+    assert not second.metadata["prefetched"]
+    assert target.prepared == []
@@ -0,0 +1,165 @@
+"""
+Tests for entry-point plugin discovery and import on first use
+"""
+
+import asyncio
+import itertools
+import sys
+from importlib import metadata
+
+import pytest
+
+from tts_notify import plugins
+from tts_notify.core.exceptions import EngineNotAvailableError, PluginError
+from tts_notify.core.models import AudioFormat, Language, TTSRequest, Voice
+from tts_notify.core.synthetic_engine import SyntheticTTSEngine
+from tts_notify.core.tts_engine import EngineRegistry
+from tts_notify.core.voice_system import VoiceManager
+from tts_notify.plugins import DETECTOR_GROUP, ENGINE_GROUP, PluginManager
+
+_GOOD_PLUGIN = '''
+from tts_notify.core.synthetic_engine import SyntheticTTSEngine
+
+class Engine(SyntheticTTSEngine):
+    def __init__(self):
+        super().__init__(latency=0.0)
+'''
+
+_BROKEN_PLUGIN = '''
+import tts_notify_missing_dependency
+'''
+
+_DETECTOR_PLUGIN = '''
+from tts_notify.core.models import Language, Voice
+from tts_notify.core.voice_system import VoiceDetector
+
+class Detector(VoiceDetector):
+    def is_available(self):
+        return True
+
+    async def detect_voices(self):
+        return [Voice(id="PluginVoice", name="PluginVoice", language=Language.ENGLISH)]
+'''
+
+_module_ids = itertools.count(1)
+
+
+@pytest.fixture
+def plugin_modules(temp_dir, monkeypatch):
+    """Write plugin modules importable by name; returns (good, broken) module names"""
+    suffix = next(_module_ids)
+    good, broken = f"tts_test_plugin_good_{suffix}", f"tts_test_plugin_broken_{suffix}"
+    (temp_dir / f"{good}.py").write_text(_GOOD_PLUGIN)
+    (temp_dir / f"{broken}.py").write_text(_BROKEN_PLUGIN)
+    (temp_dir / f"{good}_detector.py").write_text(_DETECTOR_PLUGIN)
+    monkeypatch.syspath_prepend(str(temp_dir))
+    yield good, broken
+    for name in (good, broken, f"{good}_detector"):
+        sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def installed(plugin_modules, monkeypatch):
+    """Publish the plugin modules as tts_notify.engines entry points; returns a fresh manager"""
+    good, broken = plugin_modules
+    entry_points = {
+        ENGINE_GROUP: [metadata.EntryPoint(name="good", value=f"{good}:Engine", group=ENGINE_GROUP),
+                       metadata.EntryPoint(name="broken", value=f"{broken}:Engine", group=ENGINE_GROUP)],
+        DETECTOR_GROUP: [metadata.EntryPoint(name="good", value=f"{good}_detector:Detector",
+                                             group=DETECTOR_GROUP)],
+    }
+    monkeypatch.setattr(metadata, "entry_points", lambda group=None, **kwargs: entry_points[group])
+    manager = PluginManager(enabled=True, disabled=[])
+    monkeypatch.setattr(plugins, "plugin_manager", manager)
+    return manager
+
+
+def test_discovery_imports_nothing(installed, plugin_modules):
+    specs = installed.engines()
+    assert set(specs) == {"good", "broken"}
+    assert not any(spec.loaded for spec in specs.values())
+    assert not any(name in sys.modules for name in plugin_modules)
+
+
+def test_plugin_imported_on_first_use(installed, plugin_modules):
+    good, _ = plugin_modules
+    registry = EngineRegistry()
+    assert set(registry.list_available()) == {"good", "broken"}
+    info = asyncio.run(registry.get_all_engine_info())
+    assert info["good"] == {"name": "good", "loaded": False}
+    assert good not in sys.modules
+
+    engine = registry.get("good")
+    assert good in sys.modules
+    assert installed.engines()["good"].loaded
+    assert engine.name == "good"
+
+    voice = Voice(id="Synthetic", name="Synthetic", language=Language.ENGLISH)
+    response = asyncio.run(engine.synthesize(TTSRequest(text="Loaded lazily", voice=voice,
+                                                        output_format=AudioFormat.WAV)))
+    assert response.success, response.error
+
+
+def test_disabled_plugin_is_not_discovered(installed):
+    manager = PluginManager(enabled=True, disabled=["broken"])
+    assert set(manager.engines()) == {"good"}
+
+
+def test_failing_plugin_import_is_isolated(installed, plugin_modules):
+    good, broken = plugin_modules
+    with pytest.raises(PluginError) as excinfo:
+        installed.create_engine("broken")
+    assert excinfo.value.plugin_name == "broken"
+    assert "tts_notify_missing_dependency" in installed.engines()["broken"].error
+
+    registry = EngineRegistry()
+    with pytest.raises(EngineNotAvailableError):
+        registry.get("broken")
+    # The broken plugin neither hides the others nor poisons the registry
+    assert "good" in registry.list_available()
+    assert registry.get("good", guarded=False).name == "good"
+    assert good in sys.modules and broken not in sys.modules
+
+
+def test_plugin_must_subclass_engine(plugin_modules):
+    manager = PluginManager(enabled=True, disabled=[])
+    manager.add(ENGINE_GROUP, "bogus", "pathlib:Path")
+    with pytest.raises(PluginError, match="not a TTSEngine subclass"):
+        manager.create_engine("bogus")
+    assert manager.engines()["bogus"].error == "not a TTSEngine subclass"
+
+
+def test_detector_plugin_loaded_on_first_voice_refresh(installed, plugin_modules):
+    detector_module = f"{plugin_modules[0]}_detector"
+    manager = VoiceManager()
+    assert detector_module not in sys.modules
+
+    voices = asyncio.run(manager.get_all_voices())
+    assert detector_module in sys.modules
+    assert "PluginVoice" in [voice.id for voice in voices]
+
+
+class CountingEngine(SyntheticTTSEngine):
+    initializations = 0
+
+    async def initialize(self) -> None:
+        CountingEngine.initializations += 1
+        await asyncio.sleep(0.05)
+        await super().initialize()
+
+
+def test_concurrent_first_requests_share_one_initialization():
+    CountingEngine.initializations = 0
+    registry = EngineRegistry()
+    registry.register_lazy("counting", lambda: CountingEngine(latency=0.0))
+    voice = Voice(id="Synthetic", name="Synthetic", language=Language.ENGLISH)
+
+    async def run():
+        engine = registry.get("counting")
+        requests = [TTSRequest(text=f"Request {index}", voice=voice, output_format=AudioFormat.WAV)
+                    for index in range(5)]
+        return await asyncio.gather(*[engine.synthesize(request) for request in requests])
+
+    responses = asyncio.run(run())
+    assert all(response.success for response in responses)
+    assert CountingEngine.initializations == 1
@@ -0,0 +1,45 @@
+"""
+Tests for serving requests from time-stretched clips cached at another rate
+"""
+
+import asyncio
+
+import pytest
+
+from tts_notify.core.models import AudioFormat, Language, TTSRequest, Voice
+from tts_notify.core.synthesis_cache import SynthesisCache
+from tts_notify.core.synthetic_engine import SyntheticTTSEngine
+
+pytest.importorskip("numpy")
+
+
+def make_request(rate):
+    voice = Voice(id="Synthetic", name="Synthetic", language=Language.ENGLISH)
+    return TTSRequest(text="The build finished without errors", voice=voice, rate=rate,
+                      output_format=AudioFormat.WAV)
+
+
+def test_variant_save_does_not_overwrite_linked_cache_entry(tts_config, temp_dir):
+    tts_config(TTS_NOTIFY_RATE_VARIANT_TOLERANCE=0.2, TTS_NOTIFY_COALESCE_WINDOW=0)
+    cache = SynthesisCache(cache_dir=temp_dir / "cache")
+    engine = SyntheticTTSEngine(latency=0.0, cache=cache)
+    output = temp_dir / "out.wav"
+
+    async def run():
+        await engine.initialize()
+        first = await engine.save(make_request(175), output)
+        # Served by hardlink: output now shares its inode with the 175 WPM entry
+        second = await engine.save(make_request(175), output)
+        variant = await engine.save(make_request(200), output)
+        return first, second, variant
+
+    first, second, variant = asyncio.run(run())
+    assert first.success and second.metadata["cache_hit"]
+    assert "rate_variant" in variant.metadata
+
+    source_key = engine._cache_key(make_request(175))
+    cache._memory.clear()
+    original = cache.get(source_key)
+    assert original is not None
+    assert output.read_bytes() != original
+    assert len(original) > len(output.read_bytes())
@@ -0,0 +1,37 @@
+"""
+Tests for splitting text into segments and shards
+"""
+
+from tts_notify.core.segmenter import TextSegmenter
+
+
+def test_sentences_keep_closing_quotes_and_brackets():
+    text = 'He said "Stop." She left (quietly.) «Adiós.» [Done!] End'
+    assert TextSegmenter.split_sentences(text) == [
+        'He said "Stop."', "She left (quietly.)", "«Adiós.»", "[Done!]", "End"]
+
+
+def test_paragraphs_are_boundaries():
+    assert TextSegmenter.split_sentences("One. Two\n\nThree") == ["One.", "Two", "Three"]
+
+
+def test_segments_respect_limits_and_keep_text():
+    text = " ".join(f"Sentence number {i} is here, with a clause." for i in range(40))
+    segments = TextSegmenter.split_into_segments(text, max_chars=120, first_max_chars=30)
+    assert len(segments[0]) <= 30
+    assert all(len(segment) <= 120 for segment in segments)
+    assert " ".join(segments).split() == text.split()
+
+
+def test_shards_pack_whole_paragraphs():
+    paragraphs = [f"Paragraph {i} has a little text." for i in range(10)]
+    shards = TextSegmenter.split_into_shards("\n\n".join(paragraphs), max_chars=100)
+    assert all(len(shard) <= 100 for shard in shards)
+    assert [p for shard in shards for p in shard.split("\n\n")] == paragraphs
+
+
+def test_long_paragraph_shards_split_at_sentences():
+    paragraph = " ".join(f'She said "line {i}." ' for i in range(30)).strip()
+    shards = TextSegmenter.split_into_shards(paragraph, max_chars=80)
+    assert all(shard.endswith('."') for shard in shards)
+    assert " ".join(shards).split() == paragraph.split()
@@ -0,0 +1,34 @@
+"""
+Tests for segmented streaming through TTSEngine.stream
+"""
+
+import asyncio
+
+import pytest
+
+from tts_notify.core.audio_io import read_info
+from tts_notify.core.models import AudioFormat, Language, TTSRequest, Voice
+from tts_notify.core.synthetic_engine import SyntheticTTSEngine
+from tts_notify.core.tts_engine import TTSEngine
+
+TEXT = "First sentence of the stream. A second one follows it. And the third ends it."
+
+
+@pytest.mark.parametrize("output_format", [AudioFormat.AIFF, AudioFormat.WAV])
+def test_segmented_stream_is_one_file(monkeypatch, output_format):
+    monkeypatch.setattr(TTSEngine, "_streaming_enabled", staticmethod(lambda: True))
+    engine = SyntheticTTSEngine(latency=0.0)
+    voice = Voice(id="Synthetic", name="Synthetic", language=Language.ENGLISH)
+    request = TTSRequest(text=TEXT, voice=voice, output_format=output_format)
+
+    async def run():
+        await engine.initialize()
+        chunks = [chunk async for chunk in engine.stream(request)]
+        segments = [response.audio_data async for response in engine.stream_segments(request)]
+        return chunks, segments
+
+    chunks, segments = asyncio.run(run())
+    assert len(segments) > 1 and len(chunks) == len(segments) + 1
+    info = read_info(b"".join(chunks))
+    assert info.container == output_format.value
+    assert info.frames == sum(read_info(segment).frames for segment in segments)
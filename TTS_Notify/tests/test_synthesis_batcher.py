@@ -0,0 +1,52 @@
+"""
+Tests for splitting batched renders back into clips
+"""
+
+import pytest
+
+from tts_notify.core.synthesis_batcher import split_on_silence
+
+np = pytest.importorskip("numpy")
+
+SAMPLE_RATE = 22050
+
+
+def silence(seconds):
+    return np.zeros((int(SAMPLE_RATE * seconds), 1), dtype=np.float32)
+
+
+def speech(seconds):
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)[:, None]
+
+
+def test_single_clip_is_whole_recording():
+    samples = speech(0.5)
+    assert split_on_silence(samples, SAMPLE_RATE, 1, 0.3) == [(0, len(samples))]
+
+
+def test_splits_on_longest_gaps_and_keeps_edge_padding():
+    # A short pause inside the second clip must not be taken for a separator
+    parts = [silence(0.2), speech(0.5), silence(0.6), speech(0.3), silence(0.1), speech(0.3),
+             silence(0.6), speech(0.4), silence(0.2)]
+    samples = np.concatenate(parts)
+    spans = split_on_silence(samples, SAMPLE_RATE, 3, 0.3)
+
+    assert len(spans) == 3
+    assert spans[0][0] == 0 and spans[-1][1] == len(samples)
+    for (_, end), (start, _) in zip(spans, spans[1:]):
+        assert end <= start
+    lengths = [(end - start) / SAMPLE_RATE for start, end in spans]
+    # Each clip has 0.2 s of silence on both sides, like a standalone render
+    assert lengths == pytest.approx([0.9, 1.1, 0.8], abs=0.03)
+
+
+def test_returns_none_without_enough_separators():
+    samples = np.concatenate([silence(0.2), speech(0.5), silence(0.1), speech(0.5), silence(0.2)])
+    assert split_on_silence(samples, SAMPLE_RATE, 2, 0.3) is None
+    assert split_on_silence(np.zeros((10, 1), dtype=np.float32), SAMPLE_RATE, 2, 0.3) is None
+
+
+def test_leading_and_trailing_silence_are_not_separators():
+    samples = np.concatenate([silence(0.6), speech(0.5), silence(0.6)])
+    assert split_on_silence(samples, SAMPLE_RATE, 2, 0.3) is None
@@ -0,0 +1,119 @@
+"""
+Tests for the two-tier synthesis cache and the engine's use of it
+"""
+
+import asyncio
+import os
+
+from tts_notify.core.models import AudioFormat, Language, TTSRequest, Voice
+from tts_notify.core.synthesis_cache import SynthesisCache
+from tts_notify.core.tts_engine import MacOSTTSEngine
+
+
+def make_request(text="Deploy finished", rate=175, **kwargs):
+    voice = Voice(id="Alex", name="Alex", language=Language.ENGLISH)
+    return TTSRequest(text=text, voice=voice, rate=rate, **kwargs)
+
+
+def test_key_ignores_whitespace_but_not_parameters():
+    key = SynthesisCache.make_key(make_request("Deploy  finished "))
+    assert key == SynthesisCache.make_key(make_request("Deploy finished"))
+    assert key != SynthesisCache.make_key(make_request("Deploy finished", rate=200))
+    assert key != SynthesisCache.make_key(make_request("Deploy finished"), variant="loudnorm")
+
+
+def test_memory_tier_evicts_least_recently_used(temp_dir):
+    cache = SynthesisCache(cache_dir=temp_dir, max_memory_items=2)
+    cache.put("a", b"A" * 10)
+    cache.put("b", b"B" * 10)
+    assert cache.get("a") == b"A" * 10
+    cache.put("c", b"C" * 10)
+
+    assert list(cache._memory) == ["a", "c"]
+    assert cache.stats.memory_evictions == 1
+    # Evicted from memory, still served from disk
+    assert cache.get("b") == b"B" * 10
+    assert cache.stats.disk_hits == 1
+
+
+def test_disk_tier_respects_size_cap(temp_dir):
+    cache = SynthesisCache(cache_dir=temp_dir, max_memory_items=0, max_disk_bytes=250)
+    for key in ("a", "b", "c"):
+        cache.put(key, key.encode() * 100)
+
+    stats = cache.get_stats()
+    assert stats["disk_bytes"] <= 250
+    assert stats["disk_evictions"] == 1
+    assert not (temp_dir / "a.audio").exists()
+    assert cache.get("a") is None
+
+    # A new process rebuilds the index from the files left behind
+    reopened = SynthesisCache(cache_dir=temp_dir, max_memory_items=0, max_disk_bytes=250)
+    assert reopened.get("c") == b"c" * 100
+
+
+def test_hit_and_miss_counters(temp_dir):
+    cache = SynthesisCache(cache_dir=temp_dir)
+    assert cache.get("missing") is None
+    cache.put("key", b"audio")
+    cache.get("key")
+    cache._memory.clear()
+    cache.get("key")
+
+    stats = cache.get_stats()
+    assert (stats["memory_hits"], stats["disk_hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["hit_ratio"] == 2 / 3
+
+
+def test_copy_to_serves_by_hardlink(temp_dir):
+    cache = SynthesisCache(cache_dir=temp_dir / "cache")
+    cache.put("key", b"audio")
+    output = temp_dir / "out.aiff"
+
+    assert cache.copy_to("key", output)
+    assert output.read_bytes() == b"audio"
+    assert os.path.samefile(output, cache._entry_path("key"))
+
+
+def test_copy_to_falls_back_to_copy(temp_dir):
+    cache = SynthesisCache(cache_dir=temp_dir / "cache", use_hardlinks=False)
+    cache.put("key", b"audio")
+    output = temp_dir / "out.aiff"
+
+    assert cache.copy_to("key", output)
+    assert output.read_bytes() == b"audio"
+    assert output.stat().st_nlink == 1
+
+
+def test_memory_copy_does_not_write_through_hardlink(temp_dir):
+    cache = SynthesisCache(cache_dir=temp_dir / "cache")
+    cache.put("linked", b"first")
+    output = temp_dir / "out.aiff"
+    cache.copy_to("linked", output)
+
+    # Memory-only entry (too large for the disk tier) served to the same path
+    cache.max_disk_bytes = 8
+    cache.put("memory", b"second entry")
+    assert cache.copy_to("memory", output)
+    assert output.read_bytes() == b"second entry"
+    assert cache._entry_path("linked").read_bytes() == b"first"
+
+
+def test_engine_cache_hit_skips_say(stub_say, temp_dir, tts_config):
+    tts_config(TTS_NOTIFY_COALESCE_WINDOW=0)
+    engine = MacOSTTSEngine(cache=SynthesisCache(cache_dir=temp_dir / "cache"))
+    request = make_request(output_format=AudioFormat.AIFF)
+
+    async def run():
+        await engine.initialize()
+        first = await engine.save(request, temp_dir / "first.aiff")
+        second = await engine.save(request, temp_dir / "second.aiff")
+        audio = await engine.synthesize(request)
+        return first, second, audio
+
+    first, second, audio = asyncio.run(run())
+    renders = [line for line in stub_say.read_text().splitlines() if "-o" in line.split()]
+    assert first.success and not first.metadata["cache_hit"], first.error
+    assert second.metadata["cache_hit"] and audio.metadata["cache_hit"]
+    assert len(renders) == 1
+    assert (temp_dir / "second.aiff").read_bytes() == (temp_dir / "first.aiff").read_bytes()
@@ -0,0 +1,45 @@
+"""
+Tests for the synthetic engine running through the full engine pipeline
+"""
+
+import asyncio
+
+from tts_notify.core.audio_io import read_info
+from tts_notify.core.models import AudioFormat, Language, TTSRequest, Voice
+from tts_notify.core.synthetic_engine import SyntheticTTSEngine
+
+
+def make_request(text="Synthetic engines render anywhere", **kwargs):
+    voice = Voice(id="Synthetic", name="Synthetic", language=Language.ENGLISH)
+    return TTSRequest(text=text, voice=voice, **kwargs)
+
+
+def test_synthesize_uses_duration_model():
+    engine = SyntheticTTSEngine(latency=0.0)
+
+    async def run():
+        await engine.initialize()
+        return await engine.synthesize(make_request(rate=175))
+
+    response = asyncio.run(run())
+    assert response.success, response.error
+    assert read_info(response.audio_data).duration > 0
+
+
+def test_save_accepts_timeout(temp_dir):
+    engine = SyntheticTTSEngine(latency=0.0)
+    path = temp_dir / "out.wav"
+
+    async def run():
+        await engine.initialize()
+        return await engine.save(make_request(output_format=AudioFormat.WAV), path)
+
+    response = asyncio.run(run())
+    assert response.success, response.error
+    assert read_info(path).frames > 0
+
+
+def test_estimate_duration_takes_a_request():
+    estimate = SyntheticTTSEngine(latency=0.0).estimate_duration(make_request())
+    assert estimate.audio_duration > 0
+    assert set(estimate.timeouts) == {"synthesize", "speak", "play"}
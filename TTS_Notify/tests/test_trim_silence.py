@@ -0,0 +1,93 @@
+"""
+Tests for trimming leading and trailing silence
+"""
+
+import pytest
+
+from tts_notify.core.audio_dsp import TrimSilence
+from tts_notify.core.audio_pipeline import AudioPipeline
+
+np = pytest.importorskip("numpy")
+
+SAMPLE_RATE = 22050
+FRAME = int(SAMPLE_RATE * 0.01)
+
+
+def silence(seconds, level=0.0, seed=0):
+    noise = np.random.default_rng(seed).standard_normal(int(SAMPLE_RATE * seconds))
+    return (level * noise).astype(np.float32)
+
+
+def tone(seconds, amplitude=0.5):
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 330 * t)).astype(np.float32)
+
+
+def trim(samples, block=1000, **settings):
+    stage = TrimSilence(**settings)
+    pipeline = AudioPipeline([stage])
+    pipeline.configure(SAMPLE_RATE, 1)
+    samples = samples[:, None]
+    outputs = [pipeline.process(samples[start:start + block]) for start in range(0, len(samples), block)]
+    outputs.append(pipeline.flush())
+    return np.concatenate(outputs)[:, 0], stage.get_stats()
+
+
+def loud_span(samples, threshold=0.01):
+    loud = np.flatnonzero(np.abs(samples) > threshold)
+    return loud[0], loud[-1]
+
+
+def test_trims_leading_and_trailing_silence_to_padding():
+    speech = tone(0.5)
+    source = np.concatenate([silence(0.3), speech, silence(0.4)])
+    output, stats = trim(source, padding=0.03)
+
+    pad = int(SAMPLE_RATE * 0.03)
+    first, last = loud_span(output)
+    # Padding is counted from the scoring frame where speech starts
+    assert pad <= first <= pad + FRAME
+    assert len(output) - 1 - last == pytest.approx(pad, abs=FRAME)
+    assert last - first == pytest.approx(len(speech), abs=FRAME)
+    assert stats["leading_trimmed"] == pytest.approx(0.27, abs=0.011)
+    assert stats["trailing_trimmed"] == pytest.approx(0.37, abs=0.011)
+    assert stats["input_duration"] == pytest.approx(1.2, abs=1e-3)
+
+
+def test_zero_padding_cuts_at_the_speech():
+    source = np.concatenate([silence(0.2), tone(0.3), silence(0.2)])
+    output, _ = trim(source, padding=0.0)
+    first, last = loud_span(output)
+    assert first < FRAME and len(output) - 1 - last < FRAME
+
+
+def test_pauses_inside_speech_are_kept():
+    source = np.concatenate([silence(0.1), tone(0.2), silence(0.25), tone(0.2), silence(0.1)])
+    output, _ = trim(source, padding=0.0)
+    assert len(output) == pytest.approx(int(SAMPLE_RATE * 0.65), abs=2 * FRAME)
+
+
+def test_noise_below_threshold_counts_as_silence():
+    source = np.concatenate([silence(0.3, level=0.0005), tone(0.3), silence(0.3, level=0.0005, seed=1)])
+    output, stats = trim(source, threshold_db=-50.0, padding=0.0)
+    assert len(output) == pytest.approx(int(SAMPLE_RATE * 0.3), abs=2 * FRAME)
+    assert stats["leading_trimmed"] == pytest.approx(0.3, abs=0.011)
+
+
+@pytest.mark.parametrize("block", [37, 882, 100000])
+def test_output_does_not_depend_on_block_size(block):
+    source = np.concatenate([silence(0.25), tone(0.3), silence(0.1), tone(0.1), silence(0.3)])
+    expected, _ = trim(source, block=len(source))
+    output, _ = trim(source, block=block)
+    assert np.array_equal(output, expected)
+
+
+def test_all_silent_input_keeps_only_padding():
+    output, stats = trim(silence(0.5), padding=0.03)
+    assert len(output) == int(SAMPLE_RATE * 0.03)
+    assert not output.any()
+    assert stats["leading_trimmed"] == pytest.approx(0.47, abs=1e-3)
+
+    # Shorter than the padding: kept, up to the last partial scoring frame
+    short, _ = trim(silence(0.02), padding=0.03)
+    assert int(SAMPLE_RATE * 0.02) - FRAME < len(short) <= int(SAMPLE_RATE * 0.02)
@@ -0,0 +1,227 @@
+"""
+Tests for the synthesis worker pool, its configuration and the AppKit worker backend
+"""
+
+import asyncio
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+from tts_notify.core import synthesis_worker, worker_pool
+from tts_notify.core.models import AudioFormat, Language, TTSRequest, Voice
+from tts_notify.core.tts_engine import MacOSTTSEngine
+from tts_notify.core.worker_pool import SynthesisWorkerPool
+
+
+def pool_config(command=""):
+    return SimpleNamespace(TTS_NOTIFY_WORKER_POOL_ENABLED=True, TTS_NOTIFY_WORKER_COMMAND=command)
+
+
+def test_pool_refused_without_pyobjc(monkeypatch):
+    monkeypatch.setattr(worker_pool, "appkit_available", lambda: False)
+    assert SynthesisWorkerPool.from_config(pool_config()) is None
+
+
+def test_pool_built_with_pyobjc_or_custom_worker(monkeypatch):
+    monkeypatch.setattr(worker_pool, "appkit_available", lambda: True)
+    assert SynthesisWorkerPool.from_config(pool_config()) is not None
+    monkeypatch.setattr(worker_pool, "appkit_available", lambda: False)
+    pool = SynthesisWorkerPool.from_config(pool_config("my-worker --fast"))
+    assert pool.command == ["my-worker", "--fast"]
+
+
+class FakeSynth:
+    def __init__(self):
+        self._rate = 180.0
+        self.spoken = []
+
+    @classmethod
+    def alloc(cls):
+        return cls()
+
+    def initWithVoice_(self, identifier):
+        return self
+
+    def rate(self):
+        return self._rate
+
+    def setRate_(self, rate):
+        self._rate = rate
+
+    def startSpeakingString_toURL_(self, text, url):
+        self.spoken.append((text, self._rate))
+        return True
+
+    def isSpeaking(self):
+        return False
+
+    @staticmethod
+    def availableVoices():
+        return ["com.apple.voice.Alex"]
+
+    @staticmethod
+    def attributesForVoice_(identifier):
+        return {"VoiceName": "Alex"}
+
+
+def test_appkit_backend_resets_rate(monkeypatch):
+    appkit = types.ModuleType("AppKit")
+    appkit.NSSpeechSynthesizer = FakeSynth
+    foundation = types.ModuleType("Foundation")
+    foundation.NSURL = SimpleNamespace(fileURLWithPath_=lambda path: path)
+    foundation.NSDate = SimpleNamespace(dateWithTimeIntervalSinceNow_=lambda seconds: seconds)
+    foundation.NSRunLoop = SimpleNamespace(currentRunLoop=lambda: None)
+    monkeypatch.setitem(sys.modules, "AppKit", appkit)
+    monkeypatch.setitem(sys.modules, "Foundation", foundation)
+
+    backend = synthesis_worker.AppKitBackend()
+    backend.run({"text": "fast", "voice": "Alex", "rate": 300, "output": "/tmp/a.aiff"})
+    backend.run({"text": "default", "voice": "alex", "output": "/tmp/b.aiff"})
+    assert backend._synths["alex"].spoken == [("fast", 300.0), ("default", 180.0)]
+
+
+_STUB_WORKER = r'''
+import json, math, os, struct, sys
+
+def ext80(x):
+    e = int(math.floor(math.log2(x)))
+    return struct.pack(">HQ", e + 16383, int(x / 2 ** e * (1 << 63)))
+
+def render_aiff(path, text):
+    frames = [int(8000 * math.sin(k / 8)) for k in range(2205 * max(1, len(text.split())))]
+    comm = struct.pack(">hIh", 1, len(frames), 16) + ext80(22050)
+    ssnd = struct.pack(">II", 0, 0) + struct.pack(">%dh" % len(frames), *frames)
+    body = b"AIFF" + b"COMM" + struct.pack(">I", len(comm)) + comm + b"SSND" + struct.pack(">I", len(ssnd)) + ssnd
+    with open(path, "wb") as f:
+        f.write(b"FORM" + struct.pack(">I", len(body)) + body)
+
+for line in sys.stdin:
+    request = json.loads(line)
+    if request.get("op") == "sleep":
+        import time
+        time.sleep(request["seconds"])
+    if request.get("output"):
+        render_aiff(request["output"], request["text"])
+    sys.stdout.write(json.dumps({"id": request["id"], "ok": True, "pid": os.getpid()}) + "\n")
+    sys.stdout.flush()
+'''
+
+
+@pytest.fixture
+def stub_worker(temp_dir):
+    """Command line for a stub pooled worker that answers with its pid"""
+    script = temp_dir / "stub_worker.py"
+    script.write_text(_STUB_WORKER)
+    return [sys.executable, str(script)]
+
+
+def test_pool_rejects_inverted_bounds():
+    with pytest.raises(ValueError):
+        SynthesisWorkerPool(command=["worker"], min_size=3, max_size=2)
+
+
+def test_pool_starts_min_and_grows_to_max(stub_worker):
+    pool = SynthesisWorkerPool(command=stub_worker, min_size=2, max_size=3, health_check_interval=0)
+
+    async def run():
+        await pool.start()
+        started = pool.get_stats()
+        responses = await asyncio.gather(
+            *[pool.submit({"op": "sleep", "seconds": 0.2}) for _ in range(6)])
+        finished = pool.get_stats()
+        await pool.stop()
+        return started, responses, finished
+
+    started, responses, finished = asyncio.run(run())
+    assert started["size"] == started["idle"] == 2
+    assert all(response["ok"] for response in responses)
+    assert len({response["pid"] for response in responses}) == 3
+    assert finished["spawned"] == finished["size"] == 3
+    assert finished["jobs_completed"] == 6
+    assert not pool.running and pool.size == 0
+
+
+def test_pool_recycles_worker_after_max_jobs(stub_worker):
+    pool = SynthesisWorkerPool(command=stub_worker, min_size=1, max_size=1,
+                               max_jobs_per_worker=2, health_check_interval=0)
+
+    async def run():
+        await pool.start()
+        pids = [(await pool.submit({"op": "ping"}))["pid"] for _ in range(5)]
+        await pool.stop()
+        return pids
+
+    pids = asyncio.run(run())
+    assert pids[0] == pids[1] != pids[2] == pids[3] != pids[4]
+    assert pool.stats.recycled == 2
+    assert pool.stats.spawned == 3
+
+
+def test_health_check_replaces_dead_worker(stub_worker):
+    pool = SynthesisWorkerPool(command=stub_worker, min_size=2, max_size=2, health_check_interval=0)
+
+    async def run():
+        await pool.start()
+        victim, survivor = pool._idle
+        victim.kill()
+        await victim._process.wait()
+        replaced = await pool.health_check()
+        workers = list(pool._idle)
+        response = await pool.submit({"op": "ping"})
+        await pool.stop()
+        return victim, survivor, replaced, workers, response
+
+    victim, survivor, replaced, workers, response = asyncio.run(run())
+    assert replaced == 1
+    assert len(workers) == 2 and victim not in workers and survivor in workers
+    assert response["ok"]
+    assert pool.stats.spawned == 3 and pool.stats.failed == 1
+
+
+def make_request():
+    voice = Voice(id="Alex", name="Alex", language=Language.ENGLISH)
+    return TTSRequest(text="Pool test", voice=voice, output_format=AudioFormat.AIFF)
+
+
+def test_engine_renders_on_pooled_worker(stub_say, stub_worker, temp_dir, tts_config):
+    tts_config(TTS_NOTIFY_SYNTH_CACHE_ENABLED="false", TTS_NOTIFY_COALESCE_WINDOW=0)
+    pool = SynthesisWorkerPool(command=stub_worker, min_size=1, max_size=1, health_check_interval=0)
+    engine = MacOSTTSEngine(worker_pool=pool)
+
+    async def run():
+        await engine.initialize()
+        try:
+            return await engine.save(make_request(), temp_dir / "pooled.aiff")
+        finally:
+            await engine.cleanup()
+
+    response = asyncio.run(run())
+    assert response.success, response.error
+    assert (temp_dir / "pooled.aiff").stat().st_size > 0
+    assert pool.stats.jobs_completed == 1
+    assert not [line for line in stub_say.read_text().splitlines() if "-o" in line.split()]
+
+
+@pytest.mark.parametrize("broken", ["stopped", "unspawnable"])
+def test_engine_falls_back_to_one_shot_say(broken, stub_say, stub_worker, temp_dir, tts_config):
+    tts_config(TTS_NOTIFY_SYNTH_CACHE_ENABLED="false", TTS_NOTIFY_COALESCE_WINDOW=0)
+    command = stub_worker if broken == "stopped" else [str(temp_dir / "missing-worker")]
+    pool = SynthesisWorkerPool(command=command, min_size=0, max_size=1, health_check_interval=0)
+    engine = MacOSTTSEngine(worker_pool=pool)
+
+    async def run():
+        await engine.initialize()
+        if broken == "stopped":
+            await pool.stop()
+        try:
+            return await engine.save(make_request(), temp_dir / "fallback.aiff")
+        finally:
+            await engine.cleanup()
+
+    response = asyncio.run(run())
+    assert response.success, response.error
+    assert (temp_dir / "fallback.aiff").stat().st_size > 0
+    assert pool.stats.jobs_completed == 0
+    assert [line for line in stub_say.read_text().splitlines() if "-o" in line.split()]